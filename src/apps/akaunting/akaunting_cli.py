@@ -17,6 +17,7 @@ from apps.akaunting.core.taxes import import_taxes
 from apps.akaunting.core.transfers import create_generated_transfers
 from apps.akaunting.utils import api
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -54,6 +55,18 @@ def down(volumes: bool, force: bool):
         subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    akaunting_cli,
+    SnapshotSpec(
+        app="akaunting",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        engine="mariadb",
+        volumes=[("akaunting", "/var/www/html")],
+    ),
+)
+
+
 @akaunting_cli.command()
 @click.option("--n-customers", type=int, default=50, help="Number of customers to create")
 @click.option("--n-vendors", type=int, default=50, help="Number of vendors to create")
@@ -66,7 +66,7 @@ async def create_generated_bills(number: int = 5):
         invoices = await generate_bills(number)
         contacts = await api.list_contacts("vendor")
         accounts = await api.list_accounts()
-        items = await api.list_items()
+        items_by_id = await api.items_by_id()
 
         if not contacts or not accounts:
             raise Exception("No contacts or accounts found")
@@ -86,7 +86,7 @@ async def create_generated_bills(number: int = 5):
             # Process all items in the invoice
             document_items = []
             for invoice_item in invoice.items:
-                current_item = next((item for item in items if item.id == invoice_item.item_id), None)
+                current_item = items_by_id.get(invoice_item.item_id)
                 if not current_item:
                     logger.warning(f"Item with id {invoice_item.item_id} not found")
                     continue
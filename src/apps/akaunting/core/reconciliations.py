@@ -14,6 +14,18 @@ async def create_generated_reconciliations(number: int = 5):
         if not accounts:
             raise Exception("No accounts found")
 
+        # Documents and transfers don't change while reconciling, so normalise their dates once
+        paid_document_dates = [
+            datetime.fromisoformat(doc.issued_at.replace("Z", "+00:00")).astimezone(UTC).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+            for document_type in ("invoice", "bill")
+            for doc in await api.list_documents(document_type=document_type)
+            if doc.status == "paid"
+        ]
+        transfer_dates = [
+            (transfer.from_account_id, transfer.to_account_id, transfer.paid_at.astimezone(UTC).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0))
+            for transfer in await api.list_transfers()
+        ]
+
         for _ in range(number):
             account = faker.random_element(accounts)
             logger.info(f"Processing account: {account.id} ({account.name})")
@@ -29,32 +41,14 @@ async def create_generated_reconciliations(number: int = 5):
             start_date = datetime.strptime(started_at.strftime("%Y-%m-%d"), "%Y-%m-%d")
             end_date = datetime.strptime(ended_at.strftime("%Y-%m-%d"), "%Y-%m-%d")
 
-            # Check for invoices
-            invoices = await api.list_documents(document_type="invoice")
-            has_invoices = any(
-                doc.status == "paid"
-                and start_date <= datetime.fromisoformat(doc.issued_at.replace("Z", "+00:00")).astimezone(UTC).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0) <= end_date
-                for doc in invoices
-            )
-
-            # Check for bills
-            bills = await api.list_documents(document_type="bill")
-            has_bills = any(
-                doc.status == "paid"
-                and start_date <= datetime.fromisoformat(doc.issued_at.replace("Z", "+00:00")).astimezone(UTC).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0) <= end_date
-                for doc in bills
-            )
+            # Check for paid invoices and bills
+            has_documents = any(start_date <= issued_at <= end_date for issued_at in paid_document_dates)
 
             # Check for transfers
-            transfers = await api.list_transfers()
-            has_transfers = any(
-                (transfer.from_account_id == account.id or transfer.to_account_id == account.id)
-                and start_date <= transfer.paid_at.astimezone(UTC).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0) <= end_date
-                for transfer in transfers
-            )
+            has_transfers = any(account.id in (from_account_id, to_account_id) and start_date <= paid_at <= end_date for from_account_id, to_account_id, paid_at in transfer_dates)
 
             # Only create reconciliation if there are transactions
-            if has_invoices or has_bills or has_transfers:
+            if has_documents or has_transfers:
                 # Use current balance for reconciliation
                 closing_balance = float(account.current_balance)
                 logger.info(f"Found transactions in date range, using current balance: {closing_balance}")
@@ -61,16 +61,16 @@ async def generate_transfers(number: int = 5):
 async def create_generated_transfers(number: int = 5):
     try:
         transfers = await generate_transfers(number)
+        # Account details are only needed for currency information
+        accounts = await api.accounts_by_id()
 
         for transfer in transfers:
             logger.info(transfer)
 
             transfer_date = faker.date_time_between(start_date="-1y", end_date="now")
 
-            # Get account details to handle currency information
-            accounts = await api.list_accounts()
-            from_account = next((acc for acc in accounts if str(acc.id) == transfer.from_account_id), None)
-            to_account = next((acc for acc in accounts if str(acc.id) == transfer.to_account_id), None)
+            from_account = accounts.get(int(transfer.from_account_id)) if transfer.from_account_id.isdigit() else None
+            to_account = accounts.get(int(transfer.to_account_id)) if transfer.to_account_id.isdigit() else None
 
             if not from_account or not to_account:
                 logger.warning(f"Could not find accounts for transfer: {transfer}")
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Any, Literal
 
 import aiohttp
 
@@ -50,6 +50,9 @@ class AkauntingAPI:
         self.base_url = base_url
         self.headers = {"X-Company": company_id}
         self._session = None
+        # Read-through cache for reference data, keyed by (resource, *query params)
+        self._cache: dict[tuple, list[Any]] = {}
+        self._indexes: dict[tuple, dict[int, Any]] = {}
 
     async def _get_session(self):
         """Ensure that the session exists and is active"""
@@ -66,15 +69,73 @@ class AkauntingAPI:
         await self._get_session()
 
     async def close(self):
-        """Close the aiohttp session"""
+        """Close the aiohttp session and drop cached reference data"""
         if self._session is not None:
             await self._session.close()
             self._session = None
+        self.clear_cache()
+
+    def clear_cache(self):
+        """Drop every cached listing and id index"""
+        self._cache.clear()
+        self._indexes.clear()
+
+    def _invalidate(self, *resources: str):
+        """Drop cached listings and id indexes for the given resource types"""
+        for key in [key for key in self._cache if key[0] in resources]:
+            self._cache.pop(key, None)
+            self._indexes.pop(key, None)
+
+    def _index(self, key: tuple, records: list[Any]) -> dict[int, Any]:
+        """Return an id-indexed view over a cached listing"""
+        if key not in self._indexes:
+            self._indexes[key] = {record.id: record for record in records}
+        return self._indexes[key]
+
+    async def accounts_by_id(self) -> dict[int, Account]:
+        """
+        Cached accounts indexed by id
+        """
+        return self._index(("accounts", 1, 100000), await self.list_accounts())
+
+    async def items_by_id(self) -> dict[int, Item]:
+        """
+        Cached items indexed by id
+        """
+        return self._index(("items", 1, 100000), await self.list_items())
+
+    async def taxes_by_id(self) -> dict[int, Tax]:
+        """
+        Cached taxes indexed by id
+        """
+        return self._index(("taxes", 1, 100000), await self.list_taxes())
+
+    async def categories_by_id(self, type: CategoryType | None = None) -> dict[int, Category]:  # noqa: A002
+        """
+        Cached categories of the given type indexed by id
+        """
+        return self._index(("categories", type, 1, 100000), await self.list_categories(type))
+
+    async def contacts_by_id(self, search_type: ContactType) -> dict[int, Contact]:
+        """
+        Cached contacts of the given type indexed by id
+        """
+        return self._index(("contacts", search_type, 1, 100000), await self.list_contacts(search_type))
+
+    async def documents_by_id(self, document_type: str = "invoice") -> dict[int, Document]:
+        """
+        Cached documents of the given type indexed by id
+        """
+        return self._index(("documents", document_type, 1, 100), await self.list_documents(document_type))
 
     async def list_contacts(self, search_type: ContactType, page: int = 1, limit: int = 100000) -> list[Contact]:
         """
         Fetch contacts from the Akaunting API
         """
+        key = ("contacts", search_type, page, limit)
+        if key in self._cache:
+            return self._cache[key]
+
         endpoint = f"{self.base_url}/api/contacts"
         params = {"search": f"type:{search_type}", "page": page, "limit": limit}
         session = await self._get_session()
@@ -82,7 +143,8 @@ class AkauntingAPI:
         async with session.get(endpoint, params=params) as response:
             response.raise_for_status()
             data = await response.json()
-            return ContactsResponse(**data).data
+            self._cache[key] = ContactsResponse(**data).data
+            return self._cache[key]
 
     async def add_contact(
         self,
@@ -124,6 +186,7 @@ class AkauntingAPI:
 
         # Remove None values from params
         params = {k: v for k, v in params.items() if v is not None}
+        self._invalidate("contacts")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -137,6 +200,7 @@ class AkauntingAPI:
         """
         endpoint = f"{self.base_url}/api/contacts/{contact_id}"
         params = {"search": f"type:{type}"}
+        self._invalidate("contacts")
         session = await self._get_session()
         async with session.delete(endpoint, params=params, headers=self.headers) as response:
             response.raise_for_status()
@@ -172,6 +236,7 @@ class AkauntingAPI:
 
         # Remove None values from params
         params = {k: v for k, v in params.items() if v is not None}
+        self._invalidate("items")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -182,6 +247,10 @@ class AkauntingAPI:
         """
         Fetch items from the Akaunting API
         """
+        key = ("items", page, limit)
+        if key in self._cache:
+            return self._cache[key]
+
         endpoint = f"{self.base_url}/api/items"
         params = {"page": page, "limit": limit}
         session = await self._get_session()
@@ -189,13 +258,15 @@ class AkauntingAPI:
         async with session.get(endpoint, params=params) as response:
             response.raise_for_status()
             data = await response.json()
-            return ListItemsResponse(**data).data
+            self._cache[key] = ListItemsResponse(**data).data
+            return self._cache[key]
 
     async def delete_item(self, item_id: str) -> None:
         """
         Delete an item from Akaunting
         """
         endpoint = f"{self.base_url}/api/items/{item_id}"
+        self._invalidate("items")
         session = await self._get_session()
 
         async with session.delete(endpoint, headers=self.headers) as response:
@@ -205,6 +276,10 @@ class AkauntingAPI:
         """
         Fetch taxes from the Akaunting API
         """
+        key = ("taxes", page, limit)
+        if key in self._cache:
+            return self._cache[key]
+
         endpoint = f"{self.base_url}/api/taxes"
         params = {"page": page, "limit": limit}
         session = await self._get_session()
@@ -212,7 +287,8 @@ class AkauntingAPI:
         async with session.get(endpoint, params=params, headers=self.headers) as response:
             response.raise_for_status()
             data = await response.json()
-            return TaxesResponse(**data).data
+            self._cache[key] = TaxesResponse(**data).data
+            return self._cache[key]
 
     async def add_tax(
         self,
@@ -233,6 +309,7 @@ class AkauntingAPI:
             "enabled": 1 if enabled else 0,
         }
 
+        self._invalidate("taxes")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -244,6 +321,7 @@ class AkauntingAPI:
         Delete a tax from Akaunting
         """
         endpoint = f"{self.base_url}/api/taxes/{tax_id}"
+        self._invalidate("taxes")
         session = await self._get_session()
 
         async with session.delete(endpoint, headers=self.headers) as response:
@@ -311,6 +389,10 @@ class AkauntingAPI:
         """
         Fetch accounts from the Akaunting API
         """
+        key = ("accounts", page, limit)
+        if key in self._cache:
+            return self._cache[key]
+
         endpoint = f"{self.base_url}/api/accounts"
         params = {"page": page, "limit": limit}
         session = await self._get_session()
@@ -318,7 +400,8 @@ class AkauntingAPI:
         async with session.get(endpoint, params=params, headers=self.headers) as response:
             response.raise_for_status()
             data = await response.json()
-            return AccountsResponse(**data).data
+            self._cache[key] = AccountsResponse(**data).data
+            return self._cache[key]
 
     async def add_account(
         self,
@@ -351,6 +434,7 @@ class AkauntingAPI:
 
         # Remove None values from params
         params = {k: v for k, v in params.items() if v is not None}
+        self._invalidate("accounts")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -363,6 +447,7 @@ class AkauntingAPI:
         Delete an account from Akaunting
         """
         endpoint = f"{self.base_url}/api/accounts/{account_id}"
+        self._invalidate("accounts")
         session = await self._get_session()
 
         async with session.delete(endpoint, headers=self.headers) as response:
@@ -372,6 +457,10 @@ class AkauntingAPI:
         """
         Fetch categories from the Akaunting API
         """
+        key = ("categories", type, page, limit)
+        if key in self._cache:
+            return self._cache[key]
+
         endpoint = f"{self.base_url}/api/categories"
         params = {
             "search": f"type:{type if type else ''}",
@@ -383,7 +472,8 @@ class AkauntingAPI:
         async with session.get(endpoint, params=params, headers=self.headers) as response:
             response.raise_for_status()
             data = await response.json()
-            return CategoriesResponse(**data).data
+            self._cache[key] = CategoriesResponse(**data).data
+            return self._cache[key]
 
     async def add_category(
         self,
@@ -404,6 +494,7 @@ class AkauntingAPI:
             "enabled": 1 if enabled else 0,
         }
 
+        self._invalidate("categories")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -416,6 +507,7 @@ class AkauntingAPI:
         Delete a category from Akaunting
         """
         endpoint = f"{self.base_url}/api/categories/{category_id}"
+        self._invalidate("categories")
         session = await self._get_session()
 
         async with session.delete(endpoint, headers=self.headers) as response:
@@ -425,6 +517,10 @@ class AkauntingAPI:
         """
         Fetch documents from the Akaunting API
         """
+        key = ("documents", document_type, page, limit)
+        if key in self._cache:
+            return self._cache[key]
+
         endpoint = f"{self.base_url}/api/documents"
         params = {"search": f"type:{document_type}", "page": page, "limit": limit}
         session = await self._get_session()
@@ -432,7 +528,8 @@ class AkauntingAPI:
         async with session.get(endpoint, params=params, headers=self.headers) as response:
             response.raise_for_status()
             data = await response.json()
-            return ListDocumentsResponse(**data).data
+            self._cache[key] = ListDocumentsResponse(**data).data
+            return self._cache[key]
 
     async def add_document(
         self,
@@ -489,6 +586,7 @@ class AkauntingAPI:
 
         # Remove None values from params
         params = {k: v for k, v in params.items() if v is not None}
+        self._invalidate("documents")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -535,6 +633,7 @@ class AkauntingAPI:
 
         # Remove None values from params
         params = {k: v for k, v in params.items() if v is not None}
+        self._invalidate("documents")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -547,6 +646,7 @@ class AkauntingAPI:
         """
         endpoint = f"{self.base_url}/api/documents/{document_id}"
         params = {"search": f"type:{document_type}"}
+        self._invalidate("documents")
         session = await self._get_session()
 
         async with session.delete(endpoint, params=params, headers=self.headers) as response:
@@ -556,6 +656,10 @@ class AkauntingAPI:
         """
         Fetch transfers from the Akaunting API
         """
+        key = ("transfers", page, limit)
+        if key in self._cache:
+            return self._cache[key]
+
         endpoint = f"{self.base_url}/api/transfers"
         params = {"page": page, "limit": limit}
         session = await self._get_session()
@@ -563,7 +667,8 @@ class AkauntingAPI:
         async with session.get(endpoint, params=params, headers=self.headers) as response:
             response.raise_for_status()
             data = await response.json()
-            return TransfersResponse(**data).data
+            self._cache[key] = TransfersResponse(**data).data
+            return self._cache[key]
 
     async def add_transfer(
         self,
@@ -602,6 +707,7 @@ class AkauntingAPI:
 
         # Remove None values from params
         params = {k: v for k, v in params.items() if v is not None}
+        self._invalidate("transfers")
         session = await self._get_session()
 
         async with session.post(endpoint, params=params, headers=self.headers) as response:
@@ -614,6 +720,7 @@ class AkauntingAPI:
         Delete a transfer from Akaunting
         """
         endpoint = f"{self.base_url}/api/transfers/{transfer_id}"
+        self._invalidate("transfers")
         session = await self._get_session()
 
         async with session.delete(endpoint, headers=self.headers) as response:
@@ -20,6 +20,7 @@ from apps.chatwoot.core.onboarding import setup_onboarding
 from apps.chatwoot.core.reports import fix_converstion_timestamps
 from apps.chatwoot.core.teams import generate_teams, seed_teams
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -59,6 +60,19 @@ def down():
     subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    chatwoot_cli,
+    SnapshotSpec(
+        app="chatwoot",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="postgres",
+        data_dir=settings.DATA_PATH,
+        volumes=[("rails", "/app/storage")],
+        env=lambda: {**os.environ, **settings.model_dump_str()},
+    ),
+)
+
+
 @chatwoot_cli.command()
 def seed():
     """Seed the database with data from JSON files"""
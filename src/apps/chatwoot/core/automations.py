@@ -11,7 +11,9 @@ from apps.chatwoot.core.custom_attributes import CUSTOM_ATTRIBUTE_FILE_PATH
 from apps.chatwoot.core.labels import LABELS_FILE_PATH
 from apps.chatwoot.utils.chatwoot import ChatwootClient
 from apps.chatwoot.utils.faker import faker
+from apps.chatwoot.utils.validation import ChatwootCatalog, generate_valid, repair_automation, validate_batch
 from common.logger import logger
+from common.prompts import PromptBuilder, compact_json
 
 
 StandardAttributes = Literal[
@@ -156,13 +158,16 @@ class AutomationCondition(BaseModel):
     )
 
     def model_post_init(self, __context) -> None:
-        """Auto-set custom_attribute_type based on attribute_key if not explicitly set."""
+        """
+        Auto-set custom_attribute_type based on attribute_key if not explicitly set.
+
+        Unknown keys are left for repair_automation, which maps or drops them, so one bad condition does not
+        fail the parse of a whole batch.
+        """
         if self.custom_attribute_type == "":
             is_valid, attribute_type = validate_attribute_key(self.attribute_key)
             if is_valid:
                 self.custom_attribute_type = attribute_type
-            else:
-                raise ValueError(f"Invalid attribute key: '{self.attribute_key}'. Use validate_attribute_key() to check valid attributes.")
 
 
 class AutomationAction(BaseModel):
@@ -185,18 +190,21 @@ class AutomationList(BaseModel):
 
 
 def _build_automation_prompt(
-    number_of_automations: int,
     reference_automations: list,
     available_labels: list,
     contact_custom_attributes: list,
     conversation_custom_attributes: list,
 ) -> str:
-    """Build a clean, readable prompt for automation generation."""
+    """
+    Build the static part of the automation prompt.
 
-    # Basic introduction
-    intro = f"""Generate EXACTLY {number_of_automations} automation rules for a Chatwoot customer support system of {settings.COMPANY_NAME}, a {settings.DATA_THEME_SUBJECT}.
+    The number of rules to generate is left out and sent as the user message, so retries reuse the same
+    (cached) prompt prefix.
+    """
 
-IMPORTANT: You must generate exactly {number_of_automations} automation rules, no more, no less.
+    # Basic introduction
+    intro = f"""You generate realistic automation rules for a Chatwoot customer support system of {settings.COMPANY_NAME}, a {settings.DATA_THEME_SUBJECT}.
+Always generate the EXACT number of automation rules requested, no more, no less.
 """
 
     # Reference examples
@@ -205,7 +213,7 @@ IMPORTANT: You must generate exactly {number_of_automations} automation rules, n
         examples_section = f"""
 Learn from these example automation rules to understand the structure and patterns:
 ```json
-{json.dumps(reference_automations, indent=2)}
+{compact_json(reference_automations)}
 ```
 """
 
@@ -401,51 +409,37 @@ async def generate_automations(number_of_automations: int):
 
     logger.start(f"Generating {number_of_automations} automation rules")
 
-    # Generate automation rules using OpenAI with retry logic to ensure we get the requested amount
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            automations_response = await openai_client.beta.chat.completions.parse(
-                model="gpt-4.1",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a helpful assistant that generates realistic automation rule data for Chatwoot. Always generate the EXACT number of automation rules requested."
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": _build_automation_prompt(
-                            number_of_automations,
-                            reference_automations,
-                            available_labels,
-                            contact_custom_attributes,
-                            conversation_custom_attributes,
-                        ),
-                    },
-                ],
-                response_format=AutomationList,
-            )
-
-            automations_data = automations_response.choices[0].message.parsed.automations
-
-            # Validate we got the correct number
-            if len(automations_data) >= number_of_automations:
-                # Trim to exact number if we got more
-                automations_data = automations_data[:number_of_automations]
-                break
-            else:
-                logger.warning(f"Attempt {attempt + 1}: Generated {len(automations_data)} automations, need {number_of_automations}")
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to generate {number_of_automations} automations after {max_retries} attempts")
-                    return
-
-        except Exception as e:
-            logger.error(f"Attempt {attempt + 1} failed: {e}")
-            if attempt == max_retries - 1:
-                logger.error(f"Failed to generate automations after {max_retries} attempts")
-                return
+    prompt = PromptBuilder(
+        "Automations",
+        system=_build_automation_prompt(
+            reference_automations,
+            available_labels,
+            contact_custom_attributes,
+            conversation_custom_attributes,
+        ),
+    )
+
+    async def generate(count: int, feedback: str) -> list[dict]:
+        automations_response = await prompt.parse(
+            openai_client,
+            user=f"Generate EXACTLY {count} automation rules.\n{feedback}",
+            model="gpt-4.1",
+            response_format=AutomationList,
+        )
+        return [automation.model_dump() for automation in automations_response.choices[0].message.parsed.automations]
+
+    # Invalid rules are repaired locally, and only those that cannot be are generated again
+    catalog = ChatwootCatalog.from_generated_files()
+    valid_automations = await generate_valid(generate, number_of_automations, repair_automation, catalog, "automation")
+    if not valid_automations:
+        logger.error(f"Failed to generate {number_of_automations} automations")
+        return
+    if len(valid_automations) < number_of_automations:
+        logger.warning(f"Only generated {len(valid_automations)} valid automations out of {number_of_automations}")
+
+    automations_data = [Automation(**automation) for automation in valid_automations]
+
+    prompt.log_summary()
 
     # Add timestamps to each automation
     for automation in automations_data:
@@ -484,27 +478,10 @@ async def seed_automations():
             logger.error("No automation rules loaded from file")
             return
 
-        def transform_custom_attribute_conditions(conditions: list[dict]) -> list[dict]:
-            """Transform custom attribute conditions to the correct format for Chatwoot API."""
-            transformed_conditions = []
-            for condition in conditions:
-                transformed_condition = condition.copy()
-
-                # Check if this is a custom attribute with old prefix format
-                attribute_key = condition.get("attribute_key", "")
-
-                if attribute_key.startswith("contact_custom_attribute_"):
-                    # Remove the prefix and set the custom_attribute_type
-                    transformed_condition["attribute_key"] = attribute_key.replace("contact_custom_attribute_", "")
-                    transformed_condition["custom_attribute_type"] = "contact_attribute"
-                elif attribute_key.startswith("conversation_custom_attribute_"):
-                    # Remove the prefix and set the custom_attribute_type
-                    transformed_condition["attribute_key"] = attribute_key.replace("conversation_custom_attribute_", "")
-                    transformed_condition["custom_attribute_type"] = "conversation_attribute"
-
-                transformed_conditions.append(transformed_condition)
-
-            return transformed_conditions
+        # Check the rules against the labels, teams and agents that exist, so that invalid ones are never sent
+        catalog = await ChatwootCatalog.from_client(client)
+        valid_automations, _ = validate_batch([automation.model_dump() for automation in automations], repair_automation, catalog, "automation")
+        automations = [Automation(**automation) for automation in valid_automations]
 
         # Create async tasks for adding automation rules concurrently
         async def add_single_automation(automation: Automation) -> dict | None:
@@ -513,9 +490,6 @@ async def seed_automations():
                 # Convert Pydantic model to dict for API call (exclude timestamps)
                 automation_config = automation.model_dump(exclude={"created_at", "updated_at"})
 
-                # Transform custom attribute conditions to correct format
-                automation_config["conditions"] = transform_custom_attribute_conditions(automation_config["conditions"])
-
                 result = await client.add_automation_rule(
                     name=automation_config["name"],
                     description=automation_config["description"],
@@ -8,7 +8,9 @@ from pydantic import BaseModel, Field
 from apps.chatwoot.config.settings import settings
 from apps.chatwoot.utils.chatwoot import ChatwootClient
 from apps.chatwoot.utils.faker import faker
+from apps.chatwoot.utils.validation import ChatwootCatalog, generate_valid, repair_campaign, validate_batch
 from common.logger import logger
+from common.prompts import PromptBuilder
 
 
 openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
@@ -48,25 +50,15 @@ async def generate_campaigns(number_of_campaigns: int):
 
     logger.start(f"Generating {number_of_campaigns} campaigns")
 
-    # Generate campaigns using OpenAI with retry logic to ensure we get the requested amount
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            campaigns_response = await openai_client.beta.chat.completions.parse(
-                model="gpt-4.1",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that generates realistic campaign data for Chatwoot. Always generate the EXACT number of campaigns requested.",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Generate EXACTLY {number_of_campaigns} campaigns for a Chatwoot customer support system of {settings.COMPANY_NAME}, a {settings.DATA_THEME_SUBJECT}.
-
-                        IMPORTANT: You must generate exactly {number_of_campaigns} campaigns, no more, no less.
-                        
+    prompt = PromptBuilder(
+        "Campaigns",
+        system=f"""
+                        You are a helpful assistant that generates realistic campaign data for a Chatwoot customer support system
+                        of {settings.COMPANY_NAME}, a {settings.DATA_THEME_SUBJECT}.
+                        Always generate the EXACT number of campaigns requested, no more, no less.
+
                         Create diverse, engaging campaigns for customer engagement. Include a mix of:
-                        
+
                         **Live Chat Campaigns (70% of campaigns):**
                         - Trigger on specific pages (pricing, contact, checkout, product pages, etc.)
                         - Include trigger_rules with:
@@ -80,29 +72,28 @@ async def generate_campaigns(number_of_campaigns: int):
                         - Focus on customer onboarding and retention
 
                         Each campaign should be unique and tailored to {settings.COMPANY_NAME} ({settings.DATA_THEME_SUBJECT}).""",
-                    },
-                ],
-                response_format=CampaignList,
-            )
-
-            campaigns_data = campaigns_response.choices[0].message.parsed.campaigns
-
-            # Validate we got the correct number
-            if len(campaigns_data) >= number_of_campaigns:
-                # Trim to exact number if we got more
-                campaigns_data = campaigns_data[:number_of_campaigns]
-                break
-            else:
-                logger.warning(f"Attempt {attempt + 1}: Generated {len(campaigns_data)} campaigns, need {number_of_campaigns}")
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to generate {number_of_campaigns} campaigns after {max_retries} attempts")
-                    return
-
-        except Exception as e:
-            logger.error(f"Attempt {attempt + 1} failed: {e}")
-            if attempt == max_retries - 1:
-                logger.error(f"Failed to generate campaigns after {max_retries} attempts")
-                return
+    )
+
+    async def generate(count: int, feedback: str) -> list[dict]:
+        campaigns_response = await prompt.parse(
+            openai_client,
+            user=f"Generate EXACTLY {count} campaigns.\n{feedback}",
+            model="gpt-4.1",
+            response_format=CampaignList,
+        )
+        return [campaign.model_dump() for campaign in campaigns_response.choices[0].message.parsed.campaigns]
+
+    # Invalid campaigns are repaired locally, and only those that cannot be are generated again
+    catalog = ChatwootCatalog.from_generated_files()
+    valid_campaigns = await generate_valid(generate, number_of_campaigns, repair_campaign, catalog, "campaign")
+    prompt.log_summary()
+    if not valid_campaigns:
+        logger.error(f"Failed to generate {number_of_campaigns} campaigns")
+        return
+    if len(valid_campaigns) < number_of_campaigns:
+        logger.warning(f"Only generated {len(valid_campaigns)} valid campaigns out of {number_of_campaigns}")
+
+    campaigns_data = [Campaign(**campaign) for campaign in valid_campaigns]
 
     # Add timestamps to each campaign
     for campaign in campaigns_data:
@@ -149,6 +140,11 @@ async def seed_campaigns():
         if not await validate_campaign_resources(inboxes, agents):
             return
 
+        # Check the campaigns against the inboxes that exist, so that none is sent without an inbox to go to
+        catalog = await ChatwootCatalog.from_client(client)
+        valid_campaigns, _ = validate_batch([campaign.model_dump() for campaign in campaigns], repair_campaign, catalog, "campaign")
+        campaigns = [Campaign(**campaign) for campaign in valid_campaigns]
+
         # Prepare resources
         _, live_chat_inboxes, sms_inboxes = prepare_campaign_resources(inboxes)
 
@@ -10,7 +10,9 @@ from apps.chatwoot.config.settings import settings
 from apps.chatwoot.core.agents import AGENTS_FILE_PATH
 from apps.chatwoot.utils.chatwoot import ChatwootClient
 from apps.chatwoot.utils.faker import faker
+from apps.chatwoot.utils.validation import ChatwootCatalog, generate_valid, repair_inbox, validate_batch
 from common.logger import logger
+from common.prompts import PromptBuilder, compact_json
 
 
 inboxes_file = settings.DATA_PATH / "generated" / "inboxes.json"
@@ -107,32 +109,15 @@ async def generate_inboxes(number_of_inboxes: int):
 
     logger.info(f"Generating {number_of_inboxes} inboxes")
 
-    # Generate inboxes using OpenAI with retry logic to ensure we get the requested amount
-    all_generated_inboxes = []
-    remaining_inboxes = number_of_inboxes
-    max_retries = 3
+    prompt = PromptBuilder(
+        "Inboxes",
+        system=f"""
+                        You are a helpful assistant that generates realistic inbox data for a Chatwoot customer support system of a {settings.DATA_THEME_SUBJECT}.
+                        Always generate the EXACT number of inboxes requested.
 
-    while remaining_inboxes > 0 and max_retries > 0:
-        try:
-            logger.start(f"Attempting to generate {remaining_inboxes} more inboxes")
-
-            inboxes_response = await openai_client.beta.chat.completions.parse(
-                model="gpt-4.1",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that generates realistic inbox data for Chatwoot. Always generate the EXACT number of inboxes requested.",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Generate EXACTLY {remaining_inboxes} inboxes for a Chatwoot customer support system """
-                        f"""of a {settings.DATA_THEME_SUBJECT}.
-
-                        IMPORTANT: You must generate exactly {remaining_inboxes} inboxes or more.
-                        
                         Learn from these example inboxes to understand the structure and different channel types:
                         ```json
-                        {json.dumps(reference_inboxes, indent=2)}
+                        {compact_json(reference_inboxes)}
                         ```
                         
                         From the examples, I can see 4 main types of inboxes:
@@ -178,45 +163,27 @@ async def generate_inboxes(number_of_inboxes: int):
                           - message: appropriate CSAT survey message
                           - survey_rules: with operator "contains" and empty values array
                         - Use varied and engaging CSAT messages that match the business context""",
-                    },
-                ],
-                response_format=InboxList,
-            )
-
-            batch_inboxes = inboxes_response.choices[0].message.parsed.inboxes
-
-            if batch_inboxes:
-                # Add the generated inboxes to our collection
-                all_generated_inboxes.extend(batch_inboxes)
-                generated_count = len(batch_inboxes)
-                remaining_inboxes -= generated_count
-
-                logger.info(f"Generated {generated_count} inboxes in this batch. Total: {len(all_generated_inboxes)}, Remaining: {remaining_inboxes}")
-
-                # If we have enough or more, we're done
-                if remaining_inboxes <= 0:
-                    break
-            else:
-                logger.warning("No inboxes generated in this batch")
-                max_retries -= 1
-
-        except Exception as e:
-            logger.error(f"Error generating inboxes batch: {e}")
-            max_retries -= 1
-
-            if max_retries == 0:
-                logger.error(f"Failed to generate all requested inboxes. Generated {len(all_generated_inboxes)} out of {number_of_inboxes}")
-                if len(all_generated_inboxes) == 0:
-                    return
-                break
-
-    # Use all generated inboxes, trim to exact number if we got more than requested
-    if len(all_generated_inboxes) > number_of_inboxes:
-        inboxes_data = all_generated_inboxes[:number_of_inboxes]
-        logger.info(f"Trimmed to exactly {number_of_inboxes} inboxes")
-    else:
-        inboxes_data = all_generated_inboxes
-
+    )
+
+    async def generate(count: int, feedback: str) -> list[dict]:
+        logger.start(f"Attempting to generate {count} more inboxes")
+        inboxes_response = await prompt.parse(
+            openai_client,
+            user=f"Generate EXACTLY {count} inboxes or more.\n{feedback}",
+            model="gpt-4.1",
+            response_format=InboxList,
+        )
+        return [inbox.model_dump() for inbox in inboxes_response.choices[0].message.parsed.inboxes]
+
+    # Invalid inboxes are repaired locally, and only those that cannot be are generated again
+    catalog = ChatwootCatalog.from_generated_files()
+    valid_inboxes = await generate_valid(generate, number_of_inboxes, repair_inbox, catalog, "inbox")
+    prompt.log_summary()
+    if not valid_inboxes:
+        logger.error(f"Failed to generate {number_of_inboxes} inboxes")
+        return
+
+    inboxes_data = [Inbox(**inbox) for inbox in valid_inboxes]
     logger.info(f"Final result: {len(inboxes_data)} inboxes generated successfully")
 
     # Separate agents and admins from generated data
@@ -314,6 +281,10 @@ async def seed_inboxes():
             logger.error("No inboxes loaded from file")
             return
 
+        # Normalize channel types and drop inboxes the API would refuse
+        valid_inboxes, _ = validate_batch([inbox.model_dump() for inbox in inboxes], repair_inbox, ChatwootCatalog.from_generated_files(), "inbox")
+        inboxes = [Inbox(**inbox) for inbox in valid_inboxes]
+
         # Get all users from Chatwoot API to map emails to user IDs
         api_users = await client.list_agents()
         email_to_user = {user["email"]: user for user in api_users}
@@ -10,7 +10,9 @@ from apps.chatwoot.config.settings import settings
 from apps.chatwoot.core.labels import LABELS_FILE_PATH
 from apps.chatwoot.utils.chatwoot import ChatwootClient
 from apps.chatwoot.utils.faker import faker
+from apps.chatwoot.utils.validation import ChatwootCatalog, generate_valid, repair_macro, validate_batch
 from common.logger import logger
+from common.prompts import PromptBuilder, compact_json
 
 
 openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
@@ -63,26 +65,15 @@ async def generate_macros(number_of_macros: int):
 
     logger.start(f"Generating {number_of_macros} macros")
 
-    # Generate macros using OpenAI with retry logic to ensure we get the requested amount
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            macros_response = await openai_client.beta.chat.completions.parse(
-                model="gpt-4.1",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that generates realistic macro data for Chatwoot. Always generate the EXACT number of macros requested.",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Generate EXACTLY {number_of_macros} macros for a Chatwoot customer support system of {settings.COMPANY_NAME}, a {settings.DATA_THEME_SUBJECT}.
-
-                        IMPORTANT: You must generate exactly {number_of_macros} macros, no more, no less.
-                        
+    prompt = PromptBuilder(
+        "Macros",
+        system=f"""
+                        You are a helpful assistant that generates realistic macro data for a Chatwoot customer support system of {settings.COMPANY_NAME}, a {settings.DATA_THEME_SUBJECT}.
+                        Always generate the EXACT number of macros requested, no more, no less.
+
                         Learn from these example macros to understand the structure and available actions:
                         ```json
-                        {json.dumps(reference_macros, indent=2)}
+                        {compact_json(reference_macros)}
                         ```
                         
                         From the examples, I can see macros are automated workflows with these action types:
@@ -127,29 +118,28 @@ async def generate_macros(number_of_macros: int):
                         - Make macros specific to {settings.COMPANY_NAME} ({settings.DATA_THEME_SUBJECT}) context when relevant
                         
                         Focus on creating macros that automate common support workflows and save agents time while maintaining quality service.""",
-                    },
-                ],
-                response_format=MacroList,
-            )
-
-            macros_data = macros_response.choices[0].message.parsed.macros
-
-            # Validate we got the correct number
-            if len(macros_data) >= number_of_macros:
-                # Trim to exact number if we got more
-                macros_data = macros_data[:number_of_macros]
-                break
-            else:
-                logger.warning(f"Attempt {attempt + 1}: Generated {len(macros_data)} macros, need {number_of_macros}")
-                if attempt == max_retries - 1:
-                    logger.error(f"Failed to generate {number_of_macros} macros after {max_retries} attempts")
-                    return
-
-        except Exception as e:
-            logger.error(f"Attempt {attempt + 1} failed: {e}")
-            if attempt == max_retries - 1:
-                logger.error(f"Failed to generate macros after {max_retries} attempts")
-                return
+    )
+
+    async def generate(count: int, feedback: str) -> list[dict]:
+        macros_response = await prompt.parse(
+            openai_client,
+            user=f"Generate EXACTLY {count} macros.\n{feedback}",
+            model="gpt-4.1",
+            response_format=MacroList,
+        )
+        return [macro.model_dump() for macro in macros_response.choices[0].message.parsed.macros]
+
+    # Invalid macros are repaired locally, and only those that cannot be are generated again
+    catalog = ChatwootCatalog.from_generated_files()
+    valid_macros = await generate_valid(generate, number_of_macros, repair_macro, catalog, "macro")
+    prompt.log_summary()
+    if not valid_macros:
+        logger.error(f"Failed to generate {number_of_macros} macros")
+        return
+    if len(valid_macros) < number_of_macros:
+        logger.warning(f"Only generated {len(valid_macros)} valid macros out of {number_of_macros}")
+
+    macros_data = [Macro(**macro) for macro in valid_macros]
 
     # Add timestamps to each macro
     for macro in macros_data:
@@ -188,6 +178,11 @@ async def seed_macros():
             logger.error("No macros loaded from file")
             return
 
+        # Check the macros against the labels and teams that exist, so that invalid ones are never sent
+        catalog = await ChatwootCatalog.from_client(client)
+        valid_macros, _ = validate_batch([macro.model_dump() for macro in macros], repair_macro, catalog, "macro")
+        macros = [Macro(**macro) for macro in valid_macros]
+
         # Create async tasks for adding macros concurrently
         async def add_single_macro(macro: Macro) -> dict | None:
             """Add a single macro and return the macro if successful, None if failed."""
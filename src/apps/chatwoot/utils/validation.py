@@ -0,0 +1,541 @@
+"""
+Local validation and repair of LLM-generated Chatwoot configs.
+
+Automations, macros, campaigns and inboxes reference labels, custom attributes, teams, agents, inboxes and
+inbox channel types. Invalid references used to surface only as failed API requests, or as a failed structured
+parse that threw away the whole batch. Here every generated item is checked against a ChatwootCatalog of
+what actually exists, before any API call:
+
+- fixable issues are repaired in place: nearest valid label or attribute value, coerced operator and value
+  types, conditions and actions that cannot work are dropped;
+- items that cannot be repaired are rejected with the reasons, and `generate_valid` asks the LLM again for
+  only that many items, passing the reasons along.
+
+All repair functions take and return plain dicts (`model_dump()` output), so the same pass runs on freshly
+generated items and on the JSON files read back by the seeders.
+"""
+
+import difflib
+import json
+import re
+from urllib.parse import urlparse
+
+from apps.chatwoot.config.settings import settings
+from common.logger import logger
+
+
+GENERATED_PATH = settings.DATA_PATH / "generated"
+
+# How close a misspelled name must be to a valid one to be replaced by it
+MATCH_CUTOFF = 0.75
+
+# Fallbacks when the generated files are missing, matching the ranges given in the prompts
+DEFAULT_TEAM_COUNT = 6
+DEFAULT_AGENT_COUNT = 20
+DEFAULT_INBOX_COUNT = 5
+
+AUTOMATION_EVENTS = ["message_created", "conversation_created", "conversation_updated"]
+FILTER_OPERATORS = ["equal_to", "not_equal_to", "contains", "does_not_contain"]
+QUERY_OPERATORS = ["and", "or"]
+PRIORITIES = ["low", "medium", "high", "urgent"]
+
+# Standard condition attributes, with their allowed values when they are a closed set; the values of
+# attributes in REFERENCE_ATTRIBUTES are ids, checked against the catalog instead
+STANDARD_ATTRIBUTES = {
+    "message_type": ["incoming", "outgoing"],
+    "content": None,
+    "email": None,
+    "inbox_id": None,
+    "status": ["open", "resolved", "pending"],
+    "assignee_id": None,
+    "team_id": None,
+    "priority": PRIORITIES,
+    "conversation_language": None,
+    "phone_number": None,
+}
+
+# Condition attributes whose values reference other records, with the catalog field holding their valid ids
+REFERENCE_ATTRIBUTES = {
+    "inbox_id": "inbox_ids",
+    "assignee_id": "agent_ids",
+    "team_id": "team_ids",
+}
+
+AUTOMATION_ACTIONS = [
+    "assign_agent",
+    "assign_team",
+    "add_label",
+    "remove_label",
+    "send_email_to_team",
+    "send_email_transcript",
+    "mute_conversation",
+    "snooze_conversation",
+    "resolve_conversation",
+    "open_conversation",
+    "send_webhook_event",
+]
+
+MACRO_ACTIONS = [
+    "assign_team",
+    "add_label",
+    "remove_label",
+    "send_message",
+    "add_private_note",
+    "send_attachment",
+    "resolve_conversation",
+    "snooze_conversation",
+    "mute_conversation",
+    "change_priority",
+]
+
+MACRO_VISIBILITIES = ["global", "personal"]
+
+# Inbox channel types as stored in the generated files, and as returned by the API
+CHANNEL_TYPES = {
+    "web_widget": "Channel::WebWidget",
+    "email": "Channel::Email",
+    "sms": "Channel::Sms",
+    "api": "Channel::Api",
+}
+
+# The field that identifies each channel type, to recover the type when the LLM mislabels it
+CHANNEL_FIELDS = {
+    "web_widget": "website_url",
+    "email": "email",
+    "sms": "phone_number",
+    "api": "webhook_url",
+}
+
+HEX_COLOR = re.compile(r"^#[0-9a-fA-F]{6}$")
+EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def nearest(value, choices, cutoff=MATCH_CUTOFF):
+    """The choice equal to `value` ignoring case, else the closest one above `cutoff`, else None"""
+    text = str(value).strip()
+    by_lower = {str(choice).lower(): choice for choice in choices}
+    if text.lower() in by_lower:
+        return by_lower[text.lower()]
+
+    matches = difflib.get_close_matches(text.lower(), list(by_lower), n=1, cutoff=cutoff)
+    return by_lower[matches[0]] if matches else None
+
+
+def _as_int(value):
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _absolute_url(url):
+    """`url` as an https URL, or None if it cannot be one"""
+    url = str(url or "").strip()
+    if not url:
+        return None
+    if not url.startswith(("http://", "https://")):
+        url = f"https://example.com/{url.lstrip('/')}" if "." not in url.split("/")[0] else f"https://{url}"
+    return url if urlparse(url).netloc else None
+
+
+class ChatwootCatalog:
+    """
+    What generated configs may reference.
+
+    At generation time the catalog comes from the generated data files: teams, agents and inboxes do not have ids yet,
+    so they are assumed to get sequential ids from 1, as they do on a fresh install. Seeders build it from
+    the API instead, so items are checked against the ids that really exist before they are created.
+    """
+
+    def __init__(
+        self,
+        labels: list[str],
+        contact_attributes: dict[str, list[str]],
+        conversation_attributes: dict[str, list[str]],
+        team_ids: list[int],
+        agent_ids: list[int],
+        inbox_ids: list[int],
+        channel_types: set[str],
+    ):
+        self.labels = labels
+        self.contact_attributes = contact_attributes
+        self.conversation_attributes = conversation_attributes
+        self.team_ids = team_ids
+        self.agent_ids = agent_ids
+        self.inbox_ids = inbox_ids
+        self.channel_types = channel_types
+
+    @staticmethod
+    def _load(file_name):
+        try:
+            with (GENERATED_PATH / file_name).open(encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            logger.warning(f"{file_name} not available, validating without it")
+            return None
+
+    @classmethod
+    def _custom_attributes(cls):
+        contact_attributes, conversation_attributes = {}, {}
+        for attribute in cls._load("custom_attributes.json") or []:
+            target = contact_attributes if attribute["attribute_model"] == 0 else conversation_attributes
+            target[attribute["attribute_key"]] = attribute.get("attribute_values") or []
+        return contact_attributes, conversation_attributes
+
+    @classmethod
+    def from_generated_files(cls):
+        labels = cls._load("labels.json")
+        teams = cls._load("teams.json")
+        agents = cls._load("agents.json")
+        inboxes = cls._load("inboxes.json")
+        contact_attributes, conversation_attributes = cls._custom_attributes()
+
+        return cls(
+            labels=[label["title"] for label in labels] if labels else ["bug_report", "technical_support", "sales_inquiry", "billing_issue"],
+            contact_attributes=contact_attributes,
+            conversation_attributes=conversation_attributes,
+            team_ids=list(range(1, len(teams or []) + 1)) or list(range(1, DEFAULT_TEAM_COUNT + 1)),
+            agent_ids=list(range(1, len(agents or []) + 1)) or list(range(1, DEFAULT_AGENT_COUNT + 1)),
+            inbox_ids=list(range(1, len(inboxes or []) + 1)) or list(range(1, DEFAULT_INBOX_COUNT + 1)),
+            channel_types={inbox["channel"]["type"] for inbox in inboxes} if inboxes else set(CHANNEL_TYPES),
+        )
+
+    @classmethod
+    async def from_client(cls, client):
+        """Catalog of a running Chatwoot; custom attributes still come from the generated file they were seeded from"""
+        api_channel_types = {value: key for key, value in CHANNEL_TYPES.items()}
+        contact_attributes, conversation_attributes = cls._custom_attributes()
+        inboxes = await client.list_inboxes() or []
+
+        return cls(
+            labels=[label["title"] for label in await client.list_labels() or []],
+            contact_attributes=contact_attributes,
+            conversation_attributes=conversation_attributes,
+            team_ids=[team["id"] for team in await client.list_teams() or []],
+            agent_ids=[agent["id"] for agent in await client.list_agents() or []],
+            inbox_ids=[inbox["id"] for inbox in inboxes],
+            channel_types={api_channel_types.get(inbox.get("channel_type"), inbox.get("channel_type")) for inbox in inboxes},
+        )
+
+
+def _repair_values(values, allowed, name, notes):
+    """Values as strings, mapped to the nearest allowed value when `allowed` is a closed set"""
+    values = [str(value) for value in (values if isinstance(values, list) else [values]) if str(value).strip()]
+    if not allowed:
+        return values
+
+    repaired = []
+    for value in values:
+        match = nearest(value, allowed)
+        if match is None:
+            notes.append(f"dropped value '{value}' of {name}, expected one of {allowed}")
+        else:
+            if match != value:
+                notes.append(f"{name}: '{value}' -> '{match}'")
+            repaired.append(match)
+    return repaired
+
+
+def _repair_ids(params, valid_ids, name, notes):
+    ids = []
+    for param in params:
+        value = _as_int(param)
+        if value in valid_ids:
+            ids.append(value)
+        else:
+            notes.append(f"{name}: dropped unknown id {param}")
+    return ids
+
+
+def _repair_labels(params, catalog, name, notes):
+    labels = []
+    for param in params:
+        label = nearest(param, catalog.labels)
+        if label is None:
+            notes.append(f"{name}: dropped unknown label '{param}'")
+        else:
+            if label != param:
+                notes.append(f"{name}: label '{param}' -> '{label}'")
+            labels.append(label)
+    return labels
+
+
+def _repair_condition(condition, catalog, notes):
+    """The repaired condition, or None if it references nothing that exists"""
+    condition = dict(condition)
+    key = str(condition.get("attribute_key", "")).strip()
+    for prefix, attribute_type in (("contact_custom_attribute_", "contact_attribute"), ("conversation_custom_attribute_", "conversation_attribute")):
+        if key.startswith(prefix):
+            key = key.removeprefix(prefix)
+            condition["custom_attribute_type"] = attribute_type
+
+    attributes = {key: ("", allowed) for key, allowed in STANDARD_ATTRIBUTES.items()}
+    attributes.update({key: ("contact_attribute", allowed) for key, allowed in catalog.contact_attributes.items()})
+    attributes.update({key: ("conversation_attribute", allowed) for key, allowed in catalog.conversation_attributes.items()})
+
+    match = nearest(key, attributes)
+    if match is None:
+        notes.append(f"dropped condition on unknown attribute '{key}'")
+        return None
+    if match != key:
+        notes.append(f"attribute '{key}' -> '{match}'")
+    attribute_type, allowed = attributes[match]
+    condition["attribute_key"] = match
+    condition["custom_attribute_type"] = attribute_type
+
+    operator = nearest(str(condition.get("filter_operator", "")).replace(" ", "_"), FILTER_OPERATORS) or "equal_to"
+    if operator != condition.get("filter_operator"):
+        notes.append(f"{match}: operator '{condition.get('filter_operator')}' -> '{operator}'")
+    condition["filter_operator"] = operator
+    condition["query_operator"] = nearest(condition.get("query_operator", "and"), QUERY_OPERATORS) or "and"
+
+    values = condition.get("values", [])
+    values = values if isinstance(values, list) else [values]
+    if attribute_type == "" and match in REFERENCE_ATTRIBUTES:
+        condition["values"] = _repair_ids(values, getattr(catalog, REFERENCE_ATTRIBUTES[match]), match, notes)
+    else:
+        condition["values"] = _repair_values(values, allowed, match, notes)
+    if not condition["values"]:
+        notes.append(f"dropped condition on '{match}' without any valid value")
+        return None
+    return condition
+
+
+def _repair_action(action, catalog, valid_actions, notes):
+    """The repaired action, or None if it cannot be performed"""
+    name = nearest(action.get("action_name", ""), valid_actions)
+    if name is None:
+        notes.append(f"dropped unknown action '{action.get('action_name')}'")
+        return None
+    if name != action.get("action_name"):
+        notes.append(f"action '{action.get('action_name')}' -> '{name}'")
+
+    params = action.get("action_params") or []
+    params = params if isinstance(params, list) else [params]
+
+    if name in ("add_label", "remove_label"):
+        params = _repair_labels(params, catalog, name, notes)
+    elif name == "assign_team":
+        params = _repair_ids(params, catalog.team_ids, name, notes)[:1]
+    elif name == "assign_agent":
+        params = _repair_ids(params, catalog.agent_ids, name, notes)[:1]
+    elif name == "snooze_conversation":
+        params = [value for value in (_as_int(param) for param in params) if value and value > 0][:1]
+    elif name == "change_priority":
+        params = _repair_values(params, PRIORITIES, name, notes)[:1]
+    elif name == "send_email_to_team":
+        repaired = []
+        for param in params:
+            if isinstance(param, dict) and param.get("message"):
+                team_ids = _repair_ids(param.get("team_ids") or [], catalog.team_ids, name, notes)
+                if team_ids:
+                    repaired.append({"team_ids": team_ids, "message": param["message"]})
+        params = repaired
+    elif name == "send_webhook_event":
+        url = _absolute_url(params[0]) if params else None
+        params = [url, *params[1:]] if url else []
+    elif name in ("mute_conversation", "resolve_conversation", "open_conversation"):
+        return {"action_name": name, "action_params": []}
+    else:
+        params = [param for param in params if str(param).strip()]
+
+    if not params:
+        notes.append(f"dropped action '{name}' without valid parameters")
+        return None
+    return {"action_name": name, "action_params": params}
+
+
+def repair_automation(automation: dict, catalog: ChatwootCatalog) -> tuple[dict | None, list[str]]:
+    """
+    Repair an automation rule against the catalog.
+
+    Returns:
+        tuple: (repaired automation, or None if it cannot be repaired; notes on what was changed or why it was rejected)
+    """
+    notes = []
+    automation = dict(automation)
+
+    conditions = [_repair_condition(condition, catalog, notes) for condition in automation.get("conditions", [])]
+    automation["conditions"] = [condition for condition in conditions if condition is not None]
+    actions = [_repair_action(action, catalog, AUTOMATION_ACTIONS, notes) for action in automation.get("actions", [])]
+    automation["actions"] = [action for action in actions if action is not None]
+
+    # Message content only exists on message events
+    event_name = nearest(automation.get("event_name", ""), AUTOMATION_EVENTS)
+    if any(condition["attribute_key"] in ("content", "message_type") for condition in automation["conditions"]):
+        event_name = "message_created"
+    elif event_name is None:
+        event_name = "conversation_created"
+    if event_name != automation.get("event_name"):
+        notes.append(f"event '{automation.get('event_name')}' -> '{event_name}'")
+    automation["event_name"] = event_name
+
+    if not automation.get("name"):
+        notes.append("missing name")
+    if not automation["conditions"]:
+        notes.append("no valid condition left")
+    if not automation["actions"]:
+        notes.append("no valid action left")
+    if not automation.get("name") or not automation["conditions"] or not automation["actions"]:
+        return None, notes
+    return automation, notes
+
+
+def repair_macro(macro: dict, catalog: ChatwootCatalog) -> tuple[dict | None, list[str]]:
+    """Repair a macro against the catalog. Returns (repaired macro or None, notes)."""
+    notes = []
+    macro = dict(macro)
+
+    actions = [_repair_action(action, catalog, MACRO_ACTIONS, notes) for action in macro.get("actions", [])]
+    macro["actions"] = [action for action in actions if action is not None]
+    macro["visibility"] = nearest(macro.get("visibility", ""), MACRO_VISIBILITIES) or "global"
+
+    if not macro.get("name"):
+        notes.append("missing name")
+    if not macro["actions"]:
+        notes.append("no valid action left")
+    if not macro.get("name") or not macro["actions"]:
+        return None, notes
+    return macro, notes
+
+
+def repair_campaign(campaign: dict, catalog: ChatwootCatalog) -> tuple[dict | None, list[str]]:
+    """
+    Repair a campaign against the catalog. Returns (repaired campaign or None, notes).
+
+    Live chat campaigns need a web widget inbox, SMS campaigns an SMS inbox; a campaign whose kind has no
+    inbox to go to is rejected here rather than skipped at seed time.
+    """
+    notes = []
+    campaign = dict(campaign)
+
+    trigger_rules = campaign.get("trigger_rules")
+    if trigger_rules:
+        url = _absolute_url(trigger_rules.get("url"))
+        time_on_page = _as_int(trigger_rules.get("time_on_page"))
+        if url is None:
+            notes.append(f"dropped trigger rules with invalid url '{trigger_rules.get('url')}'")
+            campaign["trigger_rules"] = None
+        else:
+            campaign["trigger_rules"] = {"url": url, "time_on_page": time_on_page if time_on_page and time_on_page > 0 else 30}
+        # A campaign is either live chat (trigger rules) or SMS (schedule and audience), never both
+        if campaign["trigger_rules"] and (campaign.get("scheduled_at") or campaign.get("audience")):
+            notes.append("dropped SMS fields of a live chat campaign")
+            campaign["scheduled_at"] = None
+            campaign["audience"] = None
+
+    is_sms = bool(campaign.get("scheduled_at") or campaign.get("audience")) and not campaign.get("trigger_rules")
+    channel_type = "sms" if is_sms else "web_widget"
+    if channel_type not in catalog.channel_types:
+        notes.append(f"no {channel_type} inbox to send a {'SMS' if is_sms else 'live chat'} campaign from")
+
+    if not campaign.get("title") or not campaign.get("message"):
+        notes.append("missing title or message")
+    if not campaign.get("title") or not campaign.get("message") or channel_type not in catalog.channel_types:
+        return None, notes
+    return campaign, notes
+
+
+def repair_inbox(inbox: dict, catalog: ChatwootCatalog) -> tuple[dict | None, list[str]]:  # noqa: ARG001
+    """
+    Repair an inbox. Returns (repaired inbox or None, notes).
+
+    The channel type is normalized ("Channel::WebWidget" -> "web_widget") and, when it disagrees with the
+    channel's fields, recovered from them. Inboxes reference nothing else, but take a catalog like the other
+    repair functions so that they can all go through validate_batch.
+    """
+    notes, errors = [], []
+    inbox = dict(inbox)
+    channel = dict(inbox.get("channel") or {})
+
+    api_channel_types = {value.lower(): key for key, value in CHANNEL_TYPES.items()}
+    channel_type = str(channel.get("type", "")).strip()
+    channel_type = api_channel_types.get(channel_type.lower()) or nearest(channel_type.replace(" ", "_"), CHANNEL_TYPES)
+    field_type = next((key for key, field in CHANNEL_FIELDS.items() if channel.get(field)), None)
+    if field_type and channel_type != field_type:
+        channel_type = field_type
+    if channel_type is None:
+        return None, [f"unknown channel type '{channel.get('type')}'"]
+    if channel_type != channel.get("type"):
+        notes.append(f"channel type '{channel.get('type')}' -> '{channel_type}'")
+    channel["type"] = channel_type
+
+    if channel_type == "web_widget":
+        channel["website_url"] = _absolute_url(channel.get("website_url"))
+        if not HEX_COLOR.match(str(channel.get("widget_color", ""))):
+            channel["widget_color"] = "#1f93ff"
+        if channel["website_url"] is None:
+            errors.append("invalid website url")
+    elif channel_type == "email" and not EMAIL.match(str(channel.get("email", ""))):
+        errors.append(f"invalid email address '{channel.get('email')}'")
+    elif channel_type == "sms":
+        digits = re.sub(r"\D", "", str(channel.get("phone_number", "")))
+        if len(digits) < 8:
+            errors.append(f"invalid phone number '{channel.get('phone_number')}'")
+        channel["phone_number"] = f"+{digits}"
+    elif channel_type == "api":
+        channel["webhook_url"] = _absolute_url(channel.get("webhook_url"))
+    inbox["channel"] = channel
+
+    if not inbox.get("name"):
+        errors.append("missing name")
+    if errors:
+        return None, notes + errors
+    return inbox, notes
+
+
+def validate_batch(items: list[dict], repair, catalog: ChatwootCatalog, name: str) -> tuple[list[dict], list[str]]:
+    """
+    Repair every item of a batch.
+
+    Returns:
+        tuple: (valid items, one reason per rejected item)
+    """
+    valid, rejected = [], []
+    for item in items:
+        title = item.get("name") or item.get("title") or "unnamed"
+        repaired, notes = repair(item, catalog)
+        if repaired is None:
+            rejected.append(f"'{title}': {'; '.join(notes)}")
+            logger.warning(f"Rejected {name} '{title}': {'; '.join(notes)}")
+        else:
+            valid.append(repaired)
+            if notes:
+                logger.info(f"Repaired {name} '{title}': {'; '.join(notes)}")
+    return valid, rejected
+
+
+async def generate_valid(generate, count: int, repair, catalog: ChatwootCatalog, name: str, max_attempts: int = 3) -> list[dict]:
+    """
+    Generate `count` valid items, re-prompting only for those that were rejected.
+
+    Args:
+        generate: async callable (count, feedback) returning a list of item dicts; feedback is empty on the
+            first attempt, then lists why the previous items were rejected, to be added to the prompt
+        count: Number of items wanted
+        repair: One of the repair_* functions
+        catalog: What the items may reference
+        name: Item name for the logs
+
+    Returns:
+        list: Up to `count` valid items; fewer if the attempts ran out
+    """
+    valid, rejected = [], []
+    for attempt in range(max_attempts):
+        missing = count - len(valid)
+        feedback = ""
+        if rejected:
+            feedback = "These items were rejected, avoid their mistakes:\n" + "\n".join(f"- {reason}" for reason in rejected)
+        try:
+            items = await generate(missing, feedback)
+        except Exception as e:
+            logger.error(f"Attempt {attempt + 1} failed: {e}")
+            continue
+
+        batch, rejected = validate_batch(items, repair, catalog, name)
+        valid.extend(batch)
+        if len(valid) >= count:
+            break
+        logger.warning(f"Attempt {attempt + 1}: {len(valid)} valid {name}s out of {count}")
+
+    return valid[:count]
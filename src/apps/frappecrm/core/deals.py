@@ -24,6 +24,7 @@ async def randomize_deal_status(number_of_deals: int):
     number_of_deals = len(deals) if number_of_deals > len(deals) else number_of_deals
     deals = fake.random_elements(elements=deals, length=number_of_deals, unique=True)
 
+    updates = []
     for deal in deals:
         status = fake.random_element(
             OrderedDict(
@@ -52,10 +53,10 @@ async def randomize_deal_status(number_of_deals: int):
                 update_data["lost_notes"] = fake.random_element(OTHER_LOST_REASONS)
             update_data["lost_reason"] = lost_reason
 
-        try:
-            client.update(update_data)
-        except Exception as e:
-            logger.error(f"Error updating deal {deal['name']} status to {status}: {e}")
-            continue
+        updates.append(update_data)
 
-    logger.succeed(f"Successfully randomized {len(deals)} deal statuses")
+    failed = client.bulk_update(updates)
+    for failure in failed:
+        logger.error(f"Error updating deal {failure['doc']['name']} status to {failure['doc'].get('status')}: {failure['error']}")
+
+    logger.succeed(f"Successfully randomized {len(deals) - len(failed)} deal statuses")
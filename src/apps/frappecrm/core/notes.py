@@ -10,11 +10,15 @@ from pydantic import BaseModel, Field
 from apps.frappecrm.config.settings import settings
 from apps.frappecrm.utils import frappe_client
 from common.logger import logger
+from common.prompts import PromptBuilder, TitleRegistry
 
 
 fake = Faker()
 openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
+# Generations per note before a note whose title keeps repeating an existing one is dropped
+NOTE_ATTEMPTS = 3
+
 
 class Note(BaseModel):
     title: str = Field(description="The title of the note")
@@ -47,6 +51,37 @@ async def generate_notes(number_of_notes: int):
         limit_page_length=settings.LIST_LIMIT,
     )
 
+    # Everything that is the same for every note goes in the shared prefix, so it is cached across calls
+    prompt = PromptBuilder(
+        "CRM notes",
+        system=f"""
+        You are a CRM user creating realistic business notes.
+        Each note should be unique and reflect authentic business interactions.
+
+        A note should include:
+        1. A brief, descriptive title
+        2. Detailed content that sounds naturally written by a business professional
+        3. Do not use Markdown formatting, use HTML for formatting
+
+        Choose one of these scenarios:
+        - Client meeting notes
+        - Internal strategy discussion
+        - Product feedback from customer
+        - Follow-up reminder
+        - Objection handling strategy
+        - Partnership/deal progress update
+
+        Make it specific, with natural business language, varying tone, and authentic details.
+        Avoid generic content and ensure it reads like something a real person would write in a CRM.
+
+        Some additional information that can be helpful:
+        - Today is {datetime.now().strftime("%Y-%m-%d")}
+        - We want to create data for {settings.DATA_THEME_SUBJECT}
+        """,
+    )
+    # Titles generated in this run are registered too, so later notes avoid them as well
+    titles = TitleRegistry(note["title"] for note in notes)
+
     tasks = []
 
     for _ in range(number_of_notes):
@@ -54,45 +89,22 @@ async def generate_notes(number_of_notes: int):
 
         async def generate_note(org: dict):
             logger.info(f"Generating note for {org['name']}")
-            note = await openai_client.beta.chat.completions.parse(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"""You are a CRM user creating realistic business notes. 
-                        Generate professional, human-like notes for a company in the {org["industry"]} industry.
-                        Each note should be unique and reflect authentic business interactions.""",
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Create a realistic CRM note for an organization in the {org["industry"]} sector.
-                        The note should include:
-                        1. A brief, descriptive title
-                        2. Detailed content that sounds naturally written by a business professional
-                        3. Do not use Markdown formatting, use HTML for formatting
-
-                        Choose one of these scenarios:
-                        - Client meeting notes
-                        - Internal strategy discussion
-                        - Product feedback from customer
-                        - Follow-up reminder
-                        - Objection handling strategy
-                        - Partnership/deal progress update
-
-                        Make it specific, with natural business language, varying tone, and authentic details.
-                        Avoid generic content and ensure it reads like something a real person would write in a CRM.
-
-                        Some additional information that can be helpful:
-                        - Today is {datetime.now().strftime("%Y-%m-%d")}
-                        - We want to create data for {settings.DATA_THEME_SUBJECT}
-                        {f"- We already have these notes: {', '.join([note['title'] for note in notes])}" if notes else ""}
-                        """,
-                    },
-                ],
-                response_format=Note,
-            )
+            for _ in range(NOTE_ATTEMPTS):
+                note = await prompt.parse(
+                    openai_client,
+                    user=f"Create a realistic CRM note for an organization in the {org['industry']} sector.\n{titles.summary()}",
+                    model="gpt-4o-mini",
+                    response_format=Note,
+                )
+
+                note = note.choices[0].message.parsed
+                if titles.add(note.title):
+                    break
+                logger.warning(f"Generated duplicate note title '{note.title}', retrying")
+            else:
+                logger.error(f"No unique note title for {org['name']} after {NOTE_ATTEMPTS} attempts, skipping")
+                return None
 
-            note = note.choices[0].message.parsed
             return {
                 "title": note.title,
                 "content": note.content,
@@ -102,7 +114,8 @@ async def generate_notes(number_of_notes: int):
 
         tasks.append(generate_note(org))
 
-    notes_data = await asyncio.gather(*tasks)
+    notes_data = [note for note in await asyncio.gather(*tasks) if note]
+    prompt.log_summary()
 
     # Save the generated notes to the JSON file
     try:
@@ -139,45 +152,43 @@ async def insert_notes(number_of_notes: int):
         limit_page_length=settings.LIST_LIMIT,
     )
 
+    users_by_email = {user["email"]: user for user in users}
+
+    # Notes are inserted as their author, with one login per author
+    sessions = frappe_client.create_session_pool()
+
     # Process notes concurrently with a semaphore to limit to 8 at once
     semaphore = asyncio.Semaphore(8)
 
     async def insert_note(note_data):
         async with semaphore:
             try:
-                # Use run_in_executor to make the blocking client.insert call non-blocking
-                loop = asyncio.get_event_loop()
+                user = users_by_email.get(note_data["user_email"]) or fake.random_element(users)
+
                 try:
-                    # Find user by email
-                    user = next((u for u in users if u["email"] == note_data["user_email"]), None)
-                    if not user:
-                        user = fake.random_element(users)
-
-                    impersonated_client = frappe_client.create_client(
-                        username=user["name"],
-                        password=settings.USER_PASSWORD,
-                    )
-                    logger.info(f"Created impersonated client for {user['name']}")
+                    impersonated_client = await asyncio.to_thread(sessions.get, user["name"])
                 except Exception as e:
                     logger.error(f"Error creating impersonated client: {e}")
                     return
 
-                await loop.run_in_executor(
-                    None,
-                    lambda: impersonated_client.insert(
-                        {
-                            "doctype": "FCRM Note",
-                            "title": note_data["title"],
-                            "content": note_data["content"],
-                        }
-                    ),
+                # The client is blocking, so the insert runs in a thread
+                await asyncio.to_thread(
+                    impersonated_client.insert,
+                    {
+                        "doctype": "FCRM Note",
+                        "title": note_data["title"],
+                        "content": note_data["content"],
+                    },
                 )
                 logger.info(f"Inserted note: {note_data['title']}")
             except Exception as e:
                 logger.error(f"Error inserting note: {e}")
 
     # Run note insertions for the requested number
-    await asyncio.gather(*[insert_note(note_data) for note_data in notes_data[:number_of_notes]])
+    try:
+        await asyncio.gather(*[insert_note(note_data) for note_data in notes_data[:number_of_notes]])
+    finally:
+        sessions.close()
 
 
 async def delete_notes():
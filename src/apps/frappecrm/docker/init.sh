@@ -27,6 +27,8 @@ bench new-site $SITE \
 --force \
 --mariadb-root-username root \
 --mariadb-root-password 123 \
+--db-name crm \
+--db-password 123 \
 --admin-password admin \
 --no-mariadb-socket
 
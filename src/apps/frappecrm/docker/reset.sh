@@ -30,6 +30,8 @@ else
       --force \
       --mariadb-root-username root \
       --mariadb-root-password 123 \
+      --db-name crm \
+      --db-password 123 \
       --admin-password admin \
       --no-mariadb-socket &&
     bench --site crm.localhost install-app crm &&
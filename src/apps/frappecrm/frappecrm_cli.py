@@ -6,6 +6,7 @@ import click
 
 from apps.frappecrm.core import contacts, deals, desk, emails, leads, notes, organizations, users
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -48,6 +49,19 @@ def down(volumes: bool, force: bool):
         subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    frappecrm_cli,
+    SnapshotSpec(
+        app="frappecrm",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="mariadb",
+        engine="mariadb",
+        databases=["crm"],
+        key_files=[Path(__file__).parent.joinpath("docker", "init.sh")],
+    ),
+)
+
+
 @frappecrm_cli.command()
 @click.option("--n-organizations", type=int, default=100, help="Number of organizations to generate")
 @click.option("--n-email-templates", type=int, default=10, help="Number of email templates to generate")
@@ -4,6 +4,7 @@ import logging
 from frappeclient import FrappeClient
 
 from apps.frappecrm.config.settings import settings
+from common import frappe_sessions
 
 
 def create_client(
@@ -42,7 +43,17 @@ def create_client(
             data={"user": email, "reason": "Seeding data"},
         )
 
+    def bulk_update_json(docs: list[dict]):
+        """Update many documents in chunks, returning the docs that failed."""
+        return frappe_sessions.bulk_update(client, docs)
+
     client.insert_many = insert_many_json
+    client.bulk_update = bulk_update_json
     client.assign = assign
     client.impersonate = impersonate
     return client
+
+
+def create_session_pool():
+    """Create a pool of clients logged in as individual users, one login per user."""
+    return frappe_sessions.FrappeSessionPool(lambda username: create_client(username=username, password=settings.USER_PASSWORD))
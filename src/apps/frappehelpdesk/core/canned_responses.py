@@ -7,7 +7,7 @@ from pydantic import BaseModel, Field
 
 from apps.frappehelpdesk.config.settings import settings
 from apps.frappehelpdesk.core.users import USERS_CACHE_FILE
-from apps.frappehelpdesk.utils.frappe_client import FrappeClient
+from apps.frappehelpdesk.utils.frappe_client import FrappeClient, create_session_pool
 from common.logger import logger
 
 
@@ -150,7 +150,8 @@ async def seed_canned_responses():
 
     successful_responses = 0
 
-    # Insert canned responses using cached author information
+    # Insert canned responses using cached author information, with one login per author
+    sessions = create_session_pool()
     for response_data in canned_responses_data:
         try:
             # Use the author information stored in the cache
@@ -159,7 +160,7 @@ async def seed_canned_responses():
                 author_email = author_info["email"]
             else:
                 # Fallback: query for any company user if no author info
-                async with FrappeClient() as client:
+                async with sessions.session(settings.ADMIN_USERNAME) as client:
                     domain = settings.COMPANY_NAME.lower()
                     domain = "".join(c for c in domain if c.isalnum()) + ".com"
 
@@ -177,7 +178,7 @@ async def seed_canned_responses():
                     author_email = fake.random_element(users)["email"]
                     logger.warning(f"No author info in cache for response '{response_data['title']}', using random user: {author_email}")
 
-            async with FrappeClient(username=author_email, password=settings.USER_PASSWORD) as impersonated_client:
+            async with sessions.session(author_email) as impersonated_client:
                 await impersonated_client.insert(
                     {
                         "title": response_data["title"],
@@ -191,6 +192,7 @@ async def seed_canned_responses():
                 successful_responses += 1
         except Exception as e:
             logger.warning(f"Error inserting canned response: {e}")
+    await sessions.close()
 
     logger.succeed(f"Seeded {successful_responses}/{len(canned_responses_data)} canned responses")
 
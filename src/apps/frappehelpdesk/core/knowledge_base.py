@@ -10,7 +10,8 @@ from pydantic import BaseModel, Field
 
 from apps.frappehelpdesk.config.settings import settings
 from apps.frappehelpdesk.core.users import USERS_CACHE_FILE
-from apps.frappehelpdesk.utils.frappe_client import FrappeClient
+from apps.frappehelpdesk.utils.frappe_client import FrappeClient, create_session_pool
+from common.dedup import DedupIndex
 from common.logger import logger
 
 
@@ -199,6 +200,15 @@ async def generate_kb_articles(number_of_articles: int):
     logger.info(f"Generating {number_of_articles} articles using {len(categories_data)} cached categories and {len(company_users)} company users")
     generated_articles = []
 
+    # Titles from the previous run and from this one, read from the cache once instead of per article
+    title_index = DedupIndex(near_fields=["title"])
+    if ARTICLES_CACHE_FILE.exists():
+        try:
+            with ARTICLES_CACHE_FILE.open() as f:
+                title_index.add_many(json.load(f).get("articles", []))
+        except Exception:
+            pass  # Ignore cache read errors
+
     concurrency_limit = 16
     semaphore = asyncio.Semaphore(concurrency_limit)
 
@@ -207,15 +217,7 @@ async def generate_kb_articles(number_of_articles: int):
             try:
                 logger.info(f"Generating article {article_index + 1}/{number_of_articles} for category: {category_name}")
 
-                # Generate existing article titles from cache to avoid duplicates
-                existing_titles = []
-                if ARTICLES_CACHE_FILE.exists():
-                    try:
-                        with ARTICLES_CACHE_FILE.open() as f:
-                            existing_cache = json.load(f)
-                            existing_titles = [article.get("title", "") for article in existing_cache.get("articles", [])]
-                    except Exception:
-                        pass  # Ignore cache read errors
+                existing_titles = title_index.avoid_summary("title")
 
                 articles = await openai_client.beta.chat.completions.parse(
                     model="gpt-4o-mini",
@@ -239,6 +241,12 @@ async def generate_kb_articles(number_of_articles: int):
                 )
                 article = articles.choices[0].message.parsed
 
+                duplicate = title_index.duplicate_of({"title": article.title})
+                if duplicate:
+                    logger.warning(f"Skipping duplicate article: {duplicate}")
+                    return None
+                title_index.add({"title": article.title})
+
                 # Select a random user as the author
                 author_user = fake.random_element(company_users)
 
@@ -322,7 +330,8 @@ async def seed_kb_articles():
 
     successful_articles = 0
 
-    # Create articles from cached data
+    # Create articles from cached data, with one login per author
+    sessions = create_session_pool()
     for article_data in articles_data:
         try:
             # Use the author information stored in the cache
@@ -334,7 +343,7 @@ async def seed_kb_articles():
                 domain = settings.COMPANY_NAME.lower()
                 domain = "".join(c for c in domain if c.isalnum()) + ".com"
 
-                async with FrappeClient() as client:
+                async with sessions.session(settings.ADMIN_USERNAME) as client:
                     users = await client.get_list(
                         "User",
                         fields=["name", "email"],
@@ -349,8 +358,8 @@ async def seed_kb_articles():
                 author_email = fake.random_element(users)["email"]
                 logger.warning(f"No author info in cache for article '{article_data['title']}', using random user: {author_email}")
 
-            # Create a new client instance for the author
-            async with FrappeClient(username=author_email, password=settings.USER_PASSWORD) as impersonated_user:
+            # Use the pooled client of the author
+            async with sessions.session(author_email) as impersonated_user:
                 # Find category ID by name
                 category_name = article_data.get("category_name")
                 category_id = None
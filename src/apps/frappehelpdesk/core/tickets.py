@@ -18,7 +18,7 @@ from apps.frappehelpdesk.core.customers import (
 from apps.frappehelpdesk.core.teams import TEAM_ASSIGNMENTS_CACHE_FILE, TEAMS_CACHE_FILE
 from apps.frappehelpdesk.utils.constants import HD_TICKET_TYPES
 from apps.frappehelpdesk.utils.database import create_mariadb_client
-from apps.frappehelpdesk.utils.frappe_client import AuthError, FrappeClient
+from apps.frappehelpdesk.utils.frappe_client import AuthError, create_session_pool
 from common.logger import logger
 
 
@@ -185,13 +185,13 @@ def adjust_to_business_hours(dt):
     return dt
 
 
-async def insert_single_ticket(ticket_data, contact, customer_name):
+async def insert_single_ticket(ticket_data, contact, customer_name, sessions):
     logger.info(f"Inserting ticket: {ticket_data.ticket.subject} for {customer_name} by {contact['name']}.")
     op_email = contact["email_id"]
     db_client = await create_mariadb_client()
 
     try:
-        async with FrappeClient(username=op_email, password=settings.USER_PASSWORD) as client:
+        async with sessions.session(op_email) as client:
             inserted_ticket = await client.insert(
                 {
                     "doctype": "HD Ticket",
@@ -242,7 +242,7 @@ async def insert_single_ticket(ticket_data, contact, customer_name):
             if item.type == "comment":
                 if not main_handler:
                     main_handler = item.author
-                async with FrappeClient(username=item.author, password=settings.USER_PASSWORD) as client:
+                async with sessions.session(item.author) as client:
                     inserted_comment = await client.insert(
                         {
                             "doctype": "HD Ticket Comment",
@@ -268,7 +268,7 @@ async def insert_single_ticket(ticket_data, contact, customer_name):
             elif item.type == "reply":
                 main_handler = item.author
                 # Insert agent reply to customer
-                async with FrappeClient() as client:
+                async with sessions.session(settings.ADMIN_USERNAME) as client:
                     # Convert timestamp to UTC for communication_date without timezone suffix
                     communication_date = datetime.fromtimestamp(item.timestamp, tz=UTC).replace(tzinfo=None).isoformat()
                     inserted_reply = await client.insert(
@@ -320,7 +320,7 @@ async def insert_single_ticket(ticket_data, contact, customer_name):
                     )
 
             elif item.type == "customer_response":
-                async with FrappeClient() as client:
+                async with sessions.session(settings.ADMIN_USERNAME) as client:
                     # Convert timestamp to UTC for communication_date without timezone suffix
                     inserted_reply = await client.insert(
                         {
@@ -390,7 +390,7 @@ async def insert_single_ticket(ticket_data, contact, customer_name):
 
             elif item.type == "status_change":
                 # Handle GPT-generated status and priority changes
-                async with FrappeClient(username=item.author, password=settings.USER_PASSWORD) as author_client:
+                async with sessions.session(item.author) as author_client:
                     if item.status and item.status != current_status:
                         await author_client.set_value(
                             "HD Ticket",
@@ -1013,7 +1013,7 @@ async def seed_tickets():
             contact = cached_ticket["contact"]
             customer_name = cached_ticket["customer_name"]
 
-            await insert_single_ticket(ticket_data, contact, customer_name)
+            await insert_single_ticket(ticket_data, contact, customer_name, sessions)
             successful_tickets += 1
         except Exception as e:
             logger.warning(f"Error creating ticket from cache: {e}")
@@ -1027,7 +1027,9 @@ async def seed_tickets():
         async with semaphore:
             await process_ticket(cached_ticket)
 
-    tasks = [process_with_semaphore(cached_ticket) for cached_ticket in cached_tickets_data]
-    await asyncio.gather(*tasks, return_exceptions=True)
+    # Tickets are written by their contacts and agents, with one login per user across all tickets
+    async with create_session_pool() as sessions:
+        tasks = [process_with_semaphore(cached_ticket) for cached_ticket in cached_tickets_data]
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     logger.succeed(f"Seeded {successful_tickets}/{len(cached_tickets_data)} tickets")
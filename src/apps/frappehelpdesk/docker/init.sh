@@ -23,6 +23,8 @@ else
     --force \
     --mariadb-root-username root \
     --mariadb-root-password ${MYSQL_PASSWORD} \
+    --db-name helpdesk \
+    --db-password ${MYSQL_PASSWORD} \
     --admin-password ${ADMIN_PASSWORD} \
     --no-mariadb-socket
 
@@ -32,6 +32,8 @@ else
       --force \
       --mariadb-root-username root \
       --mariadb-root-password ${MYSQL_PASSWORD} \
+      --db-name helpdesk \
+      --db-password ${MYSQL_PASSWORD} \
       --admin-password ${ADMIN_PASSWORD} \
       --no-mariadb-socket &&
     bench --site helpdesk.localhost install-app helpdesk &&
@@ -13,6 +13,7 @@ from apps.frappehelpdesk.core.knowledge_base import generate_kb_articles, genera
 from apps.frappehelpdesk.core.teams import delete_teams, generate_team_assignments, generate_teams, seed_team_assignments, seed_teams
 from apps.frappehelpdesk.core.tickets import generate_tickets, seed_tickets
 from apps.frappehelpdesk.core.users import generate_users, seed_users
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -55,6 +56,21 @@ def down(volumes: bool, force: bool):
         subprocess.run(["docker", "volume", "prune", "-f"], env=env)
 
 
+add_snapshot_commands(
+    frappehelpdesk_cli,
+    SnapshotSpec(
+        app="frappehelpdesk",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="mariadb",
+        engine="mariadb",
+        databases=["helpdesk"],
+        key_files=[Path(__file__).parent.joinpath("docker", "init.sh")],
+        data_dir=settings.DATA_PATH,
+        env=lambda: {**os.environ, **settings.model_dump_str()},
+    ),
+)
+
+
 @frappehelpdesk_cli.command()
 @click.option("--agents", type=int, default=40, help="Number of users to insert")
 @click.option("--admins", type=int, default=10, help="Number of admins to insert")
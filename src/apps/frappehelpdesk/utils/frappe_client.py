@@ -8,6 +8,7 @@ from urllib.parse import quote
 import aiohttp
 
 from apps.frappehelpdesk.config.settings import settings
+from common.frappe_sessions import AsyncFrappeSessionPool
 
 
 class AuthError(Exception):
@@ -359,3 +360,13 @@ class FrappeClient:
         elif "data" in rjson:
             return rjson["data"]
         return None
+
+
+def create_session_pool() -> AsyncFrappeSessionPool:
+    """Create a pool of clients logged in as individual users, one login per user."""
+
+    def create(username: str) -> FrappeClient:
+        password = settings.ADMIN_PASSWORD if username == settings.ADMIN_USERNAME else settings.USER_PASSWORD
+        return FrappeClient(username=username, password=password)
+
+    return AsyncFrappeSessionPool(create)
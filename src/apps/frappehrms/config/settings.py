@@ -10,6 +10,7 @@ class Config(BaseSettings):
     LOG_LEVEL: str = "INFO"
     DATA_THEME_SUBJECT: str = "a IT outsourcing company"
     LIST_LIMIT: int = 100000
+    PAYROLL_CONCURRENCY: int = 4  # Monthly payroll entries processed at the same time
 
     # API configuration
     API_URL: str = "http://localhost:8000"
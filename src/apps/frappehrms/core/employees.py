@@ -337,6 +337,7 @@ async def update_employees_salary_data():
         )
     ]
 
+    salary_updates = []
     for employee in employees:
         designation = employee.get("designation", "").lower()
 
@@ -388,12 +389,11 @@ async def update_employees_salary_data():
             "department": matching_department,
         }
 
-        try:
-            client.update(salary_update)
-            logger.info(f"Updated salary and contact data for employee: {employee['name']}")
-        except Exception as e:
-            logger.error(f"Failed to update salary and contact data for employee: {employee['name']}")
-            logger.error(f"Error message: {str(e).splitlines()[0]}")
+        salary_updates.append(salary_update)
+
+    for failure in client.bulk_update(salary_updates):
+        logger.error(f"Failed to update salary and contact data for employee: {failure['doc']['name']}")
+        logger.error(f"Error message: {failure['error']}")
 
     logger.info("Employee salary and contact data update completed")
 
@@ -1,3 +1,4 @@
+import asyncio
 import calendar
 import json
 import logging
@@ -11,6 +12,7 @@ from faker import Faker
 from apps.frappehrms.config.settings import settings
 from apps.frappehrms.core.companies import get_default_company
 from apps.frappehrms.utils import frappe_client
+from apps.frappehrms.utils.job_tracker import JobFailedError, JobTracker
 
 
 logger = logging.getLogger(__name__)
@@ -538,7 +540,12 @@ async def delete_payroll_entries():
 
 
 async def insert_payroll_entries(from_date: date = "2023-01-01", to_date: date | None = None):
-    """Insert payroll entries for a given date range."""
+    """
+    Insert payroll entries for a given date range and fill in their salary slips.
+
+    Up to PAYROLL_CONCURRENCY months are submitted at once. Frappe creates the salary slips of each entry
+    in a background job, and the slips of a month are filled in as soon as all of them exist.
+    """
     client = frappe_client.create_client()
     if to_date is None:
         to_date = datetime.now().strftime("%Y-%m-%d")
@@ -566,126 +573,148 @@ async def insert_payroll_entries(from_date: date = "2023-01-01", to_date: date |
         else:
             current_date = datetime(current_date.year, current_date.month + 1, 1)
 
-    # For each month, get the list of active employees
-    for month_start, month_end in month_list:
-        logging.info(f"Getting active employees for month: {month_start.strftime('%B %Y')}")
-
-        # Convert dates to string format for Frappe filters
-        month_start_str = month_start.strftime("%Y-%m-%d")
-        month_end_str = month_end.strftime("%Y-%m-%d")
-
-        # Get all employees that joined before the end of this month
-        all_employees = client.get_list(
-            "Employee",
-            fields=[
-                "employee",
-                "employee_name",
-                "designation",
-                "department",
-                "date_of_joining",
-                "relieving_date",
-                "status",
-            ],
-            filters=[
-                ["date_of_joining", "<=", month_end_str],
-                ["status", "=", "Active"],
-            ],
-            limit_page_length=settings.LIST_LIMIT,
-        )
+    slip_data = await asyncio.to_thread(_get_salary_slip_data, client)
 
-        # Filter employees in Python code
-        active_employees = []
-        for employee in all_employees:
-            # Check if employee has a relieving date
-            has_relieving_date = employee["relieving_date"] and employee["relieving_date"] != ""
-
-            # If employee has a relieving date, convert it to datetime
-            if has_relieving_date:
-                relieving_date = datetime.strptime(employee["relieving_date"], "%Y-%m-%d")
-                # Include only if relieving date is on or after month_end
-                if relieving_date >= month_end:
-                    active_employees.append(employee)
-            else:
-                # Include employees with no relieving date
-                active_employees.append(employee)
+    semaphore = asyncio.Semaphore(max(1, settings.PAYROLL_CONCURRENCY))
 
-        payroll_entry = {
-            "docstatus": 1,
-            "posting_date": month_end_str,
-            "exchange_rate": 1,
-            "company": company["name"],
-            "currency": "USD",
-            "payroll_payable_account": f"Payroll Payable - {company['abbr']}",
-            # "status": "Draft",
-            "payroll_frequency": "Monthly",
-            "start_date": month_start_str,
-            "end_date": month_end_str,
-            "validate_attendance": 0,
-            "cost_center": f"Main - {company['abbr']}",
-            "doctype": "Payroll Entry",
-            "employees": [
-                {
-                    "docstatus": 0,
-                    "employee": e["employee"],
-                    "is_salary_withheld": 0,
-                    "parentfield": "employees",
-                    "parenttype": "Payroll Entry",
-                    "doctype": "Payroll Employee Detail",
-                }
-                for e in active_employees
-            ],
-        }
-        try:
-            client.insert(payroll_entry)
-            logging.info(f"Inserted payroll entry for {month_start.strftime('%B %Y')}")
-            time.sleep(10)
-        except Exception as e:
-            logging.error(f"Error inserting payroll entry for {month_start.strftime('%B %Y')}: {e!s}")
+    async def insert_month(month_start, month_end):
+        async with semaphore:
+            return await _insert_monthly_payroll(company, month_start, month_end, slip_data)
+
+    results = await asyncio.gather(*(insert_month(month_start, month_end) for month_start, month_end in month_list))
+
+    expected = sum(expected_slips for expected_slips, _ in results)
+    updated = sum(updated_slips for _, updated_slips in results)
+    logger.info(f"Payroll for {len(month_list)} months: {updated}/{expected} salary slips filled in")
 
     return month_list
 
 
-async def update_salary_slips():
-    client = frappe_client.create_client()
-    slips = None
-    previous_slip_count = 0
-    current_slip_count = 0
+def _get_active_employees(client, month_end):
+    """Employees that joined before the end of a month and were not relieved before it."""
+    all_employees = client.get_list(
+        "Employee",
+        fields=[
+            "employee",
+            "employee_name",
+            "designation",
+            "department",
+            "date_of_joining",
+            "relieving_date",
+            "status",
+        ],
+        filters=[
+            ["date_of_joining", "<=", month_end.strftime("%Y-%m-%d")],
+            ["status", "=", "Active"],
+        ],
+        limit_page_length=settings.LIST_LIMIT,
+    )
 
-    logger.info("Waiting for slips to be created. This can take a while if there are a lot of employees.")
+    # Filter employees in Python code
+    active_employees = []
+    for employee in all_employees:
+        # Check if employee has a relieving date
+        has_relieving_date = employee["relieving_date"] and employee["relieving_date"] != ""
+
+        # If employee has a relieving date, convert it to datetime
+        if has_relieving_date:
+            relieving_date = datetime.strptime(employee["relieving_date"], "%Y-%m-%d")
+            # Include only if relieving date is on or after month_end
+            if relieving_date >= month_end:
+                active_employees.append(employee)
+        else:
+            # Include employees with no relieving date
+            active_employees.append(employee)
+
+    return active_employees
+
+
+async def _insert_monthly_payroll(company, month_start, month_end, slip_data):
+    """
+    Insert the payroll entry of one month, wait for its salary slips and fill them in.
+
+    Returns the number of expected and of filled in salary slips.
+    """
+    month = month_start.strftime("%B %Y")
+    client = await asyncio.to_thread(frappe_client.create_client)
+
+    # Convert dates to string format for Frappe filters
+    month_start_str = month_start.strftime("%Y-%m-%d")
+    month_end_str = month_end.strftime("%Y-%m-%d")
+
+    logging.info(f"Getting active employees for month: {month}")
+    active_employees = await asyncio.to_thread(_get_active_employees, client, month_end)
+
+    payroll_entry = {
+        "docstatus": 1,
+        "posting_date": month_end_str,
+        "exchange_rate": 1,
+        "company": company["name"],
+        "currency": "USD",
+        "payroll_payable_account": f"Payroll Payable - {company['abbr']}",
+        # "status": "Draft",
+        "payroll_frequency": "Monthly",
+        "start_date": month_start_str,
+        "end_date": month_end_str,
+        "validate_attendance": 0,
+        "cost_center": f"Main - {company['abbr']}",
+        "doctype": "Payroll Entry",
+        "employees": [
+            {
+                "docstatus": 0,
+                "employee": e["employee"],
+                "is_salary_withheld": 0,
+                "parentfield": "employees",
+                "parenttype": "Payroll Entry",
+                "doctype": "Payroll Employee Detail",
+            }
+            for e in active_employees
+        ],
+    }
+    try:
+        response = await asyncio.to_thread(client.insert, payroll_entry)
+        logging.info(f"Inserted payroll entry for {month}")
+    except Exception as e:
+        logging.error(f"Error inserting payroll entry for {month}: {e!s}")
+        return len(active_employees), 0
 
-    while current_slip_count == 0 or current_slip_count > previous_slip_count:
-        previous_slip_count = current_slip_count
-        slips = client.get_list(
+    # Slips are created by a background job on submit, one per employee of the entry
+    slip_filters = [["payroll_entry", "=", response["name"]]]
+    try:
+        created = await JobTracker(client).wait_for_records(
             "Salary Slip",
-            fields=["name", "docstatus", "employee"],
-            filters=[["docstatus", "=", 0]],
-            limit_page_length=settings.LIST_LIMIT,
+            slip_filters,
+            expected=len(active_employees),
+            job=("Payroll Entry", response["name"]),
         )
-        current_slip_count = len(slips)
-        logger.info(f"Still waiting for slips to be created. Found {current_slip_count} slips.")
-        time.sleep(30)
+    except (JobFailedError, TimeoutError) as e:
+        logging.error(f"Salary slips for {month} were not created: {e!s}")
+        return len(active_employees), 0
 
-    employees = client.get_list(
-        "Employee",
-        fields=["name", "employee_name", "ctc", "designation"],
-        limit_page_length=settings.LIST_LIMIT,
-    )
+    if created < len(active_employees):
+        logging.warning(f"Only {created}/{len(active_employees)} salary slips were created for {month}")
 
-    slips = client.get_list(
+    slips = await asyncio.to_thread(
+        client.get_list,
         "Salary Slip",
         fields=["name", "docstatus", "employee"],
+        filters=[*slip_filters, ["docstatus", "=", 0]],
         limit_page_length=settings.LIST_LIMIT,
-        filters=[["docstatus", "=", 0]],
     )
-    # Join slips and employees based on employee["name"] and slip["employee"]
-    employee_map = {employee["name"]: employee for employee in employees}
+    updated = await asyncio.to_thread(_fill_salary_slips, client, slips, slip_data)
+    logging.info(f"Filled in {updated} salary slips for {month}")
+
+    return len(active_employees), updated
 
-    # Create a list of slips with employee information
-    for slip in slips:
-        if slip["employee"] in employee_map:
-            ctc = employee_map[slip["employee"]]["ctc"]
-            slip["ctc"] = ctc if ctc else 0
-            slip["designation"] = employee_map[slip["employee"]]["designation"]
+
+def _get_salary_slip_data(client):
+    """Employees by name and the salary components used to fill in salary slips."""
+    employees = client.get_list(
+        "Employee",
+        fields=["name", "employee_name", "ctc", "designation"],
+        limit_page_length=settings.LIST_LIMIT,
+    )
+    employee_map = {employee["name"]: employee for employee in employees}
 
     salary_components = client.get_list(
         "Salary Component",
@@ -706,28 +735,44 @@ async def update_salary_slips():
     earnings_components = [c for c in salary_components if c["type"] == "Earning" and not c.get("depends_on_payment_days", 0)]
     deduction_components = [c for c in salary_components if c["type"] == "Deduction"]
 
+    return employee_map, earnings_components, deduction_components
+
+
+def _fill_salary_slips(client, slips, slip_data):
+    """Generate earnings and deductions for each slip and update it. Returns the number of updated slips."""
+    employee_map, earnings_components, deduction_components = slip_data
+
+    # Join slips and employees based on employee["name"] and slip["employee"]
+    for slip in slips:
+        if slip["employee"] in employee_map:
+            ctc = employee_map[slip["employee"]]["ctc"]
+            slip["ctc"] = ctc if ctc else 0
+            slip["designation"] = employee_map[slip["employee"]]["designation"]
+
     # Find Basic Pay component
     basic_pay_component = next(
         (c for c in earnings_components if c["salary_component"] == "Basic Pay"),
         None,
     )
 
+    updated = 0
     for slip in slips:
         try:
             # Generate unique earnings for this employee
             earnings = []
 
-            # Create a random seed based on employee ID to ensure consistency within a run
+            # Create a random generator seeded by employee ID to ensure consistency within a run.
+            # A local generator, since the slips of several months are filled in concurrently
             employee_id = slip["employee"]
-            random.seed(hash(employee_id) + int(time.time()))  # Add time to make it different each run
+            rng = random.Random(hash(employee_id) + int(time.time()))  # Add time to make it different each run
 
             # Calculate monthly salary as CTC/12
-            monthly_salary = int(slip["ctc"] / 12) if slip["ctc"] else random.randint(3000, 8000)
+            monthly_salary = int(slip["ctc"] / 12) if slip["ctc"] else rng.randint(3000, 8000)
 
             # Add Basic Pay (always include it)
             if basic_pay_component:
                 # Basic pay will be 60-80% of monthly salary
-                basic_pay_amount = int(monthly_salary * random.uniform(0.6, 0.8))
+                basic_pay_amount = int(monthly_salary * rng.uniform(0.6, 0.8))
                 earnings.append(
                     {
                         "doctype": "Salary Detail",
@@ -747,8 +792,8 @@ async def update_salary_slips():
                 other_components = [c for c in earnings_components if c["salary_component"] != "Basic Pay"]
                 if other_components and remaining_amount > 0:
                     # Distribute remaining amount among other components
-                    num_components = random.randint(1, min(3, len(other_components)))  # Add 1-3 other components
-                    selected_components = random.sample(other_components, num_components)
+                    num_components = rng.randint(1, min(3, len(other_components)))  # Add 1-3 other components
+                    selected_components = rng.sample(other_components, num_components)
 
                     # Distribute remaining amount proportionally
                     for i, component in enumerate(selected_components):
@@ -757,7 +802,7 @@ async def update_salary_slips():
                             amount = remaining_amount
                         else:
                             # Other components get a portion of remaining amount
-                            portion = random.uniform(0.1, 0.3)  # 10-30% of remaining
+                            portion = rng.uniform(0.1, 0.3)  # 10-30% of remaining
                             amount = int(remaining_amount * portion)
                             remaining_amount -= amount
 
@@ -780,21 +825,21 @@ async def update_salary_slips():
             monthly_salary = sum(earning["amount"] for earning in earnings)
 
             # Get random deduction components (1-4 components)
-            num_components = random.randint(1, min(4, len(deduction_components)))
-            selected_components = random.sample(deduction_components, num_components)
+            num_components = rng.randint(1, min(4, len(deduction_components)))
+            selected_components = rng.sample(deduction_components, num_components)
 
             for component in selected_components:
                 # Randomly decide between percentage or fixed amount
-                if random.random() < 0.5:  # 50% chance for percentage-based
+                if rng.random() < 0.5:  # 50% chance for percentage-based
                     # Use 1-5% of monthly salary for percentage-based deductions
-                    percent = random.uniform(0.01, 0.05)
+                    percent = rng.uniform(0.01, 0.05)
                     amount = int(monthly_salary * percent)
                 else:  # Fixed amount deductions
                     # Use fixed amounts between 50-200
-                    amount = random.randint(50, 200)
+                    amount = rng.randint(50, 200)
 
                 # 70% chance to include this deduction
-                if random.random() < 0.7:
+                if rng.random() < 0.7:
                     deductions.append(
                         {
                             "doctype": "Salary Detail",
@@ -817,11 +862,11 @@ async def update_salary_slips():
                 }
             )
             logging.info(f"Updated salary slip: {slip['name']}")
+            updated += 1
         except Exception as e:
             logging.error(f"Error updating salary slip {slip['name']}: {e!s}")
 
-    # Reset random seed
-    random.seed()
+    return updated
 
 
 async def submit_payroll_entries():
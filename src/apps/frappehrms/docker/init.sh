@@ -43,6 +43,8 @@ bench new-site hrms.localhost \
 --force \
 --mariadb-root-username root \
 --mariadb-root-password 123 \
+--db-name hrms \
+--db-password 123 \
 --admin-password admin \
 --no-mariadb-socket
 
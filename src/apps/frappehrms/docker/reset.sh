@@ -30,6 +30,8 @@ else
       --force \
       --mariadb-root-username root \
       --mariadb-root-password 123 \
+      --db-name hrms \
+      --db-password 123 \
       --admin-password admin \
       --no-mariadb-socket &&
     bench --site hrms.localhost install-app hrms &&
@@ -20,6 +20,7 @@ from apps.frappehrms.core import (
     users,
 )
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -55,6 +56,19 @@ def down(volumes: bool, force: bool):
         subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    frappehrms_cli,
+    SnapshotSpec(
+        app="frappehrms",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="mariadb",
+        engine="mariadb",
+        databases=["hrms"],
+        key_files=[Path(__file__).parent.joinpath("docker", "init.sh")],
+    ),
+)
+
+
 @frappehrms_cli.command()
 # @click.option("--n-employees", type=int, default=150, help="Number of employees to generate")
 # @click.option("--n-users", type=int, default=150, help="Number of users to generate")
@@ -290,13 +304,9 @@ def seed(
         await salaries.insert_salary_structure_assignments()
         logger.succeed("Inserted salary structure assignments")
 
-        logger.start("Inserting payroll entries...")
+        logger.start("Inserting payroll entries and salary slips...")
         await salaries.insert_payroll_entries(from_date="2024-01-01")
-        logger.succeed("Inserted payroll entries")
-
-        logger.start("Updating salary slips...")
-        await salaries.update_salary_slips()
-        logger.succeed("Updated salary slips")
+        logger.succeed("Inserted payroll entries and salary slips")
 
         logger.start("Submitting payroll entries...")
         await salaries.submit_payroll_entries()
@@ -4,6 +4,7 @@ import logging
 from frappeclient import FrappeClient
 
 from apps.frappehrms.config.settings import settings
+from common import frappe_sessions
 
 
 def create_client(
@@ -36,7 +37,12 @@ def create_client(
             }
         )
 
+    def bulk_update_json(docs: list[dict]):
+        """Update many documents in chunks, returning the docs that failed."""
+        return frappe_sessions.bulk_update(client, docs)
+
     client.insert_many = insert_many_json
+    client.bulk_update = bulk_update_json
     client.assign = assign
 
     return client
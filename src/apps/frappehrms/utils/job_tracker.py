@@ -0,0 +1,115 @@
+import asyncio
+import json
+import logging
+import random
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# Document statuses of enqueue-style actions (Payroll Entry, Bulk Salary Structure Assignment, ...)
+QUEUED_STATUSES = ("Queued",)
+FAILED_STATUSES = ("Failed",)
+
+
+class JobFailedError(Exception):
+    """Raised when the background job behind a document ends in a failed status."""
+
+    pass
+
+
+class JobTracker:
+    """
+    Wait for work that Frappe runs in background jobs, instead of sleeping for a fixed time.
+
+    Actions such as submitting a Payroll Entry only enqueue an RQ job: the document is marked
+    "Queued" and the records it creates appear later. The tracker polls the document status and
+    the number of created records with exponential backoff and jitter, so many jobs can be
+    awaited concurrently without hammering the server, and stops as soon as the expected number
+    of records exists or the job has finished.
+
+    The Frappe client is synchronous, so every call runs in a thread.
+    """
+
+    def __init__(self, client, initial_delay=1.0, max_delay=30.0, timeout=1800):
+        self.client = client
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+
+    async def count(self, doctype, filters):
+        """Number of `doctype` records matching `filters`, without fetching them."""
+        params = {"doctype": doctype, "filters": json.dumps(filters)}
+        return await asyncio.to_thread(self.client.get_api, "frappe.client.get_count", params)
+
+    async def get_status(self, doctype, name, fields=("status",)):
+        """Current values of the status `fields` of a document."""
+        params = {"doctype": doctype, "fieldname": json.dumps(list(fields)), "filters": name}
+        return await asyncio.to_thread(self.client.get_api, "frappe.client.get_value", params) or {}
+
+    async def wait(self, check, description):
+        """
+        Call `check` until it returns something other than None, and return that.
+
+        Raises:
+            TimeoutError: If `check` is still pending after `timeout` seconds.
+        """
+        delay = self.initial_delay
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            result = await check()
+            if result is not None:
+                return result
+
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Timed out after {self.timeout}s waiting for {description}")
+
+            # Jitter keeps concurrent waiters from polling in lockstep
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, self.max_delay)
+
+    async def wait_for_job(self, doctype, name):
+        """
+        Wait until the background job of a document has finished, and return its final status.
+
+        Raises:
+            JobFailedError: If the job failed.
+        """
+
+        async def check():
+            status = await self.get_status(doctype, name, ("status", "error_message"))
+            if status.get("status") in QUEUED_STATUSES:
+                return None
+            if status.get("status") in FAILED_STATUSES:
+                raise JobFailedError(f"{doctype} {name} failed: {status.get('error_message') or 'unknown error'}")
+            return status
+
+        return await self.wait(check, f"{doctype} {name}")
+
+    async def wait_for_records(self, doctype, filters, expected, job=None):
+        """
+        Wait until `expected` records of `doctype` match `filters`, and return their count.
+
+        `job` is the (doctype, name) of the document whose background job creates the records.
+        Once that job has finished the current count is returned even if it falls short, since
+        no more records will appear; a failed job raises JobFailedError.
+        """
+
+        async def check():
+            current = await self.count(doctype, filters)
+            if current >= expected:
+                return current
+
+            if job is not None:
+                status = await self.get_status(*job, ("status", "error_message"))
+                if status.get("status") in FAILED_STATUSES:
+                    raise JobFailedError(f"{job[0]} {job[1]} failed: {status.get('error_message') or 'unknown error'}")
+                if status.get("status") not in QUEUED_STATUSES:
+                    # The job may have committed its last records after the count above
+                    return await self.count(doctype, filters)
+
+            logger.info(f"Waiting for {doctype} records: {current}/{expected}")
+            return None
+
+        return await self.wait(check, f"{expected} {doctype} records")
@@ -16,6 +16,14 @@ class AppConfig(BaseSettings):
     CONTAINER_NAME: str = "gitlab-container"
     DOPPLER_TOKEN: str = ""
 
+    # Seeding concurrency
+    MAX_PARALLEL_IMPORTS: int = 4  # GitLab imports running at the same time
+    GIT_SYNC_WORKERS: int = 2  # processes running git fetch/push
+
+    # Bare mirrors of GitHub repositories, reused across seeds
+    GIT_MIRROR_CACHE_PATH: str = "~/.cache/seed-gitlab-mirrors"
+    GIT_MIRROR_CACHE_MAX_BYTES: int = 20 * 1024**3
+
     # Database configuration
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
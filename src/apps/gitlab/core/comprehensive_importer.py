@@ -3,11 +3,9 @@ Comprehensive GitLab GitHub Importer
 Ensures complete repository synchronization including all branches, tags, and source code
 """
 
-import os
+import asyncio
 import subprocess
-import tempfile
 import time
-from pathlib import Path
 from urllib.parse import urlparse
 
 from common.logger import logger
@@ -15,9 +13,118 @@ from common.logger import logger
 from .documentation import DocumentationManager
 from .github_client import GitHubClient
 from .gitlab_client import GitLabClient
+from .provisioning import DEVELOPER_ACCESS, GitLabProvisioner
+from .repo_sync import clone_and_sync_repository
 from .user_manager import UserManager
 
 
+class ImportProgressTracker:
+    """
+    Stuck detection for one running GitLab import.
+
+    Fed one progress snapshot per poll, it decides whether the import finished, failed, or has
+    stopped making progress. Used by the blocking monitor below and by the import orchestrator,
+    which polls many imports from one loop.
+    """
+
+    MAX_WAIT_WITHOUT_PROGRESS = 10 * 60  # 10 minutes without any progress
+
+    def __init__(self, label=""):
+        self.label = label
+        self.start_time = time.time()
+        self.last_progress_time = self.start_time
+        self.last_log_time = self.start_time
+        self.progress_history = []
+        self.changed = False
+
+    def update(self, progress):
+        """
+        Record a progress snapshot.
+
+        Returns "finished" or "failed" once the import is over, "verify" when it looks stuck without
+        content and needs a final content check, and None while it is still running.
+        """
+        prefix = f"{self.label}: " if self.label else ""
+        current_time = time.time()
+        elapsed = int(current_time - self.start_time)
+
+        if not progress:
+            logger.warning(f"{prefix}Could not get import progress, retrying...")
+            self.changed = False
+            return None
+
+        status = progress["status"]
+        issues_count = progress.get("issues", 0)
+        mrs_count = progress.get("mrs", 0)
+
+        previous = self.progress_history[-1] if self.progress_history else None
+        self.changed = previous is None or (previous["status"], previous["issues"], previous["mrs"]) != (status, issues_count, mrs_count)
+
+        # Check if import is finished
+        if status in ["finished", "completed"]:
+            logger.succeed(f"{prefix}Import completed in {elapsed // 60}m {elapsed % 60}s")
+            return "finished"
+        elif status == "failed":
+            logger.fail(f"{prefix}Import failed")
+            return "failed"
+
+        # Record progress for trend analysis
+        progress_snapshot = {"time": current_time, "issues": issues_count, "mrs": mrs_count, "status": status}
+        self.progress_history.append(progress_snapshot)
+
+        # Keep only last 10 minutes of history
+        self.progress_history = [p for p in self.progress_history if current_time - p["time"] <= 600]
+
+        # Check for actual progress (content changes)
+        if len(self.progress_history) >= 2:
+            first_snapshot = self.progress_history[0]
+            current_snapshot = self.progress_history[-1]
+
+            issues_progress = current_snapshot["issues"] - first_snapshot["issues"]
+            mrs_progress = current_snapshot["mrs"] - first_snapshot["mrs"]
+
+            if issues_progress > 0 or mrs_progress > 0:
+                self.last_progress_time = current_time
+                if self.changed:
+                    logger.info(f"{prefix}Progress detected: +{issues_progress} issues, +{mrs_progress} MRs in last {len(self.progress_history)} checks")
+
+        # Check if we're truly stuck (no progress for too long)
+        time_without_progress = current_time - self.last_progress_time
+
+        if time_without_progress > self.MAX_WAIT_WITHOUT_PROGRESS:
+            logger.warning(f"{prefix}No progress detected for {int(time_without_progress // 60)} minutes")
+
+            # If we have substantial content, consider it potentially complete
+            if issues_count > 0 or mrs_count > 0:
+                logger.info(f"{prefix}Found substantial content: {issues_count} issues, {mrs_count} MRs")
+                logger.info("Import may be complete but status not updated. Checking stability...")
+
+                # Check if numbers are stable for last 5 minutes
+                recent_history = [p for p in self.progress_history if current_time - p["time"] <= 300]
+                if len(recent_history) >= 5:
+                    stable_issues = all(p["issues"] == issues_count for p in recent_history)
+                    stable_mrs = all(p["mrs"] == mrs_count for p in recent_history)
+
+                    if stable_issues and stable_mrs:
+                        logger.succeed(f"{prefix}Content stable for 5+ minutes: {issues_count} issues, {mrs_count} MRs")
+                        logger.info("Proceeding to next phase (import appears complete)")
+                        return "finished"
+
+            # If no content and long stuck, check if it's a real failure
+            if issues_count == 0 and mrs_count == 0 and time_without_progress > 15 * 60:
+                logger.fail(f"{prefix}No content imported after 15+ minutes of no progress")
+                return "verify"
+
+        # Log progress periodically
+        if current_time - self.last_log_time >= 60:  # Every minute
+            self.last_log_time = current_time
+            logger.info(
+                f"{prefix}Status: {status} | Issues: {issues_count} | MRs: {mrs_count} | Elapsed: {elapsed // 60}m {elapsed % 60}s | No progress for: {int(time_without_progress // 60)}m"
+            )
+
+        return None
+
+
 class ComprehensiveImporter:
     """
     Comprehensive GitHub to GitLab importer that ensures:
@@ -59,16 +166,8 @@ class ComprehensiveImporter:
             if not sync_success:
                 logger.warning("Repository synchronization had issues, but metadata import succeeded")
 
-            # Phase 3: Attribution Fixing
-            self._fix_attribution(repo_name, owner, repo)
-
-            # Phase 4: Documentation and Verification
-            self._create_comprehensive_documentation(project_id, owner, repo)
-            self._verify_import_completeness(project_id, owner, repo)
-
-            # Phase 5: User Assignment and Activity
-            self._add_github_contributors_as_project_members(project_id, repo_name, owner, repo)
-            self._assign_admin_to_project(project_id, repo_name, owner, repo)
+            # Phases 3-5
+            self._complete_import(project_id, repo_name, owner, repo)
 
             return True
 
@@ -76,6 +175,19 @@ class ComprehensiveImporter:
             logger.fail(f"Comprehensive import failed: {e}")
             return False
 
+    def _complete_import(self, project_id, repo_name, owner, repo):
+        """Phases 3-5, run once the metadata import finished and the repository was synchronized"""
+        # Phase 3: Attribution Fixing
+        self._fix_attribution(repo_name, owner, repo)
+
+        # Phase 4: Documentation and Verification
+        self._create_comprehensive_documentation(project_id, owner, repo)
+        self._verify_import_completeness(project_id, owner, repo)
+
+        # Phase 5: User Assignment and Activity
+        self._add_github_contributors_as_project_members(project_id, repo_name, owner, repo)
+        self._assign_admin_to_project(project_id, repo_name, owner, repo)
+
     def _validate_setup(self, owner, repo):
         """Validate tokens and access"""
         if self.config["github_token"] == "your_github_personal_access_token_here":
@@ -100,13 +212,7 @@ class ComprehensiveImporter:
     def _import_metadata(self, repo_name, owner, repo):
         """Phase 1: Import metadata using GitLab's built-in importer"""
         try:
-            # Prepare user mapping
-            user_mapping_success = self._prepare_user_mapping(repo_name, owner, repo)
-            if not user_mapping_success:
-                logger.warning("User mapping preparation failed, but continuing with import")
-
-            # Start GitLab import
-            project_id = self._start_gitlab_import(repo_name, owner, repo)
+            project_id = self._start_metadata_import(repo_name, owner, repo)
             if not project_id:
                 return None
 
@@ -121,6 +227,16 @@ class ComprehensiveImporter:
             logger.fail(f"Metadata import error: {e}")
             return None
 
+    def _start_metadata_import(self, repo_name, owner, repo):
+        """Prepare the user mapping and start GitLab's importer, without waiting for it"""
+        # Prepare user mapping
+        user_mapping_success = self._prepare_user_mapping(repo_name, owner, repo)
+        if not user_mapping_success:
+            logger.warning("User mapping preparation failed, but continuing with import")
+
+        # Start GitLab import
+        return self._start_gitlab_import(repo_name, owner, repo)
+
     def _synchronize_repository_comprehensive(self, project_id, _repo_name, owner, repo, github_url):
         """
         Phase 2: Comprehensive repository synchronization
@@ -155,105 +271,11 @@ class ComprehensiveImporter:
 
     def _clone_and_sync_complete_repository(self, github_url, gitlab_repo_url, _owner, repo):
         """Clone complete repository from GitHub and sync to GitLab"""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                clone_dir = Path(temp_dir) / f"{repo}_complete"
-
-                # Try mirror clone first
-                result = subprocess.run(["git", "clone", "--mirror", github_url, clone_dir], capture_output=True, text=True)
-
-                if result.returncode != 0:
-                    # Fallback to regular clone
-                    result = subprocess.run(["git", "clone", "--bare", github_url, clone_dir], capture_output=True, text=True)
-
-                    if result.returncode != 0:
-                        logger.fail(f"Failed to clone repository: {result.stderr}")
-                        return False
-
-                # Change to clone directory
-                os.chdir(clone_dir)
-
-                # Configure GitLab remote with authentication
-                gitlab_remote_url = gitlab_repo_url.replace("http://", f"http://root:{self.gitlab.token}@")
-
-                # Remove existing GitLab remote if it exists
-                subprocess.run(["git", "remote", "remove", "gitlab"], capture_output=True)
-
-                # Add GitLab remote
-                result = subprocess.run(["git", "remote", "add", "gitlab", gitlab_remote_url], capture_output=True, text=True)
-
-                if result.returncode != 0:
-                    logger.fail(f"Failed to add GitLab remote: {result.stderr}")
-                    return False
-
-                # Push everything to GitLab
-                logger.info("Pushing complete repository to GitLab...")
-
-                # Push all branches
-                logger.info("Pushing all branches...")
-                result = subprocess.run(["git", "push", "gitlab", "--all", "--force"], capture_output=True, text=True)
-
-                if result.returncode != 0:
-                    logger.warning(f"Bulk branch push failed: {result.stderr}")
-                    # Try individual branch push
-                    self._push_branches_individually(clone_dir)
-                else:
-                    logger.info("All branches pushed successfully")
-
-                # Push all tags
-                logger.info("Pushing all tags...")
-                result = subprocess.run(["git", "push", "gitlab", "--tags", "--force"], capture_output=True, text=True)
-
-                if result.returncode != 0:
-                    logger.warning(f"Tag push failed: {result.stderr}")
-                else:
-                    logger.info("All tags pushed successfully")
-
-                return True
-
-        except Exception as e:
-            logger.fail(f"Repository cloning and sync error: {e}")
-            return False
-
-    def _push_branches_individually(self, clone_dir):
-        """Push branches individually if bulk push fails"""
-        try:
-            os.chdir(clone_dir)
-
-            # Get all branches
-            result = subprocess.run(["git", "branch", "-r"], capture_output=True, text=True)
-
-            if result.returncode != 0:
-                logger.fail("Failed to get branches")
-                return
-
-            branches = []
-            for line in result.stdout.split("\n"):
-                line = line.strip()
-                if line and not line.startswith("origin/HEAD"):
-                    branch = line.replace("origin/", "")
-                    if branch:
-                        branches.append(branch)
-
-            logger.info(f"Found {len(branches)} branches to push")
-
-            success_count = 0
-            for i, branch in enumerate(branches[:50]):  # Limit to 50 branches
-                logger.info(f"Pushing branch {i + 1}/{min(50, len(branches))}: {branch}")
-
-                result = subprocess.run(["git", "push", "gitlab", f"origin/{branch}:refs/heads/{branch}", "--force"], capture_output=True, text=True)
-
-                if result.returncode == 0:
-                    success_count += 1
-                else:
-                    logger.warning(f"Failed to push {branch}: {result.stderr[:100]}...")
-
-                time.sleep(0.1)  # Small delay
+        return clone_and_sync_repository(github_url, self._authenticated_remote_url(gitlab_repo_url), repo)
 
-            logger.info(f"Successfully pushed {success_count}/{min(50, len(branches))} branches")
-
-        except Exception as e:
-            logger.fail(f"Individual branch push error: {e}")
+    def _authenticated_remote_url(self, gitlab_repo_url):
+        """GitLab push URL with the API token as credentials"""
+        return gitlab_repo_url.replace("http://", f"http://root:{self.gitlab.token}@")
 
     def _get_gitlab_project_info(self, project_id):
         """Get GitLab project information"""
@@ -407,12 +429,7 @@ class ComprehensiveImporter:
                 logger.info(f"Creating {len(mapping_analysis['unmappable_users'])} missing users...")
                 auto_create_result = self.user_manager.auto_create_users(mapping_analysis["unmappable_users"])
 
-                # Give GitLab time to process user creation and indexing
-                logger.info("Waiting for user creation and indexing to complete...")
-                time.sleep(10)
-
-                # Refresh GitLab users list to include newly created users
-                logger.info("Refreshing GitLab users list...")
+                # Created users were added to the shared user index, so this is not a refetch
                 gitlab_users = self.gitlab.get_users()
 
                 # Re-analyze mapping with refreshed user list
@@ -514,97 +531,27 @@ class ComprehensiveImporter:
     def _monitor_import(self, project_id):
         """Monitor import progress with smart stuck detection"""
         logger.info("Monitoring import...")
-        start_time = time.time()
-        progress_history = []
-        max_wait_without_progress = 10 * 60  # 10 minutes without any progress
-        last_progress_time = start_time
+        tracker = ImportProgressTracker()
 
         while True:
-            # Get fresh progress data
-            progress = self.gitlab.get_import_progress(project_id)
-            current_time = time.time()
-            elapsed = int(current_time - start_time)
-
-            if not progress:
-                logger.warning("Could not get import progress, retrying...")
-                time.sleep(30)
-                continue
-
-            status = progress["status"]
-            issues_count = progress.get("issues", 0)
-            mrs_count = progress.get("mrs", 0)
-
-            # Check if import is finished
-            if status in ["finished", "completed"]:
-                logger.succeed(f"Import completed in {elapsed // 60}m {elapsed % 60}s")
-                return True
-            elif status == "failed":
-                logger.fail("Import failed")
-                return False
-
-            # Record progress for trend analysis
-            progress_snapshot = {"time": current_time, "issues": issues_count, "mrs": mrs_count, "status": status}
-            progress_history.append(progress_snapshot)
-
-            # Keep only last 10 minutes of history
-            progress_history = [p for p in progress_history if current_time - p["time"] <= 600]
-
-            # Check for actual progress (content changes)
-            if len(progress_history) >= 2:
-                first_snapshot = progress_history[0]
-                current_snapshot = progress_history[-1]
-
-                issues_progress = current_snapshot["issues"] - first_snapshot["issues"]
-                mrs_progress = current_snapshot["mrs"] - first_snapshot["mrs"]
-
-                if issues_progress > 0 or mrs_progress > 0:
-                    last_progress_time = current_time
-                    logger.info(f"Progress detected: +{issues_progress} issues, +{mrs_progress} MRs in last {len(progress_history)} checks")
-
-            # Check if we're truly stuck (no progress for too long)
-            time_without_progress = current_time - last_progress_time
-
-            if time_without_progress > max_wait_without_progress:
-                logger.warning(f"No progress detected for {int(time_without_progress // 60)} minutes")
-
-                # If we have substantial content, consider it potentially complete
-                if issues_count > 0 or mrs_count > 0:
-                    logger.info(f"Found substantial content: {issues_count} issues, {mrs_count} MRs")
-                    logger.info("Import may be complete but status not updated. Checking stability...")
-
-                    # Check if numbers are stable for last 5 minutes
-                    recent_history = [p for p in progress_history if current_time - p["time"] <= 300]
-                    if len(recent_history) >= 5:
-                        stable_issues = all(p["issues"] == issues_count for p in recent_history)
-                        stable_mrs = all(p["mrs"] == mrs_count for p in recent_history)
-
-                        if stable_issues and stable_mrs:
-                            logger.succeed(f"Content stable for 5+ minutes: {issues_count} issues, {mrs_count} MRs")
-                            logger.info("Proceeding to next phase (import appears complete)")
-                            return True
-
-                # If no content and long stuck, check if it's a real failure
-                if issues_count == 0 and mrs_count == 0 and time_without_progress > 15 * 60:
-                    logger.fail("No content imported after 15+ minutes of no progress")
-
-                    # One final check - maybe the API is not reflecting the real state
-                    logger.info("Performing final verification check...")
-                    verification_result = self._verify_import_has_content(project_id)
-                    if verification_result:
-                        logger.succeed("Verification found content - proceeding")
-                        return True
-                    else:
-                        logger.fail("Verification confirms no content - import likely failed")
-                        return False
-
-            # Log progress periodically
-            if elapsed % 60 == 0:  # Every minute
-                logger.info(
-                    f"Status: {status} | Issues: {issues_count} | MRs: {mrs_count} | Elapsed: {elapsed // 60}m {elapsed % 60}s | No progress for: {int(time_without_progress // 60)}m"
-                )
+            outcome = tracker.update(self.gitlab.get_import_progress(project_id))
+            if outcome == "verify":
+                return self._verify_stuck_import(project_id)
+            if outcome is not None:
+                return outcome == "finished"
 
             time.sleep(30)
 
+    def _verify_stuck_import(self, project_id):
+        """One final check for an import that stopped progressing - maybe the API is not reflecting the real state"""
+        logger.info("Performing final verification check...")
+        if self._verify_import_has_content(project_id):
+            logger.succeed("Verification found content - proceeding")
+            return True
+
+        logger.fail("Verification confirms no content - import likely failed")
+        return False
+
     def _verify_import_has_content(self, project_id):
         """Final verification to check if project actually has content"""
         try:
@@ -1267,78 +1214,25 @@ class ComprehensiveImporter:
 
             logger.info(f"Found {len(users_to_add)} GitHub contributors to add as project members")
 
-            added_count = 0
-            failed_count = 0
-
-            for user_info in users_to_add:
-                user_id = user_info["id"]
-                username = user_info["username"]
-                source = user_info["source"]
+            # One member listing, then multi-user member requests for the missing ones only
+            provisioner = GitLabProvisioner(self.gitlab)
+            result = asyncio.run(provisioner.add_members(project_id, [user_info["id"] for user_info in users_to_add], access_level=DEVELOPER_ACCESS))
 
-                try:
-                    # Add user as Developer (access level 30)
-                    member_success = self._add_user_as_project_member(project_id, user_id, username, access_level=30)
-                    if member_success:
-                        added_count += 1
-                        logger.succeed(f"Added {username} as project member ({source})")
-                    else:
-                        failed_count += 1
-                        logger.warning(f"Failed to add {username} as project member ({source})")
-
-                    # Small delay to avoid overwhelming GitLab API
-                    time.sleep(0.2)
-
-                except Exception as e:
-                    failed_count += 1
-                    logger.warning(f"Error adding {username} as member: {e}")
+            usernames = {user_info["id"]: user_info["username"] for user_info in users_to_add}
+            for user_id in result["failed"]:
+                logger.warning(f"Failed to add {usernames.get(user_id, user_id)} as project member")
 
             logger.info("Project member assignment completed:")
-            logger.info(f"   ✅ Successfully added: {added_count} users")
-            logger.info(f"   ❌ Failed to add: {failed_count} users")
-            logger.info("   Total GitHub contributors now have project access!")
+            logger.info(f"   ✅ Successfully added: {len(result['added'])} users ({len(result['existing'])} already members)")
+            logger.info(f"   ❌ Failed to add: {len(result['failed'])} users")
+            provisioner.summary.log("Member provisioning")
 
-            return added_count > 0
+            return len(result["added"]) + len(result["existing"]) > 0
 
         except Exception as e:
             logger.fail(f"Error adding GitHub contributors as members: {e}")
             return False
 
-    def _add_user_as_project_member(self, project_id, user_id, username, access_level=30):
-        """Add a specific user as project member"""
-        try:
-            # Check if user is already a member
-            response = self.gitlab._request("GET", f"/projects/{project_id}/members/{user_id}")
-            if response and response.status_code == 200:
-                logger.info(f"{username} is already a project member")
-                return True
-
-            # Add user as project member
-            # Access levels: 10=Guest, 20=Reporter, 30=Developer, 40=Maintainer, 50=Owner
-            member_data = {
-                "user_id": user_id,
-                "access_level": access_level,  # 30 = Developer (can push, create branches, etc.)
-            }
-
-            response = self.gitlab._request("POST", f"/projects/{project_id}/members", member_data)
-            if response and response.status_code == 201:
-                return True
-            elif response and response.status_code == 409:
-                logger.info(f"{username} is already a project member (conflict resolved)")
-                return True
-            else:
-                if response:
-                    logger.warning(f"Failed to add {username}: HTTP {response.status_code}")
-                    try:
-                        error_data = response.json()
-                        logger.warning(f"   Error details: {error_data}")
-                    except Exception:
-                        pass
-                return False
-
-        except Exception as e:
-            logger.fail(f"Error adding {username} as member: {e}")
-            return False
-
     def _get_admin_user(self):
         """Get the admin (root) user"""
         try:
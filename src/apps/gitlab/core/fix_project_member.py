@@ -32,11 +32,13 @@ Access Levels:
 - 50 = Owner access
 """
 
+import asyncio
 import sys
 import time
 from pathlib import Path
 
 from apps.gitlab.core.gitlab_client import GitLabClient
+from apps.gitlab.core.provisioning import GitLabProvisioner
 from common.logger import logger
 
 
@@ -154,44 +156,10 @@ class ProjectMemberDistributor:
         logger.info("Fetching all GitLab users...")
 
         all_users = {}
-        page = 1
-        per_page = 100
-
-        while True:
-            endpoint = f"/users?page={page}&per_page={per_page}"
-            logger.info(f"Making request to: {endpoint}")
-
-            response = self.gitlab._request("GET", endpoint)
-
-            if not response:
-                logger.fail("No response from GitLab API")
-                break
-
-            logger.info(f"Response status code: {response.status_code}")
-
-            if response.status_code != 200:
-                logger.fail(f"API request failed with status {response.status_code}: {response.text}")
-                break
-
-            try:
-                users = response.json()
-                logger.info(f"Retrieved {len(users)} users on page {page}")
-            except Exception as e:
-                logger.fail(f"Failed to parse JSON response: {e}")
-                logger.fail(f"Response text: {response.text}")
-                break
-
-            if not users:
-                logger.info("No more users found, stopping pagination")
-                break
-
-            for user in users:
-                # Skip root/admin users and bots
-                if user.get("username") not in ["root", "ghost"] and not user.get("bot", False):
-                    all_users[user["id"]] = {"id": user["id"], "username": user["username"], "name": user["name"], "email": user.get("email", ""), "state": user.get("state", "active")}
-                    logger.info(f"Added user: {user['username']} (ID: {user['id']}, State: {user.get('state', 'active')})")
-
-            page += 1
+        for user in self.gitlab.get_paginated("/users"):
+            # Skip root/admin users and bots
+            if user.get("username") not in ["root", "ghost"] and not user.get("bot", False):
+                all_users[user["id"]] = {"id": user["id"], "username": user["username"], "name": user["name"], "email": user.get("email", ""), "state": user.get("state", "active")}
 
         logger.info(f"Found {len(all_users)} total users")
         return all_users
@@ -302,36 +270,19 @@ class ProjectMemberDistributor:
 
     def get_project_members(self, project_id: int) -> set[int]:
         """Get all members of a specific project"""
-        members = set()
-        page = 1
-        per_page = 100
+        return {member["id"] for member in self.gitlab.get_paginated(f"/projects/{project_id}/members")}
 
-        while True:
-            response = self.gitlab._request("GET", f"/projects/{project_id}/members?page={page}&per_page={per_page}")
-            if not response or response.status_code != 200:
-                break
-
-            project_members = response.json()
-            if not project_members:
-                break
-
-            for member in project_members:
-                members.add(member["id"])
-
-            page += 1
-
-        return members
+    async def _get_members_by_project(self, provisioner: GitLabProvisioner, projects: dict[int, dict]) -> dict[int, set[int]]:
+        """Member ids of every project, listed concurrently"""
+        member_ids = await asyncio.gather(*(provisioner.get_member_ids(project_id) for project_id in projects))
+        return dict(zip(projects, member_ids, strict=True))
 
     def get_users_already_in_projects(self, projects: dict[int, dict]) -> set[int]:
         """Get set of all user IDs that are already members of any project"""
         logger.info("Finding users who are already project members...")
 
-        users_in_projects = set()
-
-        for project_id, project_info in projects.items():
-            logger.info(f"Checking members of project: {project_info['name']}")
-            project_members = self.get_project_members(project_id)
-            users_in_projects.update(project_members)
+        members_by_project = asyncio.run(self._get_members_by_project(GitLabProvisioner(self.gitlab), projects))
+        users_in_projects = set().union(*members_by_project.values())
 
         logger.info(f"Found {len(users_in_projects)} users already in projects")
         return users_in_projects
@@ -374,8 +325,8 @@ class ProjectMemberDistributor:
 
         return distribution
 
-    def add_user_to_project(self, project_id: int, user_id: int, access_level: int = 30) -> bool:
-        """Add a user to a project as a member
+    def execute_distribution(self, distribution: dict[int, list[dict]], projects: dict[int, dict], access_level: int = 30):
+        """Execute the user distribution by adding users to projects
 
         Access levels:
         10 = Guest access
@@ -384,44 +335,26 @@ class ProjectMemberDistributor:
         40 = Maintainer access
         50 = Owner access
         """
-        member_data = {"user_id": user_id, "access_level": access_level}
+        logger.info("Starting user distribution to projects...")
 
-        response = self.gitlab._request("POST", f"/projects/{project_id}/members", member_data)
+        provisioner = GitLabProvisioner(self.gitlab)
 
-        if response and response.status_code == 201:
-            return True
-        elif response and response.status_code == 409:
-            logger.warning(f"User {user_id} is already a member of project {project_id}")
-            return True
-        else:
-            if response:
-                logger.fail(f"Failed to add user {user_id} to project {project_id}: {response.status_code} - {response.text}")
-            else:
-                logger.fail(f"Failed to add user {user_id} to project {project_id}: No response")
-            return False
+        async def add_project_members(project_id: int, users: list[dict]) -> dict:
+            logger.info(f"Adding {len(users)} users to project '{projects[project_id]['name']}'...")
+            # These users are in no project yet, so there is no member listing to diff against
+            return await provisioner.add_members(project_id, [user["id"] for user in users], access_level, existing_ids=set())
 
-    def execute_distribution(self, distribution: dict[int, list[dict]], projects: dict[int, dict], access_level: int = 30):
-        """Execute the user distribution by adding users to projects"""
-        logger.info("Starting user distribution to projects...")
+        async def add_all() -> list[dict]:
+            return await asyncio.gather(*(add_project_members(project_id, users) for project_id, users in distribution.items() if users))
+
+        results = asyncio.run(add_all())
 
         total_assignments = sum(len(users) for users in distribution.values())
-        successful_assignments = 0
-        failed_assignments = 0
-
-        for project_id, users in distribution.items():
-            project_name = projects[project_id]["name"]
-            logger.info(f"Adding {len(users)} users to project '{project_name}'...")
-
-            for user in users:
-                success = self.add_user_to_project(project_id, user["id"], access_level)
-                if success:
-                    successful_assignments += 1
-                    logger.info(f"✓ Added user '{user['username']}' to project '{project_name}'")
-                else:
-                    failed_assignments += 1
-                    logger.fail(f"✗ Failed to add user '{user['username']}' to project '{project_name}'")
+        successful_assignments = sum(len(result["added"]) + len(result["existing"]) for result in results)
+        failed_assignments = sum(len(result["failed"]) for result in results)
 
         logger.info(f"Distribution complete: {successful_assignments}/{total_assignments} successful, {failed_assignments} failed")
+        provisioner.summary.log("Member distribution")
 
     def run(self, access_level: int = 30, debug_mode: bool = False):
         """Main execution function"""
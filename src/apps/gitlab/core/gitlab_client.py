@@ -2,6 +2,7 @@
 GitLab API Client
 """
 
+import threading
 import time
 
 import requests
@@ -10,6 +11,11 @@ from apps.gitlab.config.settings import settings
 from common.logger import logger
 
 
+# Full user index per GitLab instance, shared by all clients of the process
+_users_cache: dict[str, dict[str, dict]] = {}
+_users_lock = threading.Lock()
+
+
 class GitLabClient:
     """GitLab API client"""
 
@@ -118,23 +124,45 @@ class GitLabClient:
 
         return stats
 
-    def get_users(self):
-        """Get GitLab users"""
-        gitlab_users = {}
-
-        response = self._request("GET", "/users?per_page=100")
-        if response and response.status_code == 200:
-            for user in response.json():
-                gitlab_users[user["username"]] = {
-                    "id": user.get("id"),
-                    "username": user.get("username"),
-                    "name": user.get("name"),
-                    "email": user.get("email", ""),
-                    "avatar_url": user.get("avatar_url"),
-                    "web_url": user.get("web_url"),
-                }
-
-        return gitlab_users
+    def get_paginated(self, endpoint, per_page=100):
+        """Get every item of a paginated list endpoint"""
+        items = []
+        separator = "&" if "?" in endpoint else "?"
+        page = 1
+
+        while page:
+            response = self._request("GET", f"{endpoint}{separator}per_page={per_page}&page={page}")
+            if not response or response.status_code != 200:
+                break
+
+            items.extend(response.json())
+            page = int(response.headers.get("X-Next-Page") or 0)
+
+        return items
+
+    def get_users(self, refresh=False):
+        """Get all GitLab users by username, fetched once and then served from the shared index"""
+        with _users_lock:
+            if refresh or self.base_url not in _users_cache:
+                _users_cache[self.base_url] = {user["username"]: self._user_summary(user) for user in self.get_paginated("/users")}
+            return dict(_users_cache[self.base_url])
+
+    def remember_user(self, user):
+        """Add a user created through the API to the shared index, so it does not need a refetch"""
+        with _users_lock:
+            if self.base_url in _users_cache:
+                _users_cache[self.base_url][user["username"]] = self._user_summary(user)
+
+    @staticmethod
+    def _user_summary(user):
+        return {
+            "id": user.get("id"),
+            "username": user.get("username"),
+            "name": user.get("name"),
+            "email": user.get("email", ""),
+            "avatar_url": user.get("avatar_url"),
+            "web_url": user.get("web_url"),
+        }
 
     def create_user(self, user_data):
         """Create GitLab user"""
@@ -0,0 +1,201 @@
+"""
+Parallel GitHub to GitLab import orchestration.
+
+Runs the ComprehensiveImporter phases for many repositories at once:
+
+1. Up to `max_parallel_imports` GitLab imports are started (user mapping + import request).
+   Starts are serialized, since repositories share contributors and user creation must not race.
+2. A single monitor loop polls every active import, backing off while nothing changes.
+3. As soon as an import finishes, its repository is synchronized with git in a bounded process
+   pool, then the per-project attribution, documentation and membership phases run.
+
+A seed of many repositories therefore takes about as long as its largest repository.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from apps.gitlab.config.settings import settings
+from common.logger import logger
+
+from .comprehensive_importer import ComprehensiveImporter, ImportProgressTracker
+from .repo_sync import clone_and_sync_repository
+
+
+IMPORT_POLL_MIN_INTERVAL = 5
+IMPORT_POLL_MAX_INTERVAL = 60
+IMPORT_POLL_MAX_FAILURES = 5
+
+
+class ImportOrchestrator:
+    """Imports several GitHub repositories into GitLab concurrently"""
+
+    def __init__(self, repos, advanced_attribution=True, max_parallel_imports=None, git_workers=None):
+        self.repos = repos
+        self.advanced_attribution = advanced_attribution
+        self.max_parallel_imports = max_parallel_imports or settings.MAX_PARALLEL_IMPORTS
+        self.git_workers = git_workers or settings.GIT_SYNC_WORKERS
+
+        self._import_slots = None
+        self._start_lock = None
+        self._git_pool = None
+        self._active = {}
+        self._monitor_task = None
+        self._monitor_wakeup = None
+
+    async def run(self):
+        """Import every repository. Returns the names of the successful and failed imports."""
+        logger.info(f"Importing {len(self.repos)} repositories ({self.max_parallel_imports} imports in parallel, {self.git_workers} git workers)")
+        start_time = time.time()
+
+        self._import_slots = asyncio.Semaphore(self.max_parallel_imports)
+        self._start_lock = asyncio.Lock()
+        self._monitor_wakeup = asyncio.Event()
+
+        # Spawned workers, since forking a process that runs threads can deadlock on inherited locks
+        with ProcessPoolExecutor(max_workers=self.git_workers, mp_context=multiprocessing.get_context("spawn")) as git_pool:
+            self._git_pool = git_pool
+            results = await asyncio.gather(*(self._import_repository(repo_name, repo_url) for repo_name, repo_url in self.repos.items()))
+
+        successful = [repo_name for repo_name, success in zip(self.repos, results, strict=True) if success]
+        failed = [repo_name for repo_name, success in zip(self.repos, results, strict=True) if not success]
+
+        elapsed = int(time.time() - start_time)
+        logger.info(f"Imported {len(successful)}/{len(self.repos)} repositories in {elapsed // 60}m {elapsed % 60}s")
+
+        return {"successful": successful, "failed": failed}
+
+    async def _import_repository(self, repo_name, github_url):
+        """All phases for one repository"""
+        importer = ComprehensiveImporter(advanced_attribution=self.advanced_attribution)
+
+        try:
+            owner, repo = importer._parse_github_url(github_url)
+
+            async with self._import_slots:
+                async with self._start_lock:
+                    logger.start(f"Starting import of {repo_name}...")
+                    if not await asyncio.to_thread(importer._validate_setup, owner, repo):
+                        logger.fail(f"{repo_name} import failed")
+                        return False
+
+                    project_id = await asyncio.to_thread(importer._start_metadata_import, repo_name, owner, repo)
+
+                if not project_id:
+                    logger.fail(f"{repo_name} import could not be started")
+                    return False
+
+                if not await self._wait_for_import(importer, project_id, repo_name):
+                    logger.fail(f"{repo_name} import failed")
+                    return False
+
+            # The import slot is free again; git sync and the fix phases overlap with other imports
+            sync_success = await self._synchronize_repository(importer, project_id, repo_name, owner, repo, github_url)
+            if not sync_success:
+                logger.warning(f"{repo_name}: repository synchronization had issues, but metadata import succeeded")
+
+            await asyncio.to_thread(importer._complete_import, project_id, repo_name, owner, repo)
+
+            logger.succeed(f"{repo_name} imported successfully")
+            return True
+
+        except Exception as e:
+            logger.fail(f"Error importing {repo_name}: {e}")
+            return False
+
+    async def _wait_for_import(self, importer, project_id, repo_name):
+        """Register an import with the monitor loop and wait for its outcome"""
+        future = asyncio.get_running_loop().create_future()
+        self._active[project_id] = (importer, ImportProgressTracker(repo_name), future)
+
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor_imports())
+        self._monitor_wakeup.set()
+
+        return await future
+
+    async def _monitor_imports(self):
+        """Poll all active imports together, backing off while none of them changes"""
+        interval = IMPORT_POLL_MIN_INTERVAL
+        poll_failures = {}
+
+        try:
+            while self._active:
+                self._monitor_wakeup.clear()
+                active = list(self._active.items())
+                progresses = await asyncio.gather(
+                    *(asyncio.to_thread(importer.gitlab.get_import_progress, project_id) for project_id, (importer, _, _) in active),
+                    return_exceptions=True,
+                )
+
+                changed = False
+                for (project_id, (importer, tracker, future)), progress in zip(active, progresses, strict=True):
+                    # A failed poll counts as no change, until it has failed too many times in a row
+                    if isinstance(progress, Exception):
+                        poll_failures[project_id] = poll_failures.get(project_id, 0) + 1
+                        logger.warning(f"{tracker.label}: import status poll failed ({poll_failures[project_id]}/{IMPORT_POLL_MAX_FAILURES}): {progress}")
+                        if poll_failures[project_id] >= IMPORT_POLL_MAX_FAILURES:
+                            del self._active[project_id]
+                            future.set_result(False)
+                        continue
+                    poll_failures.pop(project_id, None)
+
+                    outcome = tracker.update(progress)
+                    changed = changed or tracker.changed
+
+                    if outcome is None:
+                        continue
+
+                    del self._active[project_id]
+                    if outcome == "verify":
+                        try:
+                            verified = await asyncio.to_thread(importer._verify_stuck_import, project_id)
+                        except Exception as e:
+                            logger.warning(f"{tracker.label}: could not verify stuck import: {e}")
+                            verified = False
+                        future.set_result(verified)
+                    else:
+                        future.set_result(outcome == "finished")
+
+                interval = IMPORT_POLL_MIN_INTERVAL if changed else min(interval * 2, IMPORT_POLL_MAX_INTERVAL)
+
+                # Newly registered imports wake the loop up early, so they get a first status right away
+                if self._active:
+                    try:
+                        await asyncio.wait_for(self._monitor_wakeup.wait(), timeout=interval)
+                        interval = IMPORT_POLL_MIN_INTERVAL
+                    except TimeoutError:
+                        pass
+        finally:
+            # Never leave an import waiting on a monitor that is gone
+            for _, _, future in self._active.values():
+                if not future.done():
+                    future.set_result(False)
+            self._active.clear()
+
+    async def _synchronize_repository(self, importer, project_id, repo_name, owner, repo, github_url):
+        """Phase 2 with the git work in the process pool"""
+        project_info = await asyncio.to_thread(importer._get_gitlab_project_info, project_id)
+        if not project_info:
+            return False
+
+        gitlab_remote_url = importer._authenticated_remote_url(project_info["http_url_to_repo"])
+
+        # Remove branch protections temporarily
+        protected_branches = await asyncio.to_thread(importer._remove_branch_protections, project_id)
+
+        try:
+            logger.info(f"{repo_name}: synchronizing repository...")
+            loop = asyncio.get_running_loop()
+            sync_success = await loop.run_in_executor(self._git_pool, clone_and_sync_repository, github_url, gitlab_remote_url, repo)
+        finally:
+            # Restore branch protections
+            if protected_branches:
+                await asyncio.to_thread(importer._restore_branch_protections, project_id, protected_branches)
+
+        if sync_success:
+            await asyncio.to_thread(importer._verify_repository_sync, project_id, owner, repo)
+
+        return sync_success
@@ -0,0 +1,202 @@
+"""
+Bulk user and membership provisioning for GitLab.
+
+Desired users and project members are diffed once against what GitLab already has - the shared
+user index of GitLabClient and one paginated member listing per project - so the number of API
+calls grows with the number of changes, not with the number of contributors:
+
+- missing users are created concurrently, with usernames picked from the cached index instead
+  of one availability lookup per candidate name;
+- missing members are added with the multi-user form of the members API (`user_id` as a comma
+  separated list), one call per MEMBERS_BATCH_SIZE users.
+
+The GitLab client is blocking, so calls run in threads, at most `concurrency` at a time.
+"""
+
+import asyncio
+import secrets
+import string
+
+from common.logger import logger
+
+
+PROVISIONING_CONCURRENCY = 8
+MEMBERS_BATCH_SIZE = 50
+DEVELOPER_ACCESS = 30
+MAX_USERNAME_ATTEMPTS = 3
+
+
+def generate_password(length=12):
+    """Generate secure password"""
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    return "".join(secrets.choice(alphabet) for _ in range(length))
+
+
+class ProvisioningSummary:
+    """Counts of one provisioning run, logged as a single summary"""
+
+    def __init__(self):
+        self.users_created = 0
+        self.users_failed = 0
+        self.members_added = 0
+        self.members_existing = 0
+        self.members_failed = 0
+        self.api_calls = 0
+
+    def log(self, label):
+        logger.info(
+            f"{label}: {self.users_created} users created, {self.users_failed} failed | "
+            f"{self.members_added} members added, {self.members_existing} already members, {self.members_failed} failed | "
+            f"{self.api_calls} API calls"
+        )
+
+
+class GitLabProvisioner:
+    """
+    Creates GitLab users and project memberships in bulk.
+
+    Create one provisioner per event loop: its concurrency limit belongs to the loop it first runs in.
+    """
+
+    def __init__(self, gitlab, concurrency=PROVISIONING_CONCURRENCY):
+        self.gitlab = gitlab
+        self.summary = ProvisioningSummary()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _call(self, func, *args):
+        async with self._semaphore:
+            self.summary.api_calls += 1
+            return await asyncio.to_thread(func, *args)
+
+    async def create_users(self, github_users):
+        """
+        Create a GitLab user for each GitHub user.
+
+        Returns the same shape as before: created_users, failed_users and user_credentials.
+        """
+        taken = {username.lower() for username in await self._call(self.gitlab.get_users)}
+
+        def reserve_username(base):
+            username, attempt = base, 0
+            while username.lower() in taken:
+                attempt += 1
+                username = f"{base}_{attempt}"
+            taken.add(username.lower())
+            return username
+
+        async def create(gh_username, gh_user):
+            gh_name = gh_user.get("name", "") or gh_user["login"]
+            # Handle missing email
+            gh_email = gh_user.get("email", "") or f"{gh_user['login']}@github-import.placeholder"
+            password = generate_password()
+
+            for _ in range(MAX_USERNAME_ATTEMPTS):
+                user_data = {
+                    "username": reserve_username(gh_user["login"]),
+                    "name": gh_name,
+                    "email": gh_email,
+                    "password": password,
+                    "skip_confirmation": True,
+                    "reset_password": True,
+                    "can_create_group": True,
+                    "projects_limit": 10,
+                }
+                result = await self._call(self.gitlab.create_user, user_data)
+
+                # A username the index did not know about (e.g. a blocked user): try the next suffix
+                if result["success"] or "Username has already been taken" not in result["error"]:
+                    break
+
+            if result["success"]:
+                result["password"] = password
+                self.gitlab.remember_user(result["user"])
+            return gh_username, result
+
+        results = await asyncio.gather(*(create(gh_username, gh_user) for gh_username, gh_user in github_users.items()))
+
+        created_users = []
+        failed_users = []
+        user_credentials = []
+        for gh_username, result in results:
+            if result["success"]:
+                created_users.append(result)
+                user_credentials.append(
+                    {
+                        "github_username": gh_username,
+                        "gitlab_username": result["user"]["username"],
+                        "email": result["user"]["email"],
+                        "password": result.get("password", ""),
+                        "name": result["user"]["name"],
+                    }
+                )
+            else:
+                failed_users.append({"github_username": gh_username, "error": result["error"]})
+
+        self.summary.users_created += len(created_users)
+        self.summary.users_failed += len(failed_users)
+
+        return {"created_users": created_users, "failed_users": failed_users, "user_credentials": user_credentials}
+
+    async def get_member_ids(self, project_id):
+        """Direct members of a project, fetched with one paginated listing"""
+        members = await self._call(self.gitlab.get_paginated, f"/projects/{project_id}/members")
+        return {member["id"] for member in members}
+
+    async def add_members(self, project_id, user_ids, access_level=DEVELOPER_ACCESS, existing_ids=None):
+        """
+        Make `user_ids` members of a project, skipping those who already are.
+
+        Returns the ids that were added, already members, and failed.
+        """
+        if existing_ids is None:
+            existing_ids = await self.get_member_ids(project_id)
+
+        user_ids = list(dict.fromkeys(user_ids))
+        missing = [user_id for user_id in user_ids if user_id not in existing_ids]
+        result = {"added": [], "existing": [user_id for user_id in user_ids if user_id in existing_ids], "failed": []}
+
+        chunks = [missing[i : i + MEMBERS_BATCH_SIZE] for i in range(0, len(missing), MEMBERS_BATCH_SIZE)]
+        for chunk_result in await asyncio.gather(*(self._add_member_chunk(project_id, chunk, access_level) for chunk in chunks)):
+            for key, ids in chunk_result.items():
+                result[key].extend(ids)
+
+        self.summary.members_added += len(result["added"])
+        self.summary.members_existing += len(result["existing"])
+        self.summary.members_failed += len(result["failed"])
+
+        return result
+
+    async def _add_member_chunk(self, project_id, user_ids, access_level):
+        """Add a chunk of users in one call, bisecting when GitLab rejects the whole request"""
+        member_data = {"user_id": ",".join(str(user_id) for user_id in user_ids), "access_level": access_level}
+        response = await self._call(self.gitlab._request, "POST", f"/projects/{project_id}/members", member_data)
+
+        if response is not None and response.status_code == 409:
+            return {"added": [], "existing": user_ids, "failed": []}
+
+        if response is not None and response.status_code == 201:
+            body = response.json()
+            if not isinstance(body, dict) or body.get("status") != "error":
+                return {"added": user_ids, "existing": [], "failed": []}
+
+            # Partial success: `message` maps the username of each rejected user to its error
+            users_by_name = self.gitlab.get_users()
+            result = {"added": list(user_ids), "existing": [], "failed": []}
+            for username, error in (body.get("message") or {}).items():
+                user_id = (users_by_name.get(username) or {}).get("id")
+                if user_id in result["added"]:
+                    result["added"].remove(user_id)
+                    result["existing" if "already" in str(error).lower() else "failed"].append(user_id)
+            return result
+
+        if len(user_ids) == 1:
+            error = f"HTTP {response.status_code} - {response.text[:200]}" if response is not None else "No response"
+            logger.warning(f"Failed to add user {user_ids[0]} to project {project_id}: {error}")
+            return {"added": [], "existing": [], "failed": user_ids}
+
+        middle = len(user_ids) // 2
+        first, second = await asyncio.gather(
+            self._add_member_chunk(project_id, user_ids[:middle], access_level),
+            self._add_member_chunk(project_id, user_ids[middle:], access_level),
+        )
+        return {key: first[key] + second[key] for key in first}
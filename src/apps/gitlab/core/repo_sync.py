@@ -0,0 +1,234 @@
+"""
+Git-level repository synchronization from GitHub to GitLab.
+
+These functions only shell out to git and never touch the importer's state, so the import
+orchestrator can run them in a process pool while API work for other projects continues.
+Every git command runs with an explicit `cwd` instead of changing the process working directory.
+
+GitHub repositories are kept as bare mirrors in a persistent cache keyed by URL. A re-seed only
+fetches the objects GitHub gained since the last run, and `git push --mirror` only sends GitLab
+the objects it does not have yet.
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from apps.gitlab.config.settings import settings
+from common.logger import logger
+
+
+# Branches and tags only: GitHub's refs/pull/* would be rejected by GitLab as hidden refs
+MIRROR_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+
+# Push errors that mean the pack was too large for one request, rather than a rejected ref
+PACK_SIZE_ERRORS = re.compile(r"RPC failed|HTTP 413|pack exceeds|unexpected disconnect|remote end hung up|body too large|early EOF", re.IGNORECASE)
+
+# Commits per step when a single branch is too large to push in one go
+PROGRESSIVE_PUSH_STEP = 2000
+
+POST_BUFFER_BYTES = 512 * 1024 * 1024
+
+
+def _git(*args, cwd=None):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True)
+
+
+class MirrorCache:
+    """
+    Persistent bare mirrors of GitHub repositories, with an LRU size limit.
+
+    Each mirror lives in `<root>/<repo>-<url hash>.git`. A sibling `.lock` file serializes
+    work on one mirror across the processes of the git pool, and its mtime records the last use.
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = Path(root or settings.GIT_MIRROR_CACHE_PATH).expanduser()
+        self.max_bytes = max_bytes if max_bytes is not None else settings.GIT_MIRROR_CACHE_MAX_BYTES
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, github_url):
+        name = github_url.rstrip("/").removesuffix(".git").rsplit("/", 1)[-1]
+        digest = hashlib.sha1(github_url.encode()).hexdigest()[:12]
+        return self.root / f"{name}-{digest}.git"
+
+    @contextmanager
+    def locked(self, github_url):
+        """Hold the mirror of `github_url` exclusively and mark it as recently used."""
+        lock_path = self.path_for(github_url).with_suffix(".lock")
+        with lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                os.utime(lock_path)
+                yield self.path_for(github_url)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, mirror_dir, github_url):
+        """Create the mirror on first use, then fetch only what changed on GitHub."""
+        if not (mirror_dir / "HEAD").exists():
+            logger.info(f"Creating mirror of {github_url}...")
+            shutil.rmtree(mirror_dir, ignore_errors=True)
+            result = _git("init", "--bare", str(mirror_dir))
+            if result.returncode != 0:
+                return result
+
+            _git("remote", "add", "origin", github_url, cwd=mirror_dir)
+            _git("config", "--unset-all", "remote.origin.fetch", cwd=mirror_dir)
+            for refspec in MIRROR_REFSPECS:
+                _git("config", "--add", "remote.origin.fetch", refspec, cwd=mirror_dir)
+        else:
+            logger.info(f"Updating cached mirror of {github_url}...")
+
+        result = _git("remote", "update", "--prune", cwd=mirror_dir)
+        if result.returncode != 0:
+            # A half-written mirror must not be reused by the next run
+            shutil.rmtree(mirror_dir, ignore_errors=True)
+        return result
+
+    def sweep(self, keep=None):
+        """Delete the least recently used mirrors until the cache fits in `max_bytes`."""
+        mirrors = []
+        for mirror_dir in self.root.glob("*.git"):
+            lock_path = mirror_dir.with_suffix(".lock")
+            try:
+                last_used = lock_path.stat().st_mtime if lock_path.exists() else 0
+            except FileNotFoundError:
+                last_used = 0
+            mirrors.append((last_used, _tree_size(mirror_dir), mirror_dir))
+
+        total = sum(size for _, size, _ in mirrors)
+        for _, size, mirror_dir in sorted(mirrors):
+            if total <= self.max_bytes:
+                break
+            if mirror_dir == keep:
+                continue
+
+            # Skip mirrors another worker is using right now
+            with mirror_dir.with_suffix(".lock").open("a") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue
+                shutil.rmtree(mirror_dir, ignore_errors=True)
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+            mirror_dir.with_suffix(".lock").unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Evicted cached mirror {mirror_dir.name} ({size // (1024 * 1024)} MB)")
+
+
+def clone_and_sync_repository(github_url, gitlab_remote_url, repo):
+    """Update the cached mirror of a GitHub repository and mirror it to GitLab"""
+    try:
+        cache = MirrorCache()
+
+        with cache.locked(github_url) as mirror_dir:
+            result = cache.update(mirror_dir, github_url)
+            if result.returncode != 0:
+                logger.fail(f"Failed to fetch repository: {result.stderr}")
+                return False
+
+            logger.info(f"Pushing complete repository {repo} to GitLab...")
+            start_time = time.time()
+            success = push_mirror(mirror_dir, gitlab_remote_url)
+            if success:
+                logger.info(f"All branches and tags of {repo} pushed in {time.time() - start_time:.1f}s")
+
+    except Exception as e:
+        logger.fail(f"Repository cloning and sync error: {e}")
+        return False
+
+    # Eviction is housekeeping; it must not turn a sync that already succeeded into a failure
+    try:
+        cache.sweep(keep=mirror_dir)
+    except Exception as e:
+        logger.warning(f"Mirror cache sweep failed: {e}")
+    return success
+
+
+def _tree_size(directory):
+    """Total size of the files under `directory`, ignoring files that vanish while it is walked."""
+    size = 0
+    # os.walk skips directories that disappear; other workers fetch into mirrors while they are measured
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            try:
+                size += (Path(dirpath) / filename).stat().st_size
+            except FileNotFoundError:
+                continue
+    return size
+
+
+def _push(mirror_dir, gitlab_remote_url, *refspecs):
+    args = ["-c", f"http.postBuffer={POST_BUFFER_BYTES}", "push", "--force"]
+    args += [gitlab_remote_url, *refspecs] if refspecs else ["--mirror", gitlab_remote_url]
+    return _git(*args, cwd=mirror_dir)
+
+
+def push_mirror(mirror_dir, gitlab_remote_url):
+    """
+    Push every branch and tag with one `git push --mirror`.
+
+    When GitLab drops the push because the pack is too large, the refs are pushed in smaller
+    groups, halving on each failure; a single branch that is still too large is pushed in steps
+    of PROGRESSIVE_PUSH_STEP commits. Rejections for other reasons are reported as they are.
+    """
+    result = _push(mirror_dir, gitlab_remote_url)
+    if result.returncode == 0:
+        return True
+
+    if not PACK_SIZE_ERRORS.search(result.stderr):
+        logger.warning(f"Mirror push failed: {result.stderr}")
+        return False
+
+    logger.warning("Mirror push too large for one request, pushing refs in smaller groups...")
+    refs = _git("for-each-ref", "--format=%(refname)", "refs/heads", "refs/tags", cwd=mirror_dir).stdout.split()
+    failed = _push_refs(mirror_dir, gitlab_remote_url, refs)
+
+    if failed:
+        logger.warning(f"Failed to push {len(failed)}/{len(refs)} refs: {', '.join(failed[:10])}")
+    return not failed
+
+
+def _push_refs(mirror_dir, gitlab_remote_url, refs):
+    """Push `refs`, splitting the group when the pack is too large. Returns the refs that failed."""
+    if not refs:
+        return []
+
+    result = _push(mirror_dir, gitlab_remote_url, *(f"{ref}:{ref}" for ref in refs))
+    if result.returncode == 0:
+        return []
+
+    if not PACK_SIZE_ERRORS.search(result.stderr):
+        logger.warning(f"Push of {len(refs)} refs failed: {result.stderr[:200]}")
+        return refs
+
+    if len(refs) == 1:
+        return [] if _push_progressively(mirror_dir, gitlab_remote_url, refs[0]) else refs
+
+    middle = len(refs) // 2
+    return _push_refs(mirror_dir, gitlab_remote_url, refs[:middle]) + _push_refs(mirror_dir, gitlab_remote_url, refs[middle:])
+
+
+def _push_progressively(mirror_dir, gitlab_remote_url, ref):
+    """Push one large branch in steps along its first-parent history, so each pack stays small."""
+    if not ref.startswith("refs/heads/"):
+        return False
+
+    commits = _git("rev-list", "--first-parent", "--reverse", ref, cwd=mirror_dir).stdout.split()
+    logger.info(f"Pushing {ref} in steps of {PROGRESSIVE_PUSH_STEP} commits ({len(commits)} commits)")
+
+    for commit in [*commits[PROGRESSIVE_PUSH_STEP - 1 :: PROGRESSIVE_PUSH_STEP], ref]:
+        result = _push(mirror_dir, gitlab_remote_url, f"{commit}:{ref}")
+        if result.returncode != 0:
+            logger.warning(f"Progressive push of {ref} failed: {result.stderr[:200]}")
+            return False
+
+    return True
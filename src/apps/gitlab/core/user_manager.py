@@ -2,12 +2,12 @@
 User Management for GitHub to GitLab mapping
 """
 
-import secrets
-import string
-import time
+import asyncio
 
 from common.logger import logger
 
+from .provisioning import GitLabProvisioner
+
 
 class UserManager:
     """Handles user analysis and creation"""
@@ -53,80 +53,11 @@ class UserManager:
         return mapping_analysis
 
     def auto_create_users(self, unmappable_users):
-        """Auto-create GitLab users for unmappable GitHub users"""
-        created_users = []
-        failed_users = []
-        user_credentials = []
-
-        for gh_username, gh_user_data in unmappable_users.items():
-            result = self._create_gitlab_user(gh_user_data)
-
-            if result["success"]:
-                created_users.append(result)
-                user_credentials.append(
-                    {
-                        "github_username": gh_username,
-                        "gitlab_username": result["user"]["username"],
-                        "email": result["user"]["email"],
-                        "password": result.get("password", ""),
-                        "name": result["user"]["name"],
-                    }
-                )
-            else:
-                failed_users.append({"github_username": gh_username, "error": result["error"]})
-
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-
-        logger.info(f"User creation: {len(created_users)} created, {len(failed_users)} failed")
-
-        return {"created_users": created_users, "failed_users": failed_users, "user_credentials": user_credentials}
-
-    def _create_gitlab_user(self, github_user_data):
-        """Create a GitLab user from GitHub user data"""
-        gh_username = github_user_data["login"]
-        gh_email = github_user_data.get("email", "")
-        gh_name = github_user_data.get("name", "") or gh_username
-
-        # Handle missing email
-        if not gh_email:
-            gh_email = f"{gh_username}@github-import.placeholder"
-
-        # Check if username is available
-        original_username = gh_username
-        attempt = 0
-        while True:
-            response = self.gitlab._request("GET", f"/users?username={gh_username}")
-            if response and response.status_code == 200:
-                users = response.json()
-                if not users:  # Username available
-                    break
-                else:
-                    attempt += 1
-                    gh_username = f"{original_username}_{attempt}"
-            else:
-                break
-
-        # Create user data
-        password = self._generate_password()
-        user_data = {
-            "username": gh_username,
-            "name": gh_name,
-            "email": gh_email,
-            "password": password,
-            "skip_confirmation": True,
-            "reset_password": True,
-            "can_create_group": True,
-            "projects_limit": 10,
-        }
-
-        result = self.gitlab.create_user(user_data)
-        if result["success"]:
-            result["password"] = password
+        """Auto-create GitLab users for unmappable GitHub users, concurrently"""
+        provisioner = GitLabProvisioner(self.gitlab)
+        result = asyncio.run(provisioner.create_users(unmappable_users))
 
-        return result
+        logger.info(f"User creation: {len(result['created_users'])} created, {len(result['failed_users'])} failed")
+        provisioner.summary.log("User provisioning")
 
-    def _generate_password(self, length=12):
-        """Generate secure password"""
-        alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-        return "".join(secrets.choice(alphabet) for _ in range(length))
+        return result
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import subprocess
 import time
@@ -7,9 +8,9 @@ import click
 import requests
 
 from apps.gitlab.config.settings import get_db_config, load_config, settings
-from apps.gitlab.core.comprehensive_importer import ComprehensiveImporter
 from apps.gitlab.core.fix_create_user_name import DirectDBImportUserFixer
 from apps.gitlab.core.fix_project_member import ProjectMemberDistributor
+from apps.gitlab.core.import_orchestrator import ImportOrchestrator
 from common.logger import logger
 
 
@@ -60,12 +61,13 @@ def down(volumes: bool, force: bool):
 @gitlab_cli.command()
 @click.option("--repo", type=str, help="Import specific repository")
 @click.option("--advanced-attribution", is_flag=True, default=True, help="Use advanced attribution")
-def seed(repo: str, advanced_attribution: bool):
+@click.option("--parallel", type=int, default=settings.MAX_PARALLEL_IMPORTS, show_default=True, help="Number of GitLab imports to run at the same time")
+def seed(repo: str, advanced_attribution: bool, parallel: int):
     """
     Import GitHub repositories to GitLab with automatic post-import fixes.
 
     This command performs a complete seeding workflow:
-    1. Import repositories from GitHub to GitLab
+    1. Import repositories from GitHub to GitLab, several at a time
     2. Automatically run post-import fixes to ensure data integrity
 
     The post-import fixes are essential because:
@@ -91,23 +93,10 @@ def seed(repo: str, advanced_attribution: bool):
     logger.info("🚀 Starting GitLab seeding process...")
     logger.info("Phase 1: Importing repositories from GitHub")
 
-    successful_imports = []
-    failed_imports = []
-
-    for repo_name, repo_url in repos_to_import.items():
-        logger.start(f"Importing {repo_name}...")
-        try:
-            importer = ComprehensiveImporter(advanced_attribution=advanced_attribution)
-            result = importer.import_repository_comprehensive(repo_name, repo_url)
-            if result:
-                logger.succeed(f"{repo_name} imported successfully")
-                successful_imports.append(repo_name)
-            else:
-                logger.fail(f"{repo_name} import failed")
-                failed_imports.append(repo_name)
-        except Exception as e:
-            logger.fail(f"Error importing {repo_name}: {e}")
-            failed_imports.append(repo_name)
+    orchestrator = ImportOrchestrator(repos_to_import, advanced_attribution=advanced_attribution, max_parallel_imports=parallel)
+    results = asyncio.run(orchestrator.run())
+    successful_imports = results["successful"]
+    failed_imports = results["failed"]
 
     # Phase 2: Automatic post-import fixes
     if successful_imports:
@@ -12,6 +12,7 @@ from apps.gumroad.core.settings import get_all_taxonomies, get_profile_settings
 from apps.gumroad.utils import PexelsAPI, faker, formatter
 from apps.gumroad.utils.gumroad import GumroadAPI
 from common.logger import logger
+from common.prompts import PromptBuilder, TitleRegistry, compact_json, top_matches
 
 
 openai_client = AsyncOpenAI()
@@ -20,6 +21,9 @@ openai_client = AsyncOpenAI()
 PRODUCTS_CACHE_FILE = settings.DATA_PATH / "generated" / "products.json"
 PEXELS_CACHE_FILE = settings.DATA_PATH / "pexels.json"
 
+# Taxonomies sent with each product, picked by keyword match with its title
+TAXONOMY_MATCHES = 15
+
 
 class ProductCustomAttribute(BaseModel):
     name: str
@@ -84,11 +88,47 @@ class ProductTitleList(BaseModel):
     titles: list[str]
 
 
-async def _generate_single_product(title: str):
-    """Internal function to generate a single product using OpenAI"""
-    taxonomies = await get_all_taxonomies()
+def _taxonomy_paths(taxonomies: list[dict]) -> list[dict]:
+    """Each taxonomy with its full slug path, e.g. {"id": 2, "path": "3d > 3d-modeling"}"""
+    taxonomies_by_id = {taxonomy["id"]: taxonomy for taxonomy in taxonomies}
+
+    def path(taxonomy: dict) -> str:
+        parent = taxonomies_by_id.get(taxonomy.get("parent_id"))
+        return f"{path(parent)} > {taxonomy['slug']}" if parent else taxonomy["slug"]
+
+    return [{"id": taxonomy["id"], "path": path(taxonomy)} for taxonomy in taxonomies]
+
+
+async def _product_prompt() -> tuple[PromptBuilder, list[dict]]:
+    """Prompt for product generation, with the seller profile and top-level taxonomies in its static prefix"""
+    taxonomies = _taxonomy_paths((await get_all_taxonomies()).get("taxonomies", []))
     profile = await get_profile_settings()
 
+    prompt = PromptBuilder(
+        "Gumroad products",
+        system="""
+        You are an expert Gumroad product creator.
+
+        Requirements:
+        • Description: 200-300 words, well-formatted HTML with proper tags
+        • Include what buyers get, who it's for, key benefits
+        • Content: Post-purchase instructions with license activation steps
+        • Pricing: Set competitive price based on value and target market
+        • Taxonomy: use the id of the most specific matching taxonomy, or of a top-level one if none matches
+        • Make each field unique and specific to this product
+
+        Vary your approach - be creative with structure and don't follow a rigid template!
+        """,
+        context={
+            "Seller Profile": profile,
+            "Top-level taxonomies": [taxonomy for taxonomy in taxonomies if " > " not in taxonomy["path"]],
+        },
+    )
+    return prompt, taxonomies
+
+
+async def _generate_single_product(title: str, prompt: PromptBuilder, taxonomies: list[dict]):
+    """Internal function to generate a single product using OpenAI"""
     # Add variety to prevent identical descriptions
     styles = [
         "conversational and friendly",
@@ -109,32 +149,17 @@ async def _generate_single_product(title: str):
     chosen_style = random.choice(styles)
     chosen_format = random.choice(formats)
 
-    response = await openai_client.beta.chat.completions.parse(
+    # Only the taxonomies that share keywords with the title, instead of all of them
+    matching_taxonomies = top_matches(taxonomies, title, text=lambda taxonomy: taxonomy["path"], k=TAXONOMY_MATCHES)
+
+    response = await prompt.parse(
+        openai_client,
         model="gpt-4.1-mini-2025-04-14",
-        messages=[
-            {
-                "role": "system",
-                "content": f"You are an expert Gumroad product creator. Write in a {chosen_style} tone using {chosen_format} for the description.",
-            },
-            {
-                "role": "user",
-                "content": f"""
-                Create a compelling product for: "{title}"
-                
-                Seller Profile: {profile}
-                Taxonomies: {taxonomies}
-                
-                Requirements:
-                • Description: 200-300 words, well-formatted HTML with proper tags
-                • Include what buyers get, who it's for, key benefits
-                • Content: Post-purchase instructions with license activation steps
-                • Pricing: Set competitive price based on value and target market
-                • Make each field unique and specific to this product
-                
-                Vary your approach - be creative with structure and don't follow a rigid template!
-                """,
-            },
-        ],
+        user=f"""
+        Create a compelling product for: "{title}"
+        Write in a {chosen_style} tone using {chosen_format} for the description.
+        Taxonomies matching this title: {compact_json(matching_taxonomies)}
+        """,
         response_format=Product,
     )
     return response.choices[0].message.parsed
@@ -143,36 +168,33 @@ async def _generate_single_product(title: str):
 async def _generate_product_titles(number_of_titles: int):
     """Internal function to generate product titles using OpenAI"""
     profile = await get_profile_settings()
-    generated_titles = []
+    prompt = PromptBuilder(
+        "Gumroad product titles",
+        system="""
+        You are a helper that creates data for Gumroad.
+        Generate creative and engaging product titles for the Gumroad seller with the profile below.
+        The titles should be:
+        - Catchy and memorable
+        - Clear about the product's value
+        - Optimized for search
+        - Between 5-20 words
+        - Professional and trustworthy
+        - Unique and different from each other
+        """,
+        context={"Seller Profile": profile},
+    )
+    generated_titles = TitleRegistry()
+    titles = []
 
     # Keep generating until we have enough unique titles
-    while len(generated_titles) < number_of_titles:
-        remaining = number_of_titles - len(generated_titles)
+    while len(titles) < number_of_titles:
+        remaining = number_of_titles - len(titles)
         batch_size = min(remaining + 5, 20)  # Generate a few extra to account for duplicates
 
-        response = await openai_client.beta.chat.completions.parse(
+        response = await prompt.parse(
+            openai_client,
             model="gpt-4.1-mini-2025-04-14",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helper that creates data for Gumroad.",
-                },
-                {
-                    "role": "user",
-                    "content": f"""
-                    Generate {batch_size} creative and engaging product titles for a Gumroad seller with this profile: {profile}
-                    The titles should be:
-                    - Catchy and memorable
-                    - Clear about the product's value
-                    - Optimized for search
-                    - Between 5-20 words
-                    - Professional and trustworthy
-                    - Unique and different from each other
-                    
-                    Avoid duplicating these already generated titles: {generated_titles}
-                    """,
-                },
-            ],
+            user=f"Generate {batch_size} product titles.\n{generated_titles.summary()}",
             response_format=ProductTitleList,
         )
 
@@ -181,17 +203,17 @@ async def _generate_product_titles(number_of_titles: int):
             logger.error("OpenAI API returned None for parsed response")
             continue
 
-        new_titles = parsed_response.titles
-
         # Add unique titles only
-        for title in new_titles:
-            if title not in generated_titles and len(generated_titles) < number_of_titles:
-                generated_titles.append(title)
+        for title in parsed_response.titles:
+            if len(titles) < number_of_titles and generated_titles.add(title):
+                titles.append(title)
+
+        logger.info(f"Generated {len(titles)}/{number_of_titles} titles so far")
 
-        logger.info(f"Generated {len(generated_titles)}/{number_of_titles} titles so far")
+    prompt.log_summary()
 
     # Return a ProductTitleList object with the exact number requested
-    return ProductTitleList(titles=generated_titles[:number_of_titles])
+    return ProductTitleList(titles=titles)
 
 
 def _load_cached_pexels(query: str = "panoramic", orientation: str = "landscape") -> list[dict] | None:
@@ -298,10 +320,12 @@ async def generate_products(number_of_products: int):
 
     # Generate product data for each title concurrently
     logger.info(f"Starting concurrent generation of {len(product_titles)} products...")
-    product_tasks = [_generate_single_product(title) for title in product_titles]
+    prompt, taxonomies = await _product_prompt()
+    product_tasks = [_generate_single_product(title, prompt, taxonomies) for title in product_titles]
 
     # Execute all product generation tasks concurrently
     products = await asyncio.gather(*product_tasks, return_exceptions=True)
+    prompt.log_summary()
 
     # Process results and handle any exceptions
     products_data = []
@@ -16,6 +16,7 @@ from apps.gumroad.core.sales import generate_sales, seed_sales
 from apps.gumroad.core.settings import setup_profile
 from apps.gumroad.core.workflows import generate_workflows, seed_workflows
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -63,6 +64,19 @@ def down(volumes: bool, force: bool):
         subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    gumroad_cli,
+    SnapshotSpec(
+        app="gumroad",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        engine="mariadb",
+        data_dir=settings.DATA_PATH,
+        env=lambda: {**os.environ, **settings.model_dump_str()},
+    ),
+)
+
+
 @gumroad_cli.command()
 def seed():
     async def async_seed_gumroad():
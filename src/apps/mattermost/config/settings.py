@@ -61,6 +61,12 @@ class AppConfig(BaseSettings):
 
     MAX_CONCURRENT_GENERATION_REQUESTS: int = 32
 
+    # Post insertion: channels/DMs inserted at once, global API rate limit (0 disables)
+    # and concurrency of the attachment/pin/reaction side queue
+    INSERT_MAX_CONCURRENT_LANES: int = 64
+    INSERT_REQUESTS_PER_SECOND: float = 50
+    INSERT_SIDE_QUEUE_CONCURRENCY: int = 16
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
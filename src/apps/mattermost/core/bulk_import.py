@@ -0,0 +1,286 @@
+"""
+Mattermost bulk import support.
+
+Instead of creating every team, user, post and reaction through the REST API, the generated data can be
+exported to Mattermost's bulk import format (a zip with one JSONL file plus attachment files) and loaded
+by a single server-side `import_process` job.
+"""
+
+import asyncio
+import json
+import random
+import time
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+from typing import IO, Any
+
+from apps.mattermost.config.settings import settings
+from apps.mattermost.core.messages.post_features import plan_message_reactions
+from apps.mattermost.utils.constants import CHANNEL_MESSAGES_DIR, TEAMS_JSON, USERS_JSON
+from apps.mattermost.utils.mattermost import MattermostClient
+from common.load_json import load_json
+from common.logger import logger
+
+
+BULK_IMPORT_PATH = settings.DATA_PATH.joinpath("bulk-import.zip")
+DM_JSON = settings.DATA_PATH.joinpath("direct_messages.json")
+
+# Reactions are stamped a little after the post they belong to (1 minute - 6 hours)
+REACTION_DELAY_RANGE = (60_000, 6 * 60 * 60_000)
+# "warning" is terminal too: the job finished, but skipped some lines
+JOB_FINISHED_STATUSES = {"success", "warning", "error", "canceled"}
+
+
+def _write_line(jsonl: IO[bytes], line_type: str, data: Any) -> None:
+    jsonl.write(json.dumps({"type": line_type, line_type: data}, ensure_ascii=False).encode() + b"\n")
+
+
+def _build_channel_members(users: list[dict]) -> dict[tuple[str, str], list[str]]:
+    """Map (team, channel) to the usernames that belong to it, following the same rules as insert_users_to_channels."""
+    members = defaultdict(list)
+    for user in users:
+        for team_name, channels in (user.get("team_channels") or {}).items():
+            for channel_name in channels:
+                members[(team_name, channel_name)].append(user["username"])
+    return members
+
+
+def _build_user_line(user: dict, teams: list[dict]) -> dict[str, Any]:
+    """Build a `user` import line with team and channel memberships inline."""
+    is_owner = user["username"] == settings.MATTERMOST_OWNER_USERNAME
+    user_team_channels = user.get("team_channels") or {}
+
+    team_memberships = []
+    for team in teams:
+        # The owner is added to every team and made admin of every channel
+        if is_owner:
+            channel_roles = dict.fromkeys((channel["name"] for channel in team.get("channels", [])), "admin")
+        elif team["name"] in user_team_channels:
+            channel_roles = {name: info.get("role", "member") if isinstance(info, dict) else info for name, info in user_team_channels[team["name"]].items()}
+        else:
+            continue
+
+        team_memberships.append(
+            {
+                "name": team["name"],
+                "roles": "team_user team_admin" if is_owner else "team_user",
+                "channels": [{"name": name, "roles": "channel_user channel_admin" if role == "admin" else "channel_user"} for name, role in channel_roles.items()],
+            }
+        )
+
+    return {
+        "username": user["username"],
+        "email": user["email"],
+        "auth_service": "",
+        "password": settings.MATTERMOST_PASSWORD,
+        "first_name": user.get("first_name", ""),
+        "last_name": user.get("last_name", ""),
+        "nickname": user.get("nickname", ""),
+        "position": user.get("position", ""),
+        "roles": user.get("roles", "system_user"),
+        "teams": team_memberships,
+    }
+
+
+class _PostBuilder:
+    """Turns generated threads into post/direct_post payloads and collects the attachment files they need."""
+
+    def __init__(self, id_to_username: dict[int, str]):
+        self.id_to_username = id_to_username
+        self.attachments: list[tuple[str, int]] = []
+        self.skipped_messages = 0
+
+    def build(self, thread: dict, member_usernames: list[str]) -> list[dict[str, Any]]:
+        """
+        Build the posts for one thread.
+
+        A thread with a root message becomes a single post with its replies inline;
+        otherwise every message becomes its own top-level post.
+        """
+        messages = [message for message in thread.get("messages", []) or [] if self._author(message)]
+        if not messages:
+            return []
+
+        if thread.get("has_root_message"):
+            root, *replies = messages
+            post = self._message(root, member_usernames)
+            if replies:
+                post["replies"] = [self._message(reply, member_usernames, is_reply=True) for reply in replies]
+            return [post]
+
+        return [self._message(message, member_usernames) for message in messages]
+
+    def _author(self, message: dict) -> str | None:
+        username = self.id_to_username.get(message.get("from_user"))
+        if not username:
+            self.skipped_messages += 1
+        return username
+
+    def _message(self, message: dict, member_usernames: list[str], is_reply: bool = False) -> dict[str, Any]:
+        create_at = message.get("timestamp") or int(time.time() * 1000)
+        data: dict[str, Any] = {
+            "user": self.id_to_username[message["from_user"]],
+            "message": message.get("content", ""),
+            "create_at": create_at,
+        }
+
+        if message.get("is_pinned") and not is_reply:
+            data["is_pinned"] = True
+
+        if message.get("has_reactions") and member_usernames:
+            data["reactions"] = [
+                {"user": username, "emoji_name": emoji, "create_at": create_at + random.randint(*REACTION_DELAY_RANGE)} for emoji, username in plan_message_reactions(member_usernames)
+            ]
+
+        attachment_filenames = message.get("attachment_filenames") or []
+        if attachment_filenames:
+            data["attachments"] = []
+            for filename in attachment_filenames:
+                path = f"attachments/{len(self.attachments)}/{Path(filename).name}"
+                self.attachments.append((path, random.randint(2048, 8192)))  # 2-8 KB, same as live uploads
+                data["attachments"].append({"path": path})
+
+        return data
+
+
+def export_bulk(output_path: Path = BULK_IMPORT_PATH) -> dict[str, int]:
+    """
+    Export generated teams, channels, users, channel messages and direct messages as a bulk import archive.
+
+    Lines are written in the order Mattermost requires (version, team, channel, user, post,
+    direct_channel, direct_post) and streamed into the archive one channel file at a time.
+
+    Args:
+        output_path: Where to write the zip archive
+
+    Returns:
+        Number of lines written per line type
+    """
+    teams: list[dict] = load_json(TEAMS_JSON)
+    users: list[dict] = load_json(USERS_JSON)
+    direct_messages: list[dict] = load_json(DM_JSON) if DM_JSON.exists() else []
+
+    id_to_username = {user["id"]: user["username"] for user in users}
+    channel_members = _build_channel_members(users)
+    builder = _PostBuilder(id_to_username)
+    counts: dict[str, int] = defaultdict(int)
+
+    logger.start(f"Exporting bulk import archive to {output_path}...")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("import.jsonl", "w") as jsonl:
+
+            def write(line_type: str, data: Any) -> None:
+                _write_line(jsonl, line_type, data)
+                counts[line_type] += 1
+
+            write("version", 1)
+
+            for team in teams:
+                write("team", {"name": team["name"], "display_name": team["display_name"], "type": "O", "allow_open_invite": False})
+
+            for team in teams:
+                for channel in team.get("channels", []):
+                    write(
+                        "channel",
+                        {
+                            "team": team["name"],
+                            "name": channel["name"],
+                            "display_name": channel["display_name"],
+                            "type": channel.get("channel_type", "O"),
+                            "purpose": channel.get("description", "")[:250],
+                        },
+                    )
+
+            for user in users:
+                write("user", _build_user_line(user, teams))
+
+            for channel_file in sorted(CHANNEL_MESSAGES_DIR.glob("*.json")):
+                # Files are named "<team>.<channel>.json"
+                team_name, _, channel_name = channel_file.stem.partition(".")
+                member_usernames = channel_members.get((team_name, channel_name), [])
+
+                for thread in load_json(channel_file).get("threads", []):
+                    for post in builder.build(thread, member_usernames):
+                        write("post", {"team": team_name, "channel": channel_name, **post})
+
+            for dm in direct_messages:
+                member_usernames = list(dict.fromkeys(id_to_username[member] for member in dm.get("members", []) or [] if member in id_to_username))
+                if not 2 <= len(member_usernames) <= 8:
+                    logger.warning(f"Skipping direct channel with {len(member_usernames)} resolvable members")
+                    continue
+
+                write("direct_channel", {"members": member_usernames})
+                for thread in dm.get("threads", []) or []:
+                    for post in builder.build(thread, member_usernames):
+                        write("direct_post", {"channel_members": member_usernames, **post})
+
+        # Attachment paths in the JSONL are relative to the archive's data/ directory
+        for path, size in builder.attachments:
+            archive.writestr(f"data/{path}", b"\x00" * size)
+
+    if builder.skipped_messages:
+        logger.warning(f"Skipped {builder.skipped_messages} messages whose author is not in users.json")
+
+    summary = ", ".join(f"{count} {line_type}" for line_type, count in counts.items())
+    logger.succeed(f"Exported {summary} and {len(builder.attachments)} attachments to {output_path}")
+    return dict(counts)
+
+
+async def import_bulk(archive_path: Path = BULK_IMPORT_PATH, poll_interval: float = 5.0, timeout: float = 2 * 60 * 60) -> bool:
+    """
+    Upload a bulk import archive, start the `import_process` job and wait for it to finish.
+
+    Args:
+        archive_path: Zip archive produced by export_bulk
+        poll_interval: Seconds between job status checks
+        timeout: Seconds to wait for the job to finish before giving up on it
+
+    Returns:
+        True if the import job succeeded, False otherwise
+    """
+    if not archive_path.exists():
+        logger.fail(f"Bulk import archive not found: {archive_path}")
+        return False
+
+    logger.start(f"Uploading {archive_path.name} ({archive_path.stat().st_size / (1024 * 1024):.1f} MiB)...")
+
+    async with MattermostClient() as client:
+        upload = await client.create_import_upload(archive_path.name, archive_path.stat().st_size)
+        if not upload or not await client.upload_import_data(upload["id"], archive_path):
+            return False
+
+        # Uploaded import files are stored as "<upload id>_<filename>" in the server's import directory
+        job = await client.create_job("import_process", {"import_file": f"{upload['id']}_{archive_path.name}"})
+        if not job:
+            return False
+
+        logger.info(f"Started import job {job['id']}")
+
+        last_progress = None
+        deadline = time.monotonic() + timeout
+        while job["status"] not in JOB_FINISHED_STATUSES:
+            if time.monotonic() > deadline:
+                logger.fail(f"Import job {job['id']} did not finish within {timeout:.0f}s (last status: {job['status']})")
+                return False
+
+            await asyncio.sleep(poll_interval)
+            job = await client.get_job(job["id"]) or job
+
+            if job.get("progress") != last_progress:
+                last_progress = job.get("progress")
+                logger.info(f"Import job {job['id']}: {job['status']} ({last_progress}%)")
+
+    if job["status"] not in ("success", "warning"):
+        error = (job.get("data") or {}).get("error", job["status"])
+        logger.fail(f"Import job {job['id']} failed: {error}")
+        return False
+
+    if job["status"] == "warning":
+        logger.warning(f"Import job {job['id']} completed with warnings: {(job.get('data') or {}).get('error', 'see the server logs')}")
+        return True
+
+    logger.succeed(f"Import job {job['id']} completed")
+    return True
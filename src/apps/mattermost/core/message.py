@@ -175,13 +175,7 @@ async def _process_single_channel(channel_file: Path, semaphore: asyncio.Semapho
             from apps.mattermost.core.messages.insertion import insert_thread_messages
 
             # Create users_by_id lookup for reactions (all channel members)
-            users_by_id = {}
-            async with MattermostClient() as client:
-                mattermost_users = await client.get_users()
-                # Build lookup for all users that might be in this channel
-                for user in mattermost_users:
-                    if user["id"] in member_ids:  # Only include actual channel members
-                        users_by_id[user["id"]] = {"username": user["username"]}
+            users_by_id = {user_id: shared_data["users_by_id"][user_id] for user_id in member_ids if user_id in shared_data["users_by_id"]}
 
             await insert_thread_messages(
                 threads=threads,
@@ -190,6 +184,7 @@ async def _process_single_channel(channel_file: Path, semaphore: asyncio.Semapho
                 users_by_id=users_by_id,
                 id_to_username_lookup=shared_data["id_to_username_lookup"],
                 username_to_id_lookup=shared_data["username_to_id_lookup"],
+                scheduler=shared_data["scheduler"],
             )
 
             logger.debug(f"Inserted channel messages successfully for channel: {team_name}/{channel_name}")
@@ -217,6 +212,7 @@ async def _setup_shared_resources() -> dict[str, Any]:
         # Get Mattermost users for username-to-id mapping
         mattermost_users = await client.get_users()
         username_to_id_lookup = {user["username"]: user["id"] for user in mattermost_users}
+        users_by_id = {user["id"]: {"username": user["username"]} for user in mattermost_users}
 
         # Build team-aware channels lookup (using general channels endpoint to include private channels)
         channels_lookup = {}
@@ -241,6 +237,7 @@ async def _setup_shared_resources() -> dict[str, Any]:
     return {
         "id_to_username_lookup": id_to_username_lookup,
         "username_to_id_lookup": username_to_id_lookup,
+        "users_by_id": users_by_id,
         "channels_lookup": channels_lookup,
         "teams_lookup": teams_lookup,
     }
@@ -259,15 +256,21 @@ async def insert_channel_messages():
             return
 
         # Create semaphore to limit concurrent processing
-        semaphore = asyncio.Semaphore(settings.MAX_THREADS)
+        semaphore = asyncio.Semaphore(settings.INSERT_MAX_CONCURRENT_LANES)
 
         logger.start("Inserting channel messages...")
 
-        # Create tasks for all channel message files
-        tasks = [_process_single_channel(channel_file, semaphore, shared_data) for channel_file in channel_files]
+        # One scheduler for every channel so all lanes share the rate limit and logged-in clients
+        from apps.mattermost.core.messages.insertion import InsertionScheduler
+
+        async with InsertionScheduler() as scheduler:
+            shared_data["scheduler"] = scheduler
+
+            # Create tasks for all channel message files
+            tasks = [_process_single_channel(channel_file, semaphore, shared_data) for channel_file in channel_files]
 
-        # Execute all tasks concurrently
-        await asyncio.gather(*tasks, return_exceptions=True)
+            # Execute all tasks concurrently
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         logger.succeed("Completed processing all channel messages")
 
@@ -7,7 +7,7 @@ from .concurrent_processing import (
     process_batches_concurrently,
     process_items_with_semaphore,
 )
-from .insertion import insert_thread_messages
+from .insertion import InsertionScheduler, insert_thread_messages
 from .llm_generation import (
     create_attachment_instructions,
     create_business_theme_context,
@@ -23,7 +23,7 @@ from .message_processing import (
     prepare_messages_for_json,
     prepare_threads_for_json,
 )
-from .post_features import handle_message_pinning, handle_message_reactions
+from .post_features import handle_message_pinning, handle_message_reactions, plan_message_reactions
 from .post_utils import create_base_post_data
 from .thread_utils import (
     create_message_context_prompt,
@@ -45,6 +45,8 @@ __all__ = [
     "handle_message_pinning",
     "handle_message_reactions",
     "insert_thread_messages",
+    "InsertionScheduler",
+    "plan_message_reactions",
     # Thread utilities
     "create_message_context_prompt",
     "create_thread_context_prompt",
@@ -4,20 +4,16 @@ import random
 import time
 
 from apps.mattermost.config.settings import settings
-from apps.mattermost.core.message import update_post_timestamp
 from apps.mattermost.core.messages import (
+    InsertionScheduler,
     convert_llm_to_complete_messages,
     create_attachment_instructions,
-    create_base_post_data,
     create_business_theme_context,
     create_markdown_guidelines,
     create_timestamp_context,
     create_user_directory_context,
     generate_conversation_timestamps,
     generate_thread_with_llm,
-    handle_file_attachments,
-    handle_message_pinning,
-    handle_message_reactions,
     prepare_threads_for_json,
 )
 from apps.mattermost.models.message import (
@@ -26,7 +22,6 @@ from apps.mattermost.models.message import (
     Thread,
 )
 from apps.mattermost.utils.constants import DM_MESSAGE_REACTION_PROBABILITY, THREAD_ATTACHMENT_PROBABILITY
-from apps.mattermost.utils.database import AsyncPostgresClient
 from apps.mattermost.utils.faker import faker
 from apps.mattermost.utils.mattermost import MattermostClient
 from common.load_json import load_json
@@ -38,26 +33,6 @@ DM_PATH = settings.DATA_PATH.joinpath("direct_messages.json")
 USERS_PATH = settings.DATA_PATH.joinpath("users.json")
 
 
-async def _update_dm_thread_metadata(root_post_id: str, last_reply_timestamp: int | None) -> None:
-    """Update only the lastreplyat column in the threads table for direct messages."""
-    try:
-        # Use current timestamp if last_reply_timestamp is not provided
-        if last_reply_timestamp is None:
-            last_reply_timestamp = int(time.time() * 1000)
-
-        # Only update lastreplyat column
-        update_query = """
-        UPDATE threads 
-        SET lastreplyat = $1
-        WHERE postid = $2
-        """
-
-        await AsyncPostgresClient.execute(update_query, last_reply_timestamp, root_post_id)
-
-    except Exception as e:
-        logger.warning(f"Failed to update DM thread lastreplyat for post {root_post_id}: {e}")
-
-
 def _set_probabilistic_message_attributes(messages: list[Message], owner_id: int, member_id: int) -> list[Message]:
     """Set is_pinned, has_reactions, and from_user probabilistically for messages."""
 
@@ -697,181 +672,117 @@ async def generate_direct_messages(direct_message_channels: int, min_threads_per
     logger.succeed(f"Generated {len(all_dm_conversations)} direct message conversations with {total_messages} total messages")
 
 
+async def _insert_direct_message_channel(
+    dm: dict,
+    scheduler: InsertionScheduler,
+    semaphore: asyncio.Semaphore,
+    users_by_mattermost_id_lookup: dict[str, dict],
+    username_to_mattermost_id: dict[str, str],
+    local_id_to_username: dict[int, str],
+) -> None:
+    """Create one DM/group channel and insert its threads as a scheduler lane."""
+    async with semaphore:
+        members: list[int] = dm.get("members", []) or []
+
+        # Convert local integer IDs to Mattermost UUIDs
+        member_ids: list[str] = []
+        for local_id in members:
+            username = local_id_to_username.get(local_id)
+            if username:
+                mattermost_id = username_to_mattermost_id.get(username)
+                if mattermost_id:
+                    member_ids.append(mattermost_id)
+                else:
+                    logger.warning(f"No Mattermost ID found for username {username}")
+            else:
+                logger.warning(f"No username found for local ID {local_id}")
+
+        if not member_ids:
+            return
+
+        if len(member_ids) < 2 or len(member_ids) > 7:
+            logger.warning(f"Direct channel requires 2-7 users, got {len(member_ids)}: {member_ids}")
+            return
+
+        # Pick a random member from this DM to create the channel (more realistic)
+        random_member_id = random.choice(member_ids)
+        random_member_user = users_by_mattermost_id_lookup.get(random_member_id)
+
+        if not random_member_user:
+            logger.warning(f"Could not find user data for member {random_member_id}, using default client")
+            creator_username = settings.MATTERMOST_OWNER_USERNAME
+        else:
+            # Use the random member's credentials to create the channel
+            creator_username = random_member_user["username"]
+
+        private_channel = await scheduler.call(creator_username, "create_direct_channel", member_ids)
+        if not private_channel or not private_channel.get("id"):
+            return
+
+        # Mark the channel as viewed to make it visible in UI for the admin user
+        admin_user_id = username_to_mattermost_id.get(settings.MATTERMOST_OWNER_USERNAME)
+        admin_user = users_by_mattermost_id_lookup.get(admin_user_id) if admin_user_id else None
+        if admin_user:
+            if len(member_ids) == 2:
+                # 1-on-1 DM: Find the other user ID (not the admin) for the direct channel preference
+                other_user_id = next((member_id for member_id in member_ids if member_id != admin_user_id), None)
+
+                # Without another user the method auto-detects it
+                await scheduler.call(admin_user["username"], "show_direct_channel", admin_user_id, private_channel["id"], other_user_id)
+            else:
+                # Group DM: Use group channel preferences
+                preferences = [
+                    {"user_id": admin_user_id, "category": "group_channel_show", "name": private_channel["id"], "value": "true"},
+                    {"user_id": admin_user_id, "category": "channel_open_time", "name": private_channel["id"], "value": str(int(time.time() * 1000))},
+                ]
+                await scheduler.call(admin_user["username"], "set_user_preferences", admin_user_id, preferences)
+
+        threads = [Thread(**thread) if isinstance(thread, dict) else thread for thread in dm.get("threads", []) or []]
+
+        await scheduler.insert_threads(
+            threads=threads,
+            channel_id=private_channel["id"],
+            member_ids=member_ids,
+            users_by_id=users_by_mattermost_id_lookup,
+            id_to_username_lookup=local_id_to_username,
+            username_to_id_lookup=username_to_mattermost_id,
+        )
+
+
 async def insert_direct_messages():
     direct_messages: list[DirectMessages] = load_json(DM_PATH)
     users_data = load_json(USERS_PATH)
 
     logger.start(f"Inserting {len(direct_messages)} direct messages channels...")
 
-    try:
-        async with MattermostClient() as client:
-            try:
-                mattermost_users: list[dict] = await client.get_users()
-
-                # Add the same password to all users (as done elsewhere in the codebase)
-                for user in mattermost_users:
-                    user["password"] = settings.MATTERMOST_PASSWORD
-
-                # Create lookup by Mattermost user ID
-                users_by_mattermost_id_lookup: dict[str, dict] = {user["id"]: user for user in mattermost_users}
-
-                # Create lookup by username to get Mattermost IDs
-                username_to_mattermost_id: dict[str, str] = {user["username"]: user["id"] for user in mattermost_users}
-
-                # Create lookup by local ID to get username
-                local_id_to_username: dict[int, str] = {user["id"]: user["username"] for user in users_data}
-
-            except Exception as e:
-                logger.fail(f"Failed to get users: {e}")
-                return
-
-        for dm in direct_messages:
-            members: list[int] = dm.get("members", []) or []
-
-            # Convert local integer IDs to Mattermost UUIDs
-            member_ids: list[str] = []
-            for local_id in members:
-                username = local_id_to_username.get(local_id)
-                if username:
-                    mattermost_id = username_to_mattermost_id.get(username)
-                    if mattermost_id:
-                        member_ids.append(mattermost_id)
-                    else:
-                        logger.warning(f"No Mattermost ID found for username {username}")
-                else:
-                    logger.warning(f"No username found for local ID {local_id}")
+    async with MattermostClient() as client:
+        try:
+            mattermost_users: list[dict] = await client.get_users()
 
-            if not member_ids:
-                continue
+            # Create lookup by Mattermost user ID
+            users_by_mattermost_id_lookup: dict[str, dict] = {user["id"]: user for user in mattermost_users}
 
-            if len(member_ids) < 2 or len(member_ids) > 7:
-                logger.warning(f"Direct channel requires 2-7 users, got {len(member_ids)}: {member_ids}")
-                continue
+            # Create lookup by username to get Mattermost IDs
+            username_to_mattermost_id: dict[str, str] = {user["username"]: user["id"] for user in mattermost_users}
 
-            # Pick a random member from this DM to create the channel (more realistic)
-            random_member_id = random.choice(member_ids)
-            random_member_user = users_by_mattermost_id_lookup.get(random_member_id)
+            # Create lookup by local ID to get username
+            local_id_to_username: dict[int, str] = {user["id"]: user["username"] for user in users_data}
 
-            if not random_member_user:
-                logger.warning(f"Could not find user data for member {random_member_id}, using default client")
-                async with MattermostClient() as client:
-                    private_channel = await client.create_direct_channel(member_ids)
-            else:
-                # Use the random member's credentials to create the channel
-                async with MattermostClient(username=random_member_user["username"], password=random_member_user["password"]) as client:
-                    private_channel = await client.create_direct_channel(member_ids)
-
-            # Mark the channel as viewed to make it visible in UI for the admin user
-            if private_channel and private_channel.get("id"):
-                # Use the admin user ID to show the direct channel in UI
-                admin_user_id = username_to_mattermost_id.get(settings.MATTERMOST_OWNER_USERNAME)
-                if admin_user_id:
-                    admin_user = users_by_mattermost_id_lookup.get(admin_user_id)
-                    if admin_user:
-                        # Create admin client for setting preferences
-                        async with MattermostClient(username=admin_user["username"], password=admin_user["password"]) as admin_client:
-                            if len(member_ids) == 2:
-                                # 1-on-1 DM: Find the other user ID (not the admin) for the direct channel preference
-                                other_user_id = None
-                                for member_id in member_ids:
-                                    if member_id != admin_user_id:
-                                        other_user_id = member_id
-                                        break
-
-                                if other_user_id:
-                                    await admin_client.show_direct_channel(admin_user_id, private_channel["id"], other_user_id)
-                                else:
-                                    # Fallback: let the method auto-detect the other user
-                                    await admin_client.show_direct_channel(admin_user_id, private_channel["id"])
-                            else:
-                                # Group DM: Use group channel preferences
-                                preferences = [
-                                    {"user_id": admin_user_id, "category": "group_channel_show", "name": private_channel["id"], "value": "true"},
-                                    {"user_id": admin_user_id, "category": "channel_open_time", "name": private_channel["id"], "value": str(int(time.time() * 1000))},
-                                ]
-                                await admin_client.set_user_preferences(admin_user_id, preferences)
-
-            if private_channel:
-                for thread in dm.get("threads", []) or []:
-                    thread_messages = thread.get("messages", []) or []
-                    has_root_message = thread.get("has_root_message", False)
-                    root_post_id = None  # Will be set to first message ID if has_root_message is True
-
-                    for msg_idx, msg in enumerate(thread_messages):
-                        # msg["from_user"] is a local integer ID, need to convert to Mattermost ID
-                        local_from_user_id = msg["from_user"]
-                        from_username = local_id_to_username.get(local_from_user_id)
-
-                        if not from_username:
-                            logger.warning(f"No username found for local ID {local_from_user_id}, skipping message")
-                            continue
-
-                        from_mattermost_id = username_to_mattermost_id.get(from_username)
-                        if not from_mattermost_id:
-                            logger.warning(f"No Mattermost ID found for username {from_username}, skipping message")
-                            continue
-
-                        user: dict[str, str] = users_by_mattermost_id_lookup.get(from_mattermost_id)
-                        if not user:
-                            logger.warning(f"User with Mattermost ID {from_mattermost_id} not found, skipping message")
-                            continue
-
-                        # Use timestamp as create_at if available, otherwise use current time
-                        create_at = msg.get("timestamp", int(datetime.datetime.now().timestamp() * 1000))
-
-                        async with MattermostClient(username=user["username"], password=user["password"]) as upload_client:
-                            # Handle file attachments if LLM specified filenames
-                            file_ids = await handle_file_attachments(msg, private_channel["id"], upload_client)
-
-                        # Create post data using shared utility (no user_id to respect custom timestamps)
-                        post_data = create_base_post_data(
-                            channel_id=private_channel["id"],
-                            message_content=msg.get("content"),
-                            timestamp=create_at,
-                            root_id=root_post_id if (has_root_message and msg_idx > 0 and root_post_id) else None,
-                            file_ids=file_ids if file_ids else None,
-                        )
-
-                        async with MattermostClient(username=user["username"], password=user["password"]) as client:
-                            try:
-                                # Create the message
-                                main_post = await client.create_post(post_data=post_data)
-
-                                # Update timestamp in database to ensure it's properly set
-                                if main_post and main_post.get("id"):
-                                    await update_post_timestamp(main_post["id"], create_at)
-
-                                # Store the first message ID as root for subsequent threaded replies
-                                if main_post and main_post.get("id") and msg_idx == 0:
-                                    root_post_id = main_post["id"]
-
-                                # Handle message features using shared modules
-                                if main_post and main_post.get("id"):
-                                    # Handle pinning
-                                    await handle_message_pinning(msg, main_post["id"], client)
-
-                                    # Handle reactions with proper user authentication
-                                    await handle_message_reactions(msg, main_post["id"], member_ids, users_by_mattermost_id_lookup)
-
-                                await asyncio.sleep(0.5)
-
-                            except Exception as e:
-                                logger.fail(f"Failed to create direct messages: {e}")
-
-                    # Update threads table if this thread has replies and has_root_message is True
-                    if has_root_message and root_post_id and len(thread_messages) > 1:
-                        # Get the last message timestamp
-                        last_message_timestamp = thread_messages[-1].get("timestamp") if thread_messages else None
-
-                        await _update_dm_thread_metadata(
-                            root_post_id=root_post_id,
-                            last_reply_timestamp=last_message_timestamp,
-                        )
-
-        logger.succeed(f"Inserted {len(direct_messages)} direct messages")
-
-    finally:
-        # Clean up the timestamp processor and process remaining updates
-        logger.info("Processing remaining timestamp updates...")
-        # Timestamp processor cleanup no longer needed
-        logger.succeed("Completed timestamp updates")
+        except Exception as e:
+            logger.fail(f"Failed to get users: {e}")
+            return
+
+    # Every conversation is its own lane; lanes share one rate limit and one pool of logged-in clients
+    semaphore = asyncio.Semaphore(settings.INSERT_MAX_CONCURRENT_LANES)
+
+    async with InsertionScheduler() as scheduler:
+        results = await asyncio.gather(
+            *(_insert_direct_message_channel(dm, scheduler, semaphore, users_by_mattermost_id_lookup, username_to_mattermost_id, local_id_to_username) for dm in direct_messages),
+            return_exceptions=True,
+        )
+
+    for result in results:
+        if isinstance(result, Exception):
+            logger.fail(f"Failed to create direct messages: {result}")
+
+    logger.succeed(f"Inserted {len(direct_messages)} direct messages")
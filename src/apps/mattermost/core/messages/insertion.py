@@ -2,86 +2,191 @@
 
 import asyncio
 import time
+from collections import defaultdict
+from typing import Any
 
 from apps.mattermost.config.settings import settings
 from apps.mattermost.core.message import update_post_timestamp
 from apps.mattermost.core.messages.attachments import handle_file_attachments
-from apps.mattermost.core.messages.post_features import handle_message_pinning, handle_message_reactions
+from apps.mattermost.core.messages.post_features import plan_message_reactions
 from apps.mattermost.core.messages.post_utils import create_base_post_data
-from apps.mattermost.models.message import Thread
+from apps.mattermost.models.message import Message, Thread
 from apps.mattermost.utils.database import AsyncPostgresClient
 from apps.mattermost.utils.mattermost import MattermostClient
 from common.logger import logger
 
 
-async def insert_thread_messages_batch(
-    threads: list[Thread],
-    channel_id: str,
-    member_ids: list[str],
-    users_by_id: dict[str, dict],
-    id_to_username_lookup: dict[int, str],
-    username_to_id_lookup: dict[str, str],
-    max_concurrent_threads: int = 10,
-) -> None:
-    """
-    Insert thread messages into a Mattermost channel using optimized batch processing.
-
-    Args:
-        threads: List of Thread objects to insert
-        channel_id: Mattermost channel ID
-        member_ids: List of member IDs in the channel
-        users_by_id: Dictionary mapping user IDs to user data
-        id_to_username_lookup: Dictionary mapping local user IDs to usernames
-        username_to_id_lookup: Dictionary mapping usernames to Mattermost user IDs
-        max_concurrent_threads: Maximum number of threads to process concurrently
-    """
-    # Create semaphore to limit concurrent thread processing
-    thread_semaphore = asyncio.Semaphore(max_concurrent_threads)
+class RateLimiter:
+    """Global requests-per-second limit shared by every insertion lane (0 disables it)."""
 
-    # Process threads sequentially to maintain chronological order
-    for thread in threads:
-        try:
-            await _insert_single_thread_optimized(
-                thread=thread,
-                channel_id=channel_id,
-                member_ids=member_ids,
-                users_by_id=users_by_id,
-                id_to_username_lookup=id_to_username_lookup,
-                username_to_id_lookup=username_to_id_lookup,
-                semaphore=thread_semaphore,
-            )
-            # Small delay between threads to ensure chronological order
-            await asyncio.sleep(0.1)
-        except Exception as e:
-            logger.error(f"Failed to insert thread: {e}")
-            continue
+    def __init__(self, requests_per_second: float):
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
 
+    async def acquire(self) -> None:
+        if not self.interval:
+            return
+
+        # Reserve the next free slot under the lock, then sleep outside it so waiters queue up fairly
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+
+        if wait > 0:
+            await asyncio.sleep(wait)
 
-async def _insert_single_thread_optimized(
-    thread: Thread,
-    channel_id: str,
-    member_ids: list[str],
-    users_by_id: dict[str, dict],
-    id_to_username_lookup: dict[int, str],
-    username_to_id_lookup: dict[str, str],
-    semaphore: asyncio.Semaphore,
-) -> None:
-    """Insert a single thread with optimized connection reuse and batching."""
-    async with semaphore:
-        thread_messages = thread.messages
-        has_root_message = getattr(thread, "has_root_message", False)
-        root_post_id = None
 
-        # Pre-validate all messages
-        validated_messages = []
+class ClientPool:
+    """Logged-in MattermostClient per username, reused instead of logging in for every post."""
 
-        for msg_idx, msg in enumerate(thread_messages):
-            # Validate user mappings upfront
-            local_from_user_id = msg.from_user
-            from_username = id_to_username_lookup.get(local_from_user_id)
+    def __init__(self):
+        self._clients: dict[str, MattermostClient] = {}
+        self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
+    async def get(self, username: str) -> MattermostClient:
+        async with self._locks[username]:
+            client = self._clients.get(username)
+            if client is None:
+                client = await MattermostClient(username=username, password=settings.MATTERMOST_PASSWORD).__aenter__()
+                self._clients[username] = client
+            return client
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            if client._is_logged_in:
+                await client.logout()
+            await client.close()
+        self._clients.clear()
+
+
+class InsertionScheduler:
+    """
+    Insert posts for many channels concurrently while keeping each channel ordered.
+
+    Every channel (or DM conversation) is one lane: its top-level posts and thread roots are created
+    strictly in order, and once a root id is known the thread's replies are fanned out concurrently.
+    Attachment uploads, pins and reactions run on a side queue so they never hold up a lane.
+    All API calls go through one global rate limit instead of fixed sleeps.
+
+    Example:
+        ```python
+        async with InsertionScheduler() as scheduler:
+            await asyncio.gather(*(scheduler.insert_threads(...) for channel in channels))
+        ```
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float = settings.INSERT_REQUESTS_PER_SECOND,
+        side_queue_concurrency: int = settings.INSERT_SIDE_QUEUE_CONCURRENCY,
+    ):
+        self.limiter = RateLimiter(requests_per_second)
+        self.clients = ClientPool()
+        self._side_semaphore = asyncio.Semaphore(max(1, side_queue_concurrency))
+        self._side_tasks: set[asyncio.Task] = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.drain()
+        await self.clients.close()
+
+    async def call(self, username: str, method: str, *args, **kwargs) -> Any:
+        """Call a MattermostClient method as `username`, subject to the global rate limit."""
+        client = await self.clients.get(username)
+        await self.limiter.acquire()
+        return await getattr(client, method)(*args, **kwargs)
+
+    def submit(self, coroutine) -> asyncio.Task:
+        """Queue background work (attachments, pins, reactions) without blocking the calling lane."""
+
+        async def run():
+            async with self._side_semaphore:
+                return await coroutine
+
+        task = asyncio.create_task(run())
+        self._side_tasks.add(task)
+        task.add_done_callback(self._side_tasks.discard)
+        return task
+
+    async def drain(self) -> None:
+        """Wait until the side queue is empty."""
+        while self._side_tasks:
+            await asyncio.gather(*list(self._side_tasks), return_exceptions=True)
+
+    async def insert_threads(
+        self,
+        threads: list[Thread],
+        channel_id: str,
+        member_ids: list[str],
+        users_by_id: dict[str, dict],
+        id_to_username_lookup: dict[int, str],
+        username_to_id_lookup: dict[str, str],
+    ) -> None:
+        """
+        Insert the threads of one channel as an ordered lane.
+
+        Args:
+            threads: List of Thread objects to insert, in channel order
+            channel_id: Mattermost channel ID
+            member_ids: List of member IDs in the channel
+            users_by_id: Dictionary mapping user IDs to user data
+            id_to_username_lookup: Dictionary mapping local user IDs to usernames
+            username_to_id_lookup: Dictionary mapping usernames to Mattermost user IDs
+        """
+        reply_fanouts = []
+
+        for thread in threads:
+            try:
+                messages = self._resolve_authors(thread.messages, users_by_id, id_to_username_lookup, username_to_id_lookup)
+                if not messages:
+                    continue
+
+                # Start uploads for the whole thread up front; each post only waits for its own files
+                uploads = [self.submit(self._upload_attachments(message, username, channel_id)) if message.attachment_filenames else None for message, username in messages]
+
+                if not thread.has_root_message:
+                    # Standalone posts are all top-level, so the lane creates them one by one
+                    for (message, username), upload in zip(messages, uploads, strict=True):
+                        await self._create_post(message, username, upload, channel_id, None, member_ids, users_by_id)
+                    continue
+
+                (root_message, root_username), root_upload = messages[0], uploads[0]
+                root_post_id = await self._create_post(root_message, root_username, root_upload, channel_id, None, member_ids, users_by_id)
+                if len(messages) == 1:
+                    continue
+
+                if root_post_id:
+                    reply_fanouts.append(asyncio.create_task(self._insert_replies(root_post_id, messages[1:], uploads[1:], channel_id, member_ids, users_by_id)))
+                else:
+                    # Without a root there is nothing to reply to, so the replies become top-level posts instead of being lost
+                    logger.warning(f"Root post failed, inserting its {len(messages) - 1} replies as top-level posts")
+                    for (message, username), upload in zip(messages[1:], uploads[1:], strict=True):
+                        await self._create_post(message, username, upload, channel_id, None, member_ids, users_by_id)
+            except Exception as e:
+                logger.error(f"Failed to insert thread: {e}")
+
+        for result in await asyncio.gather(*reply_fanouts, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to insert thread replies: {result}")
+
+    def _resolve_authors(
+        self,
+        messages: list[Message],
+        users_by_id: dict[str, dict],
+        id_to_username_lookup: dict[int, str],
+        username_to_id_lookup: dict[str, str],
+    ) -> list[tuple[Message, str]]:
+        """Pair each message with its author's username, dropping messages whose author can't be mapped."""
+        resolved = []
+
+        for msg in messages:
+            from_username = id_to_username_lookup.get(msg.from_user)
             if not from_username:
-                logger.warning(f"No username found for local ID {local_from_user_id}, skipping message")
+                logger.warning(f"No username found for local ID {msg.from_user}, skipping message")
                 continue
 
             from_mattermost_id = username_to_id_lookup.get(from_username)
@@ -89,80 +194,78 @@ async def _insert_single_thread_optimized(
                 logger.warning(f"No Mattermost ID found for username {from_username}, skipping message")
                 continue
 
-            user_data = users_by_id.get(from_mattermost_id)
-            if not user_data:
+            if from_mattermost_id not in users_by_id:
                 logger.warning(f"User with Mattermost ID {from_mattermost_id} not found, skipping message")
                 continue
 
-            validated_messages.append(
-                {
-                    "msg_idx": msg_idx,
-                    "msg": msg,
-                    "from_username": from_username,
-                    "user_data": user_data,
-                    "timestamp": getattr(msg, "timestamp", None),
-                }
+            resolved.append((msg, from_username))
+
+        return resolved
+
+    async def _insert_replies(
+        self,
+        root_post_id: str,
+        replies: list[tuple[Message, str]],
+        uploads: list[asyncio.Task | None],
+        channel_id: str,
+        member_ids: list[str],
+        users_by_id: dict[str, dict],
+    ) -> None:
+        # Replies carry explicit timestamps, so they can be created in any order once the root exists
+        await asyncio.gather(
+            *(self._create_post(message, username, upload, channel_id, root_post_id, member_ids, users_by_id) for (message, username), upload in zip(replies, uploads, strict=True))
+        )
+        await _update_thread_metadata(root_post_id=root_post_id, last_reply_timestamp=replies[-1][0].timestamp)
+
+    async def _upload_attachments(self, message: Message, username: str, channel_id: str) -> list[str]:
+        client = await self.clients.get(username)
+        await self.limiter.acquire()
+        return await handle_file_attachments(message.model_dump(), channel_id, client)
+
+    async def _create_post(
+        self,
+        message: Message,
+        username: str,
+        upload: asyncio.Task | None,
+        channel_id: str,
+        root_id: str | None,
+        member_ids: list[str],
+        users_by_id: dict[str, dict],
+    ) -> str | None:
+        """Create one post, then queue its pin and reactions. Returns the post id."""
+        try:
+            file_ids = await upload if upload else None
+
+            post_data = create_base_post_data(
+                channel_id=channel_id,
+                message_content=message.content,
+                timestamp=message.timestamp,
+                root_id=root_id,
+                file_ids=file_ids if file_ids else None,
             )
 
-        # Process messages using pooled connections
-        for msg_data in validated_messages:
-            msg_idx = msg_data["msg_idx"]
-            msg = msg_data["msg"]
-            from_username = msg_data["from_username"]
-            user_data = msg_data["user_data"]
-            timestamp = msg_data["timestamp"]
+            post = await self.call(username, "create_post", post_data=post_data)
+            if not post or not post.get("id"):
+                logger.warning(f"Failed to create post for user {username}")
+                return None
 
-            try:
-                # Create client for this user
-                async with MattermostClient(username=user_data["username"], password=settings.MATTERMOST_PASSWORD) as client:
-                    # Handle file attachments if any
-                    file_ids = await handle_file_attachments(msg.model_dump(), channel_id, client)
-
-                    # Create post data using shared utility
-                    post_data = create_base_post_data(
-                        channel_id=channel_id,
-                        message_content=msg.content,
-                        timestamp=timestamp,
-                        root_id=root_post_id if (has_root_message and msg_idx > 0 and root_post_id) else None,
-                        file_ids=file_ids if file_ids else None,
-                    )
-
-                    # Create the message
-                    main_post = await client.create_post(post_data=post_data)
-
-                    if not main_post:
-                        logger.warning(f"Failed to create post for user {from_username}")
-                        continue
-
-                    # Update timestamp in database to ensure it's properly set
-                    if main_post.get("id") and timestamp:
-                        await update_post_timestamp(main_post["id"], timestamp)
-
-                    # Store the first message ID as root for subsequent threaded replies
-                    if main_post.get("id") and msg_idx == 0:
-                        root_post_id = main_post["id"]
-
-                    # Handle message features using shared modules
-                    if main_post.get("id"):
-                        # Handle pinning
-                        await handle_message_pinning(msg.model_dump(), main_post["id"], client)
-
-                        # Handle reactions with proper user authentication
-                        await handle_message_reactions(msg.model_dump(), main_post["id"], member_ids, users_by_id)
-
-                    # Reduced rate limiting for batch operations
-                    await asyncio.sleep(0.2)
+            # Update timestamp in database to ensure it's properly set
+            if message.timestamp:
+                await update_post_timestamp(post["id"], message.timestamp)
 
-            except Exception as e:
-                logger.warning(f"Failed to create message for user {from_username}: {e}")
-                continue
+            if message.is_pinned:
+                self.submit(self.call(username, "pin_post", post["id"]))
 
-        # Update threads table if this thread has replies and has_root_message is True
-        if has_root_message and root_post_id and len(validated_messages) > 1:
-            await _update_thread_metadata(
-                root_post_id=root_post_id,
-                last_reply_timestamp=validated_messages[-1]["timestamp"] if validated_messages else None,
-            )
+            if message.has_reactions and member_ids:
+                for emoji, reactor_id in plan_message_reactions(member_ids):
+                    reactor = users_by_id.get(reactor_id)
+                    if reactor and reactor.get("username"):
+                        self.submit(self.call(reactor["username"], "create_reaction", post["id"], reactor_id, emoji))
+
+            return post["id"]
+        except Exception as e:
+            logger.warning(f"Failed to create message for user {username}: {e}")
+            return None
 
 
 async def _update_thread_metadata(root_post_id: str, last_reply_timestamp: int | None) -> None:
@@ -174,7 +277,7 @@ async def _update_thread_metadata(root_post_id: str, last_reply_timestamp: int |
 
         # Only update lastreplyat column
         update_query = """
-        UPDATE threads 
+        UPDATE threads
         SET lastreplyat = $1
         WHERE postid = $2
         """
@@ -192,18 +295,17 @@ async def insert_thread_messages(
     users_by_id: dict[str, dict],
     id_to_username_lookup: dict[int, str],
     username_to_id_lookup: dict[str, str],
+    scheduler: InsertionScheduler | None = None,
 ) -> None:
     """
-    Insert thread messages into a Mattermost channel using optimized batch processing.
+    Insert thread messages into a Mattermost channel.
 
-    This function maintains backward compatibility while using the optimized batch implementation.
+    Pass a shared `scheduler` to insert several channels concurrently under one rate limit and client pool;
+    without one, a scheduler is created for this channel alone.
     """
-    await insert_thread_messages_batch(
-        threads=threads,
-        channel_id=channel_id,
-        member_ids=member_ids,
-        users_by_id=users_by_id,
-        id_to_username_lookup=id_to_username_lookup,
-        username_to_id_lookup=username_to_id_lookup,
-        max_concurrent_threads=getattr(settings, "MAX_CONCURRENT_THREADS", 10),
-    )
+    if scheduler is not None:
+        await scheduler.insert_threads(threads, channel_id, member_ids, users_by_id, id_to_username_lookup, username_to_id_lookup)
+        return
+
+    async with InsertionScheduler() as scheduler:
+        await scheduler.insert_threads(threads, channel_id, member_ids, users_by_id, id_to_username_lookup, username_to_id_lookup)
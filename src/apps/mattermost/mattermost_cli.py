@@ -6,6 +6,7 @@ from pathlib import Path
 import click
 
 from apps.mattermost.config.settings import settings
+from apps.mattermost.core.bulk_import import BULK_IMPORT_PATH, export_bulk, import_bulk
 from apps.mattermost.core.config import initialize, setup_configuration
 from apps.mattermost.core.message import insert_channel_messages
 from apps.mattermost.core.messages.channel_messages import generate_channel_messages
@@ -13,6 +14,7 @@ from apps.mattermost.core.messages.direct_messages import generate_direct_messag
 from apps.mattermost.core.teams import generate_teams, insert_channels, insert_teams
 from apps.mattermost.core.users import generate_users, insert_users, insert_users_to_channels, pick_users_for_channels
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -51,6 +53,20 @@ def down(time: int):
     subprocess.run(["docker", "volume", "prune", "-f"], env=env)
 
 
+add_snapshot_commands(
+    mattermost_cli,
+    SnapshotSpec(
+        app="mattermost",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="postgres",
+        data_dir=settings.DATA_PATH,
+        volumes=[("mattermost", "/mattermost/data")],
+        compose_files=["docker-compose.yml", "docker-compose.without-nginx.yml"],
+        env=lambda: {**os.environ, **settings.model_dump_str()},
+    ),
+)
+
+
 @mattermost_cli.command()
 @click.option("-t", "--teams", type=int, default=3, help="Number of teams to generate")
 @click.option("-u", "--users", type=int, default=98, help="Number of users to generate")
@@ -102,3 +118,26 @@ def seed():
         await insert_direct_messages()
 
     asyncio.run(async_seed_mattermost())
+
+
+@mattermost_cli.command("export-bulk")
+@click.option("-o", "--output", type=click.Path(dir_okay=False, path_type=Path), default=BULK_IMPORT_PATH, help="Path of the bulk import archive to write")
+def export_bulk_command(output: Path):
+    """Export generated data as a Mattermost bulk import archive (JSONL + attachments)"""
+    export_bulk(output)
+
+
+@mattermost_cli.command("import-bulk")
+@click.option("-f", "--file", "archive", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=BULK_IMPORT_PATH, help="Bulk import archive to upload")
+@click.option("--poll-interval", type=float, default=5.0, help="Seconds between import job status checks")
+@click.option("--timeout", type=float, default=2 * 60 * 60, help="Seconds to wait for the import job to finish")
+def import_bulk_command(archive: Path, poll_interval: float, timeout: float):
+    """Upload a bulk import archive and run it as a server-side import job"""
+
+    async def async_import_bulk():
+        await initialize()
+        await setup_configuration()
+        if not await import_bulk(archive, poll_interval, timeout):
+            raise click.ClickException("Bulk import failed")
+
+    asyncio.run(async_import_bulk())
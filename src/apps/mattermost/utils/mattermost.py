@@ -1101,10 +1101,6 @@ class MattermostClient:
             "emoji_name": emoji_name,
         }
 
-        await self.session.close()
-
-        self.session = aiohttp.ClientSession()
-
         async with self.session.post(url, headers=self.headers, json=payload) as response:
             if response.status in [200, 201]:
                 data = await response.json()
@@ -1569,3 +1565,102 @@ class MattermostClient:
         except Exception as e:
             logger.error(f"Error creating group DM channel: {e}")
             return None
+
+    async def create_import_upload(self, filename: str, file_size: int) -> dict | None:
+        """
+        Create an upload session for a bulk import archive.
+
+        Args:
+            filename: Name of the archive on the server
+            file_size: Size of the archive in bytes
+
+        Returns:
+            dict: Upload session data if successful, None otherwise
+        """
+        if not self._is_logged_in:
+            raise RuntimeError("Must be logged in to create an upload session")
+
+        url = self.get_api_url("uploads")
+        payload = {"type": "import", "filename": filename, "file_size": file_size, "user_id": self.user_id}
+
+        async with self.session.post(url, headers=self.headers, json=payload) as response:
+            if response.status in [200, 201]:
+                return await response.json()
+            else:
+                response_text = await response.text()
+                logger.fail(f"Failed to create upload session: {response.status} - {response_text}")
+                return None
+
+    async def upload_import_data(self, upload_id: str, file_path: str | Path) -> dict | None:
+        """
+        Stream a bulk import archive into an upload session.
+
+        Args:
+            upload_id: The ID of the upload session
+            file_path: Path of the archive to upload
+
+        Returns:
+            dict: File information once the upload is complete, None otherwise
+        """
+        if not self._is_logged_in:
+            raise RuntimeError("Must be logged in to upload data")
+
+        url = self.get_api_url(f"uploads/{upload_id}")
+        headers = {"Authorization": self.headers["Authorization"], "Content-Type": "application/octet-stream"}
+
+        with Path(file_path).open("rb") as file:
+            async with self.session.post(url, headers=headers, data=file, timeout=aiohttp.ClientTimeout(total=None)) as response:
+                if response.status in [200, 201]:
+                    return await response.json()
+                else:
+                    response_text = await response.text()
+                    logger.fail(f"Failed to upload import data: {response.status} - {response_text}")
+                    return None
+
+    async def create_job(self, job_type: str, data: dict | None = None) -> dict | None:
+        """
+        Create a server-side job (e.g. `import_process`).
+
+        Args:
+            job_type: The type of the job
+            data: Job-specific parameters
+
+        Returns:
+            dict: Job data if successful, None otherwise
+        """
+        if not self._is_logged_in:
+            raise RuntimeError("Must be logged in to create a job")
+
+        url = self.get_api_url("jobs")
+        payload = {"type": job_type, "data": data or {}}
+
+        async with self.session.post(url, headers=self.headers, json=payload) as response:
+            if response.status in [200, 201]:
+                return await response.json()
+            else:
+                response_text = await response.text()
+                logger.fail(f"Failed to create {job_type} job: {response.status} - {response_text}")
+                return None
+
+    async def get_job(self, job_id: str) -> dict | None:
+        """
+        Get the current state of a server-side job.
+
+        Args:
+            job_id: The ID of the job
+
+        Returns:
+            dict: Job data (including `status` and `progress`) if successful, None otherwise
+        """
+        if not self._is_logged_in:
+            raise RuntimeError("Must be logged in to get a job")
+
+        url = self.get_api_url(f"jobs/{job_id}")
+
+        async with self.session.get(url, headers=self.headers) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                response_text = await response.text()
+                logger.fail(f"Failed to get job {job_id}: {response.status} - {response_text}")
+                return None
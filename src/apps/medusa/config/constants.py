@@ -79,6 +79,19 @@ CAMPAIGNS_BATCH_SIZE = 10
 PRICE_LISTS_BATCH_SIZE = 3
 MAPPING_BATCH_SIZE = 20
 
+# Medusa batch routes (/admin/*/batch): items per request and requests in flight
+PRODUCTS_BATCH_CHUNK_SIZE = 25
+LOCATION_LEVELS_BATCH_CHUNK_SIZE = 200
+PRICES_BATCH_CHUNK_SIZE = 200
+BATCH_REQUEST_CONCURRENCY = 4
+PAGINATION_CONCURRENCY = 4
+
+# Order lifecycle stages in order, and the share of generated orders that stops at each stage
+# (20% stay drafts; of the converted orders 30% are only fulfilled, the rest are paid and shipped, 90% of those delivered)
+ORDER_LIFECYCLE_STAGES = ("draft", "converted", "fulfilled", "paid", "shipped", "delivered")
+ORDER_TARGET_STATUS_WEIGHTS = {"draft": 0.2, "fulfilled": 0.24, "shipped": 0.056, "delivered": 0.504}
+ORDER_PIPELINE_CONCURRENCY = 16
+
 INCLUDE_PERSONAL_INFO_RATIO = 0.75
 INCLUDE_COMPANY_RATIO = 0.45
 
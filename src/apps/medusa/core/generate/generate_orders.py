@@ -2,7 +2,7 @@ import asyncio
 import random
 from typing import Any
 
-from apps.medusa.config.constants import ORDERS_FILEPATH, SALES_CHANNELS, US_ADDRESS_TEMPLATES
+from apps.medusa.config.constants import ORDER_TARGET_STATUS_WEIGHTS, ORDERS_FILEPATH, SALES_CHANNELS, US_ADDRESS_TEMPLATES
 from apps.medusa.config.settings import settings
 from apps.medusa.utils.api_utils import MedusaAPIUtils
 from apps.medusa.utils.data_utils import load_json_file
@@ -126,6 +126,11 @@ def generate_address(first_name: str | None = None, last_name: str | None = None
     }
 
 
+def select_target_status() -> str:
+    """Pick the lifecycle stage this order should end in (see ORDER_TARGET_STATUS_WEIGHTS)."""
+    return random.choices(list(ORDER_TARGET_STATUS_WEIGHTS), weights=list(ORDER_TARGET_STATUS_WEIGHTS.values()))[0]
+
+
 def generate_order_data(customer_email: str | None, customers: list[dict[str, Any]], products: list[dict[str, Any]]) -> dict[str, Any]:
     """Generate a single order data structure."""
     customer = next((c for c in customers if c.get("email") == customer_email), None)
@@ -142,6 +147,7 @@ def generate_order_data(customer_email: str | None, customers: list[dict[str, An
         "items": select_random_items(products),
         "billing_address": billing_address,
         "shipping_address": shipping_address,
+        "target_status": select_target_status(),
     }
 
 
@@ -52,6 +52,7 @@ from apps.medusa.core.generate.prompts.generate_products_prompts import (
 )
 from apps.medusa.utils.data_utils import load_json_file
 from common.anthropic_client import make_anthropic_request, validate_anthropic_config
+from common.dedup import DedupIndex
 from common.logger import logger
 from common.save_to_json import save_to_json
 
@@ -353,46 +354,36 @@ def add_variant_attributes(product: dict) -> dict:
     return product
 
 
-def validate_and_deduplicate(products: list[dict], used_titles: set[str], used_handles: set[str], used_skus: set[str]) -> dict:
+def product_dedup_keys(product: dict) -> dict:
+    """Fields a generated product must not share with earlier ones."""
+    return {
+        "title": product.get("title", ""),
+        "description": product.get("description", ""),
+        "handle": product.get("handle", ""),
+        "sku": [v.get("sku", "") for v in product.get("variants", []) if v.get("sku")],
+    }
+
+
+def validate_and_deduplicate(products: list[dict], index: DedupIndex) -> dict:
     validated_products = []
     skipped_count = 0
 
     for product in products:
-        title = product.get("title", "")
-        handle = product.get("handle", "")
-
-        if not title or not handle:
-            skipped_count += 1
-            continue
-
-        if title.lower() in {t.lower() for t in used_titles}:
-            skipped_count += 1
-            continue
-
-        if handle.lower() in {h.lower() for h in used_handles}:
+        if not product.get("title") or not product.get("handle"):
             skipped_count += 1
             continue
 
-        variants = product.get("variants", [])
-        product_skus = [v.get("sku", "") for v in variants if v.get("sku")]
-
-        if any(sku in used_skus for sku in product_skus):
+        if not index.add(product_dedup_keys(product)):
             skipped_count += 1
             continue
 
         validated_products.append(product)
-        used_titles.add(title)
-        used_handles.add(handle)
-        used_skus.update(product_skus)
 
     if skipped_count > 0:
         logger.info(f"⚠️ Skipped {skipped_count} duplicate/invalid products")
 
     return {
         "validated_products": validated_products,
-        "updated_used_titles": used_titles,
-        "updated_used_handles": used_handles,
-        "updated_used_skus": used_skus,
         "skipped_count": skipped_count,
     }
 
@@ -648,9 +639,8 @@ async def generate_products(n_products: int | None = None) -> dict:
     logger.info(f"📊 Catalog: {len(categories)} categories, {len(product_types)} types, {len(collections)} collections, {len(tags)} tags")
 
     generated_products: list[dict] = []
-    used_handles: set[str] = set()
-    used_skus: set[str] = set()
-    used_titles: set[str] = set()
+    # Handles and SKUs must be unique; titles and descriptions must not be near-copies of earlier ones
+    dedup_index = DedupIndex(exact_fields=["handle", "sku"], near_fields=["title", "description"])
     category_coverage: dict[str, int] = {}
     collection_coverage: dict[str, int] = {}
     type_coverage: dict[str, int] = {}
@@ -686,11 +676,8 @@ async def generate_products(n_products: int | None = None) -> dict:
                 products = await generate_complete_products(batch_size, plan_item, generated_products)
 
                 if products:
-                    validation_result = validate_and_deduplicate(products, used_titles, used_handles, used_skus)
+                    validation_result = validate_and_deduplicate(products, dedup_index)
                     validated = validation_result["validated_products"]
-                    used_titles = validation_result["updated_used_titles"]
-                    used_handles = validation_result["updated_used_handles"]
-                    used_skus = validation_result["updated_used_skus"]
 
                     if validated:
                         coverage_result = track_coverage(validated, plan_item, category_coverage, collection_coverage, type_coverage, tag_coverage)
@@ -733,8 +720,8 @@ async def generate_products(n_products: int | None = None) -> dict:
         logger.info("\n✅ GENERATION COMPLETE")
         logger.info(f"   Total Generated: {total_generated}/{target_count}")
         logger.info(f"   Success Rate: {success_rate:.1f}%")
-        logger.info(f"   Unique Handles: {len(used_handles)}")
-        logger.info(f"   Unique SKUs: {len(used_skus)}")
+        logger.info(f"   Unique Handles: {dedup_index.unique_count('handle')}")
+        logger.info(f"   Unique SKUs: {dedup_index.unique_count('sku')}")
 
         return {
             "total_generated": total_generated,
@@ -745,8 +732,8 @@ async def generate_products(n_products: int | None = None) -> dict:
             "types_covered": len(type_coverage),
             "collections_covered": len(collection_coverage),
             "tags_used": len(tag_coverage),
-            "unique_handles": len(used_handles),
-            "unique_skus": len(used_skus),
+            "unique_handles": dedup_index.unique_count("handle"),
+            "unique_skus": dedup_index.unique_count("sku"),
             "coverage_details": {
                 "categories": category_coverage,
                 "types": type_coverage,
@@ -54,14 +54,25 @@ async def fetch_shipping_options(stock_location_id: str, session: aiohttp.Client
         return []
 
 
-async def get_inventory_item_id_for_line_item(line_item: dict[str, Any], session: aiohttp.ClientSession, auth, base_url: str) -> str | None:
-    """Get inventory_item_id by fetching the product and finding the variant."""
+async def get_inventory_item_id_for_line_item(
+    line_item: dict[str, Any], session: aiohttp.ClientSession, auth, base_url: str, inventory_item_cache: dict[str, str | None] | None = None
+) -> str | None:
+    """
+    Get inventory_item_id by fetching the product and finding the variant.
+
+    Pass an `inventory_item_cache` shared across orders to look each variant up only once.
+    """
     product_id = line_item.get("product_id")
     variant_id = line_item.get("variant_id")
 
     if not product_id or not variant_id:
         return None
 
+    if inventory_item_cache is not None:
+        if variant_id not in inventory_item_cache:
+            inventory_item_cache[variant_id] = await get_inventory_item_id_for_line_item(line_item, session, auth, base_url)
+        return inventory_item_cache[variant_id]
+
     try:
         url = f"{base_url}/admin/products/{product_id}"
         params = {"fields": "*variants,*variants.inventory_items"}
@@ -85,11 +96,13 @@ async def get_inventory_item_id_for_line_item(line_item: dict[str, Any], session
         return None
 
 
-async def create_inventory_reservation(line_item: dict[str, Any], location_id: str, quantity: int, session: aiohttp.ClientSession, auth, base_url: str) -> bool:
+async def create_inventory_reservation(
+    line_item: dict[str, Any], location_id: str, quantity: int, session: aiohttp.ClientSession, auth, base_url: str, inventory_item_cache: dict[str, str | None] | None = None
+) -> bool:
     """Create an inventory reservation for a line item."""
     try:
         line_item_id = line_item.get("id")
-        inventory_item_id = await get_inventory_item_id_for_line_item(line_item, session, auth, base_url)
+        inventory_item_id = await get_inventory_item_id_for_line_item(line_item, session, auth, base_url, inventory_item_cache)
 
         if not inventory_item_id:
             return False
@@ -110,7 +123,9 @@ async def create_inventory_reservation(line_item: dict[str, Any], location_id: s
         return False
 
 
-async def create_reservations_for_order(order: dict[str, Any], location_id: str, session: aiohttp.ClientSession, auth, base_url: str) -> bool:
+async def create_reservations_for_order(
+    order: dict[str, Any], location_id: str, session: aiohttp.ClientSession, auth, base_url: str, inventory_item_cache: dict[str, str | None] | None = None
+) -> bool:
     """Create inventory reservations for all items in an order."""
     items = order.get("items", [])
     if not items:
@@ -123,13 +138,28 @@ async def create_reservations_for_order(order: dict[str, Any], location_id: str,
         remaining = quantity - fulfilled_quantity
 
         if remaining > 0:
-            success = await create_inventory_reservation(item, location_id, remaining, session, auth, base_url)
+            success = await create_inventory_reservation(item, location_id, remaining, session, auth, base_url, inventory_item_cache)
             if not success:
                 all_success = False
 
     return all_success
 
 
+def get_fulfillment_items(order: dict[str, Any]) -> list[dict[str, Any]]:
+    """Line items of an order that still have a quantity left to fulfill."""
+    fulfillment_items: list[dict[str, Any]] = []
+
+    for item in order.get("items", []):
+        quantity = item.get("quantity", 0)
+        fulfilled_quantity = item.get("fulfilled_quantity", 0)
+        remaining = quantity - fulfilled_quantity
+
+        if remaining > 0:
+            fulfillment_items.append({"id": item.get("id"), "quantity": remaining})
+
+    return fulfillment_items
+
+
 async def fulfill_order(order_id: str, location_id: str, shipping_option_id: str, session: aiohttp.ClientSession, auth, base_url: str, api_utils: MedusaAPIUtils) -> bool:
     """Create fulfillment for an order."""
     try:
@@ -144,17 +174,7 @@ async def fulfill_order(order_id: str, location_id: str, shipping_option_id: str
 
         await create_reservations_for_order(order, location_id, session, auth, base_url)
 
-        items = order.get("items", [])
-        fulfillment_items: list[dict[str, Any]] = []
-
-        for item in items:
-            quantity = item.get("quantity", 0)
-            fulfilled_quantity = item.get("fulfilled_quantity", 0)
-            remaining = quantity - fulfilled_quantity
-
-            if remaining > 0:
-                fulfillment_items.append({"id": item.get("id"), "quantity": remaining})
-
+        fulfillment_items = get_fulfillment_items(order)
         if not fulfillment_items:
             return False
 
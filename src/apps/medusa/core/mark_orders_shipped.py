@@ -25,6 +25,31 @@ async def create_shipment(order_id: str, fulfillment_id: str, items: list[dict[s
         return False
 
 
+def get_shipment_items(order: dict[str, Any], fulfillment: dict[str, Any]) -> list[dict[str, Any]]:
+    """Line items to ship for a fulfillment, falling back to all order items when the fulfillment doesn't list them."""
+    fulfillment_items = []
+
+    if fulfillment.get("items"):
+        fulfillment_items = fulfillment.get("items", [])
+    elif fulfillment.get("fulfill_items"):
+        fulfillment_items = fulfillment.get("fulfill_items", [])
+    else:
+        order_items = order.get("items", [])
+        for order_item in order_items:
+            item_id = order_item.get("id")
+            quantity = order_item.get("quantity", 0)
+            if quantity > 0:
+                fulfillment_items.append({"line_item_id": item_id, "id": item_id, "quantity": quantity})
+
+    items: list[dict[str, Any]] = []
+    for item in fulfillment_items:
+        line_item_id = item.get("line_item_id") or item.get("id")
+        if line_item_id:
+            items.append({"id": line_item_id, "quantity": item.get("quantity", 1)})
+
+    return items
+
+
 async def ship_order(order_id: str, session: aiohttp.ClientSession, auth, base_url: str, api_utils: MedusaAPIUtils) -> tuple[bool, str]:
     """Mark an order as shipped by creating shipments for all fulfillments"""
     try:
@@ -61,29 +86,7 @@ async def ship_order(order_id: str, session: aiohttp.ClientSession, auth, base_u
             if shipped_at:
                 continue
 
-            fulfillment_items = []
-
-            if fulfillment.get("items"):
-                fulfillment_items = fulfillment.get("items", [])
-            elif fulfillment.get("fulfill_items"):
-                fulfillment_items = fulfillment.get("fulfill_items", [])
-            else:
-                order_items = order.get("items", [])
-                for order_item in order_items:
-                    item_id = order_item.get("id")
-                    quantity = order_item.get("quantity", 0)
-                    if quantity > 0:
-                        fulfillment_items.append({"line_item_id": item_id, "id": item_id, "quantity": quantity})
-
-            if not fulfillment_items:
-                continue
-
-            items: list[dict[str, Any]] = []
-            for item in fulfillment_items:
-                line_item_id = item.get("line_item_id") or item.get("id")
-                if line_item_id:
-                    items.append({"id": line_item_id, "quantity": item.get("quantity", 1)})
-
+            items = get_shipment_items(order, fulfillment)
             if not items:
                 continue
 
@@ -0,0 +1,250 @@
+"""
+Streaming order lifecycle for seeding.
+
+Each generated order flows through draft → converted → fulfilled → paid → shipped → delivered on its own,
+stopping at the `target_status` picked at generation time. Many orders are in flight at once and every order
+carries its detail object from stage to stage, instead of one full pass (and one re-fetch per order) per stage.
+"""
+
+import asyncio
+import random
+from collections import Counter
+from typing import Any
+
+from apps.medusa.config.constants import ORDER_LIFECYCLE_STAGES, ORDER_PIPELINE_CONCURRENCY
+from apps.medusa.core.generate.generate_orders import select_target_status
+from apps.medusa.core.mark_orders_delivered import mark_fulfillment_delivered
+from apps.medusa.core.mark_orders_fullfilled import create_reservations_for_order, fetch_shipping_options, get_fulfillment_items, get_trendspire_stock_location
+from apps.medusa.core.mark_orders_paid import create_payment_collection, get_order_details, mark_order_as_paid
+from apps.medusa.core.mark_orders_shipped import create_shipment, get_shipment_items
+from apps.medusa.core.orders import build_channel_stock_location_map, create_order, fetch_order_catalog, load_orders_data, prepare_channel_data
+from apps.medusa.utils.api_utils import MedusaAPIUtils
+from common.logger import logger
+
+
+def resolve_target_status(order_data: dict[str, Any]) -> str:
+    """Target stage of an order; orders generated before target statuses existed get one sampled now."""
+    target_status = order_data.get("target_status")
+    return target_status if target_status in ORDER_LIFECYCLE_STAGES else select_target_status()
+
+
+class OrderLifecycle:
+    """Moves single orders through the lifecycle stages, carrying the order detail object forward."""
+
+    def __init__(
+        self,
+        api_utils: MedusaAPIUtils,
+        catalog: dict[str, list[dict[str, Any]]],
+        channel_stock_location_map: dict[str, list[str]],
+        location_id: str | None,
+        shipping_option_id: str | None,
+    ):
+        self.api_utils = api_utils
+        self.catalog = catalog
+        self.channel_stock_location_map = channel_stock_location_map
+        self.channel_data = prepare_channel_data(catalog["sales_channels"], channel_stock_location_map)
+        self.location_id = location_id
+        self.shipping_option_id = shipping_option_id
+        self.inventory_item_cache: dict[str, str | None] = {}
+
+    @property
+    def _http(self) -> tuple:
+        return self.api_utils.session, self.api_utils.auth, self.api_utils.base_url
+
+    async def run(self, order_data: dict[str, Any], target_status: str) -> str | None:
+        """
+        Take one order as far as `target_status`.
+
+        Returns:
+            The last stage the order reached, or None if the draft could not be created
+        """
+        stages = ORDER_LIFECYCLE_STAGES[: ORDER_LIFECYCLE_STAGES.index(target_status) + 1]
+        reached = None
+        order: Any = order_data
+
+        for stage in stages:
+            order = await getattr(self, f"_to_{stage}")(order)
+            if order is None:
+                logger.warning(f"Order for {order_data.get('customer_email', 'N/A')} stopped before '{stage}' (target: {target_status})")
+                break
+            reached = stage
+
+        return reached
+
+    async def _to_draft(self, order_data: dict[str, Any]) -> str | None:
+        session, auth, base_url = self._http
+        return await create_order(
+            order_data,
+            self.catalog["customers"],
+            self.catalog["products"],
+            self.catalog["regions"],
+            self.catalog["stock_locations"],
+            self.channel_data,
+            self.channel_stock_location_map,
+            session,
+            auth,
+            base_url,
+            shipping_option_id=self.shipping_option_id,
+        )
+
+    async def _to_converted(self, draft_order_id: str) -> dict[str, Any] | None:
+        status, response = await self.api_utils._make_post_request(f"/admin/draft-orders/{draft_order_id}/convert-to-order")
+        order_id = ((response or {}).get("order") or {}).get("id") if status in (200, 201) else None
+        if not order_id:
+            return None
+
+        # The one full fetch of this order; later stages update this object instead of re-fetching it
+        return await self.api_utils.fetch_order_by_id(order_id)
+
+    async def _to_fulfilled(self, order: dict[str, Any]) -> dict[str, Any] | None:
+        if not self.location_id or not self.shipping_option_id:
+            return None
+
+        session, auth, base_url = self._http
+        await create_reservations_for_order(order, self.location_id, session, auth, base_url, self.inventory_item_cache)
+
+        fulfillment_items = get_fulfillment_items(order)
+        if not fulfillment_items:
+            return None
+
+        payload = {"location_id": self.location_id, "shipping_option_id": self.shipping_option_id, "no_notification": False, "items": fulfillment_items}
+        status, response = await self.api_utils._make_post_request(f"/admin/orders/{order['id']}/fulfillments", payload)
+        if status not in (200, 201):
+            return None
+
+        updated = (response or {}).get("order") or {}
+        if updated.get("fulfillments"):
+            return {**order, **updated}
+
+        return await self.api_utils.fetch_order_by_id(order["id"])
+
+    async def _to_paid(self, order: dict[str, Any]) -> dict[str, Any] | None:
+        session, auth, base_url = self._http
+
+        if "payment_collections" not in order:
+            order = {**order, **(await get_order_details(order["id"], session, auth, base_url) or {})}
+
+        payment_collections = order.get("payment_collections") or []
+        if payment_collections:
+            payment_collection_id = payment_collections[0].get("id")
+        else:
+            created_collection = await create_payment_collection(order["id"], session, auth, base_url)
+            payment_collection_id = created_collection.get("id") if created_collection else None
+
+        if not payment_collection_id or not await mark_order_as_paid(order["id"], payment_collection_id, session, auth, base_url):
+            return None
+
+        return {**order, "payment_status": "captured"}
+
+    async def _to_shipped(self, order: dict[str, Any]) -> dict[str, Any] | None:
+        session, auth, base_url = self._http
+        fulfillments = []
+
+        for fulfillment in order.get("fulfillments", []):
+            if fulfillment.get("id") and not fulfillment.get("shipped_at"):
+                items = get_shipment_items(order, fulfillment)
+                # A fulfillment without shippable items gets no shipment, so it stays unshipped
+                if items:
+                    if not await create_shipment(order["id"], fulfillment["id"], items, session, auth, base_url):
+                        return None
+                    fulfillment = {**fulfillment, "shipped_at": True}
+            fulfillments.append(fulfillment)
+
+        if not any(fulfillment.get("shipped_at") for fulfillment in fulfillments):
+            return None
+
+        return {**order, "fulfillments": fulfillments}
+
+    async def _to_delivered(self, order: dict[str, Any]) -> dict[str, Any] | None:
+        session, auth, base_url = self._http
+
+        for fulfillment in order.get("fulfillments", []):
+            if fulfillment.get("shipped_at") and not fulfillment.get("delivered_at") and not await mark_fulfillment_delivered(order["id"], fulfillment["id"], session, auth, base_url):
+                return None
+
+        return order
+
+
+async def resolve_shipping_option(api_utils: MedusaAPIUtils, location_id: str | None) -> str | None:
+    """Find the Standard Shipping option of the fulfillment location once, for every order."""
+    if not location_id:
+        return None
+
+    shipping_options = await fetch_shipping_options(location_id, api_utils.session, api_utils.auth, api_utils.base_url)
+    standard_shipping = next((option for option in shipping_options if "standard" in option.get("name", "").lower() and "shipping" in option.get("name", "").lower()), None)
+
+    if not standard_shipping:
+        logger.warning("Standard Shipping option not found, orders will stop after conversion")
+        return None
+
+    return standard_shipping.get("id")
+
+
+async def run_order_lifecycle(concurrency: int = ORDER_PIPELINE_CONCURRENCY) -> dict[str, int]:
+    """
+    Create every generated order and drive it to its target status, with `concurrency` orders in flight.
+
+    Returns:
+        Number of orders whose last reached stage is each lifecycle stage, plus "failed" and "total"
+    """
+    logger.info("=" * 60)
+    logger.info("Starting Order Lifecycle Pipeline")
+    logger.info("=" * 60)
+
+    orders_data = load_orders_data()
+    if not orders_data:
+        return {"total": 0, "failed": 0}
+
+    async with MedusaAPIUtils() as api_utils:
+        catalog = await fetch_order_catalog(api_utils)
+        if not catalog["products"]:
+            logger.warning("No products available. Cannot create orders. Exiting.")
+            return {"total": 0, "failed": 0}
+
+        channel_stock_location_map = await build_channel_stock_location_map(catalog["sales_channels"], api_utils.session, api_utils.auth, api_utils.base_url)
+        location_id = await get_trendspire_stock_location(api_utils)
+        shipping_option_id = await resolve_shipping_option(api_utils, location_id)
+
+        lifecycle = OrderLifecycle(api_utils, catalog, channel_stock_location_map, location_id, shipping_option_id)
+        targets = [resolve_target_status(order_data) for order_data in orders_data]
+        logger.info(f"Target status distribution: {dict(Counter(targets))}")
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        reached_counts: Counter = Counter()
+        completed = 0
+
+        async def process(order_data: dict[str, Any], target_status: str) -> None:
+            nonlocal completed
+            async with semaphore:
+                try:
+                    reached = await lifecycle.run(order_data, target_status)
+                except Exception as e:
+                    logger.error(f"Order for {order_data.get('customer_email', 'N/A')} failed: {e}")
+                    reached = None
+
+            reached_counts[reached or "failed"] += 1
+            completed += 1
+            if completed % 50 == 0 or completed == len(orders_data):
+                logger.info(f"[{completed}/{len(orders_data)}] orders processed")
+
+        # Shuffle so concurrent orders of the same customer don't all hit the API back to back
+        pairs = list(zip(orders_data, targets, strict=True))
+        random.shuffle(pairs)
+        await asyncio.gather(*(process(order_data, target_status) for order_data, target_status in pairs))
+
+    result = {"total": len(orders_data), **{stage: reached_counts[stage] for stage in ORDER_LIFECYCLE_STAGES}, "failed": reached_counts["failed"]}
+
+    target_counts = Counter(targets)
+    for stage in ORDER_LIFECYCLE_STAGES:
+        if target_counts[stage] or reached_counts[stage]:
+            logger.info(f"  {stage:<10} reached {reached_counts[stage]:>5} / target {target_counts[stage]:>5}")
+    logger.info(f"Order lifecycle completed - {result}")
+    logger.info("=" * 60)
+    logger.info("Order Lifecycle Pipeline Completed")
+    logger.info("=" * 60)
+
+    return result
+
+
+if __name__ == "__main__":
+    asyncio.run(run_order_lifecycle())
@@ -146,8 +146,14 @@ async def create_order(
     session: aiohttp.ClientSession,
     auth,
     base_url: str,
-) -> bool:
-    """Create a single order via Medusa API with retry logic."""
+    shipping_option_id: str | None = None,
+) -> str | None:
+    """
+    Create a single draft order via Medusa API with retry logic.
+
+    When `shipping_option_id` is given the shipping method is added in the same edit session as the items.
+    Returns the draft order ID, or None if the order could not be created.
+    """
     try:
         customer = None
         if order_data.get("customer_email"):
@@ -186,24 +192,24 @@ async def create_order(
         async with session.post(url, json=payload, headers=headers) as response:
             if response.status not in (200, 201):
                 logger.error("Failed to create draft order")
-                return False
+                return None
 
             result = await response.json()
             draft_order_id = result.get("draft_order", {}).get("id")
 
             if not draft_order_id:
-                return False
+                return None
 
             # Start edit session
             url = f"{base_url}/admin/draft-orders/{draft_order_id}/edit"
             async with session.post(url, headers=headers) as edit_response:
                 if edit_response.status not in (200, 201):
-                    return False
+                    return None
 
             # Add items
             items = select_random_items(order_data, products_cache, sales_channel_id, channel_stock_location_map, stock_locations_cache)
             if not items:
-                return False
+                return None
 
             url = f"{base_url}/admin/draft-orders/{draft_order_id}/edit/items"
             payload = {"items": items}
@@ -217,31 +223,68 @@ async def create_order(
                             payload = {"items": items_no_channel}
                             async with session.post(url, json=payload, headers=headers) as retry_response:
                                 if retry_response.status not in (200, 201):
-                                    return False
+                                    return None
                         else:
-                            return False
+                            return None
                     else:
-                        return False
+                        return None
+
+            if shipping_option_id:
+                url = f"{base_url}/admin/draft-orders/{draft_order_id}/edit/shipping-methods"
+                async with session.post(url, json={"shipping_option_id": shipping_option_id}, headers=headers) as shipping_response:
+                    if shipping_response.status not in (200, 201):
+                        logger.warning(f"Failed to add shipping method to draft order {draft_order_id}")
 
             # Request confirmation
             url = f"{base_url}/admin/draft-orders/{draft_order_id}/edit/request"
             async with session.post(url, headers=headers) as request_response:
                 if request_response.status not in (200, 201):
-                    return False
+                    return None
 
             # Confirm edit
             url = f"{base_url}/admin/draft-orders/{draft_order_id}/edit/confirm"
             async with session.post(url, headers=headers) as confirm_response:
                 if confirm_response.status not in (200, 201):
-                    return False
+                    return None
 
-            return True
+            return draft_order_id
 
     except Exception as e:
         logger.error(f"Error creating order: {e}")
         raise
 
 
+async def fetch_order_catalog(api_utils: MedusaAPIUtils) -> dict[str, list[dict[str, Any]]]:
+    """Fetch the customers, products, USD regions, sales channels and stock locations orders are built from."""
+    logger.info("Fetching catalog data from Medusa API...")
+
+    customers_cache = await api_utils._fetch_with_pagination("/admin/customers", "customers", initial_limit=1000)
+    products_cache = await api_utils.fetch_products(limit=1000)
+    regions = await api_utils.fetch_regions()
+    sales_channels_cache = await api_utils.fetch_sales_channels()
+    stock_locations_cache = await api_utils.fetch_stock_locations()
+
+    usd_regions = [r for r in regions if r.get("currency_code", "").upper() == "USD"]
+    regions_cache = usd_regions if usd_regions else []
+
+    logger.info(
+        f"Successfully fetched catalog data - "
+        f"Customers: {len(customers_cache)}, "
+        f"Products: {len(products_cache)}, "
+        f"USD Regions: {len(regions_cache)}, "
+        f"Sales Channels: {len(sales_channels_cache)}, "
+        f"Stock Locations: {len(stock_locations_cache)}"
+    )
+
+    return {
+        "customers": customers_cache,
+        "products": products_cache,
+        "regions": regions_cache,
+        "sales_channels": sales_channels_cache,
+        "stock_locations": stock_locations_cache,
+    }
+
+
 async def seed_orders() -> dict[str, int]:
     logger.info("=" * 60)
     logger.info("Starting Order Seeding Script")
@@ -250,26 +293,12 @@ async def seed_orders() -> dict[str, int]:
     orders_data = load_orders_data()
 
     async with MedusaAPIUtils() as api_utils:
-        # Fetch all catalog data
-        logger.info("Fetching catalog data from Medusa API...")
-
-        customers_cache = await api_utils._fetch_with_pagination("/admin/customers", "customers", initial_limit=1000)
-        products_cache = await api_utils.fetch_products(limit=1000)
-        regions = await api_utils.fetch_regions()
-        sales_channels_cache = await api_utils.fetch_sales_channels()
-        stock_locations_cache = await api_utils.fetch_stock_locations()
-
-        usd_regions = [r for r in regions if r.get("currency_code", "").upper() == "USD"]
-        regions_cache = usd_regions if usd_regions else []
-
-        logger.info(
-            f"Successfully fetched catalog data - "
-            f"Customers: {len(customers_cache)}, "
-            f"Products: {len(products_cache)}, "
-            f"USD Regions: {len(regions_cache)}, "
-            f"Sales Channels: {len(sales_channels_cache)}, "
-            f"Stock Locations: {len(stock_locations_cache)}"
-        )
+        catalog = await fetch_order_catalog(api_utils)
+        customers_cache = catalog["customers"]
+        products_cache = catalog["products"]
+        regions_cache = catalog["regions"]
+        sales_channels_cache = catalog["sales_channels"]
+        stock_locations_cache = catalog["stock_locations"]
 
         if not orders_data:
             logger.warning("No orders to create. Exiting.")
@@ -4,11 +4,7 @@ import asyncio
 import random
 from typing import Any
 
-import requests
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
-
 from apps.medusa.config.constants import PRICE_LIST_CONFIGS
-from apps.medusa.utils.api_auth import get_medusa_auth_headers, get_medusa_base_url
 from apps.medusa.utils.api_utils import MedusaAPIUtils
 from common.logger import logger
 
@@ -41,51 +37,48 @@ def generate_prices(config: dict[str, Any], products: list[dict[str, Any]]) -> l
     return prices
 
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type((requests.exceptions.RequestException, requests.exceptions.Timeout)),
-    reraise=True,
-)
-async def create_price_list(session: Any, price_list_data: dict[str, Any]) -> bool:
-    """Create a price list in Medusa."""
-    if not session:
+async def create_price_list(api_utils: MedusaAPIUtils, price_list_data: dict[str, Any]) -> bool:
+    """
+    Create a price list in Medusa.
+
+    The list itself is created without prices; its prices are then added through the
+    price list batch route, which chunks them and reports the ones that failed.
+    """
+    payload = {
+        "title": price_list_data["title"],
+        "type": price_list_data.get("type", "sale"),
+        "status": price_list_data.get("status", "active"),
+    }
+
+    if price_list_data.get("description"):
+        payload["description"] = price_list_data["description"]
+    if price_list_data.get("starts_at"):
+        payload["starts_at"] = price_list_data["starts_at"]
+    if price_list_data.get("ends_at"):
+        payload["ends_at"] = price_list_data["ends_at"]
+    if price_list_data.get("rules"):
+        payload["rules"] = price_list_data["rules"]
+
+    status, response = await api_utils._make_post_request("/admin/price-lists", payload)
+    price_list_id = ((response or {}).get("price_list") or {}).get("id") if status in (200, 201) else None
+    if not price_list_id:
         return False
 
-    try:
-        payload = {
-            "title": price_list_data["title"],
-            "type": price_list_data.get("type", "sale"),
-            "status": price_list_data.get("status", "active"),
-        }
-
-        if price_list_data.get("description"):
-            payload["description"] = price_list_data["description"]
-        if price_list_data.get("starts_at"):
-            payload["starts_at"] = price_list_data["starts_at"]
-        if price_list_data.get("ends_at"):
-            payload["ends_at"] = price_list_data["ends_at"]
-        if price_list_data.get("prices"):
-            payload["prices"] = price_list_data["prices"]
-        if price_list_data.get("rules"):
-            payload["rules"] = price_list_data["rules"]
-
-        base_url = get_medusa_base_url()
-        url = f"{base_url}/admin/price-lists"
-        headers = get_medusa_auth_headers()
-
-        async with session.post(url, json=payload, headers=headers) as response:
-            return response.status in (200, 201)
-
-    except Exception:
-        return False
+    prices = price_list_data.get("prices") or []
+    if not prices:
+        return True
+
+    result = await api_utils.batch_price_list_prices(price_list_id, create=prices)
+    if result["failed"]:
+        logger.warning(f"Price list '{payload['title']}': {len(result['failed'])} of {len(prices)} prices failed")
+
+    return len(result["created"]) > 0
 
 
-async def seed_price_lists_internal(session: Any) -> dict[str, int]:
+async def seed_price_lists_internal(api_utils: MedusaAPIUtils) -> dict[str, int]:
     """Internal function to seed price lists."""
-    async with MedusaAPIUtils() as api_utils:
-        products = await api_utils.fetch_products()
-        sales_channels = await api_utils.fetch_sales_channels()
+    products = await api_utils.fetch_products()
+    sales_channels = await api_utils.fetch_sales_channels()
 
     if not products or not sales_channels:
         return {"total": 0, "successful": 0, "failed": 0}
@@ -94,7 +87,7 @@ async def seed_price_lists_internal(session: Any) -> dict[str, int]:
 
     logger.info(f"Seeding price lists: {len(PRICE_LIST_CONFIGS)} total")
 
-    successful = 0
+    price_lists = []
     failed = 0
 
     for config in PRICE_LIST_CONFIGS:
@@ -112,39 +105,32 @@ async def seed_price_lists_internal(session: Any) -> dict[str, int]:
 
         prices = generate_prices(config, products)
 
-        price_list_data = {
-            "title": price_list_name,
-            "description": config.get("description", ""),
-            "type": config.get("type", "sale"),
-            "status": config.get("status", "active"),
-            "prices": prices,
-            "rules": {"sales_channel_id": [sales_channel["id"]]},
-        }
+        price_lists.append(
+            {
+                "title": price_list_name,
+                "description": config.get("description", ""),
+                "type": config.get("type", "sale"),
+                "status": config.get("status", "active"),
+                "prices": prices,
+                "rules": {"sales_channel_id": [sales_channel["id"]]},
+            }
+        )
 
-        result = await create_price_list(session, price_list_data)
+    # Price lists are independent of each other, so create them (and their price batches) concurrently
+    results = await asyncio.gather(*(create_price_list(api_utils, price_list_data) for price_list_data in price_lists))
 
-        if result:
-            successful += 1
-        else:
-            failed += 1
+    successful = sum(results)
+    failed += len(results) - successful
 
     logger.info(f"Seeded price lists: {successful} successful, {failed} failed")
 
     return {"total": len(PRICE_LIST_CONFIGS), "successful": successful, "failed": failed}
 
 
-@retry(
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    stop=stop_after_attempt(3),
-    retry=retry_if_exception_type((requests.exceptions.RequestException, requests.exceptions.Timeout)),
-    reraise=True,
-)
 async def seed_price_lists():
     """Seed price lists in Medusa."""
-    import aiohttp
-
-    async with aiohttp.ClientSession() as session:
-        return await seed_price_lists_internal(session)
+    async with MedusaAPIUtils() as api_utils:
+        return await seed_price_lists_internal(api_utils)
 
 
 if __name__ == "__main__":
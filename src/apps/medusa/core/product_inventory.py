@@ -1,10 +1,11 @@
 import asyncio
 import random
+from collections import defaultdict
 from typing import Any
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
-from apps.medusa.utils.api_auth import BaseMedusaAPI
+from apps.medusa.config.constants import BATCH_REQUEST_CONCURRENCY
 from apps.medusa.utils.api_utils import MedusaAPIUtils
 from common.logger import logger
 
@@ -41,102 +42,37 @@ async def get_product_variants(session, auth, base_url: str, product_id: str) ->
         return []
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), retry=retry_if_exception_type(Exception))
-async def update_location_level(session, auth, base_url: str, inventory_item_id: str, location_level_id: str, quantity: int | None = None) -> bool:
-    """Update inventory quantity for an existing location level."""
-    if not session or not auth:
-        return False
-
-    if quantity is None:
-        quantity = random.randint(100, 500)
-
-    url = f"{base_url}/admin/inventory-items/{inventory_item_id}/location-levels/{location_level_id}"
-    headers = auth.get_auth_headers()
-    payload = {"stocked_quantity": quantity}
-
-    async with session.post(url, headers=headers, json=payload) as response:
-        return response.status in (200, 201)
+def plan_location_levels(variants: list[dict[str, Any]], stock_locations: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Plan the location level writes for a product's variants.
 
+    Existing levels at known stock locations get a new quantity; inventory items without one
+    get a level at the first stock location.
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10), retry=retry_if_exception_type(Exception))
-async def create_location_level(session, auth, base_url: str, inventory_item_id: str, location_id: str, quantity: int | None = None) -> bool:
-    """Create a new location level for an inventory item."""
-    if not session or not auth:
-        return False
-
-    if quantity is None:
-        quantity = random.randint(100, 500)
-
-    url = f"{base_url}/admin/inventory-items/{inventory_item_id}/location-levels"
-    headers = auth.get_auth_headers()
-    payload = {"location_id": location_id, "stocked_quantity": quantity}
+    Returns:
+        (levels to create, levels to update), both keyed by inventory_item_id + location_id
+    """
+    valid_location_ids = {loc.get("id") for loc in stock_locations}
+    fallback_location_id = stock_locations[0].get("id") if stock_locations else None
+    creates: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
 
-    async with session.post(url, headers=headers, json=payload) as response:
-        return response.status in (200, 201)
-
-
-async def update_inventory(session, auth, base_url: str, product: dict[str, Any], stock_locations: list[dict[str, Any]]) -> bool:
-    """Update inventory for a single product and its variants."""
-    if not session or not auth:
-        return False
-
-    product_id = product.get("id")
-    if not product_id:
-        return False
+    for variant in variants:
+        for inventory_item in variant.get("inventory_items", []) or []:
+            inventory_item_id = inventory_item.get("inventory_item_id") or inventory_item.get("id")
+            if not inventory_item_id:
+                continue
 
-    try:
-        variants = await get_product_variants(session, auth, base_url, product_id)
-        if not variants:
-            return False
+            location_levels = (inventory_item.get("inventory") or {}).get("location_levels", [])
+            existing_location_ids = [level.get("location_id") for level in location_levels if level.get("id") and level.get("location_id") in valid_location_ids]
 
-        valid_location_ids = {loc.get("id") for loc in stock_locations}
-        success_count = 0
+            for location_id in existing_location_ids:
+                updates.append({"inventory_item_id": inventory_item_id, "location_id": location_id, "stocked_quantity": random.randint(100, 500)})
 
-        for variant in variants:
-            inventory_items = variant.get("inventory_items", [])
-            if not inventory_items:
-                continue
+            if not existing_location_ids and fallback_location_id:
+                creates.append({"inventory_item_id": inventory_item_id, "location_id": fallback_location_id, "stocked_quantity": random.randint(100, 500)})
 
-            for inventory_item in inventory_items:
-                inventory_item_id = inventory_item.get("inventory_item_id") or inventory_item.get("id")
-                if not inventory_item_id:
-                    continue
-
-                inventory_details = inventory_item.get("inventory", {})
-                location_levels = inventory_details.get("location_levels", [])
-
-                if location_levels:
-                    updated_any = False
-                    for location_level in location_levels:
-                        location_id = location_level.get("location_id")
-                        location_level_id = location_level.get("id")
-
-                        if location_id in valid_location_ids and location_level_id:
-                            result = await update_location_level(session, auth, base_url, inventory_item_id, location_level_id)
-                            if result:
-                                success_count += 1
-                                updated_any = True
-
-                    if not updated_any and stock_locations:
-                        first_location = stock_locations[0]
-                        location_id = first_location.get("id")
-                        if location_id:
-                            result = await create_location_level(session, auth, base_url, inventory_item_id, location_id)
-                            if result:
-                                success_count += 1
-                else:
-                    if stock_locations:
-                        first_location = stock_locations[0]
-                        location_id = first_location.get("id")
-                        if location_id:
-                            result = await create_location_level(session, auth, base_url, inventory_item_id, location_id)
-                            if result:
-                                success_count += 1
-
-        return success_count > 0
-
-    except Exception:
-        return False
+    return creates, updates
 
 
 async def update_product_inventory() -> dict[str, int]:
@@ -155,25 +91,55 @@ async def update_product_inventory() -> dict[str, int]:
         total = len(products)
         logger.info(f"Starting inventory update process - Total products: {total}")
 
-        successful = 0
-        failed = 0
-
-        # Use BaseMedusaAPI context for session and auth
-        async with BaseMedusaAPI() as medusa_api:
-            for idx, product in enumerate(products, 1):
-                product_title = product.get("title", "Unknown")
-                product_id = product.get("id", "N/A")
-
-                logger.info(f"[{idx}/{total}] Updating inventory for product: '{product_title}' (ID: {product_id})")
-
-                result = await update_inventory(medusa_api.session, medusa_api.auth, medusa_api.base_url, product, stock_locations)
-
-                if result:
-                    successful += 1
-                    logger.info(f"[{idx}/{total}] ✓ Successfully updated inventory for: '{product_title}'")
-                else:
-                    failed += 1
-                    logger.error(f"[{idx}/{total}] ✗ Failed to update inventory for: '{product_title}'")
+        # Variant lookups are independent per product, so run them with bounded concurrency
+        semaphore = asyncio.Semaphore(BATCH_REQUEST_CONCURRENCY * 2)
+
+        async def fetch_variants(product: dict[str, Any]) -> list[dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await get_product_variants(api_utils.session, api_utils.auth, api_utils.base_url, product["id"])
+                except Exception as e:
+                    logger.error(f"Failed to fetch variants for '{product.get('title', 'Unknown')}': {e}")
+                    return []
+
+        products = [product for product in products if product.get("id")]
+        variants_by_product = await asyncio.gather(*(fetch_variants(product) for product in products))
+
+        creates: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        product_by_level: dict[tuple[str, str], str] = {}
+        planned_products: set[str] = set()
+
+        for product, variants in zip(products, variants_by_product, strict=True):
+            product_creates, product_updates = plan_location_levels(variants, stock_locations)
+            for level in product_creates + product_updates:
+                product_by_level[(level["inventory_item_id"], level["location_id"])] = product["id"]
+            if product_creates or product_updates:
+                planned_products.add(product["id"])
+            creates.extend(product_creates)
+            updates.extend(product_updates)
+
+        logger.info(f"Writing {len(creates)} new and {len(updates)} existing location levels in batches")
+        result = await api_utils.batch_location_levels(create=creates, update=updates)
+
+        # A product counts as updated when at least one of its levels was written
+        failed_levels: dict[str, int] = defaultdict(int)
+        for failure in result["failed"]:
+            product_id = product_by_level.get((failure["item"]["inventory_item_id"], failure["item"]["location_id"]))
+            failed_levels[product_id] += 1
+
+        planned_levels: dict[str, int] = defaultdict(int)
+        for product_id in product_by_level.values():
+            planned_levels[product_id] += 1
+
+        successful = sum(1 for product_id in planned_products if failed_levels[product_id] < planned_levels[product_id])
+        failed = total - successful
+
+        for product in products:
+            if product["id"] not in planned_products:
+                logger.error(f"✗ No inventory items to update for: '{product.get('title', 'Unknown')}'")
+            elif failed_levels[product["id"]] >= planned_levels[product["id"]]:
+                logger.error(f"✗ Failed to update inventory for: '{product.get('title', 'Unknown')}'")
 
         logger.info(f"Inventory update completed - Total: {total}, Successful: {successful}, Failed: {failed}, Success Rate: {(successful / total * 100):.1f}%")
 
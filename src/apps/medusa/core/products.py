@@ -1,10 +1,7 @@
 import asyncio
 from typing import Any
 
-from tenacity import retry, stop_after_attempt, wait_exponential
-
 from apps.medusa.config.settings import settings
-from apps.medusa.utils.api_auth import get_medusa_auth_headers, get_medusa_base_url
 from apps.medusa.utils.api_utils import MedusaAPIUtils
 from apps.medusa.utils.data_utils import load_json_file
 from common.logger import logger
@@ -211,32 +208,13 @@ def prepare_product_payload(product_data: dict[str, Any], mappings: dict[str, di
     return payload
 
 
-@retry(wait=wait_exponential(multiplier=1, min=2, max=10), stop=stop_after_attempt(3))
-async def create_product(session: Any, product_data: dict[str, Any], mappings: dict[str, dict[str, str]]) -> bool:
-    """Create a product in Medusa."""
-    if not session:
-        return False
-
-    try:
-        payload = prepare_product_payload(product_data, mappings)
-
-        base_url = get_medusa_base_url()
-        url = f"{base_url}/admin/products"
-        headers = get_medusa_auth_headers()
-
-        async with session.post(url, json=payload, headers=headers) as response:
-            if response.status in (200, 201):
-                return True
-            else:
-                response_data = await response.json()
-                return bool(response_data.get("type") == "invalid_data" and "already exists" in response_data.get("message", "").lower())
+def _is_existing_product_error(error: str) -> bool:
+    """Products that already exist count as seeded, so reruns stay idempotent."""
+    return "invalid_data" in error and "already exists" in error.lower()
 
-    except Exception:
-        return False
 
-
-async def seed_products_internal(session: Any, products: list[dict[str, Any]], mappings: dict[str, dict[str, str]]) -> dict[str, int]:
-    """Internal function to seed products."""
+async def seed_products_internal(api_utils: MedusaAPIUtils, products: list[dict[str, Any]], mappings: dict[str, dict[str, str]]) -> dict[str, int]:
+    """Internal function to seed products through the batch endpoint."""
     if not products:
         logger.warning("No products to seed")
         return {"total": 0, "successful": 0, "failed": 0}
@@ -244,21 +222,28 @@ async def seed_products_internal(session: Any, products: list[dict[str, Any]], m
     total = len(products)
     logger.info(f"Starting product seeding process - Total products: {total}")
 
-    successful = 0
+    payloads = []
     failed = 0
+    for product in products:
+        try:
+            payloads.append(prepare_product_payload(product, mappings))
+        except ValueError as e:
+            failed += 1
+            logger.error(f"✗ Skipping product '{product.get('title', 'Unknown')}': {e}")
 
-    for idx, product in enumerate(products, 1):
-        product_title = product.get("title", "Unknown")
-        logger.info(f"[{idx}/{total}] Seeding product: '{product_title}'")
-
-        result = await create_product(session, product, mappings)
+    result = await api_utils.batch_products(create=payloads)
 
-        if result:
-            successful += 1
-            logger.info(f"[{idx}/{total}] ✓ Successfully seeded: '{product_title}'")
+    existing = 0
+    for failure in result["failed"]:
+        product_title = failure["item"].get("title", "Unknown")
+        if _is_existing_product_error(failure["error"]):
+            existing += 1
+            logger.info(f"Product already exists: '{product_title}'")
         else:
             failed += 1
-            logger.error(f"[{idx}/{total}] ✗ Failed to seed: '{product_title}'")
+            logger.error(f"✗ Failed to seed: '{product_title}' - {failure['error']}")
+
+    successful = len(result["created"]) + existing
 
     logger.info(f"Product seeding completed - Total: {total}, Successful: {successful}, Failed: {failed}, Success Rate: {(successful / total * 100):.1f}%")
 
@@ -267,8 +252,6 @@ async def seed_products_internal(session: Any, products: list[dict[str, Any]], m
 
 async def seed_products():
     """Seed products into Medusa."""
-    import aiohttp
-
     logger.info("=" * 60)
     logger.info("Starting Product Seeding Script")
     logger.info("=" * 60)
@@ -281,8 +264,8 @@ async def seed_products():
     medusa_data = await load_medusa_data()
     mappings = build_mapping_dictionaries(medusa_data)
 
-    async with aiohttp.ClientSession() as session:
-        result = await seed_products_internal(session, products, mappings)
+    async with MedusaAPIUtils() as api_utils:
+        result = await seed_products_internal(api_utils, products, mappings)
 
     logger.info("=" * 60)
     logger.info("Product Seeding Script Completed")
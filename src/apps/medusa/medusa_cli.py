@@ -6,11 +6,9 @@ from pathlib import Path
 import click
 
 from apps.medusa.config.constants import RANDOM_SEED
-from apps.medusa.core.add_shipping_options import add_shipping_to_draft_orders
 from apps.medusa.core.attributes import seed_product_attributes
 from apps.medusa.core.categories import seed_categories
 from apps.medusa.core.collections import seed_collections
-from apps.medusa.core.convert_draft_orders import convert_draft_orders
 from apps.medusa.core.customer_groups import seed_customer_groups
 from apps.medusa.core.customers import seed_customers
 from apps.medusa.core.delete_existing_categories import delete_existing_categories
@@ -27,11 +25,7 @@ from apps.medusa.core.generate.generate_tags import tags
 from apps.medusa.core.generate.generate_types import types
 from apps.medusa.core.generate.products_mapping import products_mapping
 from apps.medusa.core.mark_categories_inactive import deactivate_empty_categories
-from apps.medusa.core.mark_orders_delivered import mark_orders_as_delivered
-from apps.medusa.core.mark_orders_fullfilled import mark_orders_as_fulfilled
-from apps.medusa.core.mark_orders_paid import mark_orders_as_paid
-from apps.medusa.core.mark_orders_shipped import mark_orders_as_shipped
-from apps.medusa.core.orders import seed_orders
+from apps.medusa.core.order_lifecycle import run_order_lifecycle
 from apps.medusa.core.price_lists import seed_price_lists
 from apps.medusa.core.product_inventory import seed_product_inventory
 from apps.medusa.core.products import seed_products
@@ -48,6 +42,7 @@ from apps.medusa.core.tags import seed_tags
 from apps.medusa.core.tax_region import seed_tax_region
 from apps.medusa.core.types import seed_types
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -86,6 +81,16 @@ def down():
     logger.succeed("✅ Cleanup completed!")
 
 
+add_snapshot_commands(
+    medusa_cli,
+    SnapshotSpec(
+        app="medusa",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="postgres",
+    ),
+)
+
+
 @medusa_cli.command()
 def seed():
     """Seed Medusa with sample data"""
@@ -119,13 +124,7 @@ def seed():
         await seed_product_attributes()
         await seed_price_lists()
         await seed_promotions()
-        await seed_orders()
-        await add_shipping_to_draft_orders()
-        await convert_draft_orders()
-        await mark_orders_as_fulfilled()
-        await mark_orders_as_paid()
-        await mark_orders_as_shipped()
-        await mark_orders_as_delivered()
+        await run_order_lifecycle()
 
         logger.succeed("✅ Medusa data seeding completed!")
 
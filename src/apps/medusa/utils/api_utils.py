@@ -5,6 +5,13 @@ from typing import Any
 
 import aiohttp
 
+from apps.medusa.config.constants import (
+    BATCH_REQUEST_CONCURRENCY,
+    LOCATION_LEVELS_BATCH_CHUNK_SIZE,
+    PAGINATION_CONCURRENCY,
+    PRICES_BATCH_CHUNK_SIZE,
+    PRODUCTS_BATCH_CHUNK_SIZE,
+)
 from apps.medusa.config.settings import settings
 from apps.medusa.utils.api_auth import authenticate_async
 from common.logger import logger
@@ -70,7 +77,12 @@ class MedusaAPIUtils:
             return 0, None
 
     async def _fetch_with_pagination(self, endpoint: str, result_key: str, initial_limit: int = 1000) -> list[dict[str, Any]]:
-        """Fetch data with smart pagination."""
+        """
+        Fetch data with smart pagination.
+
+        Once the first page reports the total `count`, the remaining pages are fetched concurrently
+        (PAGINATION_CONCURRENCY at a time); without a count it falls back to walking pages in order.
+        """
         result = await self._make_get_request(endpoint, {"limit": initial_limit})
 
         if not result:
@@ -78,8 +90,34 @@ class MedusaAPIUtils:
             return []
 
         items = result.get(result_key, [])
+        count = result.get("count")
+
+        if isinstance(count, int) and len(items) < count and items:
+            logger.debug(f"Large dataset detected ({count} {result_key}), fetching remaining pages concurrently...")
+            semaphore = asyncio.Semaphore(PAGINATION_CONCURRENCY)
+            # The server may cap the limit below the one asked for, so the first page's size is the real page size
+            page = len(items)
+
+            async def fetch_page(offset: int) -> list[dict[str, Any]]:
+                async with semaphore:
+                    page_result = await self._make_get_request(endpoint, {"limit": page, "offset": offset})
+                return page_result.get(result_key, []) if page_result else []
+
+            pages = await asyncio.gather(*(fetch_page(offset) for offset in range(page, count, page)))
+            for page_items in pages:
+                items.extend(page_items)
+
+            if len(items) != count:
+                logger.warning(f"Fetched {len(items)} of {count} {result_key} concurrently, fetching them again page by page...")
+                items = []
+                while True:
+                    page_result = await self._make_get_request(endpoint, {"limit": page, "offset": len(items)})
+                    page_items = page_result.get(result_key, []) if page_result else []
+                    items.extend(page_items)
+                    if len(page_items) < page:
+                        break
 
-        if len(items) == initial_limit:
+        elif count is None and len(items) == initial_limit:
             logger.debug("Large dataset detected, using pagination...")
             offset = initial_limit
             limit = 100
@@ -104,6 +142,86 @@ class MedusaAPIUtils:
         logger.info(f"Fetched {len(items)} {result_key}")
         return items
 
+    async def _post_batch_chunk(self, endpoint: str, operation: str, chunk: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Send one chunk of a batch operation, bisecting on failure so one bad item doesn't sink the whole chunk.
+
+        Returns:
+            (records the API returned for the operation, failed items with their error)
+        """
+        try:
+            headers = self.auth.get_auth_headers()
+            async with self.session.post(f"{self.base_url}{endpoint}", headers=headers, json={operation: chunk}) as response:
+                if response.status in (200, 201):
+                    result = await response.json()
+                    # Batch routes answer with "created" / "updated" lists
+                    return result.get(f"{operation}d", []), []
+                error = f"{response.status} - {await response.text()}"
+        except Exception as e:
+            error = str(e)
+
+        if len(chunk) == 1:
+            return [], [{"operation": operation, "item": chunk[0], "error": error}]
+
+        middle = len(chunk) // 2
+        left_done, left_failed = await self._post_batch_chunk(endpoint, operation, chunk[:middle])
+        right_done, right_failed = await self._post_batch_chunk(endpoint, operation, chunk[middle:])
+        return left_done + right_done, left_failed + right_failed
+
+    async def _batch_request(
+        self,
+        endpoint: str,
+        create: list[dict[str, Any]] | None = None,
+        update: list[dict[str, Any]] | None = None,
+        chunk_size: int = 100,
+        concurrency: int = BATCH_REQUEST_CONCURRENCY,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Run create/update operations against a Medusa `/batch` route.
+
+        Items are split into `chunk_size` requests with at most `concurrency` in flight. Medusa applies
+        each request in one transaction, so a failing chunk is bisected until the offending items are isolated.
+
+        Returns:
+            {"created": [...], "updated": [...], "failed": [{"operation", "item", "error"}, ...]}
+        """
+        if not self.auth or not self.session:
+            raise RuntimeError("API utilities not initialized. Use async context manager.")
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def send(operation: str, chunk: list[dict[str, Any]]) -> tuple[str, list[dict[str, Any]], list[dict[str, Any]]]:
+            async with semaphore:
+                done, failed = await self._post_batch_chunk(endpoint, operation, chunk)
+            return operation, done, failed
+
+        chunks = [(operation, items[i : i + chunk_size]) for operation, items in (("create", create or []), ("update", update or [])) for i in range(0, len(items), chunk_size)]
+        results = await asyncio.gather(*(send(operation, chunk) for operation, chunk in chunks))
+
+        result: dict[str, list[dict[str, Any]]] = {"created": [], "updated": [], "failed": []}
+        for operation, done, failed in results:
+            result[f"{operation}d"].extend(done)
+            result["failed"].extend(failed)
+
+        if result["failed"]:
+            logger.warning(f"{endpoint}: {len(result['failed'])} of {len(create or []) + len(update or [])} items failed")
+            for failure in result["failed"][:5]:
+                logger.debug(f"{endpoint} {failure['operation']} failed: {failure['error']}")
+
+        return result
+
+    async def batch_products(self, create: list[dict[str, Any]] | None = None, update: list[dict[str, Any]] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Create and/or update products through /admin/products/batch."""
+        return await self._batch_request("/admin/products/batch", create=create, update=update, chunk_size=PRODUCTS_BATCH_CHUNK_SIZE)
+
+    async def batch_location_levels(self, create: list[dict[str, Any]] | None = None, update: list[dict[str, Any]] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Create and/or update inventory location levels (keyed by inventory_item_id + location_id) in bulk."""
+        return await self._batch_request("/admin/inventory-items/location-levels/batch", create=create, update=update, chunk_size=LOCATION_LEVELS_BATCH_CHUNK_SIZE)
+
+    async def batch_price_list_prices(self, price_list_id: str, create: list[dict[str, Any]] | None = None, update: list[dict[str, Any]] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Add and/or update the prices of a price list in bulk."""
+        return await self._batch_request(f"/admin/price-lists/{price_list_id}/prices/batch", create=create, update=update, chunk_size=PRICES_BATCH_CHUNK_SIZE)
+
     async def fetch_categories(self) -> list[dict[str, Any]]:
         """Fetch all existing categories from Medusa API."""
         result = await self._make_get_request("/admin/product-categories")
@@ -10,6 +10,14 @@ from apps.odoohr.utils.odoo import OdooClient
 from common.logger import logger
 
 
+# Button methods that take a "To Approve" leave to each seeded end state
+LEAVE_TRANSITION_PATHS = {
+    "validate": ["action_approve", "action_validate"],
+    "refuse": ["action_refuse"],
+    "cancel": ["action_refuse", "action_cancel"],
+}
+
+
 async def insert_time_off(count=30):
     time_off_config = load_json(settings.DATA_PATH.joinpath("time_off.json"))
 
@@ -66,23 +74,11 @@ async def insert_time_off(count=30):
         approved = ids_to_diversify[8:18]
         refused = ids_to_diversify[18:25]
         cancelled = ids_to_diversify[25:30]
-        for leave_id in approved:
-            try:
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_approve", [[leave_id]])
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_validate", [[leave_id]])
-            except Exception:
-                continue
-        for leave_id in refused:
-            try:
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_refuse", [[leave_id]])
-            except Exception:
-                continue
-        for leave_id in cancelled:
-            try:
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_refuse", [[leave_id]])
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_cancel", [[leave_id]])
-            except Exception:
-                continue
+
+        planner = client.plan_transitions(HRModelName.HR_LEAVE.value, LEAVE_TRANSITION_PATHS)
+        planner.add("validate", approved).add("refuse", refused).add("cancel", cancelled)
+        result = await planner.run()
+        logger.info(f"Time off transitions: {result.summary()}")
     logger.succeed(f"Inserted {len(inserted_ids)} time off records")
 
 
@@ -96,17 +92,18 @@ async def delete_time_off():
         if not time_offs:
             return
 
-        # Reset any non-draft/confirm records to draft
-        refused_ids = [t["id"] for t in time_offs if t["state"] == "refuse"]
-        cancelled_ids = [t["id"] for t in time_offs if t["state"] == "cancel"]
-        non_confirmed_ids = [t["id"] for t in time_offs if t["state"] != "confirm"]
-        if refused_ids or cancelled_ids:
-            for leave_id in refused_ids + cancelled_ids:
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_reset_confirm", [[leave_id]])
-        if non_confirmed_ids:
-            for leave_id in non_confirmed_ids:
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_refuse", [[leave_id]])
-                await client.execute_kw(HRModelName.HR_LEAVE.value, "action_reset_confirm", [[leave_id]])
+        # Reset any non-draft/confirm records to draft; refused and cancelled ones must be reset before they can be refused again
+        planner = client.plan_transitions(
+            HRModelName.HR_LEAVE.value,
+            {
+                "reset": ["action_refuse", "action_reset_confirm"],
+                "reset_refused": ["action_reset_confirm", "action_refuse", "action_reset_confirm"],
+            },
+        )
+        planner.add("reset", [t["id"] for t in time_offs if t["state"] != "confirm"])
+        planner.add("reset_refused", [t["id"] for t in time_offs if t["state"] in ("refuse", "cancel")])
+        await planner.run()
+
         # Now delete all time off records
         all_ids = [t["id"] for t in time_offs]
         await client.unlink(HRModelName.HR_LEAVE.value, all_ids)
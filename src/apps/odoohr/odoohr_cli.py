@@ -19,6 +19,7 @@ from apps.odoohr.core.time_off import insert_time_off
 from apps.odoohr.core.time_off_type import insert_time_off_types
 from apps.odoohr.core.working_schedule import insert_working_schedules
 from apps.odoohr.utils.odoo import create_odoo_db
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 # from apps.odoohr.generators.candidate import generate_candidates
@@ -58,6 +59,17 @@ def down():
     subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    odoohr_cli,
+    SnapshotSpec(
+        app="odoohr",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        volumes=[("odoo", "/var/lib/odoo")],
+    ),
+)
+
+
 # @odoohr_cli.command()
 # @click.option("--n-jobs", type=int, default=40, help="Number of job positions to generate")
 # @click.option("--n-candidates", type=int, default=60, help="Number of candidates to generate")
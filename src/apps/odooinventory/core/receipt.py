@@ -117,25 +117,10 @@ async def insert_receipts():
 async def _process_diversify_chunk(pickings_chunk: list[dict[str, Any]]):
     """Processes a chunk of pickings to diversify their statuses."""
     async with OdooClient() as client:
+        planner = client.plan_transitions(StockModelName.STOCK_PICKING.value, {"assigned": ["action_confirm"], "done": ["button_validate"]})
         for picking in pickings_chunk:
-            try:
-                picking_id = picking["id"]
-                status = faker.random_element(OrderedDict([("assigned", 0.5), ("done", 0.5)]))
-
-                if status == "assigned":
-                    await client.execute_kw(
-                        StockModelName.STOCK_PICKING.value,
-                        "action_confirm",
-                        [picking_id],
-                    )
-                elif status == "done":
-                    await client.execute_kw(
-                        StockModelName.STOCK_PICKING.value,
-                        "button_validate",
-                        [picking_id],
-                    )
-            except Exception:
-                continue
+            planner.add(faker.random_element(OrderedDict([("assigned", 0.5), ("done", 0.5)])), picking["id"])
+        await planner.run()
 
 
 async def diversify_receipt_statuses():
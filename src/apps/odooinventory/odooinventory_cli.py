@@ -37,6 +37,7 @@ from apps.odooinventory.generators.combo import generate_combos
 from apps.odooinventory.generators.product import generate_products
 from apps.odooinventory.generators.work_center import generate_work_centers
 from apps.odooinventory.utils.odoo import create_odoo_db
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -72,6 +73,17 @@ def down():
     subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    odooinventory_cli,
+    SnapshotSpec(
+        app="odooinventory",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        volumes=[("odoo", "/var/lib/odoo")],
+    ),
+)
+
+
 @odooinventory_cli.command()
 @click.option("--n-products", type=int, default=20, help="Number of products to generate")
 @click.option("--n-combo", type=int, default=10, help="Number of combo to generate")
@@ -6,6 +6,7 @@ import requests
 
 from apps.odooinventory.config.settings import settings
 from common.logger import logger
+from common.odoo_transitions import DEFAULT_TRANSITION_CHUNK_SIZE, TransitionPlanner
 
 
 class OdooClient:
@@ -248,6 +249,21 @@ class OdooClient:
 
         return await self.execute_kw(model, "unlink", [ids_list])
 
+    def plan_transitions(self, model: str, paths: dict[str, t.Sequence[str]], chunk_size: int = DEFAULT_TRANSITION_CHUNK_SIZE) -> TransitionPlanner:
+        """
+        Start a batched workflow transition for records of `model`.
+
+        Args:
+            model: Odoo model name
+            paths: Target state -> sequence of button methods that lead to it
+            chunk_size: Maximum number of ids per RPC call
+
+        Returns:
+            TransitionPlanner to declare target states on and run
+        """
+
+        return TransitionPlanner(self, model, paths, chunk_size)
+
 
 def create_odoo_db():
     """Create a new Odoo database using credentials from settings"""
@@ -17,6 +17,7 @@ from apps.odooproject.generators.project import generate_projects
 from apps.odooproject.generators.task import generate_tasks
 from apps.odooproject.generators.user import generate_users
 from apps.odooproject.utils.odoo import create_odoo_db
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -52,6 +53,17 @@ def down():
     subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    odooproject_cli,
+    SnapshotSpec(
+        app="odooproject",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        volumes=[("odoo", "/var/lib/odoo")],
+    ),
+)
+
+
 @odooproject_cli.command()
 @click.option("--n-users", type=int, default=50, help="Number of users to generate")
 @click.option("--n-plans", type=int, default=7, help="Number of plans to generate")
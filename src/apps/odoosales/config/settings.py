@@ -23,6 +23,8 @@ class AppConfig(BaseSettings):
     ODOO_DB: str = "odoo"
     ODOO_USERNAME: str = "admin"
     ODOO_PASSWORD: str = "admin"
+    # Reject search_read calls without a field list, which fetch every field of the model
+    ODOO_STRICT_FIELDS: bool = False
 
     COMPANY_NAME: str = "Modern Market Co."
     COMPANY_DOMAIN: str = "modernmarket.co"
@@ -9,6 +9,9 @@ from common.logger import logger
 
 faker = Faker("en_US")
 
+# Records per create/write call; a failed chunk is retried record by record
+INVOICE_CHUNK_SIZE = 100
+
 
 async def insert_invoices():
     logger.start("Inserting invoices...")
@@ -22,27 +25,26 @@ async def insert_invoices():
 
         orders_to_invoice = orders_to_invoice[: int(len(orders_to_invoice) * 0.5)]
 
-        for order in orders_to_invoice:
+        # One invoicing wizard per chunk of orders; without consolidated billing it still makes one invoice per order
+        for i in range(0, len(orders_to_invoice), INVOICE_CHUNK_SIZE):
+            chunk = orders_to_invoice[i : i + INVOICE_CHUNK_SIZE]
             try:
-                invoice_id = await client.create(
-                    "sale.advance.payment.inv",
-                    {
-                        "advance_payment_method": "delivered",
-                        "sale_order_ids": [order["id"]],
-                    },
-                )
-                await client.execute_kw("sale.advance.payment.inv", "create_invoices", [invoice_id])
+                await _invoice_orders(client, [order["id"] for order in chunk])
             except Exception as e:
-                logger.warning(f"Failed to create invoice for order {order['name']}: {e}")
-                continue
+                logger.warning(f"Failed to invoice {len(chunk)} orders at once, invoicing them one by one: {e}")
+                for order in chunk:
+                    try:
+                        await _invoice_orders(client, [order["id"]])
+                    except Exception as e:
+                        logger.warning(f"Failed to create invoice for order {order['name']}: {e}")
 
         existing_invoices = await client.search_read(
             "account.move",
-            [],
+            [("state", "=", "draft")],
             fields=["id", "name"],
         )
 
-        # Updates invoices for each sale order
+        # Every invoice gets its own number and dates, so these writes cannot be merged
         for invoice in existing_invoices:
             try:
                 await client.write(
@@ -54,12 +56,27 @@ async def insert_invoices():
                         "invoice_date_due": faker.date_between(start_date="today", end_date="+30d").strftime("%Y-%m-%d"),
                     },
                 )
-                await client.execute_kw("account.move", "action_post", [invoice["id"]])
-
             except Exception as e:
                 raise ValueError(f"Skip creating invoice for order {invoice['name']}: {e}")
 
-    logger.succeed(f"Inserted {len(existing_invoices)} invoices")
+        # Post them in chunks
+        planner = client.plan_transitions("account.move", {"posted": ["action_post"]}, chunk_size=INVOICE_CHUNK_SIZE)
+        planner.add("posted", [invoice["id"] for invoice in existing_invoices])
+        result = await planner.run()
+
+    logger.succeed(f"Inserted {len(result.reached['posted'])} invoices")
+
+
+async def _invoice_orders(client: OdooClient, order_ids: list[int]) -> None:
+    wizard_id = await client.create(
+        "sale.advance.payment.inv",
+        {
+            "advance_payment_method": "delivered",
+            "sale_order_ids": order_ids,
+            "consolidated_billing": False,
+        },
+    )
+    await client.execute_kw("sale.advance.payment.inv", "create_invoices", [wizard_id])
 
 
 async def pay_invoices():
@@ -80,33 +97,23 @@ async def pay_invoices():
 
         not_paid_invoices = not_paid_invoices[: int(len(not_paid_invoices) * 0.5)]
 
-        for invoice in not_paid_invoices:
+        # All invoices get the same value, so they are written a chunk at a time
+        for i in range(0, len(not_paid_invoices), INVOICE_CHUNK_SIZE):
+            chunk = not_paid_invoices[i : i + INVOICE_CHUNK_SIZE]
             try:
-                # lines = await client.search_read(
-                #     "account.move.line",
-                #     [("move_id", "=", invoice["id"])],
-                #     fields=["id"],
-                # )
-                # await client.execute_kw("account.move", "action_register_payment", [invoice["id"]])
-                # register_id = await client.create(
-                #     "account.payment.register",
-                #     {
-                #         "journal_id": journal[0]["id"],
-                #         "payment_date": datetime.date.today().strftime("%Y-%m-%d"),
-                #         "line_ids": [
-                #             [6, 0, [line["id"] for line in lines]],
-                #         ],
-                #         "can_edit_wizard": True,
-                #     },
-                # )
-                # await client.execute_kw("account.payment.register", "action_create_payments", [register_id])
-                await client.write(
-                    "account.move",
-                    invoice["id"],
-                    {"payment_state": "paid"},
-                )
-            except Exception as e:
-                logger.warning(f"Failed to pay invoice {invoice['name']}: {e}")
+                await client.write("account.move", [invoice["id"] for invoice in chunk], {"payment_state": "paid"})
                 continue
+            except Exception as e:
+                logger.warning(f"Failed to pay {len(chunk)} invoices at once, paying them one by one: {e}")
+
+            for invoice in chunk:
+                try:
+                    await client.write(
+                        "account.move",
+                        invoice["id"],
+                        {"payment_state": "paid"},
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to pay invoice {invoice['name']}: {e}")
 
     logger.succeed("Finished paying invoices.")
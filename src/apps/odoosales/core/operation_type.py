@@ -17,6 +17,8 @@ async def get_operation_types():
     async with OdooClient() as client:
         response = await client.search_read(
             "stock.picking.type",
+            [],
+            ["id", "name", "code", "sequence_code", "warehouse_id", "return_picking_type_id"],
         )
         # logger.info(f"Inventory operation types: {response}")
         return response
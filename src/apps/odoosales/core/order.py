@@ -17,18 +17,10 @@ async def insert_orders():
             )
 
             orders_count = len(quotations) // 2
-            confirmed_count = 0
-            for quotation in quotations[:orders_count]:
-                try:
-                    await client.execute_kw(
-                        SaleModelName.SALE_ORDER.value,
-                        "action_confirm",
-                        [quotation["id"]],
-                    )
-                    confirmed_count += 1
-                except Exception:
-                    continue
-            logger.succeed(f"Confirmed {confirmed_count} quotations as sales orders.")
+            planner = client.plan_transitions(SaleModelName.SALE_ORDER.value, {"sale": ["action_confirm"]})
+            planner.add("sale", [quotation["id"] for quotation in quotations[:orders_count]])
+            result = await planner.run()
+            logger.succeed(f"Confirmed {len(result.reached['sale'])} quotations as sales orders.")
 
             orders = await client.search_read(
                 SaleModelName.SALE_ORDER.value,
@@ -47,28 +47,31 @@ async def insert_payment_methods():
         logger.fail(f"Failed to create/update payment methods and journals: {e}")
 
 
-async def create_pos_order_payments(orders: list):
+async def create_pos_order_payments(client: OdooClient, orders: list):
     """
-    Create payment entries for all POS orders.
-    """
-    async with OdooClient() as client:
-        try:
-            for order in orders:
-                # Get payment method id
-                payment_method_id = await client.search_read("pos.payment.method", [("name", "=", order["payment"])], ["id"])
-
-                if not payment_method_id:
-                    logger.warning(f"Payment method {order['payment']} not found for order {order['order_number']}. Skipping payment creation.")
-                    continue
+    Create payment entries for all POS orders of a session with one create call. If that call fails, the
+    payments are created one by one and those that fail are skipped.
 
-                payment_method_id = payment_method_id[0]["id"]
+    Each order carries the id of its payment method ("payment_method_id"), resolved from the reference data
+    loaded by the caller, so no lookup is made per order.
+    """
+    payments_data = [
+        {
+            "pos_order_id": order["order_id"],
+            "payment_method_id": order["payment_method_id"],
+            "amount": order["amount"],
+            "payment_date": order["date"],  # Ensure date is in 'YYYY-MM-DD HH:MM:SS' format
+        }
+        for order in orders
+    ]
+    try:
+        await client.create("pos.payment", [payments_data])
+        return
+    except Exception as e:
+        logger.warning(f"Failed to create {len(payments_data)} POS order payments at once, creating them one by one: {e}")
 
-                payment_data = {
-                    "pos_order_id": order["order_id"],
-                    "payment_method_id": payment_method_id,
-                    "amount": order["amount"],
-                    "payment_date": order["date"],  # Ensure date is in 'YYYY-MM-DD HH:MM:SS' format
-                }
-                await client.create("pos.payment", payment_data)
+    for order, payment in zip(orders, payments_data, strict=True):
+        try:
+            await client.create("pos.payment", payment)
         except Exception as e:
-            logger.warning(f"Failed to create POS order payments: {e}")
+            logger.warning(f"Failed to create the payment of order {order['order_number']}: {e}")
@@ -7,6 +7,7 @@ from apps.odoosales.config.constants import CrmModelName, ProductModelName
 from apps.odoosales.core.payment import create_pos_order_payments
 from apps.odoosales.utils.odoo import OdooClient
 from common.logger import logger
+from common.odoo_reference import OdooReferenceData, ReferenceQuery
 
 
 fake = Faker()
@@ -14,86 +15,82 @@ fake = Faker()
 POS_CONFIG_ID = 1  # Default POS config ID
 
 
+async def _create_orders(client: OdooClient, orders: list[dict]) -> list[dict]:
+    """
+    Create the orders of a session with one list-valued create call.
+
+    The call runs in one transaction, so if any order is refused none is created; the orders are then
+    created one by one and those that fail are skipped. Returns the created orders with their "order_id".
+    """
+    try:
+        order_ids = await client.create("pos.order", [[order["data"] for order in orders]])
+        return [{**order, "order_id": order_id} for order, order_id in zip(orders, order_ids, strict=True)]
+    except Exception as e:
+        logger.warning(f"Failed to create {len(orders)} orders at once, creating them one by one: {e}")
+
+    created = []
+    for order in orders:
+        try:
+            created.append({**order, "order_id": await client.create("pos.order", order["data"])})
+        except Exception as e:
+            logger.warning(f"Failed to create order {order['order_number']}: {e}")
+    return created
+
+
 async def insert_pos_orders():
     logger.start("Inserting POS orders...")
 
     async with OdooClient() as client:
         try:
-            # 1. Get necessary reference data
-            templates = await client.search_read(
-                ProductModelName.PRODUCT_TEMPLATE.value,
-                [("sale_ok", "=", True)],
-                ["id", "name"],
+            # 1. Get necessary reference data, once and with only the fields used below
+            reference = await OdooReferenceData(client).load(
+                products=ReferenceQuery(
+                    ProductModelName.PRODUCT_PRODUCT.value,
+                    ["display_name", "lst_price"],
+                    [("product_tmpl_id.sale_ok", "=", True)],
+                    name_field="display_name",
+                ),
+                crm_teams=ReferenceQuery(CrmModelName.CRM_TEAM.value, ["name", "user_id"], [("use_opportunities", "=", True), ("use_leads", "=", True)]),
+                emps=ReferenceQuery("hr.employee", ["name", "user_id"]),
+                customers=ReferenceQuery("res.partner", ["name"], [("customer_rank", ">", 0)]),
+                warehouses=ReferenceQuery("stock.warehouse", ["name"]),
+                pos_configs=ReferenceQuery("pos.config", ["name"]),
+                pricelists=ReferenceQuery("product.pricelist", ["name"], [("name", "=", "2025 Standard Retail")]),
+                payment_methods=ReferenceQuery("pos.payment.method", ["name"], [("journal_id", "!=", None)]),
             )
-            products = await client.search_read(
-                ProductModelName.PRODUCT_PRODUCT.value,
-                [("product_tmpl_id", "in", [template["id"] for template in templates])],
-            )
-            if not products:
-                logger.fail("No product variants available for POS. Aborting.")
-                return
-
-            crm_teams = await client.search_read(
-                CrmModelName.CRM_TEAM.value,
-                [("use_opportunities", "=", True), ("use_leads", "=", True)],
-                ["id", "name", "user_id"],
-            )
-            if not crm_teams:
-                logger.fail("No CRM teams with opportunities and leads enabled found. Aborting.")
-                return
+            for name, message in [
+                ("products", "No product variants available for POS."),
+                ("crm_teams", "No CRM teams with opportunities and leads enabled found."),
+                ("emps", "No employee users (cashiers) found."),
+                ("customers", "No customers found."),
+                ("warehouses", "No warehouses (stores) found."),
+                ("pos_configs", "No POS Config found."),
+                ("payment_methods", "No POS payment methods found."),
+            ]:
+                if not reference[name]:
+                    logger.fail(f"{message} Aborting.")
+                    return
+
+            products = reference["products"].records
+            crm_teams = reference["crm_teams"]
+            emps = reference["emps"].records
+            customers = reference["customers"].records
+            warehouses = reference["warehouses"].records
+            payment_methods_db = reference["payment_methods"].records
+            pos_config_id = reference["pos_configs"].records[0]["id"]
+            pricelist_id = reference["pricelists"].records[0]["id"] if reference["pricelists"] else 1
 
             team_members = await client.search_read(
                 "crm.team.member",
-                [("crm_team_id", "in", [team["id"] for team in crm_teams])],
+                [("crm_team_id", "in", crm_teams.ids())],
                 ["id", "user_id", "crm_team_id"],
             )
             if not team_members:
                 logger.fail("No team members found for CRM teams. Aborting.")
                 return
 
-            emps = await client.search_read("hr.employee", [], ["id", "name", "user_id"])
-            if not emps:
-                logger.fail("No employee users (cashiers) found. Aborting.")
-                return
-
             # Build team leader lookup
             team_leader_lookup = {team["id"]: team["user_id"][0] for team in crm_teams if team.get("user_id")}
-            # Build member-to-employee mapping
-
-            customers = await client.search_read(
-                "res.partner",
-                [("customer_rank", ">", 0)],
-                ["id", "name"],
-            )
-            if not customers:
-                logger.fail("No customers found. Aborting.")
-                return
-
-            warehouses = await client.search_read("stock.warehouse", [], ["id", "name"])
-            if not warehouses:
-                logger.fail("No warehouses (stores) found. Aborting.")
-                return
-
-            pos_configs = await client.search_read("pos.config", [], ["id", "name"])
-            if not pos_configs:
-                logger.fail("No POS Config found. Aborting.")
-                return
-
-            pricelist = await client.search_read(
-                "product.pricelist",
-                [("name", "=", "2025 Standard Retail")],
-                ["id"],
-            )
-            pricelist_id = pricelist[0]["id"] if pricelist else 1
-
-            payment_methods_db = await client.search_read(
-                "pos.payment.method",
-                [("journal_id", "!=", None)],
-                ["id", "name"],
-            )
-            if not payment_methods_db:
-                logger.fail("No POS payment methods found. Aborting.")
-                return
 
             # 2. For each team member, open at least 3 sessions and insert orders
             total_orders = 0
@@ -120,7 +117,7 @@ async def insert_pos_orders():
                     session_data = {
                         "user_id": leader_user_id,  # Team leader as session user
                         "employee_id": emp["id"],  # Random employee as session employee
-                        "config_id": pos_configs[0]["id"],
+                        "config_id": pos_config_id,
                         "start_at": start_at_dt.strftime("%Y-%m-%d %H:%M:%S"),
                         "stop_at": stop_at_dt.strftime("%Y-%m-%d %H:%M:%S"),
                         "cash_register_balance_start": opening_balance,
@@ -128,7 +125,7 @@ async def insert_pos_orders():
                     }
                     session_id = await client.create("pos.session", session_data)
                     total_sessions += 1
-                    # Insert orders (checkout products)
+                    # Insert orders (checkout products), all orders of the session in one create call
                     orders = []
                     for i in range(orders_per_session):
                         order_date = fake.date_time_between(start_date="-1y", end_date="now")
@@ -136,7 +133,7 @@ async def insert_pos_orders():
                         customer = random.choice(customers)
                         order_number = f"POS{member_user_id}{session_num}{i}{random.randint(1000, 9999)}"
                         order_products = random.sample(products, random.randint(1, min(5, len(products))))
-                        payment_method = random.choice(payment_methods_db)["name"]
+                        payment_method = random.choice(payment_methods_db)
                         order_lines = []
                         total_amount = 0
                         for product in order_products:
@@ -171,28 +168,25 @@ async def insert_pos_orders():
                             "pricelist_id": pricelist_id,
                             "crm_team_id": team_id,
                         }
-                        try:
-                            order_id = await client.create("pos.order", order_data)
-                            orders.append(
-                                {
-                                    "order_id": order_id,
-                                    "order_number": order_number,
-                                    "date": order_date.strftime("%Y-%m-%d %H:%M:%S"),
-                                    "store": warehouse["name"],
-                                    "cashier": emp["name"],
-                                    "payment": payment_method,
-                                    "amount": round(total_amount * 1.0825, 2),
-                                    "products": [p["display_name"] for p in order_products],
-                                    "team": next(t["name"] for t in crm_teams if t["id"] == team_id),
-                                }
-                            )
-                            total_orders += 1
-                        except Exception as e:
-                            logger.warning(f"Failed to create order {order_number}: {e}")
-                            continue
+                        orders.append(
+                            {
+                                "data": order_data,
+                                "order_number": order_number,
+                                "date": order_date.strftime("%Y-%m-%d %H:%M:%S"),
+                                "store": warehouse["name"],
+                                "cashier": emp["name"],
+                                "payment": payment_method["name"],
+                                "payment_method_id": payment_method["id"],
+                                "amount": round(total_amount * 1.0825, 2),
+                                "products": [p["display_name"] for p in order_products],
+                                "team": crm_teams.name(team_id),
+                            }
+                        )
+                    orders = await _create_orders(client, orders)
+                    total_orders += len(orders)
                     # Create payments for all orders in this session
                     if orders:
-                        await create_pos_order_payments(orders)
+                        await create_pos_order_payments(client, orders)
                     # Close register (POS session)
                     try:
                         await client.write(
@@ -61,6 +61,7 @@ from apps.odoosales.generators.sale_team import generate_sale_teams
 from apps.odoosales.generators.skill import generate_skills
 from apps.odoosales.generators.user import generate_users
 from apps.odoosales.utils.odoo import create_odoo_db
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -94,6 +95,17 @@ def down():
     subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    odoosales_cli,
+    SnapshotSpec(
+        app="odoosales",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        volumes=[("odoo", "/var/lib/odoo")],
+    ),
+)
+
+
 @odoosales_cli.command()
 @click.option("--n-plans", type=int, default=10, help="Number of activity plans to generate")
 @click.option("--n-users", type=int, default=50, help="Number of activity users to generate")
@@ -14,6 +14,7 @@ class AppConfig(BaseSettings):
     UPLOAD_ENDPOINT: str = "/example/upload"
     USER_ID: str = "uid-1"
     LANGUAGE: str = "en"
+    UPLOAD_PARALLELISM: int = 8
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,33 +1,42 @@
+import asyncio
 import re
 import urllib.parse
 from pathlib import Path
 
+import httpx
 import requests
 
 from apps.onlyofficedocs.config.settings import settings
 from common.logger import logger
 
 
-def upload_file(file_path: str) -> dict:
-    """Upload a file to OnlyOffice Docs server."""
+UPLOAD_HEADERS = {
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "Origin": settings.BASE_URL,
+    "Referer": f"{settings.BASE_URL}/example/?userid={settings.USER_ID}&lang={settings.LANGUAGE}&directUrl=false",
+    "X-Requested-With": "XMLHttpRequest",
+}
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+FILE_ROW_PATTERN = re.compile(r'<tr class="tableRow"[^>]*title="([^"]+)"[^>]*>.*?<a class="stored-edit[^"]*"[^>]*href="[^"]*fileName=([^"]+)"[^>]*>\s*<span>([^<]+)</span>', re.DOTALL)
+
+# Parsed /example/ listing, shared by every command in the run until refreshed
+_uploaded_files_cache: dict | None = None
+_uploaded_files_index: dict[str, dict] = {}
+
+
+async def upload_file(client: httpx.AsyncClient, file_path: str) -> dict:
+    """Upload a file to OnlyOffice Docs server, streaming it as a multipart body."""
     current_dir = Path.cwd()
     absolute_file_path = current_dir / file_path
 
     if not absolute_file_path.exists():
         return {"success": False, "error": "File not found", "file_name": file_path}
 
-    headers = {
-        "Accept": "application/json, text/javascript, */*; q=0.01",
-        "Origin": settings.BASE_URL,
-        "Referer": f"{settings.BASE_URL}/example/?userid={settings.USER_ID}&lang={settings.LANGUAGE}&directUrl=false",
-        "X-Requested-With": "XMLHttpRequest",
-    }
-
     with absolute_file_path.open("rb") as file:
-        files = {"uploadedFile": (absolute_file_path.name, file, "application/vnd.openxmlformats-officedocument.wordprocessingml.document")}
+        files = {"uploadedFile": (absolute_file_path.name, file, DOCX_MIME_TYPE)}
 
         try:
-            response = requests.post(f"{settings.BASE_URL}{settings.UPLOAD_ENDPOINT}", files=files, headers=headers, timeout=30)
+            response = await client.post(f"{settings.BASE_URL}{settings.UPLOAD_ENDPOINT}", files=files, headers=UPLOAD_HEADERS)
             response.raise_for_status()
 
             try:
@@ -35,7 +44,7 @@ def upload_file(file_path: str) -> dict:
             except ValueError:
                 return {"success": True, "data": response.text, "file_name": absolute_file_path.name}
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             return {"success": False, "error": str(e), "file_name": absolute_file_path.name}
 
 
@@ -44,23 +53,58 @@ def get_data_files() -> list[str]:
     return [f"apps/onlyofficedocs/data/{f.name}" for f in settings.DATA_PATH.glob("*.docx")]
 
 
-def upload_files(file_paths: list[str]) -> list[dict]:
-    """Upload multiple files."""
+async def upload_files(file_paths: list[str], parallel: int = settings.UPLOAD_PARALLELISM, skip_existing: bool = True) -> list[dict]:
+    """
+    Upload multiple files concurrently over a shared connection pool.
+
+    Files whose name already appears in the server listing are skipped, since the
+    example server would otherwise store them again under a suffixed name.
+    """
+    existing_files = await asyncio.to_thread(get_uploaded_file_index) if skip_existing else {}
+    pending_paths = []
     results = []
     for file_path in file_paths:
-        result = upload_file(file_path)
-        results.append(result)
-
-        if result["success"]:
-            logger.succeed(f"{result['file_name']}")
+        file_name = Path(file_path).name
+        if file_name in existing_files:
+            results.append({"success": True, "skipped": True, "file_name": file_name})
         else:
-            logger.error(f"{result['file_name']}: {result['error']}")
+            pending_paths.append(file_path)
+
+    if results:
+        logger.info(f"Skipping {len(results)} files already on the server")
 
+    semaphore = asyncio.Semaphore(max(1, parallel))
+    limits = httpx.Limits(max_connections=parallel, max_keepalive_connections=parallel)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+
+        async def upload_with_semaphore(file_path: str) -> dict:
+            async with semaphore:
+                result = await upload_file(client, file_path)
+
+            if result["success"]:
+                logger.succeed(f"{result['file_name']}")
+            else:
+                logger.error(f"{result['file_name']}: {result['error']}")
+            return result
+
+        results.extend(await asyncio.gather(*(upload_with_semaphore(file_path) for file_path in pending_paths)))
+
+    if pending_paths:
+        invalidate_uploaded_files()
     return results
 
 
-def get_uploaded_files() -> dict:
-    """Get all uploaded files from OnlyOffice server by parsing the main page."""
+def get_uploaded_files(refresh: bool = False) -> dict:
+    """
+    Get all uploaded files from OnlyOffice server by parsing the main page.
+    The parsed listing is cached; pass refresh=True to fetch it again.
+    """
+    global _uploaded_files_cache, _uploaded_files_index
+
+    if _uploaded_files_cache is not None and not refresh:
+        return _uploaded_files_cache
+
     try:
         response = requests.get(f"{settings.BASE_URL}/example/", timeout=30)
         response.raise_for_status()
@@ -69,9 +113,7 @@ def get_uploaded_files() -> dict:
         files = []
 
         # Find all table rows with file information
-        file_rows = re.findall(
-            r'<tr class="tableRow"[^>]*title="([^"]+)"[^>]*>.*?<a class="stored-edit[^"]*"[^>]*href="[^"]*fileName=([^"]+)"[^>]*>\s*<span>([^<]+)</span>', response.text, re.DOTALL
-        )
+        file_rows = FILE_ROW_PATTERN.findall(response.text)
 
         for title, encoded_name, display_name in file_rows:
             # Decode URL-encoded filename
@@ -102,12 +144,28 @@ def get_uploaded_files() -> dict:
                 }
             )
 
-        return {"success": True, "files": files, "count": len(files)}
+        _uploaded_files_cache = {"success": True, "files": files, "count": len(files)}
+        _uploaded_files_index = {file_info["name"]: file_info for file_info in files}
+        return _uploaded_files_cache
 
     except requests.RequestException as e:
         return {"success": False, "error": str(e), "files": [], "count": 0}
 
 
+def get_uploaded_file_index(refresh: bool = False) -> dict[str, dict]:
+    """Uploaded files indexed by file name, built from the cached listing."""
+    get_uploaded_files(refresh)
+    return _uploaded_files_index
+
+
+def invalidate_uploaded_files() -> None:
+    """Drop the cached listing and its index, so that the next lookup fetches the listing again."""
+    global _uploaded_files_cache, _uploaded_files_index
+
+    _uploaded_files_cache = None
+    _uploaded_files_index = {}
+
+
 def download_file(download_url: str, save_path: str) -> dict:
     """Download a single file from OnlyOffice server."""
     try:
@@ -165,6 +223,7 @@ def delete_file(file_name: str) -> dict:
         response = requests.delete(delete_url, headers=headers, timeout=30)
         response.raise_for_status()
 
+        invalidate_uploaded_files()
         return {"success": True, "file_name": file_name}
 
     except requests.RequestException as e:
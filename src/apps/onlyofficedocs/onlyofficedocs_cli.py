@@ -1,3 +1,4 @@
+import asyncio
 import json
 import shutil
 import subprocess
@@ -6,7 +7,7 @@ from pathlib import Path
 import click
 
 from apps.onlyofficedocs.config.settings import settings
-from apps.onlyofficedocs.core.files import delete_all_files, download_all_files, get_data_files, get_uploaded_files, upload_file, upload_files
+from apps.onlyofficedocs.core.files import delete_all_files, download_all_files, get_data_files, get_uploaded_files, upload_files
 from common.logger import logger
 
 
@@ -31,17 +32,11 @@ def down():
 
 @onlyofficedocs_cli.command()
 @click.option("--file-path", "-f", help="File path relative to src/")
-def seed(file_path: str):
+@click.option("--parallel", "-p", type=int, default=settings.UPLOAD_PARALLELISM, help="Number of concurrent uploads")
+def seed(file_path: str, parallel: int):
     """Upload files to OnlyOffice"""
-    if file_path:
-        result = upload_file(file_path)
-        if result["success"]:
-            logger.succeed(f"{result['file_name']}")
-        else:
-            logger.error(f"{result['file_name']}: {result['error']}")
-    else:
-        files = get_data_files()
-        upload_files(files)
+    files = [file_path] if file_path else get_data_files()
+    asyncio.run(upload_files(files, parallel=parallel))
 
 
 @onlyofficedocs_cli.command()
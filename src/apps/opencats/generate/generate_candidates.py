@@ -20,41 +20,40 @@ from apps.opencats.generate.prompts.generate_candidates_prompts import (
 )
 from apps.opencats.utils.data_utils import format_date_for_opencats, format_phone_number, load_existing_data
 from common.anthropic_client import make_anthropic_request, parse_anthropic_response, validate_anthropic_config
+from common.dedup import DedupIndex
 from common.logger import logger
 from common.save_to_json import save_to_json
 
 
+def candidate_dedup_keys(candidate: dict[str, Any]) -> dict[str, str]:
+    """Identifiers that must stay unique across candidates."""
+    full_name = f"{candidate.get('firstName', '')} {candidate.get('lastName', '')}".strip()
+    return {"email": candidate.get("email1", ""), "name": full_name}
+
+
 def load_existing_candidates():
     """Load existing candidates to prevent duplicates."""
     existing_data = load_existing_data(CANDIDATES_FILEPATH)
 
-    used_emails = set()
-    used_names = set()
-
-    for candidate in existing_data:
-        if candidate.get("email1"):
-            used_emails.add(candidate["email1"].lower())
-        if candidate.get("firstName") and candidate.get("lastName"):
-            full_name = f"{candidate['firstName']} {candidate['lastName']}".lower()
-            used_names.add(full_name)
+    index = DedupIndex(exact_fields=["email", "name"])
+    index.add_many(candidate_dedup_keys(candidate) for candidate in existing_data)
 
     return {
-        "used_emails": used_emails,
-        "used_names": used_names,
+        "index": index,
         "generated_candidates": existing_data,
     }
 
 
-def create_candidates_prompt(used_emails: set, used_names: set, batch_size: int) -> str:
+def create_candidates_prompt(index: DedupIndex, batch_size: int) -> str:
     """Create prompt for candidate generation."""
     excluded_emails_text = ""
-    if used_emails:
-        recent_emails = list(used_emails)[-10:]
+    recent_emails = index.avoid_summary("email")
+    if recent_emails:
         excluded_emails_text = EXCLUDED_EMAILS_TEMPLATE.format(emails_list=", ".join(recent_emails))
 
     excluded_names_text = ""
-    if used_names:
-        recent_names = list(used_names)[-10:]
+    recent_names = index.avoid_summary("name")
+    if recent_names:
         excluded_names_text = EXCLUDED_NAMES_TEMPLATE.format(names_list=", ".join(recent_names))
 
     # Calculate percentages for variety
@@ -83,10 +82,10 @@ def create_candidates_prompt(used_emails: set, used_names: set, batch_size: int)
 
 
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-async def generate_candidates_batch(used_emails: set, used_names: set, batch_size: int) -> list[dict[str, Any]]:
+async def generate_candidates_batch(index: DedupIndex, batch_size: int) -> list[dict[str, Any]]:
     """Generate a batch of candidates using AI."""
     try:
-        prompt = create_candidates_prompt(used_emails, used_names, batch_size)
+        prompt = create_candidates_prompt(index, batch_size)
 
         # Explicitly access settings values to avoid attribute access issues in retry
         api_key = settings.ANTHROPIC_API_KEY
@@ -216,8 +215,7 @@ async def candidates(n_candidates: int | None = None) -> dict[str, Any]:
 
     # Load existing data
     existing = load_existing_candidates()
-    used_emails = existing["used_emails"]
-    used_names = existing["used_names"]
+    index = existing["index"]
     generated_candidates = existing["generated_candidates"]
 
     current_count = len(generated_candidates)
@@ -240,20 +238,18 @@ async def candidates(n_candidates: int | None = None) -> dict[str, Any]:
         logger.info(f"ℹ 🔄 Generating batch {batch_num + 1}/{batches} ({batch_size} candidates)")
 
         try:
-            batch_candidates = await generate_candidates_batch(used_emails, used_names, batch_size)
+            batch_candidates = await generate_candidates_batch(index, batch_size)
+
+            # Keep only candidates whose email and name were not used before
+            unique_candidates = [candidate for candidate in batch_candidates if index.add(candidate_dedup_keys(candidate))]
+            if len(unique_candidates) < len(batch_candidates):
+                logger.warning(f"⚠ Skipped {len(batch_candidates) - len(unique_candidates)} duplicate candidates in batch {batch_num + 1}")
+            batch_candidates = unique_candidates
 
             if batch_candidates:
                 # Reset failure counter on successful batch
                 consecutive_failures = 0
 
-                # Update used identifiers to avoid duplicates
-                for candidate in batch_candidates:
-                    if candidate.get("email1"):
-                        used_emails.add(candidate["email1"].lower())
-                    if candidate.get("firstName") and candidate.get("lastName"):
-                        full_name = f"{candidate['firstName']} {candidate['lastName']}".lower()
-                        used_names.add(full_name)
-
                 new_candidates.extend(batch_candidates)
                 logger.info(f"✔ ✅ Generated {len(batch_candidates)} candidates in batch {batch_num + 1}")
             else:
@@ -29,6 +29,7 @@ from apps.opencats.generate.generate_events import events
 from apps.opencats.generate.generate_joborders import joborders
 from apps.opencats.generate.generate_lists import lists
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -67,6 +68,17 @@ def down():
     logger.succeed("✅ Cleanup completed!")
 
 
+add_snapshot_commands(
+    opencats_cli,
+    SnapshotSpec(
+        app="opencats",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="opencatsdb",
+        engine="mariadb",
+    ),
+)
+
+
 @opencats_cli.command()
 def clear():
     """Clear only the seeded data, preserving users and system tables"""
@@ -1,9 +1,16 @@
 """ownCloud WebDAV upload functionality."""
 
+import asyncio
 import base64
 import os
+import time
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from urllib.parse import unquote, urlparse
+from xml.etree import ElementTree
 
+import aiofiles
 import httpx
 
 from common.logger import logger
@@ -11,6 +18,23 @@ from common.logger import logger
 from ..utils.utils import get_directory_structure, get_file_mappings, is_file_path
 
 
+# Files at or above this size go through TUS chunked uploads instead of a single PUT
+CHUNKED_UPLOAD_THRESHOLD = 32 * 1024 * 1024
+CHUNK_SIZE = 8 * 1024 * 1024
+STREAM_BLOCK_SIZE = 256 * 1024
+DEFAULT_PARALLEL_UPLOADS = 16
+
+PROPFIND_BODY = """<?xml version="1.0"?>
+<d:propfind xmlns:d="DAV:">
+  <d:prop>
+    <d:getetag/>
+    <d:getcontentlength/>
+    <d:getlastmodified/>
+    <d:resourcetype/>
+  </d:prop>
+</d:propfind>"""
+
+
 def get_basic_auth_header() -> str:
     """Generate Basic Auth header for ownCloud."""
     user = os.getenv("OCIS_USER", "admin")
@@ -28,82 +52,236 @@ def build_webdav_url(path: str) -> str:
     return f"{base_url}/remote.php/dav/{path}"
 
 
-async def create_directory(owncloud_path: str) -> bool:
+async def iter_file(local_file: Path, offset: int = 0, length: int | None = None):
+    """Stream a file (or a slice of it) in STREAM_BLOCK_SIZE blocks without loading it into memory."""
+    remaining = local_file.stat().st_size - offset if length is None else length
+    async with aiofiles.open(local_file, "rb") as f:
+        await f.seek(offset)
+        while remaining > 0:
+            block = await f.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+class UploadStats:
+    """Counters for the throughput report."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.uploaded_files = 0
+        self.uploaded_bytes = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+        self.failed_files = 0
+
+    def report(self) -> str:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        megabytes = self.uploaded_bytes / (1024 * 1024)
+        return (
+            f"Uploaded {self.uploaded_files} files ({megabytes:.1f} MiB) in {elapsed:.1f}s "
+            f"[{megabytes / elapsed:.2f} MiB/s, {self.uploaded_files / elapsed:.1f} files/s], "
+            f"skipped {self.skipped_files} unchanged ({self.skipped_bytes / (1024 * 1024):.1f} MiB), "
+            f"{self.failed_files} failed"
+        )
+
+
+class OwnCloudUploader:
     """
-    Create a directory in ownCloud using WebDAV MKCOL.
+    WebDAV upload engine sharing one pooled HTTP/2 client across all requests.
 
-    Args:
-        owncloud_path: ownCloud directory path (e.g., 'files/admin/folder')
-
-    Returns:
-        True if successful, False otherwise
+    Directories are created breadth-first with one concurrent MKCOL wave per depth level,
+    then files are PUT concurrently (bounded by `parallel`) with streamed bodies.
+    Files whose remote size and modification time already match are skipped.
     """
-    headers = {"Authorization": get_basic_auth_header()}
-    url = build_webdav_url(owncloud_path)
 
-    try:
-        async with httpx.AsyncClient(verify=False) as client:
-            resp = await client.request("MKCOL", url, headers=headers)
+    def __init__(self, parallel: int = DEFAULT_PARALLEL_UPLOADS):
+        self.parallel = max(1, parallel)
+        self.stats = UploadStats()
+        self._semaphore = asyncio.Semaphore(self.parallel)
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            verify=False,
+            http2=True,
+            headers={"Authorization": get_basic_auth_header()},
+            limits=httpx.Limits(max_connections=self.parallel, max_keepalive_connections=self.parallel),
+            timeout=httpx.Timeout(30.0, write=300.0),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def create_directory(self, owncloud_path: str) -> bool:
+        """
+        Create a directory in ownCloud using WebDAV MKCOL.
+
+        Args:
+            owncloud_path: ownCloud directory path (e.g., 'files/admin/folder')
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self._semaphore:
+                resp = await self._client.request("MKCOL", build_webdav_url(owncloud_path))
             resp.raise_for_status()
 
-        logger.info(f"Created directory: {owncloud_path}")
-        return True
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code == 405:  # Method Not Allowed - directory already exists
-            logger.debug(f"Directory already exists: {owncloud_path}")
+            logger.info(f"Created directory: {owncloud_path}")
             return True
-        else:
-            logger.error(f"Failed to create directory {owncloud_path}: {e}")
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 405:  # Method Not Allowed - directory already exists
+                logger.debug(f"Directory already exists: {owncloud_path}")
+                return True
+            else:
+                logger.error(f"Failed to create directory {owncloud_path}: {e}")
+                return False
+        except Exception as e:
+            logger.error(f"Error creating directory {owncloud_path}: {e}")
             return False
-    except Exception as e:
-        logger.error(f"Error creating directory {owncloud_path}: {e}")
-        return False
 
+    async def create_directories(self, directories: list[str]) -> None:
+        """Create directories breadth-first, issuing every MKCOL of a depth level concurrently."""
+        levels = defaultdict(list)
+        for directory in directories:
+            levels[directory.count("/")].append(directory)
+
+        for depth in sorted(levels):
+            await asyncio.gather(*(self.create_directory(directory) for directory in levels[depth]))
+
+    async def list_remote_files(self, owncloud_dir: str) -> dict[str, dict]:
+        """
+        List files directly inside a remote directory with a Depth: 1 PROPFIND.
+
+        Returns:
+            Mapping of ownCloud path to {"etag", "size", "mtime"}
+        """
+        try:
+            async with self._semaphore:
+                resp = await self._client.request(
+                    "PROPFIND",
+                    build_webdav_url(owncloud_dir),
+                    headers={"Depth": "1", "Content-Type": "application/xml"},
+                    content=PROPFIND_BODY,
+                )
+            if resp.status_code == 404:
+                return {}
+            resp.raise_for_status()
+        except Exception as e:
+            logger.warning(f"Could not list {owncloud_dir}, uploading its files unconditionally: {e}")
+            return {}
+
+        ns = {"d": "DAV:"}
+        remote_files = {}
+        for response in ElementTree.fromstring(resp.content).findall("d:response", ns):
+            prop = response.find("d:propstat/d:prop", ns)
+            if prop is None or prop.find("d:resourcetype/d:collection", ns) is not None:
+                continue
+
+            href = unquote(urlparse(response.findtext("d:href", "", ns)).path)
+            path = href.split("/remote.php/dav/", 1)[-1]
+            lastmodified = prop.findtext("d:getlastmodified", None, ns)
+            remote_files[path] = {
+                "etag": (prop.findtext("d:getetag", "", ns) or "").strip('"'),
+                "size": int(prop.findtext("d:getcontentlength", "0", ns) or 0),
+                "mtime": int(parsedate_to_datetime(lastmodified).timestamp()) if lastmodified else None,
+            }
+
+        return remote_files
+
+    async def upload_file(self, local_path: str, owncloud_path: str, remote: dict | None = None) -> bool:
+        """
+        Upload a file to ownCloud, skipping it when the remote copy is unchanged.
+
+        Args:
+            local_path: Local file path
+            owncloud_path: ownCloud file path (e.g., 'files/admin/file.txt')
+            remote: PROPFIND entry for the remote file, if it exists
+
+        Returns:
+            True if the file was uploaded or skipped, False otherwise
+        """
+        local_file = Path(local_path)
+        if not local_file.exists():
+            logger.error(f"Local file not found: {local_path}")
+            return False
 
-async def upload_to_owncloud(local_path: str, owncloud_path: str) -> bool:
-    """
-    Upload a file to ownCloud using WebDAV PUT.
+        stat = local_file.stat()
+        if remote and remote["size"] == stat.st_size and remote["mtime"] == int(stat.st_mtime):
+            self.stats.skipped_files += 1
+            self.stats.skipped_bytes += stat.st_size
+            return True
 
-    Args:
-        local_path: Local file path
-        owncloud_path: ownCloud file path (e.g., 'files/admin/file.txt')
+        # Preserve the local modification time so the next run can detect unchanged files
+        headers = {"X-OC-Mtime": str(int(stat.st_mtime))}
+
+        try:
+            async with self._semaphore:
+                if stat.st_size >= CHUNKED_UPLOAD_THRESHOLD:
+                    await self._upload_chunked(local_file, owncloud_path, stat.st_size, headers)
+                else:
+                    headers["Content-Length"] = str(stat.st_size)
+                    resp = await self._client.put(build_webdav_url(owncloud_path), headers=headers, content=iter_file(local_file))
+                    resp.raise_for_status()
+
+            self.stats.uploaded_files += 1
+            self.stats.uploaded_bytes += stat.st_size
+            logger.info(f"Uploaded {local_path} -> {owncloud_path} ({stat.st_size} bytes)")
+            return True
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Failed to upload {local_path}: HTTP {e.response.status_code}")
+        except Exception as e:
+            logger.error(f"Error uploading {local_path}: {e}")
 
-    Returns:
-        True if successful, False otherwise
-    """
-    local_file = Path(local_path)
-    if not local_file.exists():
-        logger.error(f"Local file not found: {local_path}")
+        self.stats.failed_files += 1
         return False
 
-    headers = {"Authorization": get_basic_auth_header()}
-    url = build_webdav_url(owncloud_path)
-
-    try:
-        with local_file.open("rb") as f:
-            file_content = f.read()
-
-        async with httpx.AsyncClient(verify=False, timeout=30.0) as client:
-            resp = await client.put(url, headers=headers, content=file_content)
+    async def _upload_chunked(self, local_file: Path, owncloud_path: str, size: int, headers: dict[str, str]) -> None:
+        """Upload a large file with the TUS resumable upload protocol in CHUNK_SIZE pieces."""
+        parent, _, filename = owncloud_path.rpartition("/")
+        encoded_name = base64.b64encode(filename.encode()).decode()
+        encoded_mtime = base64.b64encode(headers["X-OC-Mtime"].encode()).decode()
+
+        create = await self._client.post(
+            build_webdav_url(parent),
+            headers={
+                "Tus-Resumable": "1.0.0",
+                "Upload-Length": str(size),
+                "Upload-Metadata": f"filename {encoded_name},mtime {encoded_mtime}",
+            },
+        )
+        create.raise_for_status()
+        upload_url = httpx.URL(build_webdav_url(parent)).join(create.headers["Location"])
+
+        offset = 0
+        while offset < size:
+            length = min(CHUNK_SIZE, size - offset)
+            resp = await self._client.patch(
+                upload_url,
+                headers={
+                    "Tus-Resumable": "1.0.0",
+                    "Upload-Offset": str(offset),
+                    "Content-Type": "application/offset+octet-stream",
+                    "Content-Length": str(length),
+                },
+                content=iter_file(local_file, offset, length),
+            )
             resp.raise_for_status()
-
-        file_size = local_file.stat().st_size
-        logger.info(f"Uploaded {local_path} -> {owncloud_path} ({file_size} bytes)")
-        return True
-    except httpx.HTTPStatusError as e:
-        logger.error(f"Failed to upload {local_path}: HTTP {e.response.status_code}")
-        return False
-    except Exception as e:
-        logger.error(f"Error uploading {local_path}: {e}")
-        return False
+            offset = int(resp.headers.get("Upload-Offset", offset + length))
 
 
-async def upload(local_base_path: str) -> None:
+async def upload(local_base_path: str, parallel: int = DEFAULT_PARALLEL_UPLOADS) -> None:
     """
     Master function to upload files and directories to ownCloud.
 
     Args:
         local_base_path: Base directory path (relative to src directory)
+        parallel: Maximum number of concurrent WebDAV requests
     """
     logger.start(f"Starting upload from {local_base_path}")
 
@@ -117,15 +295,20 @@ async def upload(local_base_path: str) -> None:
 
         logger.info(f"Found {len(directories)} directories and {len(file_only_mappings)} files")
 
-        # Create directories first
-        for directory in directories:
-            await create_directory(directory)
+        async with OwnCloudUploader(parallel) as uploader:
+            # Create directories first
+            await uploader.create_directories(directories)
+
+            # Fetch what is already on the server so unchanged files can be skipped
+            remote_dirs = {remote.rpartition("/")[0] for _, remote in file_only_mappings}
+            listings = await asyncio.gather(*(uploader.list_remote_files(remote_dir) for remote_dir in remote_dirs))
+            remote_files = {path: entry for listing in listings for path, entry in listing.items()}
+
+            # Upload files
+            results = await asyncio.gather(*(uploader.upload_file(local_path, owncloud_path, remote_files.get(owncloud_path)) for local_path, owncloud_path in file_only_mappings))
 
-        # Upload files
-        success_count = 0
-        for local_path, owncloud_path in file_only_mappings:
-            if await upload_to_owncloud(local_path, owncloud_path):
-                success_count += 1
+        success_count = sum(results)
+        logger.info(uploader.stats.report())
 
         if success_count == len(file_only_mappings):
             logger.succeed(f"Successfully uploaded all {success_count} files")
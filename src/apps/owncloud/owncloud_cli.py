@@ -4,8 +4,9 @@ from pathlib import Path
 
 import click
 
-from apps.owncloud.core.upload import upload
+from apps.owncloud.core.upload import DEFAULT_PARALLEL_UPLOADS, upload
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -67,13 +68,24 @@ def down():
         raise
 
 
+add_snapshot_commands(
+    owncloud_cli,
+    SnapshotSpec(
+        app="owncloud",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        volumes=[("ocis", "/var/lib/ocis")],
+    ),
+)
+
+
 @owncloud_cli.command()
 @click.option("--path", required=True, help="Local directory path to upload (relative to src directory) apps/owncloud/data/default/hr")
-def seed(path: str):
+@click.option("--parallel", type=int, default=DEFAULT_PARALLEL_UPLOADS, help="Maximum number of concurrent WebDAV requests")
+def seed(path: str, parallel: int):
     """Upload files and directories to ownCloud"""
 
     async def async_seed():
-        await upload(path)
+        await upload(path, parallel)
 
     asyncio.run(async_seed())
 
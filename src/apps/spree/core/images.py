@@ -1,15 +1,13 @@
 import asyncio
-import base64
-import hashlib
 import json
 import random
 import secrets
+import shutil
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
-import aiofiles
 import aiohttp
 
 from apps.spree.config.settings import settings
@@ -19,6 +17,7 @@ from apps.spree.utils.constants import (
 )
 from apps.spree.utils.database import db_client
 from apps.spree.utils.pexels import PexelsAPI
+from common.asset_store import get_asset_store
 from common.logger import logger
 
 
@@ -68,7 +67,7 @@ class DirectImageSeeder:
         return f"{self.storage_path}/{prefix}/{middle}/{key}"
 
     async def _download_image_to_storage(self, url: str, storage_key: str) -> tuple[int, str, str]:
-        """Download image directly to storage location and calculate MD5 checksum.
+        """Copy an image into the storage location from the shared asset store, downloading it only on first use.
 
         Args:
                     url: Image URL to download
@@ -80,38 +79,23 @@ class DirectImageSeeder:
         if not self.session:
             raise RuntimeError("Session not initialized. Use async context manager.")
 
+        asset = await get_asset_store().fetch(url, self.session)
+
         storage_file_path = self._get_storage_path_for_key(storage_key)
 
         # Create directory structure
         Path(storage_file_path).parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(shutil.copyfile, asset.path, storage_file_path)
 
-        async with self.session.get(url) as response:
-            response.raise_for_status()
-
-            # Get original filename from URL or Content-Disposition
-            original_filename = url.split("/")[-1].split("?")[0]
-            if "." not in original_filename:
-                content_type = response.headers.get("content-type", "image/jpeg")
-                ext = "jpg" if "jpeg" in content_type else content_type.split("/")[-1]
-                original_filename = f"{storage_key}.{ext}"
-
-            # Write file directly to storage and calculate MD5 checksum
-            if aiofiles is None:
-                raise ImportError("aiofiles package is required for direct image seeding. Install with: pip install aiofiles")
-
-            md5_hash = hashlib.md5()
-            file_size = 0
-
-            async with aiofiles.open(storage_file_path, "wb") as f:
-                async for chunk in response.content.iter_chunked(8192):
-                    await f.write(chunk)
-                    md5_hash.update(chunk)
-                    file_size += len(chunk)
-
-            # Convert MD5 hash to base64 (Rails format)
-            checksum = base64.b64encode(md5_hash.digest()).decode("ascii")
+        # Get original filename from URL
+        original_filename = url.split("/")[-1].split("?")[0]
+        if "." not in original_filename:
+            content_type = asset.content_type or "image/jpeg"
+            ext = "jpg" if "jpeg" in content_type else content_type.split("/")[-1]
+            original_filename = f"{storage_key}.{ext}"
 
-        return file_size, original_filename, checksum
+        # MD5 checksum in base64 (Rails format), computed once by the asset store
+        return asset.size, original_filename, asset.md5_base64
 
     async def _insert_blob_record(self, storage_key: str, filename: str, file_size: int, checksum: str, content_type: str = "image/jpeg") -> int:
         """Insert Active Storage blob record directly with checksum.
@@ -642,238 +642,134 @@ async def seed_menus():
 
         current_time = datetime.now()
 
-        # First pass: Insert menus and their root container items
-        menu_id_map = {}  # generated_id -> database_id
-        root_container_map = {}  # database_menu_id -> root_container_id
-
-        for menu in menus:
-            try:
-                # Check if menu already exists
-                existing_menu = await db_client.fetchrow(
-                    "SELECT id FROM spree_menus WHERE location = $1 AND locale = $2 AND store_id = $3", menu["location"], menu["locale"], menu["store_id"]
-                )
-
-                if existing_menu:
-                    menu_id_map[menu["id"]] = existing_menu["id"]
-                    # Check if root container item exists for this menu
-                    existing_root = await db_client.fetchrow(
-                        "SELECT id FROM spree_menu_items WHERE menu_id = $1 AND parent_id IS NULL AND item_type = $2", existing_menu["id"], "Container"
-                    )
-                    if existing_root:
-                        root_container_map[existing_menu["id"]] = existing_root["id"]
-                    continue
-
-                # Insert menu
-                menu_record = await db_client.fetchrow(
-                    """
-                    INSERT INTO spree_menus (name, location, locale, store_id, created_at, updated_at)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                    RETURNING id
-                    """,
-                    menu["name"],
-                    menu["location"],
-                    menu["locale"],
-                    menu["store_id"],
-                    current_time,
-                    current_time,
-                )
-
-                if menu_record:
-                    database_menu_id = menu_record["id"]
-                    menu_id_map[menu["id"]] = database_menu_id
-                    # Create root container menu item for this menu
-                    root_container_record = await db_client.fetchrow(
-                        """
-                        INSERT INTO spree_menu_items (name, subtitle, destination, new_window, item_type,
-                                                    linked_resource_type, linked_resource_id, code, parent_id,
-                                                    lft, rgt, depth, menu_id, created_at, updated_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
-                        RETURNING id
-                        """,
-                        menu["name"],  # Use menu name for the container
-                        None,  # subtitle
-                        None,  # destination (containers don't have destinations)
-                        False,  # new_window
-                        "Container",  # item_type
-                        "Spree::Linkable::Uri",  # linked_resource_type
-                        None,  # linked_resource_id
-                        None,  # code
-                        None,  # parent_id (root level)
-                        1,  # lft (will be recalculated later)
-                        2,  # rgt (will be recalculated later)
-                        0,  # depth
-                        database_menu_id,  # menu_id
-                        current_time,  # created_at
-                        current_time,  # updated_at
-                    )
+        def menu_item_row(item: dict, parent_id: int | None, depth: int, database_menu_id: int) -> dict:
+            return {
+                "name": item["name"],
+                "subtitle": item.get("subtitle"),
+                "destination": item.get("destination"),
+                "new_window": item.get("new_window", False),
+                "item_type": item.get("item_type", "Link"),
+                "linked_resource_type": item.get("linked_resource_type", "Spree::Linkable::Uri"),
+                "linked_resource_id": item.get("linked_resource_id"),
+                "code": item.get("code"),
+                "parent_id": parent_id,
+                "lft": item.get("lft", 1),  # Recalculated below
+                "rgt": item.get("rgt", 2),
+                "depth": depth,
+                "menu_id": database_menu_id,
+                "created_at": current_time,
+                "updated_at": current_time,
+            }
+
+        # First pass: Insert missing menus and their root container items
+        menu_key_map = {(menu["location"], menu["locale"], menu["store_id"]): menu["id"] for menu in await db_client.fetch("SELECT id, location, locale, store_id FROM spree_menus")}
+        new_menus = [menu for menu in menus if (menu["location"], menu["locale"], menu["store_id"]) not in menu_key_map]
+        existing_menu_ids = list(menu_key_map.values())
+
+        inserted_menus = await db_client.upsert(
+            "spree_menus",
+            [
+                {"name": menu["name"], "location": menu["location"], "locale": menu["locale"], "store_id": menu["store_id"], "created_at": current_time, "updated_at": current_time}
+                for menu in {(menu["location"], menu["locale"], menu["store_id"]): menu for menu in new_menus}.values()
+            ],
+            key_columns=(),
+            returning=("id", "location", "locale", "store_id"),
+        )
+        for record in inserted_menus:
+            menu_key_map[(record["location"], record["locale"], record["store_id"])] = record["id"]
 
-                    if root_container_record:
-                        root_container_map[database_menu_id] = root_container_record["id"]
+        menu_id_map = {menu["id"]: menu_key_map[(menu["location"], menu["locale"], menu["store_id"])] for menu in menus}  # generated_id -> database_id
 
-            except Exception as e:
-                logger.error(f"Failed to insert menu {menu['name']}: {e}")
-                continue
+        # Menus that already existed keep their root container; new menus get one named after the menu
+        root_container_map = {  # database_menu_id -> root_container_id
+            root["menu_id"]: root["id"]
+            for root in await db_client.fetch(
+                "SELECT id, menu_id FROM spree_menu_items WHERE menu_id = ANY($1::bigint[]) AND parent_id IS NULL AND item_type = 'Container'", existing_menu_ids
+            )
+        }
+        new_menu_names = {menu_id_map[menu["id"]]: menu["name"] for menu in new_menus}
+        root_containers = await db_client.upsert(
+            "spree_menu_items",
+            [menu_item_row({"name": name, "item_type": "Container"}, None, 0, database_menu_id) for database_menu_id, name in new_menu_names.items()],
+            key_columns=(),
+            returning=("id", "menu_id"),
+        )
+        root_container_map.update({root["menu_id"]: root["id"] for root in root_containers})
 
         # Second pass: Insert menu items
-        all_menu_items = []
-        for menu in menus:
-            menu_items = menu.get("menu_items", [])
-            # Update menu_id to database ID
-            database_menu_id = menu_id_map.get(menu["id"])
-            if database_menu_id:
-                for item in menu_items:
-                    item["database_menu_id"] = database_menu_id
-                    all_menu_items.append(item)
-
-        logger.info(f"Processing {len(all_menu_items)} menu items")
-
-        # Build item mapping and parent relationships
-        item_id_map = {}  # name -> database_id (within each menu)
         items_by_menu = {}  # database_menu_id -> list of items
-
-        for item in all_menu_items:
-            database_menu_id = item["database_menu_id"]
-            if database_menu_id not in items_by_menu:
-                items_by_menu[database_menu_id] = []
-            items_by_menu[database_menu_id].append(item)
-
-        # Insert items for each menu
+        for menu in menus:
+            items_by_menu.setdefault(menu_id_map[menu["id"]], []).extend(menu.get("menu_items", []))
+
+        logger.info(f"Processing {sum(len(items) for items in items_by_menu.values())} menu items")
+
+        # Existing items are matched by name under the same parent
+        database_menu_ids = list(items_by_menu)
+        existing_item_ids = {
+            (item["parent_id"], item["name"]): item["id"]
+            for item in await db_client.fetch("SELECT id, name, parent_id FROM spree_menu_items WHERE menu_id = ANY($1::bigint[])", database_menu_ids)
+        }
+        item_id_map = {}  # f"{database_menu_id}_{name}" -> database_id
+
+        async def insert_missing_items(items_with_parents: list[tuple[int, dict, int]], depth: int) -> None:
+            """Insert the items not yet under their parent with one statement, and map every item name to its ID."""
+            rows = []
+            pending = set()
+            for database_menu_id, item, parent_id in items_with_parents:
+                key = (parent_id, item["name"])
+                if key in existing_item_ids:
+                    item_id_map[f"{database_menu_id}_{item['name']}"] = existing_item_ids[key]
+                elif key not in pending:
+                    # Duplicates within the batch are inserted once and get their ID from the returned rows
+                    pending.add(key)
+                    rows.append(menu_item_row(item, parent_id, depth, database_menu_id))
+
+            for record in await db_client.upsert("spree_menu_items", rows, key_columns=(), returning=("id", "name", "parent_id", "menu_id")):
+                existing_item_ids[(record["parent_id"], record["name"])] = record["id"]
+                item_id_map[f"{record['menu_id']}_{record['name']}"] = record["id"]
+
+        # Top-level items are children of the root container, child items of a top-level item
+        top_level_items = []
         for database_menu_id, menu_items in items_by_menu.items():
-            # Get the root container ID for this menu
             root_container_id = root_container_map.get(database_menu_id)
             if not root_container_id:
                 logger.warning(f"No root container found for menu {database_menu_id}, skipping menu items")
                 continue
+            top_level_items.extend((database_menu_id, item, root_container_id) for item in menu_items if item.get("parent_name") is None)
 
-            # First pass: insert top-level items (children of root container)
-            top_level_items = [item for item in menu_items if item.get("parent_name") is None]
-            child_items = [item for item in menu_items if item.get("parent_name") is not None]
-
-            logger.info(f"Processing {len(top_level_items)} top-level items for menu {database_menu_id}")
-
-            for item in top_level_items:
-                try:
-                    # Check if item already exists (child of root container)
-                    existing_item = await db_client.fetchrow(
-                        "SELECT id FROM spree_menu_items WHERE name = $1 AND menu_id = $2 AND parent_id = $3", item["name"], database_menu_id, root_container_id
-                    )
+        logger.info(f"Processing {len(top_level_items)} top-level items")
+        await insert_missing_items(top_level_items, depth=1)
 
-                    if existing_item:
-                        item_id_map[f"{database_menu_id}_{item['name']}"] = existing_item["id"]
-                        continue
-
-                    # Insert top-level menu item (child of root container)
-                    item_record = await db_client.fetchrow(
-                        """
-                        INSERT INTO spree_menu_items (name, subtitle, destination, new_window, item_type,
-                                                    linked_resource_type, linked_resource_id, code, parent_id,
-                                                    lft, rgt, depth, menu_id, created_at, updated_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
-                        RETURNING id
-                        """,
-                        item["name"],
-                        item.get("subtitle"),
-                        item["destination"],
-                        item.get("new_window", False),
-                        item.get("item_type", "Link"),
-                        item.get("linked_resource_type", "Spree::Linkable::Uri"),
-                        item.get("linked_resource_id"),
-                        item.get("code"),
-                        root_container_id,  # parent_id = root container
-                        item.get("lft", 1),
-                        item.get("rgt", 2),
-                        1,  # depth = 1 (child of root container at depth 0)
-                        database_menu_id,
-                        current_time,
-                        current_time,
-                    )
-
-                    if item_record:
-                        item_id_map[f"{database_menu_id}_{item['name']}"] = item_record["id"]
-
-                except Exception as e:
-                    logger.error(f"Failed to insert top-level menu item {item['name']}: {e}")
+        child_items = []
+        for database_menu_id, menu_items in items_by_menu.items():
+            for item in menu_items:
+                parent_name = item.get("parent_name")
+                if parent_name is None or database_menu_id not in root_container_map:
                     continue
-
-            # Second pass: insert child items
-            logger.info(f"Processing {len(child_items)} child items for menu {database_menu_id}")
-
-            for item in child_items:
-                try:
-                    parent_name = item.get("parent_name")
-                    parent_key = f"{database_menu_id}_{parent_name}"
-
-                    if not parent_name or parent_key not in item_id_map:
-                        logger.warning(f"Parent '{parent_name}' not found for menu item '{item['name']}', skipping")
-                        continue
-
-                    parent_id = item_id_map[parent_key]
-
-                    # Check if item already exists
-                    existing_item = await db_client.fetchrow("SELECT id FROM spree_menu_items WHERE name = $1 AND parent_id = $2", item["name"], parent_id)
-
-                    if existing_item:
-                        item_id_map[f"{database_menu_id}_{item['name']}"] = existing_item["id"]
-                        continue
-
-                    # Insert child menu item
-                    item_record = await db_client.fetchrow(
-                        """
-                        INSERT INTO spree_menu_items (name, subtitle, destination, new_window, item_type,
-                                                    linked_resource_type, linked_resource_id, code, parent_id,
-                                                    lft, rgt, depth, menu_id, created_at, updated_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15)
-                        RETURNING id
-                        """,
-                        item["name"],
-                        item.get("subtitle"),
-                        item["destination"],
-                        item.get("new_window", False),
-                        item.get("item_type", "Link"),
-                        item.get("linked_resource_type", "Spree::Linkable::Uri"),
-                        item.get("linked_resource_id"),
-                        item.get("code"),
-                        parent_id,
-                        item.get("lft", 1),
-                        item.get("rgt", 2),
-                        2,  # depth = 2 (grandchild of root container)
-                        database_menu_id,
-                        current_time,
-                        current_time,
-                    )
-
-                    if item_record:
-                        item_id_map[f"{database_menu_id}_{item['name']}"] = item_record["id"]
-
-                except Exception as e:
-                    logger.error(f"Failed to insert child menu item {item['name']}: {e}")
+                parent_key = f"{database_menu_id}_{parent_name}"
+                if parent_key not in item_id_map:
+                    logger.warning(f"Parent '{parent_name}' not found for menu item '{item['name']}', skipping")
                     continue
+                child_items.append((database_menu_id, item, item_id_map[parent_key]))
+
+        logger.info(f"Processing {len(child_items)} child items")
+        await insert_missing_items(child_items, depth=2)
 
         # Update nested set values for the complete hierarchy (including root containers)
         logger.info("Updating nested set values for complete menu hierarchy...")
-        for database_menu_id in menu_id_map.values():
-            try:
-                # Get all menu items for this menu (including root container)
-                all_menu_items = await db_client.fetch("SELECT id, name, parent_id, depth FROM spree_menu_items WHERE menu_id = $1 ORDER BY depth, name", database_menu_id)
-
-                if all_menu_items:
-                    # Build hierarchy mapping for nested set calculation
-                    items_by_parent = {}
-                    for item in all_menu_items:
-                        parent_id = item["parent_id"]
-                        if parent_id not in items_by_parent:
-                            items_by_parent[parent_id] = []
-                        items_by_parent[parent_id].append({"id": item["id"], "name": item["name"]})
-
-                    # Calculate nested set values starting from root containers (parent_id = None)
-                    lft_rgt_values, _ = calculate_nested_set_values_for_menu_items(items_by_parent, parent_id=None, left_value=1)
-
-                    # Update all items with new nested set values
-                    for item_id, values in lft_rgt_values.items():
-                        await db_client.execute("UPDATE spree_menu_items SET lft = $1, rgt = $2 WHERE id = $3", values["lft"], values["rgt"], item_id)
-
-            except Exception as e:
-                logger.error(f"Failed to update nested set values for menu {database_menu_id}: {e}")
+        items_by_menu_and_parent = {}  # database_menu_id -> parent_id -> list of items
+        for item in await db_client.fetch(
+            "SELECT id, name, parent_id, menu_id FROM spree_menu_items WHERE menu_id = ANY($1::bigint[]) ORDER BY depth, name", list(set(menu_id_map.values()))
+        ):
+            items_by_menu_and_parent.setdefault(item["menu_id"], {}).setdefault(item["parent_id"], []).append({"id": item["id"], "name": item["name"]})
+
+        nested_set_rows = []
+        for items_by_parent in items_by_menu_and_parent.values():
+            # Calculate nested set values starting from root containers (parent_id = None)
+            lft_rgt_values, _ = calculate_nested_set_values_for_menu_items(items_by_parent, parent_id=None, left_value=1)
+            nested_set_rows.extend({"id": item_id, "lft": values["lft"], "rgt": values["rgt"]} for item_id, values in lft_rgt_values.items())
+
+        await db_client.update_many("spree_menu_items", nested_set_rows)
 
         logger.succeed(f"Successfully processed {len(menu_id_map)} menus and {len(item_id_map)} menu items in the database")
 
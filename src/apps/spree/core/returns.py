@@ -140,47 +140,14 @@ async def seed_rma_reasons():
         return_reasons = data.get("return_reasons", [])
         logger.info(f"Loaded {len(return_reasons)} return authorization reasons from {RETURN_AUTHORIZATIONS_FILE}")
 
-        # Insert each return authorization reason into the database
-        inserted_count = 0
-        for reason in return_reasons:
-            try:
-                reason_id = reason.get("id")
-
-                # Check if reason with this ID already exists
-                existing_reason = await db_client.fetchrow("SELECT id FROM spree_return_authorization_reasons WHERE id = $1", reason_id)
-
-                if existing_reason:
-                    # Update existing reason
-                    await db_client.execute(
-                        """
-                        UPDATE spree_return_authorization_reasons 
-                        SET name = $1, active = $2, mutable = $3, updated_at = NOW()
-                        WHERE id = $4
-                        """,
-                        reason["name"],
-                        reason["active"],
-                        reason["mutable"],
-                        reason_id,
-                    )
-                    logger.info(f"Updated existing return authorization reason: {reason['name']} [ID: {reason_id}]")
-                else:
-                    # Insert new reason with specified ID
-                    await db_client.execute(
-                        """
-                        INSERT INTO spree_return_authorization_reasons (id, name, active, mutable, created_at, updated_at)
-                        VALUES ($1, $2, $3, $4, NOW(), NOW())
-                        """,
-                        reason_id,
-                        reason["name"],
-                        reason["active"],
-                        reason["mutable"],
-                    )
-
-                inserted_count += 1
-
-            except Exception as e:
-                logger.error(f"Failed to insert/update return authorization reason {reason['name']}: {e}")
-                continue
+        # Insert new and update existing reasons in one statement
+        current_time = datetime.now()
+        rows = [
+            {"id": reason["id"], "name": reason["name"], "active": reason["active"], "mutable": reason["mutable"], "created_at": current_time, "updated_at": current_time}
+            for reason in return_reasons
+        ]
+        await db_client.upsert("spree_return_authorization_reasons", rows)
+        inserted_count = len(rows)
 
         logger.succeed(f"Successfully processed {inserted_count} return authorization reasons in the database")
 
@@ -448,57 +415,24 @@ async def seed_rmas():
         rmas = data.get("return_authorizations", [])
         logger.info(f"Loaded {len(rmas)} return authorizations from {RETURN_AUTHORIZATIONS_FILE}")
 
-        # Insert each return authorization into the database
-        inserted_count = 0
-        for rma in rmas:
-            try:
-                rma_id = rma.get("id")
-
-                # Check if RMA with this ID already exists
-                existing_rma = await db_client.fetchrow("SELECT id FROM spree_return_authorizations WHERE id = $1", rma_id)
-
-                if existing_rma:
-                    # Update existing RMA
-                    await db_client.execute(
-                        """
-                        UPDATE spree_return_authorizations 
-                        SET number = $1, state = $2, order_id = $3, memo = $4,
-                            stock_location_id = $5, return_authorization_reason_id = $6,
-                            updated_at = NOW()
-                        WHERE id = $7
-                        """,
-                        rma["number"],
-                        rma["state"],
-                        rma["order_id"],
-                        rma["memo"],
-                        rma["stock_location_id"],
-                        rma["return_authorization_reason_id"],
-                        rma_id,
-                    )
-                    logger.info(f"Updated existing return authorization: {rma['number']} [ID: {rma_id}]")
-                else:
-                    # Insert new RMA with specified ID
-                    await db_client.execute(
-                        """
-                        INSERT INTO spree_return_authorizations 
-                        (id, number, state, order_id, memo, stock_location_id, 
-                         return_authorization_reason_id, created_at, updated_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, NOW(), NOW())
-                        """,
-                        rma_id,
-                        rma["number"],
-                        rma["state"],
-                        rma["order_id"],
-                        rma["memo"],
-                        rma["stock_location_id"],
-                        rma["return_authorization_reason_id"],
-                    )
-
-                inserted_count += 1
-
-            except Exception as e:
-                logger.error(f"Failed to insert/update return authorization {rma.get('number', 'unknown')}: {e}")
-                continue
+        # Insert new and update existing return authorizations in one statement per chunk
+        current_time = datetime.now()
+        rows = [
+            {
+                "id": rma["id"],
+                "number": rma["number"],
+                "state": rma["state"],
+                "order_id": rma["order_id"],
+                "memo": rma["memo"],
+                "stock_location_id": rma["stock_location_id"],
+                "return_authorization_reason_id": rma["return_authorization_reason_id"],
+                "created_at": current_time,
+                "updated_at": current_time,
+            }
+            for rma in rmas
+        ]
+        await db_client.upsert("spree_return_authorizations", rows)
+        inserted_count = len(rows)
 
         logger.succeed(f"Successfully processed {inserted_count} return authorizations in the database")
 
@@ -722,242 +656,125 @@ async def seed_customer_returns():
         customer_returns = data.get("customer_returns", [])
         logger.info(f"Loaded {len(customer_returns)} customer returns from {CUSTOMER_RETURNS_FILE}")
 
-        # Insert each customer return into the database
-        inserted_count = 0
-        for cr in customer_returns:
-            try:
-                cr_id = cr.get("id")
-
-                # Check if customer return with this ID already exists
-                existing_cr = await db_client.fetchrow("SELECT id FROM spree_customer_returns WHERE id = $1", cr_id)
+        current_time = datetime.now()
 
+        # Insert new and update existing customer returns in one statement per chunk
+        rows = [
+            {
+                "id": cr["id"],
+                "number": cr["number"],
+                "stock_location_id": cr["stock_location_id"],
+                "store_id": cr["store_id"],
                 # Convert JSON metadata to JSONB
-                public_metadata = json.dumps(cr.get("public_metadata", {})) if cr.get("public_metadata") else "{}"
-                private_metadata = json.dumps(cr.get("private_metadata", {})) if cr.get("private_metadata") else "{}"
+                "public_metadata": json.dumps(cr["public_metadata"]) if cr.get("public_metadata") else "{}",
+                "private_metadata": json.dumps(cr["private_metadata"]) if cr.get("private_metadata") else "{}",
+                "created_at": datetime.fromisoformat(cr["created_at"]),
+                "updated_at": datetime.fromisoformat(cr["updated_at"]),
+            }
+            for cr in customer_returns
+        ]
+
+        # CRITICAL: Every customer return in Spree MUST have return_items that belong to a return_authorization
+        # Load the authorized RMAs and the inventory units of all referenced orders at once
+        rma_ids = list({ra_id for cr in customer_returns for ra_id in cr.get("return_authorizations") or []})
+        authorized_rmas = {
+            rma["id"]: rma["order_id"]
+            for rma in await db_client.fetch("SELECT id, order_id FROM spree_return_authorizations WHERE id = ANY($1::bigint[]) AND state = 'authorized'", rma_ids)
+        }
+
+        order_ids = list({cr["associated_order_id"] for cr in customer_returns if cr.get("associated_order_id")})
+        units_by_order = {}
+        for unit in await db_client.fetch(
+            """
+            SELECT iu.id, iu.order_id, li.price, COALESCE(iu.state, 'on_hand') as state,
+                   EXISTS (SELECT 1 FROM spree_return_items ri WHERE ri.inventory_unit_id = iu.id) AS has_return_item
+            FROM spree_inventory_units iu
+            JOIN spree_line_items li ON li.id = iu.line_item_id
+            WHERE iu.order_id = ANY($1::bigint[])
+            ORDER BY li.price DESC
+            """,
+            order_ids,
+        ):
+            units_by_order.setdefault(unit["order_id"], []).append(unit)
+
+        # Inventory units that already are, or are about to be, the subject of a return item
+        returned_unit_ids = {unit["id"] for units in units_by_order.values() for unit in units if unit["has_return_item"]}
+        return_items = []
+        already_returned = 0
 
-                # Get return authorizations IDs
-                return_authorization_ids = cr.get("return_authorizations", [])
+        for cr in customer_returns:
+            order_id = cr.get("associated_order_id")
+            return_authorization_ids = cr.get("return_authorizations") or []
 
-                # Parse string timestamps to datetime objects
-                created_at = datetime.strptime(cr["created_at"], "%Y-%m-%d %H:%M:%S")
-                updated_at = datetime.strptime(cr["updated_at"], "%Y-%m-%d %H:%M:%S")
+            if not return_authorization_ids or not order_id:
+                logger.warning(f"Customer return {cr['number']} missing required RMA or order associations")
+                continue
 
-                if existing_cr:
-                    # Update existing customer return
-                    await db_client.execute(
-                        """
-                        UPDATE spree_customer_returns 
-                        SET number = $1, stock_location_id = $2,
-                            store_id = $3, public_metadata = $4, private_metadata = $5,
-                            updated_at = $6
-                        WHERE id = $7
-                        """,
-                        cr["number"],
-                        cr["stock_location_id"],
-                        cr["store_id"],
-                        public_metadata,
-                        private_metadata,
-                        updated_at,
-                        cr_id,
-                    )
-                    logger.info(f"Updated existing customer return: {cr['number']} [ID: {cr_id}]")
+            # Only RMAs that are authorized and belong to this order can hold its return items
+            existing_rmas = []
+            for ra_id in return_authorization_ids:
+                if ra_id not in authorized_rmas:
+                    continue
+                if authorized_rmas[ra_id] == order_id:
+                    existing_rmas.append(ra_id)
                 else:
-                    # Insert new customer return with specified ID
-                    await db_client.execute(
-                        """
-                        INSERT INTO spree_customer_returns 
-                        (id, number, stock_location_id, store_id, 
-                         public_metadata, private_metadata, created_at, updated_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                        """,
-                        cr_id,
-                        cr["number"],
-                        cr["stock_location_id"],
-                        cr["store_id"],
-                        public_metadata,
-                        private_metadata,
-                        created_at,
-                        updated_at,
-                    )
-                    logger.info(f"Inserted new customer return: {cr['number']} [ID: {cr_id}]")
+                    logger.warning(f"RMA {ra_id} belongs to order {authorized_rmas[ra_id]}, not {order_id}")
 
-                    # CRITICAL: Every customer return in Spree MUST have return_items that belong to a return_authorization
-                # Get the associated return authorizations and order ID
-                order_id = cr.get("associated_order_id")
-                return_authorization_ids = cr.get("return_authorizations", [])
-
-                if not return_authorization_ids or not order_id:
-                    logger.warning(f"Customer return {cr['number']} missing required RMA or order associations")
-                    continue
+            if not existing_rmas:
+                logger.warning(f"No valid RMAs found for customer return {cr['number']}")
+                continue
 
-                # Step 1: Find available inventory units for the order
-                try:
-                    # Verify RMAs actually exist in the database
-                    existing_rmas = []
-                    for ra_id in return_authorization_ids:
-                        ra_exists = await db_client.fetchrow(
-                            """
-                            SELECT id, order_id FROM spree_return_authorizations
-                            WHERE id = $1 AND state = 'authorized'
-                            """,
-                            ra_id,
-                        )
-
-                        if ra_exists:
-                            # Make sure RMA belongs to this order
-                            if ra_exists["order_id"] == order_id:
-                                existing_rmas.append(ra_id)
-                            else:
-                                logger.warning(f"RMA {ra_id} belongs to order {ra_exists['order_id']}, not {order_id}")
-
-                    if not existing_rmas:
-                        logger.warning(f"No valid RMAs found for customer return {cr['number']}")
-                        continue
+            # Prefer units that are not returned yet, most expensive first; fall back to any unit of the order
+            order_units = units_by_order.get(order_id, [])
+            inventory_units = [unit for unit in order_units if unit["id"] not in returned_unit_ids and unit["state"] != "returned"][:5]
+            if not inventory_units:
+                inventory_units = [unit for unit in order_units if unit["state"] != "returned"][:3] or order_units[:3]
+            if not inventory_units:
+                logger.error(f"No inventory units found at all for customer return {cr['number']} with order {order_id}")
+                continue
 
-                        # Find inventory units that can be returned with detailed product information
-                    # This ensures we're only returning items that were actually in the customer's order
-                    inventory_units = await db_client.fetch(
-                        """
-                        SELECT iu.id, li.price, v.sku, p.name, p.description,
-                               COALESCE(iu.state, 'on_hand') as state
-                        FROM spree_inventory_units iu
-                        JOIN spree_line_items li ON li.id = iu.line_item_id
-                        JOIN spree_variants v ON v.id = iu.variant_id
-                        JOIN spree_products p ON p.id = v.product_id
-                        LEFT JOIN spree_return_items ri ON ri.inventory_unit_id = iu.id
-                        WHERE iu.order_id = $1 
-                          AND ri.id IS NULL
-                          AND iu.state != 'returned'
-                        ORDER BY li.price DESC
-                        LIMIT 5
-                        """,
-                        order_id,
-                    )
+            # Distribute inventory units across RMAs, at most 3 return items per customer return
+            items_created = 0
+            for i, unit in enumerate(inventory_units):
+                if unit["id"] in returned_unit_ids:
+                    continue
 
-                    # If no available inventory units found, get any inventory units for this order
-                    # that haven't been returned yet, regardless of return items
-                    if not inventory_units:
-                        inventory_units = await db_client.fetch(
-                            """
-                            SELECT iu.id, li.price, v.sku, p.name,
-                                  COALESCE(iu.state, 'on_hand') as state
-                            FROM spree_inventory_units iu
-                            JOIN spree_line_items li ON li.id = iu.line_item_id
-                            JOIN spree_variants v ON v.id = iu.variant_id
-                            JOIN spree_products p ON p.id = v.product_id
-                            WHERE iu.order_id = $1
-                              AND iu.state != 'returned'
-                            ORDER BY li.price DESC
-                            LIMIT 3
-                            """,
-                            order_id,
-                        )
-
-                    # We must have inventory units to proceed
-                    if not inventory_units:
-                        logger.warning(f"No inventory units available for customer return {cr['number']} with order {order_id}")
-                        # Try to find any inventory units for this order, even if they're already returned
-                        inventory_units = await db_client.fetch(
-                            """
-                            SELECT iu.id, li.price, v.sku, p.name,
-                                  COALESCE(iu.state, 'on_hand') as state
-                            FROM spree_inventory_units iu
-                            JOIN spree_line_items li ON li.id = iu.line_item_id
-                            JOIN spree_variants v ON v.id = iu.variant_id
-                            JOIN spree_products p ON p.id = v.product_id
-                            WHERE iu.order_id = $1
-                            ORDER BY li.price DESC
-                            LIMIT 3
-                            """,
-                            order_id,
-                        )
-
-                        if not inventory_units:
-                            logger.error(f"No inventory units found at all for customer return {cr['number']} with order {order_id}")
-                            continue
-                        else:
-                            logger.info(f"Found {len(inventory_units)} inventory units for order {order_id} (some may be already returned)")
-
-                    # Use the valid RMAs that we've already verified
-                    # We can proceed since we've already validated that existing_rmas is not empty
-
-                    # Step 3: Create return items for each inventory unit
-                    # The key change: each customer return must have at least one return item
-                    # and each return item must belong to a valid return authorization
-                    items_created = 0
-
-                    # Distribute inventory units across RMAs
-                    for i, unit in enumerate(inventory_units):
-                        inventory_unit_id = unit["id"]
-
-                        # Select an RMA for this inventory unit
-                        # Using modulo to rotate through the available RMAs
-                        ra_id = existing_rmas[i % len(existing_rmas)]
-
-                        # Check if this inventory unit is already associated with a return item
-                        existing_return_item = await db_client.fetchrow(
-                            """
-                            SELECT id FROM spree_return_items 
-                            WHERE inventory_unit_id = $1
-                            """,
-                            inventory_unit_id,
-                        )
-
-                        if existing_return_item:
-                            # Skip units already being returned
-                            logger.info(f"Inventory unit {inventory_unit_id} already has return item, skipping")
-                            continue
-
-                        # Use the price that we already fetched with the inventory unit
-                        # Each unit in inventory_units now has price, sku, and name information
-                        pre_tax_amount = unit["price"]
-                        product_name = unit["name"]
-                        product_sku = unit["sku"]
-                        logger.info(f"Processing return of {product_name} (SKU: {product_sku}) at price {pre_tax_amount}")
-
-                        # Create return item linking customer return, return authorization and inventory unit
-                        await db_client.execute(
-                            """
-                            INSERT INTO spree_return_items 
-                            (customer_return_id, return_authorization_id, inventory_unit_id, 
-                             pre_tax_amount, acceptance_status, reception_status, created_at, updated_at)
-                            VALUES ($1, $2, $3, $4, $5, $6, NOW(), NOW())
-                            """,
-                            cr_id,
-                            ra_id,
-                            inventory_unit_id,
-                            pre_tax_amount,  # Use the actual price from the order
-                            "accepted",
-                            "received",  # Set as received per the process_return! method
-                        )
-                        items_created += 1
-
-                        # A customer return must have at least one return item, but we can create more if available
-                        if items_created >= 3:  # Limit to 3 items per customer return
-                            break
-
-                    logger.info(f"Created {items_created} return items for customer return {cr['number']} with order {order_id}")
-
-                    # Update inventory units to 'returned' state (only if not already returned)
-                    if items_created > 0:
-                        for unit in inventory_units[:items_created]:
-                            await db_client.execute(
-                                """
-                                UPDATE spree_inventory_units
-                                SET state = 'returned'
-                                WHERE id = $1 AND state != 'returned'
-                                """,
-                                unit["id"],
-                            )
-
-                except Exception as e:
-                    logger.error(f"Failed to set up return items for customer return {cr['number']}: {e}")
-
-                inserted_count += 1
+                returned_unit_ids.add(unit["id"])
+                return_items.append(
+                    {
+                        "customer_return_id": cr["id"],
+                        "return_authorization_id": existing_rmas[i % len(existing_rmas)],
+                        "inventory_unit_id": unit["id"],
+                        "pre_tax_amount": unit["price"],  # Use the actual price from the order
+                        "acceptance_status": "accepted",
+                        "reception_status": "received",  # Set as received per the process_return! method
+                        "created_at": current_time,
+                        "updated_at": current_time,
+                    }
+                )
+                items_created += 1
+                if items_created >= 3:
+                    break
+
+            # Expected on reruns, so it is only counted
+            if not items_created:
+                already_returned += 1
+                logger.debug(f"All inventory units of order {order_id} already have return items, none created for customer return {cr['number']}")
+
+        async with db_client.transaction() as conn:
+            await db_client.upsert("spree_customer_returns", rows, conn=conn)
+            await db_client.upsert("spree_return_items", return_items, key_columns=(), conn=conn)
+
+            # Update inventory units to 'returned' state (only if not already returned)
+            await conn.execute(
+                "UPDATE spree_inventory_units SET state = 'returned' WHERE id = ANY($1::bigint[]) AND state != 'returned'",
+                [item["inventory_unit_id"] for item in return_items],
+            )
 
-            except Exception as e:
-                logger.error(f"Failed to insert/update customer return {cr.get('number', 'unknown')}: {e}")
-                continue
+        inserted_count = len(rows)
+        logger.info(f"Created {len(return_items)} return items for {inserted_count} customer returns")
+        if already_returned:
+            logger.info(f"{already_returned} customer returns already had return items for all their inventory units")
 
         logger.succeed(f"Successfully processed {inserted_count} customer returns in the database")
 
@@ -9,6 +9,7 @@ from faker import Faker
 from pydantic import BaseModel, Field
 
 from apps.spree.config.settings import settings
+from apps.spree.libs.stock_ledger import StockLedger
 from apps.spree.utils.constants import PRODUCTS_FILE, STOCK_LOCATIONS_FILE, STOCK_TRANSFERS_FILE
 from apps.spree.utils.database import db_client
 from common.logger import Logger
@@ -289,7 +290,7 @@ async def seed_stock_transfers():
                 # Convert database records to format matching the JSON structure
                 stock_locations = [{"id": loc["id"], "name": loc["name"]} for loc in stock_locations_data]
 
-        # Get all variants and their stock items
+        # Get all variants
         variants = await db_client.fetch(
             """
             SELECT v.id, v.sku, p.name as product_name, v.is_master
@@ -297,12 +298,10 @@ async def seed_stock_transfers():
             JOIN spree_products p ON v.product_id = p.id
         """
         )
+        variant_ids = [v["id"] for v in variants]
+        logger.info(f"Found {len(variant_ids)} variants in database")
 
-        variant_map = {v["id"]: {"sku": v["sku"], "product_name": v["product_name"], "is_master": v["is_master"]} for v in variants}
-        logger.info(f"Found {len(variant_map)} variants in database")
-
-        # Get stock items (mapping variants to stock locations)
-        # Note: Only get active stock items (where deleted_at IS NULL)
+        # Load every active stock item once; transfers are replayed against them in memory
         stock_items = await db_client.fetch(
             """
             SELECT si.id, si.variant_id, si.stock_location_id, si.count_on_hand
@@ -310,345 +309,82 @@ async def seed_stock_transfers():
             WHERE si.deleted_at IS NULL
         """
         )
+        ledger = StockLedger([dict(si) for si in stock_items])
+        logger.info(f"Found {len(stock_items)} stock items in database")
 
-        stock_item_map = {}
-        for si in stock_items:
-            key = (si["variant_id"], si["stock_location_id"])
-            stock_item_map[key] = {"id": si["id"], "count": si["count_on_hand"]}
-
-        logger.info(f"Found {len(stock_item_map)} stock items in database")
-
-        # If we have variants but not enough stock items (stock in different locations),
-        # let's create them - one product should have stock in multiple locations
-        if variants and stock_locations and len(stock_item_map) < len(variants) * len(stock_locations):
-            logger.info("Ensuring all variants have stock items in all locations...")
-
-            # Iterate through all variants and stock locations
-            for variant in variants:
-                variant_id = variant["id"]
-
-                for stock_location in stock_locations:
-                    stock_location_id = stock_location["id"]
-                    key = (variant_id, stock_location_id)
-
-                    # If this variant doesn't have a stock item in this location, create one
-                    if key not in stock_item_map:
-                        # Generate random initial stock (between 10-200)
-                        initial_stock = random.randint(10, 200)
-
-                        # Insert the stock item
-                        stock_item = await db_client.fetchrow(
-                            """
-                            INSERT INTO spree_stock_items (
-                                variant_id, stock_location_id, count_on_hand, 
-                                created_at, updated_at, backorderable
-                            )
-                            VALUES ($1, $2, $3, $4, $5, $6)
-                            RETURNING id, count_on_hand
-                        """,
-                            variant_id,
-                            stock_location_id,
-                            initial_stock,
-                            current_time,
-                            current_time,
-                            False,  # backorderable = false by default
-                        )
-
-                        if stock_item:
-                            # Add to our map
-                            stock_item_map[key] = {"id": stock_item["id"], "count": stock_item["count_on_hand"]}
-                            logger.info(f"Created stock item for variant {variant_id} in location {stock_location_id} with {initial_stock} units")
+        # One product should have stock in multiple locations: give every variant a stock item in every location
+        location_ids = [loc["id"] for loc in stock_locations if loc.get("id") in stock_location_map]
+        created_items = ledger.ensure_items(variant_ids, location_ids)
+        if created_items:
+            logger.info(f"Planned {created_items} missing stock items across {len(location_ids)} locations")
 
-            # Update our count of stock items
-            logger.info(f"Now have {len(stock_item_map)} stock items across all locations")
+        # Transfers already in the database, or repeated in the file, are not inserted again
+        numbers = [transfer["number"] for transfer in stock_transfers]
+        existing_numbers = {row["number"] for row in await db_client.fetch("SELECT number FROM spree_stock_transfers WHERE number = ANY($1::varchar[])", numbers)}
 
-        # Process each stock transfer
-        inserted_transfers = 0
         existing_transfers = 0
         skipped_transfers = 0
 
         for transfer_data in stock_transfers:
-            try:
-                # Check if transfer already exists by number
-                existing_transfer = await db_client.fetchrow("SELECT id FROM spree_stock_transfers WHERE number = $1", transfer_data["number"])
-
-                if existing_transfer:
-                    existing_transfers += 1
-                    logger.info(f"Found existing stock transfer: {transfer_data['number']}")
-                    continue
-
-                # Verify stock locations
-                destination_id = transfer_data["destination_location_id"]
-                source_id = transfer_data.get("source_location_id")
-
-                if destination_id not in stock_location_map:
-                    logger.warning(f"Destination location ID {destination_id} not found, skipping transfer {transfer_data['number']}")
-                    skipped_transfers += 1
-                    continue
-
-                if source_id is not None and source_id not in stock_location_map:
-                    logger.warning(f"Source location ID {source_id} not found, skipping transfer {transfer_data['number']}")
-                    skipped_transfers += 1
-                    continue
-
-                # Insert stock transfer
-                transfer_record = await db_client.fetchrow(
-                    """
-                    INSERT INTO spree_stock_transfers (
-                        type, reference, source_location_id, destination_location_id,
-                        created_at, updated_at, number
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7)
-                    RETURNING id
-                    """,
-                    None,  # type
-                    transfer_data["reference"],
-                    transfer_data.get("source_location_id"),
-                    transfer_data["destination_location_id"],
-                    current_time,
-                    current_time,
-                    transfer_data["number"],
-                )
-
-                if not transfer_record:
-                    logger.error(f"Failed to insert stock transfer: {transfer_data['number']}")
-                    skipped_transfers += 1
-                    continue
-
-                transfer_id = transfer_record["id"]
-                inserted_transfers += 1
-
-                # Process stock movements
-                if transfer_data.get("stock_movements"):
-                    # Use pre-generated stock movements but pair them with real variant IDs from the database
-                    stock_movements = transfer_data.get("stock_movements", [])
-
-                    # Get list of available variants
-                    variant_ids = list(variant_map.keys())
-                    if not variant_ids:
-                        logger.warning(f"No variants available to create stock movements for transfer {transfer_data['number']}")
-                        continue
-
-                    # We need to pick random variants that have stock items in both locations
-                    usable_variants = []
-                    for variant_id in variant_ids:
-                        # For transfers with source, check both source and destination
-                        if source_id is not None:
-                            source_key = (variant_id, source_id)
-                            dest_key = (variant_id, destination_id)
-                            if source_key in stock_item_map and dest_key in stock_item_map:
-                                usable_variants.append(
-                                    {"variant_id": variant_id, "source_stock_item_id": stock_item_map[source_key]["id"], "dest_stock_item_id": stock_item_map[dest_key]["id"]}
-                                )
-                        else:
-                            # For transfers without source, just check destination
-                            dest_key = (variant_id, destination_id)
-                            if dest_key in stock_item_map:
-                                usable_variants.append({"variant_id": variant_id, "source_stock_item_id": None, "dest_stock_item_id": stock_item_map[dest_key]["id"]})
-
-                    if not usable_variants:
-                        logger.warning(f"No usable variants with stock items in required locations for transfer {transfer_data['number']}")
-                        continue
-
-                    # Count how many variant-pairs we need to create (half the number of movements)
-                    variant_pair_count = max(1, len(stock_movements) // 2)
-
-                    # Make sure we don't exceed available variants
-                    variant_pair_count = min(variant_pair_count, len(usable_variants))
-
-                    # Create appropriate number of movements
-                    selected_variants = random.sample(usable_variants, variant_pair_count)
-
-                    for variant_info in selected_variants:
-                        variant_id = variant_info["variant_id"]
-                        source_stock_item_id = variant_info["source_stock_item_id"]
-                        dest_stock_item_id = variant_info["dest_stock_item_id"]
-
-                        # Use a realistic quantity (between 10-50)
-                        quantity = random.randint(10, 50)
-
-                        # First create source movement if applicable
-                        if source_id is not None and source_stock_item_id is not None:
-                            source_key = (variant_id, source_id)
-
-                            # Insert source movement (negative quantity)
-                            await db_client.execute(
-                                """
-                                INSERT INTO spree_stock_movements (
-                                    stock_item_id, quantity, action, created_at, updated_at,
-                                    originator_type, originator_id
-                                )
-                                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                                """,
-                                source_stock_item_id,
-                                -quantity,
-                                None,  # action
-                                current_time,
-                                current_time,
-                                "Spree::StockTransfer",
-                                transfer_id,
-                            )
-
-                            # Update count_on_hand for source stock item
-                            new_count = stock_item_map[source_key]["count"] - quantity
-                            await db_client.execute(
-                                "UPDATE spree_stock_items SET count_on_hand = $1, updated_at = $2 WHERE id = $3",
-                                max(0, new_count),  # Ensure count doesn't go below 0
-                                current_time,
-                                source_stock_item_id,
-                            )
-
-                            # Update our local map
-                            stock_item_map[source_key]["count"] = max(0, new_count)
-
-                        # Then create destination movement
-                        if dest_stock_item_id is not None:
-                            dest_key = (variant_id, destination_id)
-
-                            # Insert destination movement (positive quantity)
-                            await db_client.execute(
-                                """
-                                INSERT INTO spree_stock_movements (
-                                    stock_item_id, quantity, action, created_at, updated_at,
-                                    originator_type, originator_id
-                                )
-                                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                                """,
-                                dest_stock_item_id,
-                                quantity,
-                                None,  # action
-                                current_time,
-                                current_time,
-                                "Spree::StockTransfer",
-                                transfer_id,
-                            )
-
-                            # Update count_on_hand for destination stock item
-                            new_count = stock_item_map[dest_key]["count"] + quantity
-                            await db_client.execute(
-                                "UPDATE spree_stock_items SET count_on_hand = $1, updated_at = $2 WHERE id = $3",
-                                max(0, new_count),  # Ensure count doesn't go below 0
-                                current_time,
-                                dest_stock_item_id,
-                            )
-
-                            # Update our local map
-                            stock_item_map[dest_key]["count"] = max(0, new_count)
-
-                        # variant_name = variant_map[variant_id]["product_name"]
-                        # if source_id is not None:
-                        #     logger.info(f"Transferred {quantity} of {variant_name} from {stock_location_map.get(source_id)} to {stock_location_map.get(destination_id)}")
-                        # else:
-                        #     logger.info(f"Added {quantity} of {variant_name} to {stock_location_map.get(destination_id)}")
-                else:
-                    variant_count = random.randint(1, 3)
-                    random_variants = random.sample(list(variant_map.keys()), min(variant_count, len(variant_map)))
-
-                    for variant_id in random_variants:
-                        quantity = random.randint(10, 100)
-
-                        create_movements = True
-
-                        source_stock_item_id = None
-                        if source_id is not None:
-                            source_stock_item_key = (variant_id, source_id)
-                            if source_stock_item_key not in stock_item_map:
-                                create_movements = False
-                            else:
-                                source_stock_item_id = stock_item_map[source_stock_item_key]["id"]
-
-                        # Check for destination stock item
-                        dest_stock_item_key = (variant_id, destination_id)
-                        if dest_stock_item_key not in stock_item_map:
-                            create_movements = False
-                        else:
-                            dest_stock_item_id = stock_item_map[dest_stock_item_key]["id"]
-
-                        if not create_movements:
-                            continue
-
-                        if source_id is not None:
-                            await db_client.execute(
-                                """
-                                INSERT INTO spree_stock_movements (
-                                    stock_item_id, quantity, action, created_at, updated_at,
-                                    originator_type, originator_id
-                                )
-                                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                                """,
-                                source_stock_item_id,
-                                -quantity,
-                                None,  # action
-                                current_time,
-                                current_time,
-                                "Spree::StockTransfer",
-                                transfer_id,
-                            )
-
-                            new_count = stock_item_map[source_stock_item_key]["count"] - quantity
-                            await db_client.execute(
-                                "UPDATE spree_stock_items SET count_on_hand = $1, updated_at = $2 WHERE id = $3",
-                                max(0, new_count),  # Ensure count doesn't go below 0
-                                current_time,
-                                source_stock_item_id,
-                            )
-
-                            # Update our local map
-                            stock_item_map[source_stock_item_key]["count"] = max(0, new_count)
-
-                        # Second, create destination movement (positive quantity)
-                        await db_client.execute(
-                            """
-                            INSERT INTO spree_stock_movements (
-                                stock_item_id, quantity, action, created_at, updated_at,
-                                originator_type, originator_id
-                            )
-                            VALUES ($1, $2, $3, $4, $5, $6, $7)
-                            """,
-                            dest_stock_item_id,
-                            quantity,
-                            None,  # action
-                            current_time,
-                            current_time,
-                            "Spree::StockTransfer",
-                            transfer_id,
-                        )
+            number = transfer_data["number"]
+            if number in existing_numbers:
+                existing_transfers += 1
+                continue
 
-                        # Update count_on_hand for destination stock item
-                        new_count = stock_item_map[dest_stock_item_key]["count"] + quantity
-                        await db_client.execute("UPDATE spree_stock_items SET count_on_hand = $1, updated_at = $2 WHERE id = $3", new_count, current_time, dest_stock_item_id)
+            # Verify stock locations
+            destination_id = transfer_data["destination_location_id"]
+            source_id = transfer_data.get("source_location_id")
 
-                        # Update our local map
-                        stock_item_map[dest_stock_item_key]["count"] = new_count
+            if destination_id not in stock_location_map:
+                logger.warning(f"Destination location ID {destination_id} not found, skipping transfer {number}")
+                skipped_transfers += 1
+                continue
 
-                        # Log the transfer info
-                        variant_info = variant_map[variant_id]
-                        if source_id is not None:
-                            logger.info(f"Transferred {quantity} of {variant_info['product_name']} from {stock_location_map.get(source_id)} to {stock_location_map.get(destination_id)}")
-                        else:
-                            logger.info(f"Added {quantity} of {variant_info['product_name']} to {stock_location_map.get(destination_id)}")
+            if source_id is not None and source_id not in stock_location_map:
+                logger.warning(f"Source location ID {source_id} not found, skipping transfer {number}")
+                skipped_transfers += 1
+                continue
 
-                # dest_name = stock_location_map.get(destination_id, f"Location ID: {destination_id}")
-                # source_info = f" from {stock_location_map.get(source_id)}" if source_id is not None else ""
-                # logger.info(f"Inserted stock transfer: {transfer_data['internal_name']} - {dest_name}{source_info}")
+            existing_numbers.add(number)
+            ledger.add_transfer(transfer_data)
 
-            except Exception as e:
-                logger.error(f"Failed to process stock transfer {transfer_data.get('number')}: {e}")
-                skipped_transfers += 1
+            # Pair the generated movements with real variants that have stock items in the required locations
+            usable_variants = [variant_id for variant_id in variant_ids if ledger.has_item(variant_id, destination_id) and (source_id is None or ledger.has_item(variant_id, source_id))]
+            if not usable_variants:
+                logger.warning(f"No usable variants with stock items in required locations for transfer {number}")
                 continue
 
+            stock_movements = transfer_data.get("stock_movements")
+            if stock_movements:
+                variant_count = max(1, len(stock_movements) // 2)
+                min_quantity, max_quantity = 10, 50
+            else:
+                variant_count = random.randint(1, 3)
+                min_quantity, max_quantity = 10, 100
+
+            for variant_id in random.sample(usable_variants, min(variant_count, len(usable_variants))):
+                ledger.move(number, variant_id, source_id, destination_id, random.randint(min_quantity, max_quantity))
+
+        ledger.verify()
+        if ledger.clamped_movements:
+            logger.info(f"{ledger.clamped_movements} movements were reduced to the stock available at their source")
+
+        async with db_client.transaction() as conn:
+            written = await ledger.write(conn, current_time)
+
         # Log summary
         total_transfers = await db_client.fetchval("SELECT COUNT(*) FROM spree_stock_transfers")
 
         logger.succeed("Successfully processed stock transfers:")
-        logger.succeed(f"  - {inserted_transfers} new stock transfers inserted")
+        logger.succeed(f"  - {written['transfers']} new stock transfers inserted")
         logger.succeed(f"  - {existing_transfers} existing stock transfers found")
         logger.succeed(f"  - {skipped_transfers} stock transfers skipped due to errors")
         logger.succeed(f"  - {total_transfers} total stock transfers in database")
+        logger.succeed(f"  - {written['stock_items_created']} stock items created, {written['stock_items_updated']} updated")
 
         # Log stock movement statistics
         total_movements = await db_client.fetchval("SELECT COUNT(*) FROM spree_stock_movements WHERE originator_type = 'Spree::StockTransfer'")
-        logger.succeed(f"  - {total_movements} stock movements created")
+        logger.succeed(f"  - {written['movements']} stock movements created, {total_movements} in database")
 
     except Exception as e:
         logger.error(f"Error seeding stock transfers in database: {e}")
@@ -406,102 +406,49 @@ async def seed_users():
 
         logger.info(f"Found {len(role_id_map)} roles in database: {list(role_id_map.keys())}")
 
-        # Insert each user into the database
-        inserted_count = 0
+        # Insert new and update existing users in one statement per chunk
+        current_time = datetime.now()
+        rows = [
+            {
+                "id": user["id"],  # Use the pre-generated ID
+                "encrypted_password": user["encrypted_password"],
+                "password_salt": user["password_salt"],
+                "email": user["email"],
+                "login": user["login"],
+                "authentication_token": user["authentication_token"],
+                "spree_api_key": user["spree_api_key"],
+                "sign_in_count": user["sign_in_count"],
+                "failed_attempts": user["failed_attempts"],
+                "last_request_at": parse_datetime(user["last_request_at"]),
+                "current_sign_in_at": parse_datetime(user["current_sign_in_at"]),
+                "last_sign_in_at": parse_datetime(user["last_sign_in_at"]),
+                "current_sign_in_ip": user["current_sign_in_ip"],
+                "last_sign_in_ip": user["last_sign_in_ip"],
+                "first_name": user["first_name"],
+                "last_name": user["last_name"],
+                "selected_locale": user["selected_locale"],
+                "remember_created_at": parse_datetime(user["remember_created_at"]),
+                "created_at": current_time,
+                "updated_at": current_time,
+            }
+            for user in users
+        ]
+
+        # Role assignments of users with roles are replaced as a whole
+        role_users = []
         for user in users:
-            try:
-                # Check if user with this ID already exists
-                existing_user = await db_client.fetchrow("SELECT id FROM spree_users WHERE id = $1", user["id"])
-
-                user_id = user["id"]  # Use the pre-generated ID
-                if existing_user:
-                    # Update existing user
-                    await db_client.execute(
-                        """
-                        UPDATE spree_users
-                        SET encrypted_password = $1, password_salt = $2, email = $3, first_name = $4, last_name = $5,
-                            login = $6, authentication_token = $7, spree_api_key = $8, sign_in_count = $9,
-                            failed_attempts = $10, last_request_at = $11, current_sign_in_at = $12,
-                            last_sign_in_at = $13, current_sign_in_ip = $14, last_sign_in_ip = $15,
-                            selected_locale = $16, remember_created_at = $17, updated_at = NOW()
-                        WHERE id = $18
-                        """,
-                        user["encrypted_password"],
-                        user["password_salt"],
-                        user["email"],
-                        user["first_name"],
-                        user["last_name"],
-                        user["login"],
-                        user["authentication_token"],
-                        user["spree_api_key"],
-                        user["sign_in_count"],
-                        user["failed_attempts"],
-                        parse_datetime(user["last_request_at"]),
-                        parse_datetime(user["current_sign_in_at"]),
-                        parse_datetime(user["last_sign_in_at"]),
-                        user["current_sign_in_ip"],
-                        user["last_sign_in_ip"],
-                        user["selected_locale"],
-                        parse_datetime(user["remember_created_at"]),
-                        user_id,
-                    )
-                    logger.info(f"Updated existing user: {user['email']} (ID: {user_id})")
+            for role_name in user["roles"] or []:
+                if role_name in role_id_map:
+                    role_users.append({"role_id": role_id_map[role_name], "user_id": user["id"], "created_at": current_time, "updated_at": current_time})
                 else:
-                    # Insert new user with specified ID
-                    await db_client.execute(
-                        """
-                        INSERT INTO spree_users (id, encrypted_password, password_salt, email, login,
-                                               authentication_token, spree_api_key, sign_in_count, failed_attempts,
-                                               last_request_at, current_sign_in_at, last_sign_in_at,
-                                               current_sign_in_ip, last_sign_in_ip, first_name, last_name,
-                                               selected_locale, remember_created_at, created_at, updated_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, NOW(), NOW())
-                        """,
-                        user_id,
-                        user["encrypted_password"],
-                        user["password_salt"],
-                        user["email"],
-                        user["login"],
-                        user["authentication_token"],
-                        user["spree_api_key"],
-                        user["sign_in_count"],
-                        user["failed_attempts"],
-                        parse_datetime(user["last_request_at"]),
-                        parse_datetime(user["current_sign_in_at"]),
-                        parse_datetime(user["last_sign_in_at"]),
-                        user["current_sign_in_ip"],
-                        user["last_sign_in_ip"],
-                        user["first_name"],
-                        user["last_name"],
-                        user["selected_locale"],
-                        parse_datetime(user["remember_created_at"]),
-                    )
+                    logger.warning(f"Role '{role_name}' not found in database for user {user['email']}")
 
-                # Handle role assignments
-                if user["roles"] and user_id:
-                    # First, remove existing role assignments for this user
-                    await db_client.execute("DELETE FROM spree_role_users WHERE user_id = $1", user_id)
-
-                    # Add new role assignments
-                    for role_name in user["roles"]:
-                        if role_name in role_id_map:
-                            role_id = role_id_map[role_name]
-                            await db_client.execute(
-                                """
-                                INSERT INTO spree_role_users (role_id, user_id, created_at, updated_at)
-                                VALUES ($1, $2, NOW(), NOW())
-                                """,
-                                role_id,
-                                user_id,
-                            )
-                        else:
-                            logger.warning(f"Role '{role_name}' not found in database for user {user['email']}")
-
-                inserted_count += 1
+        async with db_client.transaction() as conn:
+            await db_client.upsert("spree_users", rows, conn=conn)
+            await conn.execute("DELETE FROM spree_role_users WHERE user_id = ANY($1::bigint[])", [user["id"] for user in users if user["roles"]])
+            await db_client.upsert("spree_role_users", role_users, key_columns=(), conn=conn)
 
-            except Exception as e:
-                logger.error(f"Failed to insert/update user {user['email']}: {e}")
-                continue
+        inserted_count = len(rows)
 
         logger.succeed(f"Successfully processed {inserted_count} users in the database")
 
@@ -531,72 +478,55 @@ async def seed_addresses():
         addresses = data.get("addresses", [])
         logger.info(f"Loaded {len(addresses)} addresses from {ADDRESSES_FILE}")
 
-        # Insert each address into the database
-        inserted_count = 0
-        for address in addresses:
-            try:
-                user_id = address["user_id"]
-
-                # Check if similar address already exists for this user
-                existing_address = await db_client.fetchrow(
-                    "SELECT id FROM spree_addresses WHERE user_id = $1 AND address1 = $2 AND city = $3", user_id, address["address1"], address["city"]
-                )
-
-                if existing_address:
-                    # Update existing address
-                    await db_client.execute(
-                        """
-                        UPDATE spree_addresses
-                        SET firstname = $1, lastname = $2, address2 = $3, zipcode = $4, phone = $5,
-                            state_name = $6, alternative_phone = $7, company = $8, state_id = $9,
-                            country_id = $10, label = $11, updated_at = NOW()
-                        WHERE id = $12
-                        """,
-                        address["firstname"],
-                        address["lastname"],
-                        address["address2"],
-                        address["zipcode"],
-                        address["phone"],
-                        address["state_name"],
-                        address["alternative_phone"],
-                        address["company"],
-                        address["state_id"],
-                        address["country_id"],
-                        address["label"],
-                        existing_address["id"],
-                    )
-                else:
-                    # Insert new address with pre-generated ID
-                    await db_client.execute(
-                        """
-                        INSERT INTO spree_addresses (id, firstname, lastname, address1, address2, city, zipcode,
-                                                   phone, state_name, alternative_phone, company, state_id,
-                                                   country_id, user_id, label, created_at, updated_at, deleted_at)
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, NOW(), NOW(), $16)
-                        """,
-                        address["id"],
-                        address["firstname"],
-                        address["lastname"],
-                        address["address1"],
-                        address["address2"],
-                        address["city"],
-                        address["zipcode"],
-                        address["phone"],
-                        address["state_name"],
-                        address["alternative_phone"],
-                        address["company"],
-                        address["state_id"],
-                        address["country_id"],
-                        user_id,
-                        address["label"],
-                        None,  # deleted_at
-                    )
-
-                inserted_count += 1
-
-            except Exception as e:
-                logger.error(f"Failed to insert/update address for user ID {address['user_id']}: {e}")
-                continue
+        # An address already stored for the same user, street and city is updated in place
+        existing_addresses = await db_client.fetch(
+            "SELECT id, user_id, address1, city FROM spree_addresses WHERE user_id = ANY($1::bigint[])", list({address["user_id"] for address in addresses})
+        )
+        existing_ids = {(row["user_id"], row["address1"], row["city"]): row["id"] for row in existing_addresses}
+
+        current_time = datetime.now()
+        rows = [
+            {
+                "id": existing_ids.get((address["user_id"], address["address1"], address["city"]), address["id"]),
+                "firstname": address["firstname"],
+                "lastname": address["lastname"],
+                "address1": address["address1"],
+                "address2": address["address2"],
+                "city": address["city"],
+                "zipcode": address["zipcode"],
+                "phone": address["phone"],
+                "state_name": address["state_name"],
+                "alternative_phone": address["alternative_phone"],
+                "company": address["company"],
+                "state_id": address["state_id"],
+                "country_id": address["country_id"],
+                "user_id": address["user_id"],
+                "label": address["label"],
+                "created_at": current_time,
+                "updated_at": current_time,
+                "deleted_at": None,
+            }
+            for address in addresses
+        ]
+        await db_client.upsert(
+            "spree_addresses",
+            rows,
+            update_columns=(
+                "firstname",
+                "lastname",
+                "address2",
+                "zipcode",
+                "phone",
+                "state_name",
+                "alternative_phone",
+                "company",
+                "state_id",
+                "country_id",
+                "label",
+                "updated_at",
+            ),
+        )
+        inserted_count = len(rows)
 
         logger.succeed(f"Successfully processed {inserted_count} addresses in the database")
 
@@ -14,6 +14,7 @@ from apps.spree.utils.ai import instructor_client
 from apps.spree.utils.constants import PAGES_FILE
 from apps.spree.utils.database import db_client
 from apps.spree.utils.pexels import PexelsAPI
+from common.asset_store import get_asset_store
 from common.logger import Logger
 
 
@@ -317,24 +318,18 @@ async def seed_gallery_sections() -> None:
                         if not seeder.session:
                             raise RuntimeError("Session not initialized")
 
-                        async with seeder.session.get(image_url) as response:
-                            response.raise_for_status()
-                            image_data = await response.read()
+                        store = get_asset_store()
+                        asset = await store.fetch(image_url, seeder.session)
 
-                        # Crop the second image to 27:40 ratio
+                        # Crop the second image to 27:40 ratio, keeping the cropped copy in the store for reruns
                         if link_num == 2:
-                            image_data = await crop_image_to_ratio(image_data, 27 / 40)
-                        else:
-                            pass  # No cropping for other links
-
-                        # Calculate checksum and file size for processed image
-                        import base64
-                        import hashlib
-
-                        md5_hash = hashlib.md5()
-                        md5_hash.update(image_data)
-                        checksum = base64.b64encode(md5_hash.digest()).decode("ascii")
-                        file_size = len(image_data)
+                            cropped_source = f"{image_url}#crop-27x40"
+                            asset = store.lookup(cropped_source) or store.put_bytes(await crop_image_to_ratio(asset.read_bytes(), 27 / 40), source=cropped_source)
+
+                        image_data = asset.read_bytes()
+
+                        checksum = asset.md5_base64
+                        file_size = asset.size
 
                         # Get filename from URL
                         filename = image_url.split("/")[-1].split("?")[0]
@@ -1,5 +1,3 @@
-import base64
-import hashlib
 import json
 from datetime import datetime
 from io import BytesIO
@@ -14,6 +12,7 @@ from apps.spree.utils.ai import instructor_client
 from apps.spree.utils.constants import PAGES_FILE
 from apps.spree.utils.database import db_client
 from apps.spree.utils.pexels import PexelsAPI
+from common.asset_store import get_asset_store
 from common.logger import Logger
 
 
@@ -291,18 +290,19 @@ async def seed_hero_image_assets() -> None:
                     if not seeder.session:
                         raise RuntimeError("Session not initialized")
 
-                    async with seeder.session.get(image_url) as response:
-                        response.raise_for_status()
-                        image_data = await response.read()
+                    store = get_asset_store()
+                    overlay_source = f"{image_url}#white-overlay"
 
-                    # Add white overlay to the image
-                    processed_image_data = await add_white_overlay_to_image(image_data)
+                    # Add white overlay to the image, keeping the processed copy in the store for reruns
+                    asset = store.lookup(overlay_source)
+                    if asset is None:
+                        original = await store.fetch(image_url, seeder.session)
+                        asset = store.put_bytes(await add_white_overlay_to_image(original.read_bytes()), source=overlay_source)
 
-                    # Calculate checksum and file size for processed image
-                    md5_hash = hashlib.md5()
-                    md5_hash.update(processed_image_data)
-                    checksum = base64.b64encode(md5_hash.digest()).decode("ascii")
-                    file_size = len(processed_image_data)
+                    processed_image_data = asset.read_bytes()
+
+                    checksum = asset.md5_base64
+                    file_size = asset.size
 
                     # Get filename from URL
                     filename = image_url.split("/")[-1].split("?")[0]
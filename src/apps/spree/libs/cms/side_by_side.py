@@ -14,6 +14,7 @@ from apps.spree.utils.ai import instructor_client
 from apps.spree.utils.constants import PAGES_FILE
 from apps.spree.utils.database import db_client
 from apps.spree.utils.pexels import PexelsAPI
+from common.asset_store import get_asset_store
 from common.logger import Logger
 
 
@@ -309,18 +310,11 @@ async def seed_side_by_side_sections() -> None:
                         if not seeder.session:
                             raise RuntimeError("Session not initialized")
 
-                        async with seeder.session.get(image_url) as response:
-                            response.raise_for_status()
-                            image_data = await response.read()
+                        asset = await get_asset_store().fetch(image_url, seeder.session)
+                        image_data = asset.read_bytes()
 
-                        # Calculate checksum and file size for processed image
-                        import base64
-                        import hashlib
-
-                        md5_hash = hashlib.md5()
-                        md5_hash.update(image_data)
-                        checksum = base64.b64encode(md5_hash.digest()).decode("ascii")
-                        file_size = len(image_data)
+                        checksum = asset.md5_base64
+                        file_size = asset.size
 
                         # Get filename from URL
                         filename = image_url.split("/")[-1].split("?")[0]
@@ -0,0 +1,181 @@
+"""In-memory stock ledger for replaying stock transfers before writing them."""
+
+import random
+from datetime import datetime
+
+
+StockKey = tuple[int, int]
+
+
+class StockLedger:
+    """
+    Replays stock transfers against stock items held in memory.
+
+    The ledger is loaded once with the stock items of the database, keyed by (variant_id, stock_location_id).
+    Transfers are applied in order: a source never goes below zero, so a transfer moves at most what the
+    source has on hand. The result is the final count_on_hand of every stock item and every movement row,
+    which `write` then applies with a handful of set-based statements. Nothing here touches the database,
+    so a replay can be checked offline with `verify`.
+    """
+
+    def __init__(self, stock_items: list[dict]):
+        self.items: dict[StockKey, dict] = {}
+        for stock_item in stock_items:
+            key = (stock_item["variant_id"], stock_item["stock_location_id"])
+            self.items[key] = {
+                "id": stock_item["id"],
+                "initial": stock_item["count_on_hand"],
+                "count_on_hand": stock_item["count_on_hand"],
+            }
+
+        self.transfers: list[dict] = []
+        self.movements: list[dict] = []
+        self.clamped_movements = 0
+
+    def ensure_items(self, variant_ids: list[int], location_ids: list[int], min_stock: int = 10, max_stock: int = 200) -> int:
+        """Add a stock item with random initial stock for each variant missing from a location. Returns how many were added."""
+        added = 0
+        for variant_id in variant_ids:
+            for location_id in location_ids:
+                key = (variant_id, location_id)
+                if key not in self.items:
+                    initial_stock = random.randint(min_stock, max_stock)
+                    self.items[key] = {"id": None, "initial": initial_stock, "count_on_hand": initial_stock}
+                    added += 1
+        return added
+
+    def has_item(self, variant_id: int, location_id: int) -> bool:
+        return (variant_id, location_id) in self.items
+
+    def add_transfer(self, transfer: dict) -> None:
+        """Register a stock transfer, keyed by its number, before its movements are applied."""
+        self.transfers.append(transfer)
+
+    def move(self, number: str, variant_id: int, source_id: int | None, destination_id: int, quantity: int) -> int:
+        """
+        Move `quantity` of a variant from `source_id` (or from outside when None) to `destination_id`.
+
+        Returns the quantity actually moved, which is less than requested when the source runs short.
+        """
+        if source_id is not None:
+            source = self.items[(variant_id, source_id)]
+            moved = min(quantity, source["count_on_hand"])
+            if moved < quantity:
+                self.clamped_movements += 1
+            if moved <= 0:
+                return 0
+
+            source["count_on_hand"] -= moved
+            self.movements.append({"key": (variant_id, source_id), "quantity": -moved, "number": number})
+        else:
+            moved = quantity
+
+        self.items[(variant_id, destination_id)]["count_on_hand"] += moved
+        self.movements.append({"key": (variant_id, destination_id), "quantity": moved, "number": number})
+        return moved
+
+    def verify(self) -> None:
+        """
+        Check the replay: no negative stock, and every final count equals its initial count plus its movements.
+
+        Raises:
+            ValueError: If the ledger is inconsistent.
+        """
+        totals: dict[StockKey, int] = {}
+        for movement in self.movements:
+            totals[movement["key"]] = totals.get(movement["key"], 0) + movement["quantity"]
+
+        for key, item in self.items.items():
+            if item["count_on_hand"] < 0:
+                raise ValueError(f"Stock item {key} ends with negative stock: {item['count_on_hand']}")
+            if item["initial"] + totals.get(key, 0) != item["count_on_hand"]:
+                raise ValueError(f"Stock item {key} does not add up: {item['initial']} + {totals.get(key, 0)} != {item['count_on_hand']}")
+
+        numbers = {transfer["number"] for transfer in self.transfers}
+        unknown = {movement["number"] for movement in self.movements} - numbers
+        if unknown:
+            raise ValueError(f"Movements reference unknown transfers: {', '.join(sorted(unknown))}")
+
+    @property
+    def new_items(self) -> dict[StockKey, dict]:
+        return {key: item for key, item in self.items.items() if item["id"] is None}
+
+    @property
+    def changed_items(self) -> dict[StockKey, dict]:
+        return {key: item for key, item in self.items.items() if item["id"] is not None and item["count_on_hand"] != item["initial"]}
+
+    async def write(self, conn, current_time: datetime) -> dict:
+        """
+        Write the replay in four statements on `conn`, which should be inside a transaction.
+
+        New stock items are inserted with their final count, transfers and movements are bulk-inserted,
+        and the counts of existing stock items are applied with one UPDATE ... FROM unnest(...).
+        """
+        new_items = self.new_items
+        changed_items = self.changed_items
+        if new_items:
+            keys = list(new_items)
+            rows = await conn.fetch(
+                """
+                INSERT INTO spree_stock_items (variant_id, stock_location_id, count_on_hand, created_at, updated_at, backorderable)
+                SELECT t.variant_id, t.stock_location_id, t.count_on_hand, $4, $4, false
+                FROM unnest($1::bigint[], $2::bigint[], $3::int[]) AS t(variant_id, stock_location_id, count_on_hand)
+                RETURNING id, variant_id, stock_location_id
+                """,
+                [key[0] for key in keys],
+                [key[1] for key in keys],
+                [new_items[key]["count_on_hand"] for key in keys],
+                current_time,
+            )
+            for row in rows:
+                self.items[(row["variant_id"], row["stock_location_id"])]["id"] = row["id"]
+
+        transfer_ids = {}
+        if self.transfers:
+            rows = await conn.fetch(
+                """
+                INSERT INTO spree_stock_transfers (type, reference, source_location_id, destination_location_id, created_at, updated_at, number)
+                SELECT NULL, t.reference, t.source_location_id, t.destination_location_id, $5, $5, t.number
+                FROM unnest($1::varchar[], $2::bigint[], $3::bigint[], $4::varchar[]) AS t(reference, source_location_id, destination_location_id, number)
+                RETURNING id, number
+                """,
+                [transfer.get("reference") for transfer in self.transfers],
+                [transfer.get("source_location_id") for transfer in self.transfers],
+                [transfer["destination_location_id"] for transfer in self.transfers],
+                [transfer["number"] for transfer in self.transfers],
+                current_time,
+            )
+            transfer_ids = {row["number"]: row["id"] for row in rows}
+
+        if self.movements:
+            await conn.execute(
+                """
+                INSERT INTO spree_stock_movements (stock_item_id, quantity, action, created_at, updated_at, originator_type, originator_id)
+                SELECT t.stock_item_id, t.quantity, NULL, $4, $4, 'Spree::StockTransfer', t.originator_id
+                FROM unnest($1::bigint[], $2::int[], $3::bigint[]) AS t(stock_item_id, quantity, originator_id)
+                """,
+                [self.items[movement["key"]]["id"] for movement in self.movements],
+                [movement["quantity"] for movement in self.movements],
+                [transfer_ids[movement["number"]] for movement in self.movements],
+                current_time,
+            )
+
+        if changed_items:
+            await conn.execute(
+                """
+                UPDATE spree_stock_items AS si
+                SET count_on_hand = t.count_on_hand, updated_at = $3
+                FROM unnest($1::bigint[], $2::int[]) AS t(id, count_on_hand)
+                WHERE si.id = t.id
+                """,
+                [item["id"] for item in changed_items.values()],
+                [item["count_on_hand"] for item in changed_items.values()],
+                current_time,
+            )
+
+        return {
+            "stock_items_created": len(new_items),
+            "stock_items_updated": len(changed_items),
+            "transfers": len(transfer_ids),
+            "movements": len(self.movements),
+        }
@@ -41,6 +41,7 @@ from apps.spree.core.users import generate_users, seed_users
 from apps.spree.libs.orders.shipping_rates import generate_shipping_rates, seed_shipping_rates
 from apps.spree.utils.database import close_db, init_db
 from common.logger import logger
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -82,6 +83,19 @@ def down(timeout: int):
     subprocess.run(["rm", "-rf", "storage"], cwd=docker_dir, env=env)
 
 
+add_snapshot_commands(
+    spree_cli,
+    SnapshotSpec(
+        app="spree",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="postgres",
+        data_dir=settings.DATA_PATH,
+        volumes=[("web", "/rails/storage")],
+        env=lambda: {**os.environ, **settings.model_dump_str()},
+    ),
+)
+
+
 @spree_cli.command()
 @click.option("-f", "--follow", is_flag=True, help="Follow logs")
 def logs(follow: bool):
@@ -10,12 +10,16 @@ from common.logger import Logger
 
 logger = Logger()
 
+# Rows per statement of the set-based upsert and update helpers
+BULK_CHUNK_SIZE = 1000
+
 
 class AsyncPGClient:
     """AsyncPG client with connection pooling for efficient connection reuse."""
 
     def __init__(self):
         self._pool: Pool | None = None
+        self._column_types: dict[str, dict[str, str]] = {}
         self._connection_string = self._build_connection_string()
 
     def _build_connection_string(self) -> str:
@@ -92,6 +96,111 @@ class AsyncPGClient:
         async with self.get_connection() as conn, conn.transaction():
             yield conn
 
+    @asynccontextmanager
+    async def _connection_or_transaction(self, conn: Connection | None) -> AsyncGenerator[Connection, None]:
+        """Use the caller's connection, or run in a transaction of our own."""
+        if conn is not None:
+            yield conn
+        else:
+            async with self.transaction() as conn:
+                yield conn
+
+    async def column_types(self, table: str, conn: Connection | None = None) -> dict[str, str]:
+        """Postgres types of the columns of a table, used to type the arrays passed to unnest()."""
+        if table not in self._column_types:
+            query = """
+                SELECT a.attname, format_type(a.atttypid, NULL) AS type
+                FROM pg_attribute a
+                WHERE a.attrelid = $1::regclass AND a.attnum > 0 AND NOT a.attisdropped
+            """
+            rows = await conn.fetch(query, table) if conn is not None else await self.fetch(query, table)
+            self._column_types[table] = {row["attname"]: row["type"] for row in rows}
+        return self._column_types[table]
+
+    async def _unnest(self, table: str, columns: list[str], conn: Connection) -> str:
+        """`unnest($1::type[], ...) AS data(columns)` for the given columns of a table."""
+        types = await self.column_types(table, conn)
+        unknown = [column for column in columns if column not in types]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {', '.join(unknown)}")
+        arrays = [column for column in columns if types[column].endswith("[]")]
+        if arrays:
+            raise ValueError(f"Array columns cannot be passed through unnest(): {', '.join(arrays)}")
+
+        params = ", ".join(f"${i}::{types[column]}[]" for i, column in enumerate(columns, 1))
+        return f"unnest({params}) AS data({', '.join(columns)})"
+
+    async def upsert(
+        self,
+        table: str,
+        rows: list[dict],
+        key_columns: tuple[str, ...] = ("id",),
+        update_columns: tuple[str, ...] | None = None,
+        returning: tuple[str, ...] = (),
+        conn: Connection | None = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> list:
+        """
+        Insert rows with one INSERT ... SELECT * FROM unnest(...) per chunk.
+
+        Every row must have the same keys, which are the columns written. Rows whose `key_columns` conflict with an
+        existing row update it: `update_columns` defaults to all other columns except created_at, and an empty tuple
+        leaves existing rows untouched. Without `key_columns` the rows are simply inserted. Array parameters are typed
+        from the table's columns, so values only need the Python type asyncpg expects for the column.
+
+        All chunks run in one transaction, or on `conn` when given. Returns the `returning` columns of the written rows.
+        """
+        if not rows:
+            return []
+
+        columns = list(rows[0])
+        if key_columns:
+            # ON CONFLICT cannot touch the same row twice in one statement: the last row for a key wins
+            rows = list({tuple(row[column] for column in key_columns): row for row in rows}.values())
+            if update_columns is None:
+                update_columns = tuple(column for column in columns if column not in key_columns and column != "created_at")
+
+        results = []
+        async with self._connection_or_transaction(conn) as conn:
+            query = f"INSERT INTO {table} ({', '.join(columns)}) SELECT * FROM {await self._unnest(table, columns, conn)}"
+            if key_columns:
+                query += f" ON CONFLICT ({', '.join(key_columns)}) "
+                query += ("DO UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)) if update_columns else "DO NOTHING"
+            if returning:
+                query += f" RETURNING {', '.join(returning)}"
+
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i : i + chunk_size]
+                args = [[row[column] for row in chunk] for column in columns]
+                if returning:
+                    results.extend(await conn.fetch(query, *args))
+                else:
+                    await conn.execute(query, *args)
+
+        return results
+
+    async def update_many(
+        self,
+        table: str,
+        rows: list[dict],
+        key_columns: tuple[str, ...] = ("id",),
+        conn: Connection | None = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> None:
+        """Update existing rows with one UPDATE ... FROM unnest(...) per chunk, setting every non-key column of the rows."""
+        if not rows:
+            return
+
+        columns = list(rows[0])
+        assignments = ", ".join(f"{column} = data.{column}" for column in columns if column not in key_columns)
+        matches = " AND ".join(f"{table}.{column} = data.{column}" for column in key_columns)
+
+        async with self._connection_or_transaction(conn) as conn:
+            query = f"UPDATE {table} SET {assignments} FROM {await self._unnest(table, columns, conn)} WHERE {matches}"
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i : i + chunk_size]
+                await conn.execute(query, *[[row[column] for row in chunk] for column in columns])
+
     async def health_check(self) -> bool:
         """Check if the database connection is healthy."""
         try:
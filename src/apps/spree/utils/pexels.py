@@ -1,11 +1,11 @@
 import asyncio
-import base64
 import random
 from typing import Any
 
 import aiohttp
 
 from apps.spree.config.settings import settings
+from common.asset_store import get_asset_store
 from common.logger import logger
 
 
@@ -432,9 +432,10 @@ class PexelsAPI:
         if photos and len(photos) > 0:
             photo_url = await self.download_photo_url(photos[0], size="medium")
             if photo_url:
-                async with aiohttp.ClientSession() as session, session.get(photo_url) as resp:
-                    if resp.status == 200:
-                        img_data = await resp.read()
-                        b64_data = base64.b64encode(img_data).decode("ascii")
-                        return f"data:image/jpeg;base64,{b64_data}"
+                try:
+                    asset = await get_asset_store().fetch(photo_url)
+                except aiohttp.ClientError as e:
+                    logger.warning(f"Failed to download photo {photo_url}: {e}")
+                    return None
+                return asset.data_uri
         return None
@@ -28,6 +28,12 @@ class AppConfig(BaseSettings):
     POSTGRES_PASSWORD: str = "your-super-secret-and-long-postgres-password"
     POSTGRES_USER: str = "supabase_admin.your-tenant-id"
 
+    # Seeding Throughput
+    INSERT_BATCH_SIZE: int = 500  # Rows per PostgREST insert request
+    INSERT_CONCURRENCY: int = 4  # PostgREST insert requests in flight
+    COPY_THRESHOLD: int = 50000  # Row count at which seeding switches to direct Postgres COPY, 0 disables
+    STORAGE_UPLOAD_CONCURRENCY: int = 8  # Storage uploads in flight
+
     # Supabase Authentication
     JWT_SECRET: str = "your-super-secret-jwt-token-with-at-least-32-characters-long"
     JWT_EXPIRY: int = 3600
@@ -6,7 +6,7 @@ from pydantic import BaseModel, Field
 from apps.supabase.config.settings import settings
 from apps.supabase.core.enums import BrandCategoryType
 from apps.supabase.utils.faker import faker
-from apps.supabase.utils.supabase import get_supabase_client
+from apps.supabase.utils.supabase import get_supabase_client, load_records
 from common.logger import logger
 
 
@@ -157,19 +157,15 @@ async def seed_brands_data():
         logger.error("No brand data available. Please generate brand data first.")
         return
     logger.info(f"Inserting {len(brands_data)} brands into Supabase brands table")
-    for brand in brands_data:
-        record = {
+    records = [
+        {
             "id": brand.id,
             "name": brand.name,
             "created_at": brand.created_at,
             "logo_url": brand.logo_url,
             "description": brand.description,
         }
-        try:
-            await supabase.table("brands").insert(record).execute()
-        except Exception as e:
-            if "duplicate key value" in str(e) or "already exists" in str(e):
-                pass
-            else:
-                logger.error(f"Error inserting brand {brand.name}: {e}")
-    logger.succeed(f"Inserted {len(brands_data)} brands into brands table")
+        for brand in brands_data
+    ]
+    inserted = await load_records(supabase, "brands", records)
+    logger.succeed(f"Inserted {inserted} of {len(brands_data)} brands into brands table")
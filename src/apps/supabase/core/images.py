@@ -13,7 +13,7 @@ from apps.supabase.core.enums import (
     ModerationStatusType,
 )
 from apps.supabase.utils.faker import faker
-from apps.supabase.utils.supabase import get_supabase_client
+from apps.supabase.utils.supabase import get_supabase_client, load_records
 from common.logger import logger
 
 
@@ -371,23 +371,19 @@ async def seed_images_data():
 
     logger.start(f"Inserting {len(images_data)} images into Supabase images table")
 
+    records = []
     for image in images_data:
         # Assign a random user UUID as the uploader
         image.uploaded_by = faker.random.choice(user_uuids)
 
         # Create a copy of the record without uploaded_by_user
-        record = image.model_dump()
+        record = image.model_dump(mode="json")
         record.pop("uploaded_by_user", None)  # Remove uploaded_by_user from the record
+        records.append(record)
 
-        try:
-            await supabase.table("images").insert(record).execute()
-        except Exception as e:
-            if "duplicate key value" in str(e) or "already exists" in str(e):
-                pass
-            else:
-                logger.error(f"Error inserting image {image.filename}: {e}")
+    inserted = await load_records(supabase, "images", records)
 
-    logger.succeed(f"Inserted {len(images_data)} images into images table")
+    logger.succeed(f"Inserted {inserted} of {len(images_data)} images into images table")
 
 
 async def generate_uploaded_images_metadata():
@@ -11,7 +11,7 @@ from apps.supabase.core.enums import (
     MealType,
 )
 from apps.supabase.utils.faker import faker
-from apps.supabase.utils.supabase import get_supabase_client
+from apps.supabase.utils.supabase import get_supabase_client, load_records
 from common.logger import logger
 
 
@@ -313,13 +313,6 @@ async def seed_meal_logs_data():
         # Assign a random user UUID
         log.user_id = faker.random.choice(user_uuids)
 
-        try:
-            # Insert log record
-            await supabase.table("logs").insert(log.model_dump()).execute()
-        except Exception as e:
-            if "duplicate key value" in str(e) or "already exists" in str(e):
-                pass
-            else:
-                logger.error(f"Error inserting log {log.id}: {e}")
-
-    logger.succeed(f"Inserted {len(logs_data)} meal logs into logs table")
+    inserted = await load_records(supabase, "logs", [log.model_dump(mode="json") for log in logs_data])
+
+    logger.succeed(f"Inserted {inserted} of {len(logs_data)} meal logs into logs table")
@@ -12,7 +12,7 @@ from apps.supabase.core.enums import (
     MealType,
 )
 from apps.supabase.utils.faker import faker
-from apps.supabase.utils.supabase import get_supabase_client
+from apps.supabase.utils.supabase import get_supabase_client, load_records
 from common.logger import logger
 
 
@@ -413,6 +413,7 @@ async def seed_meals_data():
 
     logger.start(f"Inserting {len(meals_data)} meals into Supabase meals table")
 
+    records = []
     for meal in meals_data:
         # Assign a random user UUID as the creator
         meal.created_by = faker.random.choice(user_uuids)
@@ -425,16 +426,11 @@ async def seed_meals_data():
                 logger.warning(f"Brand name {meal.brand_name} not found in database, setting brand_id to null")
                 meal.brand_id = None
 
-        record = meal.model_dump()
+        record = meal.model_dump(mode="json")
         # Remove brand_name as it's not in the database schema
         record.pop("brand_name", None)
+        records.append(record)
 
-        try:
-            await supabase.table("meals").insert(record).execute()
-        except Exception as e:
-            if "duplicate key value" in str(e) or "already exists" in str(e):
-                pass
-            else:
-                logger.error(f"Error inserting meal {meal.name}: {e}")
+    inserted = await load_records(supabase, "meals", records)
 
-    logger.succeed(f"Inserted {len(meals_data)} meals into meals table")
+    logger.succeed(f"Inserted {inserted} of {len(meals_data)} meals into meals table")
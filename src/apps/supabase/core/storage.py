@@ -1,3 +1,4 @@
+import asyncio
 import json
 import mimetypes
 from pathlib import Path
@@ -42,10 +43,33 @@ def get_storage_url(bucket: str, path: str) -> str:
     return f"/storage/v1/object/public/{bucket}/{path}"
 
 
+async def upload_file(bucket, bucket_name: str, file_path: Path, semaphore: asyncio.Semaphore) -> dict | None:
+    """
+    Upload a single file to a storage bucket, streaming the body from disk.
+    Existing objects are overwritten so reruns don't depend on "already exists" errors.
+    Returns the uploaded file metadata, or None if the upload failed.
+    """
+    file_size = file_path.stat().st_size
+    mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    storage_path = f"{file_path.name}"
+
+    async with semaphore:
+        try:
+            with file_path.open("rb") as f:
+                await bucket.upload(path=storage_path, file=f, file_options={"content-type": mime_type, "upsert": "true"})
+        except Exception as e:
+            logger.error(f"Failed to upload {file_path.name} to {bucket_name}: {e!s}")
+            return None
+
+    logger.info(f"Uploaded {file_path.name} to {bucket_name}")
+    return {"filename": file_path.name, "url": get_storage_url(bucket_name, storage_path), "storage_path": storage_path, "file_size_bytes": file_size, "mime_type": mime_type}
+
+
 async def upload_storage_content():
     """
     Upload files to all storage buckets in Supabase based on the configuration in storage.json.
-    Loops through all buckets and uploads files from their respective local directories.
+    Loops through all buckets and uploads files from their respective local directories,
+    with up to STORAGE_UPLOAD_CONCURRENCY uploads in flight.
     Returns a dictionary with uploaded files metadata for each bucket.
     """
     logger.start("Uploading content to all Supabase storage buckets...")
@@ -59,6 +83,7 @@ async def upload_storage_content():
     client = await get_supabase_client()
 
     all_uploaded_files = {}
+    semaphore = asyncio.Semaphore(settings.STORAGE_UPLOAD_CONCURRENCY)
 
     # Process each bucket
     for bucket_config in storage_config["buckets"]:
@@ -82,47 +107,10 @@ async def upload_storage_content():
             logger.warning(f"Local directory not found: {local_dir}")
             continue
 
-        uploaded_files = []
-
-        # Upload all files in the directory
-        for file_path in local_dir.iterdir():
-            if file_path.is_file():
-                try:
-                    # Get file size and mime type
-                    file_size = file_path.stat().st_size
-                    mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
-
-                    # Generate storage path
-                    storage_path = f"{file_path.name}"
-
-                    # Read file content
-                    with file_path.open("rb") as f:
-                        file_content = f.read()
-
-                    # Upload to Supabase
-                    await client.storage.from_(bucket_name).upload(path=storage_path, file=file_content, file_options={"content-type": mime_type})
-
-                    # Get URL
-                    url = get_storage_url(bucket_name, storage_path)
-
-                    uploaded_files.append({"filename": file_path.name, "url": url, "storage_path": storage_path, "file_size_bytes": file_size, "mime_type": mime_type})
-
-                    logger.info(f"Uploaded {file_path.name} to {bucket_name}")
-
-                except Exception as e:
-                    if "already exists" in str(e).lower():
-                        # If file exists, just get its URL
-                        storage_path = f"{file_path.name}"
-                        url = get_storage_url(bucket_name, storage_path)
-
-                        # Get file info for existing file
-                        file_size = file_path.stat().st_size
-                        mime_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
-
-                        uploaded_files.append({"filename": file_path.name, "url": url, "storage_path": storage_path, "file_size_bytes": file_size, "mime_type": mime_type})
-                        logger.warning(f"File {file_path.name} already exists in {bucket_name}, using existing URL")
-                    else:
-                        logger.error(f"Failed to upload {file_path.name} to {bucket_name}: {e!s}")
+        bucket = client.storage.from_(bucket_name)
+        file_paths = [file_path for file_path in local_dir.iterdir() if file_path.is_file()]
+        results = await asyncio.gather(*(upload_file(bucket, bucket_name, file_path, semaphore) for file_path in file_paths))
+        uploaded_files = [result for result in results if result is not None]
 
         all_uploaded_files[bucket_name] = uploaded_files
         logger.succeed(f"Processed {len(uploaded_files)} files for bucket: {bucket_name}")
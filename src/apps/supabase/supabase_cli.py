@@ -14,6 +14,7 @@ from apps.supabase.core.meals import generate_meals_data, seed_meals_data
 from apps.supabase.core.storage import create_storage_buckets, upload_storage_content
 from apps.supabase.core.tables import create_tables
 from apps.supabase.core.users import generate_user_preferences_data, generate_users_data, seed_user_preferences_data, seed_users_data
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -58,6 +59,19 @@ def down(volumes: bool, force: bool):
         subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    supabase_cli,
+    SnapshotSpec(
+        app="supabase",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        data_dir=settings.DATA_PATH,
+        database_user="supabase_admin",
+        env=lambda: {**os.environ, **settings.model_dump_str()},
+    ),
+)
+
+
 @supabase_cli.command()
 def seed():
     """Seed the supabase database with test data"""
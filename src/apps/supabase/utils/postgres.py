@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 import typing as t
 
 import asyncpg
@@ -60,3 +63,63 @@ class PostgresClient:
             raise RuntimeError("Connection pool is not initialized. Use 'async with PostgresClient()'.")
         async with self.pool.acquire() as conn:
             return await conn.fetchval(query, *args)
+
+    async def copy_records(
+        self,
+        table: str,
+        records: list[dict[str, t.Any]],
+        conflict_columns: list[str] | None = None,
+        schema_name: str = "public",
+    ) -> int:
+        """
+        Bulk load records with COPY through a temporary staging table.
+
+        Rows are streamed as CSV so Postgres parses dates, UUIDs and enums itself, then merged
+        into the target with ON CONFLICT DO NOTHING to keep reruns idempotent.
+        Returns the number of rows inserted into the target table.
+        """
+        if self.pool is None:
+            raise RuntimeError("Connection pool is not initialized. Use 'async with PostgresClient()'.")
+        if not records:
+            return 0
+
+        columns = list(records[0].keys())
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        conflict_target = f"({', '.join(conflict_columns)})" if conflict_columns else ""
+        staging_table = f"_copy_{table}"
+
+        async with self.pool.acquire() as conn, conn.transaction():
+            # Lists go to array columns as array literals, but to json/jsonb columns as JSON
+            json_columns = {
+                row["column_name"]
+                for row in await conn.fetch(
+                    "SELECT column_name FROM information_schema.columns WHERE table_schema = $1 AND table_name = $2 AND data_type IN ('json', 'jsonb')",
+                    schema_name,
+                    table,
+                )
+            }
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for record in records:
+                writer.writerow([_to_copy_value(record.get(column), column in json_columns) for column in columns])
+
+            await conn.execute(f'CREATE TEMP TABLE "{staging_table}" (LIKE "{schema_name}"."{table}" INCLUDING DEFAULTS) ON COMMIT DROP')
+            await conn.copy_to_table(staging_table, source=io.BytesIO(buffer.getvalue().encode("utf-8")), columns=columns, format="csv", null="\\N")
+            status = await conn.execute(f'INSERT INTO "{schema_name}"."{table}" ({column_list}) SELECT {column_list} FROM "{staging_table}" ON CONFLICT {conflict_target} DO NOTHING')
+
+        return int(status.split()[-1])
+
+
+def _to_copy_value(value: t.Any, json_column: bool = False) -> t.Any:
+    """Render a Python value as a Postgres CSV COPY field for a column, json/jsonb or not"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, dict) or (json_column and isinstance(value, list)):
+        return json.dumps(value)
+    if isinstance(value, list):
+        # Postgres array literal, every element quoted
+        return "{" + ",".join('"' + str(item).replace("\\", "\\\\").replace('"', '\\"') + '"' for item in value) + "}"
+    return value
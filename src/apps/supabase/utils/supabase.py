@@ -1,8 +1,99 @@
+import asyncio
+from typing import Any
+
+from postgrest.types import ReturnMethod
 from supabase import AsyncClient, create_async_client
 
 from apps.supabase.config.settings import settings
+from apps.supabase.utils.postgres import PostgresClient
+from common.logger import logger
 
 
 async def get_supabase_client():
     client: AsyncClient = await create_async_client(settings.SUPABASE_PUBLIC_URL, settings.SERVICE_ROLE_KEY)
     return client
+
+
+async def _upsert_chunk(client: AsyncClient, table: str, chunk: list[dict[str, Any]], on_conflict: str, ignore_duplicates: bool) -> int:
+    """
+    Upsert a chunk of records, bisecting on failure so one bad row doesn't sink the whole batch.
+    Returns the number of records that were sent successfully.
+    """
+    try:
+        await (
+            client.table(table)
+            .upsert(
+                chunk,
+                on_conflict=on_conflict,
+                ignore_duplicates=ignore_duplicates,
+                returning=ReturnMethod.minimal,
+            )
+            .execute()
+        )
+        return len(chunk)
+    except Exception as e:
+        if len(chunk) == 1:
+            conflict_key = ", ".join(f"{column}={chunk[0].get(column)}" for column in (column.strip() for column in on_conflict.split(",")))
+            logger.error(f"Error inserting into {table} ({conflict_key}): {e}")
+            return 0
+
+    middle = len(chunk) // 2
+    return await _upsert_chunk(client, table, chunk[:middle], on_conflict, ignore_duplicates) + await _upsert_chunk(client, table, chunk[middle:], on_conflict, ignore_duplicates)
+
+
+async def insert_records(
+    client: AsyncClient,
+    table: str,
+    records: list[dict[str, Any]],
+    on_conflict: str = "id",
+    ignore_duplicates: bool = True,
+    batch_size: int = settings.INSERT_BATCH_SIZE,
+    concurrency: int = settings.INSERT_CONCURRENCY,
+) -> int:
+    """
+    Insert records through PostgREST in multi-row batches.
+
+    Rows that conflict on `on_conflict` are skipped (or updated when `ignore_duplicates` is False),
+    which keeps reruns idempotent without matching on "duplicate key" error strings.
+
+    Args:
+        client: Supabase async client
+        table: Target table name
+        records: Rows to insert
+        on_conflict: Comma separated conflict target columns
+        ignore_duplicates: Skip conflicting rows instead of updating them
+        batch_size: Number of rows per request
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        Number of records sent successfully
+    """
+    if not records:
+        return 0
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def send(chunk: list[dict[str, Any]]) -> int:
+        async with semaphore:
+            return await _upsert_chunk(client, table, chunk, on_conflict, ignore_duplicates)
+
+    chunks = [records[i : i + batch_size] for i in range(0, len(records), batch_size)]
+    inserted = await asyncio.gather(*(send(chunk) for chunk in chunks))
+    return sum(inserted)
+
+
+async def load_records(
+    client: AsyncClient,
+    table: str,
+    records: list[dict[str, Any]],
+    on_conflict: str = "id",
+) -> int:
+    """
+    Load records into a public table, switching to a direct Postgres COPY once the
+    row count reaches COPY_THRESHOLD (0 disables the COPY path).
+    """
+    if settings.COPY_THRESHOLD and len(records) >= settings.COPY_THRESHOLD:
+        async with PostgresClient() as postgres:
+            return await postgres.copy_records(table, records, conflict_columns=on_conflict.split(","))
+
+    return await insert_records(client, table, records, on_conflict=on_conflict)
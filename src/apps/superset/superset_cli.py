@@ -3,6 +3,8 @@ from pathlib import Path
 
 import click
 
+from common.snapshots import SnapshotSpec, add_snapshot_commands
+
 
 @click.group()
 def superset_cli():
@@ -41,3 +43,14 @@ def down(volumes: bool, force: bool):
     if force:
         print("Force cleanup: removing all unused volumes...")
         subprocess.run(["docker", "volume", "prune", "-f"])
+
+
+add_snapshot_commands(
+    superset_cli,
+    SnapshotSpec(
+        app="superset",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="db",
+        volumes=[("superset", "/app/superset_home")],
+    ),
+)
@@ -15,4 +15,5 @@ WORKSPACE_ASSIGNMENTS_FILE = "generated/workspace_assignments.json"
 WORKSPACES_FILE = "workspaces.json"
 BASES_FILE = "bases.json"
 TABLES_FILE = "tables.json"
+LINK_UPDATE_CHUNK_SIZE = 100
 EXAMPLE_ATTACHMENTS_URL = "https://pdfobject.com/pdf/sample.pdf"
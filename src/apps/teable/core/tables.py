@@ -1,14 +1,12 @@
 import asyncio
-import copy
 import json
-import random
 import re
 from datetime import datetime
 from pathlib import Path
 
 from openai import AsyncOpenAI
 
-from apps.teable.config.constants import TABLES_FILE
+from apps.teable.config.constants import LINK_UPDATE_CHUNK_SIZE, TABLES_FILE
 from apps.teable.config.settings import settings
 from apps.teable.core.bases import get_base_id_by_name
 from apps.teable.utils.faker import faker
@@ -23,60 +21,133 @@ openai_client = AsyncOpenAI()
 table_name_to_id_map = {}
 
 
-def weighted_random_selection(elements, weights, num_selections, unique=True):
+class WeightedSampler:
     """
-    Custom weighted random selection function.
+    Weighted random sampler backed by a Fenwick tree.
 
-    Args:
-        elements: List of elements to choose from
-        weights: List of weights corresponding to each element
-        num_selections: Number of elements to select
-        unique: If True, each element can only be selected once
+    Drawing an index and changing a weight are both O(log n), so weights can be
+    adjusted after every draw without rebuilding the whole distribution.
+    """
 
-    Returns:
-        List of selected elements
+    def __init__(self, weights: list[float]):
+        self._size = len(weights)
+        self._weights = list(weights)
+        self._tree = [0.0] * (self._size + 1)
+        for i in range(1, self._size + 1):
+            self._tree[i] += self._weights[i - 1]
+            parent = i + (i & -i)
+            if parent <= self._size:
+                self._tree[parent] += self._tree[i]
+
+    def total(self) -> float:
+        """Sum of all weights"""
+        total = 0.0
+        i = self._size
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def update(self, index: int, weight: float):
+        """Set the weight of the element at index"""
+        delta = weight - self._weights[index]
+        self._weights[index] = weight
+        i = index + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def sample(self) -> int | None:
+        """Draw an index with probability proportional to its weight, or None if all weights are zero"""
+        target = faker.random.random() * self.total()
+        if target <= 0:
+            return None
+
+        position = 0
+        step = 1 << self._size.bit_length()
+        while step:
+            next_position = position + step
+            if next_position <= self._size and self._tree[next_position] <= target:
+                target -= self._tree[next_position]
+                position = next_position
+            step >>= 1
+
+        return min(position, self._size - 1)
+
+
+def plan_many_many_links(record_ids: list[str], foreign_records: list[dict], min_links: int = 1, max_links: int = 2) -> dict[str, list[dict]]:
     """
-    if not elements or not weights or len(elements) != len(weights):
-        return []
+    Assign each record 1-2 distinct foreign records, favouring foreign records that
+    have been picked less often so links spread evenly across the foreign table.
+    """
+    if not foreign_records:
+        return {}
 
-    if num_selections <= 0:
-        return []
+    sampler = WeightedSampler([1.0] * len(foreign_records))
+    selection_counts = [0] * len(foreign_records)
+    plan = {}
+
+    for record_id in record_ids:
+        num_selections = min(faker.random_int(min=min_links, max=max_links), len(foreign_records))
 
-    # Create a list of (element, weight) pairs
-    weighted_elements = list(zip(elements, weights, strict=False))
-    selected = []
+        # Zero the weight of each pick so a record never links the same foreign record twice
+        selected = []
+        for _ in range(num_selections):
+            index = sampler.sample()
+            if index is None:
+                break
+            selected.append(index)
+            sampler.update(index, 0.0)
 
-    for _ in range(min(num_selections, len(elements) if unique else num_selections)):
-        if not weighted_elements:
-            break
+        for index in selected:
+            selection_counts[index] += 1
+            # Weight decreases as count increases, with a minimum weight of 0.1
+            sampler.update(index, max(0.1, 1.0 / (1 + selection_counts[index] * 0.5)))
 
-        # Calculate total weight
-        total_weight = sum(weight for _, weight in weighted_elements)
-        if total_weight <= 0:
-            break
+        plan[record_id] = [foreign_records[index] for index in selected]
 
-        # Generate random number between 0 and total_weight
-        rand_num = random.uniform(0, total_weight)
+    return plan
 
-        # Select element based on cumulative weights
-        cumulative_weight = 0
-        selected_element = None
-        selected_index = -1
 
-        for i, (element, weight) in enumerate(weighted_elements):
-            cumulative_weight += weight
-            if rand_num <= cumulative_weight:
-                selected_element = element
-                selected_index = i
+def plan_many_one_links(record_ids: list[str], foreign_records: list[dict]) -> dict[str, dict]:
+    """
+    Assign each record one foreign record, using every foreign record once
+    before any of them is reused.
+    """
+    plan = {}
+    remaining_foreign_records = []
+
+    for record_id in record_ids:
+        if not remaining_foreign_records:
+            if not foreign_records:
                 break
+            remaining_foreign_records = list(foreign_records)
+            faker.random.shuffle(remaining_foreign_records)
+
+        plan[record_id] = remaining_foreign_records.pop()
+
+    return plan
 
-        if selected_element is not None:
-            selected.append(selected_element)
-            if unique:
-                # Remove selected element from the pool
-                weighted_elements.pop(selected_index)
 
-    return selected
+def to_link_value(record: dict) -> dict:
+    """Reduce a foreign record to the id/title pair Teable expects in a link cell"""
+    return {"id": record.get("id"), "title": record.get("name", record.get("title", ""))}
+
+
+async def push_link_updates(teable, table_id: str, field_name: str, plan: dict[str, list[dict] | dict], concurrency: int = 4):
+    """Write planned link values with Teable's multi-record update endpoint, LINK_UPDATE_CHUNK_SIZE records at a time"""
+    updates = [{"id": record_id, "fields": {field_name: value}} for record_id, value in plan.items()]
+    chunks = [updates[i : i + LINK_UPDATE_CHUNK_SIZE] for i in range(0, len(updates), LINK_UPDATE_CHUNK_SIZE)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def push(chunk: list[dict]):
+        async with semaphore:
+            try:
+                await teable.update_records(table_id, chunk)
+            except Exception as e:
+                logger.error(f"Failed to link {len(chunk)} records with {field_name}: {e}")
+
+    await asyncio.gather(*(push(chunk) for chunk in chunks))
 
 
 def get_data_filename(name: str, parent_base_name: str) -> str:
@@ -185,7 +256,7 @@ async def link_records_in_tables():
                 field_name = tbl_field["name"]
                 relationship = tbl_field["options"]["relationship"]
                 foreign_table_name = tbl_field["options"].get("foreignTableName")
-                current_table_records = await teable.get_records(
+                current_table_records = await teable.get_all_records(
                     current_table_id,
                     filter=json.dumps(
                         {
@@ -211,74 +282,24 @@ async def link_records_in_tables():
                     foreign_table_name,
                 )
                 foreign_table_id = foreign_table["id"]
-                foreign_table_records = await teable.get_records(foreign_table_id)
+                foreign_table_records = await teable.get_all_records(foreign_table_id)
+
+                record_ids = [record["id"] for record in current_table_records.get("records", [])]
+                foreign_records = [to_link_value(record) for record in foreign_table_records.get("records", [])]
 
                 if relationship == "manyMany":
-                    selectable_foreign_records = copy.deepcopy(foreign_table_records.get("records", []))
-
-                    # Track selection counts for weighted selection
-                    selection_counts = {record["id"]: 0 for record in selectable_foreign_records}
-
-                    for record in current_table_records.get("records", []):
-                        record_id = record["id"]
-
-                        # Calculate weights (higher count = lower weight)
-                        weights = []
-                        for foreign_record in selectable_foreign_records:
-                            count = selection_counts[foreign_record["id"]]
-                            # Weight decreases as count increases (using exponential decay)
-                            weight = max(0.1, 1.0 / (1 + count * 0.5))  # Minimum weight of 0.1
-                            weights.append(weight)
-
-                        # Perform weighted random selection
-                        num_selections = faker.random_int(min=1, max=2)
-                        selected_foreign_records = weighted_random_selection(
-                            selectable_foreign_records,
-                            weights,
-                            num_selections,
-                            True,
-                        )
-
-                        # Update selection counts and log selection statistics
-                        for selected_record in selected_foreign_records:
-                            selection_counts[selected_record["id"]] += 1
-
-                        selected_foreign_records = [
-                            {
-                                "id": record.get("id"),
-                                "title": record.get("name", record.get("title", "")),
-                            }
-                            for record in selected_foreign_records
-                        ]
-                        await teable.update_record(
-                            current_table_id,
-                            record_id,
-                            {"fields": {field_name: selected_foreign_records}},
-                        )
-
-                if relationship == "manyOne":
-                    remaining_foreign_records = copy.deepcopy(foreign_table_records.get("records", []))
-
-                    for record in current_table_records.get("records", []):
-                        record_id = record["id"]
-
-                        # Check if we've run out of foreign records
-                        if len(remaining_foreign_records) == 0:
-                            remaining_foreign_records = copy.deepcopy(foreign_table_records.get("records", []))
-                            if len(remaining_foreign_records) == 0:
-                                logger.info(f"No more foreign records available for {field_name} in table {tbl['name']}, skipping...")
-                                break
-
-                        selected_foreign_record = faker.random_element(elements=remaining_foreign_records)
-                        # Remove the selected record from remaining_foreign_records
-                        remaining_foreign_records.remove(selected_foreign_record)
-                        await teable.update_record(
-                            current_table_id,
-                            record_id,
-                            {"fields": {field_name: selected_foreign_record}},
-                        )
-
-                logger.succeed(f"Linked {len(current_table_records.get('records', []))} records with {field_name} in table {tbl['name']}")
+                    plan = plan_many_many_links(record_ids, foreign_records)
+                elif relationship == "manyOne":
+                    plan = plan_many_one_links(record_ids, foreign_records)
+                else:
+                    continue
+
+                if len(plan) < len(record_ids):
+                    logger.info(f"No foreign records available for {field_name} in table {tbl['name']}, skipping...")
+
+                await push_link_updates(teable, current_table_id, field_name, plan)
+
+                logger.succeed(f"Linked {len(plan)} records with {field_name} in table {tbl['name']}")
 
 
 async def add_records_to_tables():
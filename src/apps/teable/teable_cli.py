@@ -16,6 +16,7 @@ from apps.teable.core.workspaces import (
     insert_workspaces,
 )
 from apps.teable.utils.teable import close_global_client
+from common.snapshots import SnapshotSpec, add_snapshot_commands
 
 
 @click.group()
@@ -59,6 +60,19 @@ def down(volumes: bool, force: bool):
         subprocess.run(["docker", "volume", "prune", "-f"])
 
 
+add_snapshot_commands(
+    teable_cli,
+    SnapshotSpec(
+        app="teable",
+        docker_dir=Path(__file__).parent.joinpath("docker"),
+        database_service="teable-db",
+        data_dir=settings.DATA_PATH,
+        volumes=[("teable", "/app/.assets")],
+        env=lambda: {**os.environ, **settings.model_dump_str()},
+    ),
+)
+
+
 @teable_cli.command()
 def seed():
     async def async_seed_teable():
@@ -390,6 +390,26 @@ class TeableClient:
 
         return await self._request("GET", f"/api/table/{table_id}/record", params=params)
 
+    async def get_all_records(self, table_id: str, page_size: int = 1000, **kwargs) -> dict[str, Any]:
+        """
+        Get every record from a table, following skip/take pagination past a single page
+
+        Args:
+            table_id: ID of the table
+            page_size: Number of records requested per page
+            **kwargs: Additional filters passed through to get_records
+
+        Returns:
+            Records data with all pages merged into "records"
+        """
+        records = []
+        while True:
+            page = await self.get_records(table_id, take=page_size, skip=len(records), **kwargs)
+            page_records = page.get("records", [])
+            records.extend(page_records)
+            if len(page_records) < page_size:
+                return {"records": records}
+
     @property
     def is_logged_in(self) -> bool:
         """Check if user is currently logged in"""
@@ -668,6 +688,33 @@ class TeableClient:
 
         return await self._request("PATCH", f"/api/table/{table_id}/record/{record_id}", json=data)
 
+    async def update_records(
+        self,
+        table_id: str,
+        records: list[dict],
+        field_key_type: str = "name",
+        typecast: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Update multiple records in a table with a single request
+
+        Args:
+            table_id: ID of the table
+            records: List of record dictionaries, each containing an "id" and a "fields" key mapping field names to values
+            field_key_type: Type of field keys to use ("id" or "name")
+            typecast: Whether to automatically convert field values to the correct type
+
+        Returns:
+            Dictionary containing the updated records data
+        """
+        data = {
+            "fieldKeyType": field_key_type,
+            "typecast": typecast,
+            "records": records,
+        }
+
+        return await self._request("PATCH", f"/api/table/{table_id}/record", json=data)
+
 
 # Global client instance for reuse
 _global_client: TeableClient | None = None
@@ -1,3 +1,5 @@
+import asyncio
+
 import click
 
 from apps.akaunting.akaunting_cli import akaunting_cli
@@ -20,6 +22,7 @@ from apps.spree.spree_cli import spree_cli
 from apps.supabase.supabase_cli import supabase_cli
 from apps.superset.superset_cli import superset_cli
 from apps.teable.teable_cli import teable_cli
+from common import fleet, loopwatch
 
 
 @click.group()
@@ -27,7 +30,24 @@ def cli():
     pass
 
 
+@cli.command()
+@click.option("--apps", required=True, help="Comma-separated apps to start together, e.g. odoosales,chatwoot,mattermost")
+@click.option("--seed/--no-seed", default=True, help="Seed each app as soon as it is ready")
+@click.option("--timeout", type=int, default=fleet.READY_TIMEOUT, help="Seconds to wait for each app to become ready")
+def up(apps: str, seed: bool, timeout: int):
+    """Start several apps concurrently and seed each one as soon as it is ready"""
+    try:
+        results = asyncio.run(fleet.bring_up([app.strip() for app in apps.split(",") if app.strip()], seed=seed, timeout=timeout))
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    if any(result["status"] != "ok" for result in results):
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
+    loopwatch.enable_from_env()
+
     cli.add_command(akaunting_cli, name="akaunting")
     cli.add_command(chatwoot_cli, name="chatwoot")
     cli.add_command(frappecrm_cli, name="frappecrm")
@@ -0,0 +1,344 @@
+"""
+Local content-addressed store for images and other binary assets.
+
+Avatars, logos and stock photos are reused across apps and reruns. The store keeps every blob once,
+keyed by its SHA-256, and remembers which source (URL or local file) produced it, so a rerun never
+downloads, hashes or base64-encodes the same bytes twice. Checksums, dimensions, base64 text and
+resized variants are computed once and persisted next to the blob.
+
+Layout under the store root:
+
+    index.sqlite            assets, sources and variants tables
+    blobs/ab/<sha256>       raw bytes
+    blobs/ab/<sha256>.b64   base64 text, written on first use
+
+The least recently used assets are evicted once the blobs exceed ASSET_STORE_MAX_BYTES.
+
+Example:
+    ```python
+    store = get_asset_store()
+    asset = await store.fetch("https://images.pexels.com/photos/1/pexels-photo-1.jpeg")
+    thumbnail = store.variant(asset, 256)
+    data_uri = thumbnail.data_uri
+    ```
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+import aiohttp
+
+from common.logger import logger
+
+
+ASSET_STORE_PATH = Path(os.environ.get("ASSET_STORE_PATH", Path.home() / ".cache" / "seed-assets"))
+ASSET_STORE_MAX_BYTES = int(os.environ.get("ASSET_STORE_MAX_BYTES", 2 * 1024 * 1024 * 1024))
+
+# Evict down to this share of the size limit so eviction doesn't run on every insert
+EVICTION_TARGET_RATIO = 0.9
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    sha256 TEXT PRIMARY KEY,
+    md5 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    width INTEGER,
+    height INTEGER,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS assets_last_access ON assets (last_access);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS variants (
+    sha256 TEXT NOT NULL,
+    name TEXT NOT NULL,
+    variant_sha256 TEXT NOT NULL,
+    PRIMARY KEY (sha256, name)
+);
+"""
+
+CONTENT_TYPES_BY_FORMAT = {"JPEG": "image/jpeg", "PNG": "image/png", "GIF": "image/gif", "WEBP": "image/webp"}
+
+
+class Asset:
+    """One stored blob and its metadata (checksum, size, image type and dimensions), computed once when it is stored."""
+
+    def __init__(self, store: "AssetStore", sha256: str, md5: str, size: int, content_type: str | None, width: int | None, height: int | None):
+        self.store = store
+        self.sha256 = sha256
+        self.md5 = md5
+        self.size = size
+        self.content_type = content_type
+        self.width = width
+        self.height = height
+
+    def __repr__(self) -> str:
+        return f"Asset({self.sha256[:12]}, {self.size} bytes, {self.content_type}, {self.width}x{self.height})"
+
+    @property
+    def path(self) -> Path:
+        return self.store._blob_path(self.sha256)
+
+    @property
+    def md5_base64(self) -> str:
+        """MD5 digest in base64, the checksum format Active Storage expects."""
+        return base64.b64encode(bytes.fromhex(self.md5)).decode("ascii")
+
+    @property
+    def b64(self) -> str:
+        """Base64 text of the blob, encoded once and then read back from disk."""
+        return self.store._b64(self)
+
+    @property
+    def data_uri(self) -> str:
+        return f"data:{self.content_type or 'application/octet-stream'};base64,{self.b64}"
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+
+def _probe_image(data: bytes) -> tuple[str | None, int | None, int | None]:
+    """Content type and dimensions of image bytes, or Nones for anything Pillow can't read."""
+    try:
+        from PIL import Image
+
+        with Image.open(BytesIO(data)) as image:
+            return CONTENT_TYPES_BY_FORMAT.get(image.format or ""), image.width, image.height
+    except Exception:
+        return None, None, None
+
+
+class AssetStore:
+    """sqlite-indexed blob store; safe to share between the threads of process_in_parallel."""
+
+    def __init__(self, root: str | Path = ASSET_STORE_PATH, max_bytes: int = ASSET_STORE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.joinpath("blobs").mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / sha256
+
+    def _row_to_asset(self, row: tuple) -> Asset:
+        return Asset(self, *row)
+
+    def get(self, sha256: str) -> Asset | None:
+        """Look up an asset by content hash and mark it as recently used."""
+        with self._lock:
+            row = self._db.execute("SELECT sha256, md5, size, content_type, width, height FROM assets WHERE sha256 = ?", (sha256,)).fetchone()
+            if row is None or not self._blob_path(sha256).exists():
+                return None
+            self._db.execute("UPDATE assets SET last_access = ? WHERE sha256 = ?", (time.time(), sha256))
+            self._db.commit()
+        return self._row_to_asset(row)
+
+    def lookup(self, source: str, fingerprint: str | None = None) -> Asset | None:
+        """Asset previously stored for `source`, if its fingerprint still matches."""
+        with self._lock:
+            row = self._db.execute("SELECT sha256, fingerprint FROM sources WHERE source = ?", (source,)).fetchone()
+        if row is None or row[1] != fingerprint:
+            return None
+        return self.get(row[0])
+
+    def put_bytes(self, data: bytes, source: str | None = None, fingerprint: str | None = None, content_type: str | None = None) -> Asset:
+        """Store bytes (deduplicated by content) and optionally remember the source they came from."""
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha256)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+                tmp.write(data)
+            Path(tmp.name).replace(path)
+
+        return self._index(sha256, hashlib.md5(data).hexdigest(), data, source, fingerprint, content_type)
+
+    def put_file(self, file_path: str | Path) -> Asset:
+        """
+        Store a local file. Unchanged files (same size and mtime) are answered from the index without reading them.
+
+        Raises:
+            FileNotFoundError / IsADirectoryError like open() would
+        """
+        file_path = Path(file_path).resolve()
+        stat = file_path.stat()
+        source = file_path.as_uri()
+        fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+
+        asset = self.lookup(source, fingerprint)
+        if asset is not None:
+            return asset
+
+        return self.put_bytes(file_path.read_bytes(), source=source, fingerprint=fingerprint)
+
+    async def fetch(self, url: str, session: aiohttp.ClientSession | None = None) -> Asset:
+        """
+        Return the asset for `url`, downloading it only if the store has never seen that URL.
+
+        Concurrent fetches of the same URL on one event loop share a single download.
+
+        Raises:
+            aiohttp.ClientError: If the download fails
+        """
+        asset = self.lookup(url)
+        if asset is not None:
+            return asset
+
+        task = self._inflight.get(url)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._download(url, session))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+
+        return await asyncio.shield(task)
+
+    async def _download(self, url: str, session: aiohttp.ClientSession | None) -> Asset:
+        owns_session = session is None
+        session = session or aiohttp.ClientSession()
+        sha256_hash, md5_hash = hashlib.sha256(), hashlib.md5()
+        fd, tmp_name = tempfile.mkstemp(dir=self.root / "blobs")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+
+        # Stream to a temporary file while hashing, then move it to its content address
+        try:
+            with tmp_path.open("wb") as tmp:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    content_type = response.headers.get("content-type", "").split(";")[0] or None
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        tmp.write(chunk)
+                        sha256_hash.update(chunk)
+                        md5_hash.update(chunk)
+
+            sha256 = sha256_hash.hexdigest()
+            path = self._blob_path(sha256)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            if owns_session:
+                await session.close()
+
+        return self._index(sha256, md5_hash.hexdigest(), path.read_bytes(), url, None, content_type)
+
+    def _index(self, sha256: str, md5: str, data: bytes, source: str | None, fingerprint: str | None, content_type: str | None) -> Asset:
+        """Record a blob that is already on disk, probing image metadata the first time it is seen."""
+        now = time.time()
+
+        with self._lock:
+            row = self._db.execute("SELECT sha256, md5, size, content_type, width, height FROM assets WHERE sha256 = ?", (sha256,)).fetchone()
+            if row is None:
+                probed_type, width, height = _probe_image(data)
+                row = (sha256, md5, len(data), probed_type or content_type, width, height)
+                self._db.execute("INSERT INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (*row, now, now))
+            else:
+                self._db.execute("UPDATE assets SET last_access = ? WHERE sha256 = ?", (now, sha256))
+
+            if source is not None:
+                self._db.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (source, sha256, fingerprint))
+            self._db.commit()
+
+            self._evict(keep=sha256)
+
+        return self._row_to_asset(row)
+
+    def _b64(self, asset: Asset) -> str:
+        b64_path = asset.path.with_suffix(".b64")
+        try:
+            return b64_path.read_text()
+        except FileNotFoundError:
+            encoded = base64.b64encode(asset.read_bytes()).decode("ascii")
+            b64_path.write_text(encoded)
+            return encoded
+
+    def variant(self, asset: Asset, max_width: int, max_height: int | None = None, image_format: str = "JPEG", quality: int = 85) -> Asset:
+        """
+        Resized copy of an image that fits within max_width x max_height (aspect ratio kept, never upscaled).
+
+        Variants are assets themselves and are remembered per (asset, size, format), so each is rendered once.
+        """
+        max_height = max_height or max_width
+        name = f"{max_width}x{max_height}.{image_format.lower()}.q{quality}"
+
+        with self._lock:
+            row = self._db.execute("SELECT variant_sha256 FROM variants WHERE sha256 = ? AND name = ?", (asset.sha256, name)).fetchone()
+        if row is not None:
+            existing = self.get(row[0])
+            if existing is not None:
+                return existing
+
+        from PIL import Image
+
+        with Image.open(asset.path) as image:
+            image.thumbnail((max_width, max_height))
+            if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            buffer = BytesIO()
+            image.save(buffer, format=image_format, quality=quality)
+
+        resized = self.put_bytes(buffer.getvalue(), content_type=CONTENT_TYPES_BY_FORMAT.get(image_format))
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO variants VALUES (?, ?, ?)", (asset.sha256, name, resized.sha256))
+            self._db.commit()
+        return resized
+
+    def _evict(self, keep: str) -> None:
+        """Drop least recently used assets until the store is back under its size limit. Caller holds the lock."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM assets").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * EVICTION_TARGET_RATIO
+        evicted = 0
+        for sha256, size in self._db.execute("SELECT sha256, size FROM assets WHERE sha256 != ? ORDER BY last_access", (keep,)).fetchall():
+            if total <= target:
+                break
+
+            path = self._blob_path(sha256)
+            path.unlink(missing_ok=True)
+            path.with_suffix(".b64").unlink(missing_ok=True)
+            self._db.execute("DELETE FROM assets WHERE sha256 = ?", (sha256,))
+            self._db.execute("DELETE FROM sources WHERE sha256 = ?", (sha256,))
+            self._db.execute("DELETE FROM variants WHERE sha256 = ? OR variant_sha256 = ?", (sha256, sha256))
+            total -= size
+            evicted += 1
+
+        self._db.commit()
+        logger.debug(f"Asset store: evicted {evicted} assets, {total / (1024 * 1024):.1f} MiB left")
+
+
+_store: AssetStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_asset_store() -> AssetStore:
+    """Process-wide store at ASSET_STORE_PATH, shared by every app."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AssetStore()
+        return _store
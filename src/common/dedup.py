@@ -0,0 +1,242 @@
+"""
+In-memory duplicate detection for generated records.
+
+LLM generators tend to repeat themselves: the same names, the same emails and titles that differ
+only by a word or two. A DedupIndex keeps every value a generator has accepted so far and answers
+"is this new?" in constant time, no matter how many records were generated before:
+
+- exact fields (emails, handles, SKUs) are normalized and kept in hash sets;
+- near fields (titles, descriptions) additionally go through a MinHash/LSH index over character
+  shingles, so "Wireless Noise-Cancelling Headphones" is caught as a repeat of "Wireless Noise
+  Cancelling Headphone".
+
+The index also keeps the most recent values of each field, which generators feed back into their
+prompts as a compact list of things to avoid.
+"""
+
+import re
+import typing as t
+from collections import deque
+
+import numpy as np
+
+
+DEFAULT_NEAR_THRESHOLD = 0.8
+# 8 bands of 8 rows make texts candidates from a similarity of about (1/8) ** (1/8) ~= 0.77 upwards,
+# just under the default threshold, so few candidates need a full signature comparison
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 8
+# Shingles are packed into integers below _PRIME, which holds 3 bytes
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_SUMMARY_SIZE = 30
+
+# Hash values and permutation coefficients stay below 2**31, so a * h + b fits in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_INITIAL_CAPACITY = 1024
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize(value: t.Any) -> str:
+    """Lowercase, drop punctuation and collapse whitespace, so trivial variations compare equal."""
+    return " ".join(_NON_WORD.sub(" ", str(value).lower()).split())
+
+
+class MinHashLSH:
+    """
+    Near-duplicate index over one text field.
+
+    Each text is reduced to a MinHash signature of `num_perm` values. Signatures are split into
+    `bands`; texts that agree on a whole band land in the same bucket and become candidates, and
+    candidates are confirmed by comparing full signatures, whose agreement estimates the Jaccard
+    similarity of the two shingle sets.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_NEAR_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+
+        self._signatures = np.empty((_INITIAL_CAPACITY, num_perm), dtype=np.uint32)
+        self._texts: list[str] = []
+        self._buckets: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        # Every window of `shingle_size` bytes, packed into one integer per shingle
+        data = np.frombuffer(text.encode().ljust(self.shingle_size), dtype=np.uint8).astype(np.uint64)
+        count = len(data) - self.shingle_size + 1
+        packed = np.zeros(count, dtype=np.uint64)
+        for offset in range(self.shingle_size):
+            packed = (packed << np.uint64(8)) | data[offset : offset + count]
+        return np.unique(packed % _PRIME)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text, computed for all permutations at once."""
+        hashes = self._shingles(normalize(text))
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        raw = signature.tobytes()
+        step = self.rows * signature.itemsize
+        return [raw[start : start + step] for start in range(0, len(raw), step)]
+
+    def query(self, text: str, signature: np.ndarray | None = None) -> str | None:
+        """Return a stored text similar to `text` above the threshold, or None."""
+        if signature is None:
+            signature = self.signature(text)
+
+        candidates: set[int] = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature), strict=True):
+            candidates.update(buckets.get(key, ()))
+        if not candidates:
+            return None
+
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[ids] == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        return self._texts[ids[best]] if similarity[best] >= self.threshold else None
+
+    def add(self, text: str, signature: np.ndarray | None = None) -> None:
+        """Store a text without checking it."""
+        if signature is None:
+            signature = self.signature(text)
+
+        record_id = len(self._texts)
+        if record_id == len(self._signatures):
+            self._signatures = np.concatenate([self._signatures, np.empty_like(self._signatures)])
+
+        self._signatures[record_id] = signature
+        self._texts.append(text)
+        for buckets, key in zip(self._buckets, self._band_keys(signature), strict=True):
+            buckets.setdefault(key, []).append(record_id)
+
+
+class DedupIndex:
+    """
+    Exact and near-duplicate index over a few fields of generated records.
+
+    Records are plain dicts; a field value may be a string or a list of strings (e.g. all SKUs of
+    a product). A record is a duplicate when any of its exact-field values was seen before, or
+    when any of its near-field values is within the similarity threshold of an earlier one.
+
+    Example:
+        ```python
+        index = DedupIndex(exact_fields=["handle", "sku"], near_fields=["title"])
+        index.add_many(existing_products)
+        for product in generated:
+            if index.add(product):
+                accepted.append(product)
+        prompt += f"Avoid these titles: {', '.join(index.avoid_summary('title'))}"
+        ```
+    """
+
+    def __init__(
+        self,
+        exact_fields: t.Iterable[str] = (),
+        near_fields: t.Iterable[str] = (),
+        threshold: float = DEFAULT_NEAR_THRESHOLD,
+        summary_size: int = DEFAULT_SUMMARY_SIZE,
+    ):
+        self.exact_fields = tuple(exact_fields)
+        self.near_fields = tuple(near_fields)
+        fields = self.exact_fields + self.near_fields
+
+        self._seen: dict[str, set[str]] = {field: set() for field in fields}
+        self._near: dict[str, MinHashLSH] = {field: MinHashLSH(threshold=threshold) for field in self.near_fields}
+        self._recent: dict[str, deque[str]] = {field: deque(maxlen=summary_size) for field in fields}
+        self.accepted = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return self.accepted
+
+    @staticmethod
+    def _values(record: dict, field: str) -> list[str]:
+        value = record.get(field)
+        if not value:
+            return []
+        values = value if isinstance(value, list | tuple | set) else [value]
+        return [str(v) for v in values if v]
+
+    def duplicate_of(self, record: dict) -> str | None:
+        """Describe why `record` is a duplicate, or return None if it is new."""
+        return self._check(record, {})
+
+    def _check(self, record: dict, signatures: dict[tuple[str, str], np.ndarray]) -> str | None:
+        """Look `record` up, keeping the near-field signatures it computed in `signatures` for reuse."""
+        for field in self._seen:
+            for value in self._values(record, field):
+                if normalize(value) in self._seen[field]:
+                    return f"{field} '{value}' already used"
+
+        for field, lsh in self._near.items():
+            for value in self._values(record, field):
+                signatures[(field, value)] = signature = lsh.signature(value)
+                match = lsh.query(value, signature)
+                if match is not None:
+                    return f"{field} '{value}' is too close to '{match}'"
+
+        return None
+
+    def add(self, record: dict) -> bool:
+        """Register `record` if it is new. Returns False, leaving the index untouched, for duplicates."""
+        signatures: dict[tuple[str, str], np.ndarray] = {}
+        if self._check(record, signatures) is not None:
+            self.rejected += 1
+            return False
+
+        self._register(record, signatures)
+        return True
+
+    def add_many(self, records: t.Iterable[dict], check: bool = False) -> int:
+        """
+        Register many records, e.g. the ones already persisted by an earlier run.
+
+        With `check=False` the records are trusted and stored without lookups.
+        Returns the number of records registered.
+        """
+        added = 0
+        for record in records:
+            if check:
+                added += self.add(record)
+            else:
+                self._register(record, {})
+                added += 1
+        return added
+
+    def _register(self, record: dict, signatures: dict[tuple[str, str], np.ndarray]) -> None:
+        for field in self._seen:
+            for value in self._values(record, field):
+                self._seen[field].add(normalize(value))
+                self._recent[field].append(value)
+                if field in self._near:
+                    self._near[field].add(value, signatures.get((field, value)))
+        self.accepted += 1
+
+    def unique_count(self, field: str) -> int:
+        """Number of distinct normalized values accepted for `field`."""
+        return len(self._seen[field])
+
+    def avoid_summary(self, field: str, limit: int | None = None) -> list[str]:
+        """Most recently accepted values of `field`, newest last, for "do not repeat" prompt hints."""
+        recent = list(self._recent[field])
+        return recent[-limit:] if limit else recent
@@ -0,0 +1,335 @@
+"""
+Concurrent bring-up of several apps.
+
+`python cli.py up --apps odoosales,chatwoot,mattermost` starts the compose projects of all the
+given apps at once, waits for each one with the readiness probes declared in FLEET, and seeds
+every app the moment its own probes pass. Standing up a fleet of apps therefore takes about as
+long as the slowest app, instead of the sum of all of them.
+
+Each app is started and seeded through its own CLI (`cli.py <app> up -d`, `cli.py <app> seed`) in a
+subprocess, so app-specific setup steps still run. Their output goes to one log file per app.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import aiohttp
+
+from common.logger import logger
+from common.snapshots import MARIADB_CLIENT, POSTGRES_USER
+
+
+CLI_PATH = Path(__file__).resolve().parent.parent / "cli.py"
+APPS_DIR = CLI_PATH.parent / "apps"
+LOG_DIR = Path("fleet")
+
+READY_TIMEOUT = 900
+PROBE_MIN_DELAY = 1
+PROBE_MAX_DELAY = 15
+PROBE_REQUEST_TIMEOUT = 5
+
+SELECT_ONE = {
+    "postgres": f'psql -U {POSTGRES_USER} -d template1 -Atc "SELECT 1"',
+    "mariadb": f'{MARIADB_CLIENT} -N -e "SELECT 1"',
+}
+
+
+class TcpProbe:
+    """Ready once a port accepts connections"""
+
+    def __init__(self, port, host="localhost"):
+        self.port = port
+        self.host = host
+
+    def __str__(self):
+        return f"tcp {self.host}:{self.port}"
+
+    async def check(self):
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), PROBE_REQUEST_TIMEOUT)
+        except (OSError, TimeoutError):
+            return False
+        writer.close()
+        return True
+
+
+class HttpProbe:
+    """
+    Ready once a URL answers with one of `statuses`.
+
+    Used for health and API version endpoints; endpoints that need authentication are ready
+    as soon as they answer 401.
+    """
+
+    def __init__(self, url, statuses=(200,)):
+        self.url = url
+        self.statuses = statuses
+
+    def __str__(self):
+        return f"http {self.url}"
+
+    async def check(self):
+        try:
+            async with (
+                aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=PROBE_REQUEST_TIMEOUT)) as session,
+                session.get(self.url, allow_redirects=False, ssl=False) as response,
+            ):
+                return response.status in self.statuses
+        except (aiohttp.ClientError, TimeoutError):
+            return False
+
+
+class SqlProbe:
+    """Ready once the database of a compose project answers `SELECT 1`"""
+
+    def __init__(self, project, service, engine="postgres"):
+        self.project = project
+        self.service = service
+        self.engine = engine
+
+    def __str__(self):
+        return f"sql {self.project}/{self.service}"
+
+    async def check(self):
+        # Containers are looked up by their compose labels, so no compose file has to be parsed
+        container = await _output(
+            "docker",
+            "ps",
+            "-q",
+            "--filter",
+            f"label=com.docker.compose.project={self.project}",
+            "--filter",
+            f"label=com.docker.compose.service={self.service}",
+        )
+        if not container:
+            return False
+
+        return await _output("docker", "exec", container.split()[0], "sh", "-c", SELECT_ONE[self.engine]) == "1"
+
+
+class FleetApp:
+    """
+    How to bring up one app.
+
+    Args:
+        probes: Checked in order; the app is ready once all of them pass
+        project: Compose project name; two apps sharing one cannot run side by side
+        ports: Host ports the app publishes, to refuse fleets whose apps would clash
+        up_args: Arguments of `cli.py <app>` that start the app without blocking,
+            or None to run `docker compose up -d` in the app's docker directory
+    """
+
+    def __init__(self, probes, project, ports=(), up_args=("up", "-d")):
+        self.probes = probes
+        self.project = project
+        self.ports = set(ports)
+        self.up_args = up_args
+
+
+ODOO = FleetApp(
+    [SqlProbe("odoo", "db"), HttpProbe("http://localhost:8069/web/health")],
+    project="odoo",
+    ports=[5432, 8069, 8071, 8072],
+)
+
+FLEET = {
+    "akaunting": FleetApp(
+        [SqlProbe("akaunting", "db", "mariadb"), HttpProbe("http://localhost:8000", (200, 302))],
+        project="akaunting",
+        ports=[8000],
+        up_args=None,
+    ),
+    "chatwoot": FleetApp(
+        [SqlProbe("chatwoot", "postgres"), HttpProbe("http://localhost:3000/api")],
+        project="chatwoot",
+        ports=[3000, 5432, 6379],
+    ),
+    "frappecrm": FleetApp(
+        [SqlProbe("crm", "mariadb", "mariadb"), HttpProbe("http://localhost:8000/api/method/version")],
+        project="crm",
+        ports=[8000, 9000],
+    ),
+    "frappehelpdesk": FleetApp(
+        [SqlProbe("frappehelpdesk", "mariadb", "mariadb"), HttpProbe("http://localhost:8000/api/method/version")],
+        project="frappehelpdesk",
+        ports=[3306, 8000, 9000],
+    ),
+    "frappehrms": FleetApp(
+        [SqlProbe("hrms", "mariadb", "mariadb"), HttpProbe("http://localhost:8000/api/method/version")],
+        project="hrms",
+        ports=[8000, 9000],
+        up_args=None,
+    ),
+    "gitlab": FleetApp(
+        [HttpProbe("http://localhost/api/v4/version", (200, 401))],
+        project="docker",
+        ports=[22, 80, 443],
+    ),
+    "gumroad": FleetApp(
+        [SqlProbe("gumroad", "db", "mariadb"), TcpProbe(9200), HttpProbe("http://localhost", (200, 301, 302))],
+        project="gumroad",
+        ports=[80, 3306, 9200],
+    ),
+    "mattermost": FleetApp(
+        [SqlProbe("mattermost", "postgres"), HttpProbe("http://localhost:8065/api/v4/system/ping")],
+        project="mattermost",
+        ports=[5432, 8065],
+    ),
+    "medusa": FleetApp(
+        [SqlProbe("docker", "postgres"), HttpProbe("http://localhost:9000/health")],
+        project="docker",
+        ports=[5432, 9000],
+    ),
+    "odoohr": ODOO,
+    "odooinventory": ODOO,
+    "odooproject": ODOO,
+    "odoosales": ODOO,
+    "onlyofficedocs": FleetApp(
+        [HttpProbe("http://localhost/healthcheck")],
+        project="onlyofficedocs",
+        ports=[80],
+        up_args=("up",),
+    ),
+    "opencats": FleetApp(
+        [SqlProbe("docker", "opencatsdb", "mariadb"), HttpProbe("http://localhost", (200, 301, 302))],
+        project="docker",
+        ports=[80, 443, 3306, 8080],
+    ),
+    "owncloud": FleetApp(
+        [TcpProbe(9200)],
+        project="docker",
+        ports=[9200],
+    ),
+    "spree": FleetApp(
+        [SqlProbe("spree", "postgres"), HttpProbe("http://localhost:3000", (200, 301, 302))],
+        project="spree",
+        ports=[3000, 5432, 6379],
+    ),
+    "supabase": FleetApp(
+        [SqlProbe("supabase", "db"), HttpProbe("http://localhost:8000/rest/v1/", (200, 401))],
+        project="supabase",
+        ports=[4000, 5432, 6543, 8000, 8443],
+    ),
+    "superset": FleetApp(
+        [SqlProbe("superset", "db"), HttpProbe("http://localhost:8088/health")],
+        project="superset",
+        ports=[8088],
+    ),
+    "teable": FleetApp(
+        [SqlProbe("teable", "teable-db"), HttpProbe("http://localhost:3000/health")],
+        project="teable",
+        ports=[3000, 42345],
+    ),
+}
+
+
+async def _output(*args):
+    """Stripped stdout of a command, or None if it failed"""
+    process = await asyncio.create_subprocess_exec(*args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+    stdout, _ = await process.communicate()
+    return stdout.decode().strip() if process.returncode == 0 else None
+
+
+async def _run(args, log_path, cwd=None):
+    """Run a command with its output appended to `log_path`. Returns the exit code."""
+    with log_path.open("ab") as log_file:
+        process = await asyncio.create_subprocess_exec(*args, cwd=cwd, stdout=log_file, stderr=asyncio.subprocess.STDOUT)
+        return await process.wait()
+
+
+def check_fleet(app_names):
+    """Refuse unknown apps and apps that cannot run side by side"""
+    unknown = [name for name in app_names if name not in FLEET]
+    if unknown:
+        raise ValueError(f"Unknown apps: {', '.join(unknown)}. Known apps: {', '.join(FLEET)}")
+
+    for i, name in enumerate(app_names):
+        for other in app_names[i + 1 :]:
+            if FLEET[name].project == FLEET[other].project:
+                raise ValueError(f"{name} and {other} share the compose project '{FLEET[name].project}' and cannot run together")
+            clashes = FLEET[name].ports & FLEET[other].ports
+            if clashes:
+                raise ValueError(f"{name} and {other} both publish port {', '.join(map(str, sorted(clashes)))}")
+
+
+async def wait_until_ready(app, deadline):
+    """Poll the probes of an app with exponential backoff and jitter until all of them pass"""
+    for probe in app.probes:
+        delay = PROBE_MIN_DELAY
+        while not await probe.check():
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f"{probe} not ready")
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, PROBE_MAX_DELAY)
+
+
+async def _bring_up_app(name, seed, timeout, log_dir):
+    """Start, wait for and seed one app. Returns its timings."""
+    app = FLEET[name]
+    log_path = log_dir / f"{name}.log"
+    result = {"app": name, "status": "failed", "up": None, "ready": None, "seed": None, "log": str(log_path)}
+    start_time = time.monotonic()
+
+    if app.up_args is None:
+        returncode = await _run(["docker", "compose", "up", "-d"], log_path, cwd=APPS_DIR / name / "docker")
+    else:
+        returncode = await _run([sys.executable, str(CLI_PATH), name, *app.up_args], log_path, cwd=CLI_PATH.parent)
+    result["up"] = time.monotonic() - start_time
+    if returncode != 0:
+        logger.warning(f"{name}: up failed, see {log_path}")
+        return result
+
+    try:
+        await wait_until_ready(app, start_time + timeout)
+    except TimeoutError as e:
+        logger.warning(f"{name}: {e} after {timeout}s")
+        return result
+    result["ready"] = time.monotonic() - start_time
+    logger.info(f"{name} ready in {result['ready']:.0f}s")
+
+    if seed:
+        seed_start = time.monotonic()
+        returncode = await _run([sys.executable, str(CLI_PATH), name, "seed"], log_path, cwd=CLI_PATH.parent)
+        result["seed"] = time.monotonic() - seed_start
+        if returncode != 0:
+            logger.warning(f"{name}: seed failed, see {log_path}")
+            return result
+        logger.info(f"{name} seeded in {result['seed']:.0f}s")
+
+    result["status"] = "ok"
+    return result
+
+
+async def bring_up(app_names, seed=True, timeout=READY_TIMEOUT):
+    """Bring up and optionally seed all apps concurrently. Returns the timings of each app."""
+    check_fleet(app_names)
+
+    log_dir = LOG_DIR / datetime.now().strftime("%Y%m%d-%H%M%S")
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    logger.start(f"Bringing up {', '.join(app_names)}...")
+    start_time = time.monotonic()
+    results = await asyncio.gather(*(_bring_up_app(name, seed, timeout, log_dir) for name in app_names))
+    elapsed = time.monotonic() - start_time
+
+    failed = [result["app"] for result in results if result["status"] != "ok"]
+    if failed:
+        logger.fail(f"{len(failed)}/{len(app_names)} apps failed: {', '.join(failed)}")
+    else:
+        logger.succeed(f"{len(app_names)} apps up")
+
+    def seconds(value):
+        return f"{value:>7.0f}s" if value is not None else "       -"
+
+    logger.info(f"{'app':<16} {'up':>8} {'ready':>8} {'seed':>8}  status")
+    for result in results:
+        logger.info(f"{result['app']:<16} {seconds(result['up'])} {seconds(result['ready'])} {seconds(result['seed'])}  {result['status']}")
+
+    sequential = sum((result["ready"] or result["up"] or 0) + (result["seed"] or 0) for result in results)
+    logger.info(f"Fleet took {elapsed:.0f}s, about {sequential:.0f}s one app after the other. Logs in {log_dir}")
+
+    return results
@@ -0,0 +1,133 @@
+"""
+Logged-in Frappe sessions shared across a seeder, and bulk document updates.
+
+Seeders that act as individual users (notes written by their owner, ticket comments by their
+author) used to log in once per record. The pools here log a user in the first time a session
+is asked for and hand out the same client afterwards, so a seeder costs one login per user:
+
+    sessions = FrappeSessionPool(lambda username: create_client(username=username, password=...))
+    client = sessions.get(user["name"])
+
+FrappeSessionPool holds synchronous `frappeclient.FrappeClient` sessions (frappecrm, frappehrms)
+and is safe to use from several threads; AsyncFrappeSessionPool holds async clients used as
+context managers (frappehelpdesk).
+"""
+
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager, suppress
+
+from common.logger import logger
+
+
+BULK_UPDATE_CHUNK_SIZE = 200
+
+
+class FrappeSessionPool:
+    """
+    One logged-in synchronous client per user.
+
+    `login(username)` must return a logged-in client. It runs once per user, on first use; threads
+    asking for a user whose login is in progress wait for it instead of logging in again.
+    """
+
+    def __init__(self, login):
+        self._login = login
+        self._clients = {}
+        self._user_locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        client = self._clients.get(username)
+        if client is not None:
+            return client
+
+        with self._lock:
+            user_lock = self._user_locks.setdefault(username, threading.Lock())
+
+        with user_lock:
+            if username not in self._clients:
+                self._clients[username] = self._login(username)
+                logger.info(f"Logged in as {username}")
+            return self._clients[username]
+
+    def close(self):
+        """Log out every session"""
+        for client in self._clients.values():
+            # Ignore logout errors
+            with suppress(Exception):
+                client.logout()
+        self._clients.clear()
+
+
+class AsyncFrappeSessionPool:
+    """
+    One logged-in async client per user.
+
+    `create(username)` returns a client that logs in when entered as an async context manager;
+    it is entered on first use and exited by `close()`.
+    """
+
+    def __init__(self, create):
+        self._create = create
+        self._clients = {}
+        self._user_locks = {}
+
+    async def get(self, username):
+        client = self._clients.get(username)
+        if client is not None:
+            return client
+
+        async with self._user_locks.setdefault(username, asyncio.Lock()):
+            if username not in self._clients:
+                client = self._create(username)
+                self._clients[username] = await client.__aenter__()
+                logger.info(f"Logged in as {username}")
+            return self._clients[username]
+
+    @asynccontextmanager
+    async def session(self, username):
+        """The pooled client of a user, as a drop-in for `async with FrappeClient(username=...)`"""
+        yield await self.get(username)
+
+    async def close(self):
+        """Log out and close every session"""
+        for client in self._clients.values():
+            # Ignore logout errors
+            with suppress(Exception):
+                await client.__aexit__(None, None, None)
+        self._clients.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+def bulk_update(client, docs, chunk_size=BULK_UPDATE_CHUNK_SIZE):
+    """
+    Update documents with `frappe.client.bulk_update`, one request per chunk.
+
+    Each doc holds its `doctype`, `name` and the fields to set. Frappe saves the documents of a
+    chunk one by one and reports those that failed, so one bad document does not fail the others.
+    Returns the failed docs as {"doc", "error"} dicts.
+    """
+    failed = []
+    for i in range(0, len(docs), chunk_size):
+        chunk = docs[i : i + chunk_size]
+        payload = [{"docname": doc["name"], **{key: value for key, value in doc.items() if key != "name"}} for doc in chunk]
+        try:
+            result = client.post_request({"cmd": "frappe.client.bulk_update", "docs": json.dumps(payload)})
+        except Exception as e:
+            failed.extend({"doc": doc, "error": str(e)} for doc in chunk)
+            continue
+
+        for failure in (result or {}).get("failed_docs", []):
+            # The server returns the whole traceback; its last line is the error itself
+            traceback_lines = (failure.get("exc") or "unknown error").strip().splitlines()
+            doc = failure.get("doc", {})
+            failed.append({"doc": {"name": doc.get("docname"), **doc}, "error": traceback_lines[-1]})
+
+    return failed
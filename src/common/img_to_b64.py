@@ -1,11 +1,12 @@
-import base64
 from pathlib import Path
 
+from common.asset_store import get_asset_store
+
 
 def img_to_b64(img_path: str | Path) -> str:
+    """Base64 of an image file, served from the shared asset store so unchanged files are encoded only once."""
     try:
-        with Path(img_path).open("rb") as img_file:
-            return base64.b64encode(img_file.read()).decode("utf-8")
+        return get_asset_store().put_file(img_path).b64
     except FileNotFoundError:
         raise ValueError(f"Image file not found: {img_path}") from None
     except IsADirectoryError:
@@ -0,0 +1,300 @@
+"""
+Event-loop blocking detector for the async seeders.
+
+A coroutine that calls `time.sleep`, `requests` or the synchronous FrappeClient stops every other
+task on its event loop until the call returns, which silently turns `asyncio.gather` back into a
+sequential loop. LoopWatch makes these stalls visible:
+
+- every event loop callback is timed; when one runs longer than the threshold, a watchdog thread
+  captures the stack of the blocked thread while it is still blocked, and the stall is attributed
+  to the innermost seeder coroutine on that stack;
+- `time.sleep`, `requests.Session.request` and the public methods of `frappeclient.FrappeClient`
+  report every call made from a thread with a running event loop, with the calling site.
+
+At exit, both are summarized in the log and written to a per-run JSON report.
+
+Enable it for any command through the environment:
+
+    SEED_LOOPWATCH=1 python cli.py odooinventory seed
+
+SEED_LOOPWATCH_THRESHOLD_MS (default 100) sets the stall threshold and SEED_LOOPWATCH_REPORT_DIR
+(default `loopwatch`) the directory the reports are written to.
+"""
+
+import asyncio
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from common.logger import logger
+
+
+DEFAULT_THRESHOLD_MS = 100
+DEFAULT_REPORT_DIR = "loopwatch"
+STACK_DEPTH = 12
+SUMMARY_SIZE = 10
+
+_SRC_DIR = Path(__file__).resolve().parent.parent
+_APPS_DIR = str(_SRC_DIR / "apps")
+_HIDDEN_PREFIXES = (__file__, str(Path(asyncio.__file__).parent))
+
+# Public FrappeClient methods that are not requests to the server
+_FRAPPE_LOCAL_METHODS = {"preprocess", "post_process", "post_process_file_stream"}
+
+
+def _relative(filename):
+    try:
+        return str(Path(filename).resolve().relative_to(_SRC_DIR))
+    except ValueError:
+        return filename
+
+
+def _seeder_of(frame):
+    """
+    Name the seeder function running in `frame` or one of its callers.
+
+    That is the innermost coroutine defined in an app module, or failing that the innermost app function.
+    """
+    innermost_app_frame = None
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.startswith(_APPS_DIR):
+            if code.co_flags & inspect.CO_COROUTINE:
+                return f"{_relative(code.co_filename)}:{code.co_qualname}"
+            innermost_app_frame = innermost_app_frame or frame
+        frame = frame.f_back
+
+    if innermost_app_frame is not None:
+        return f"{_relative(innermost_app_frame.f_code.co_filename)}:{innermost_app_frame.f_code.co_qualname}"
+    return None
+
+
+def _calling_site(frame):
+    """Innermost frame of this repository, skipping library frames such as `requests.api`"""
+    while frame is not None and not frame.f_code.co_filename.startswith(_HIDDEN_PREFIXES):
+        if frame.f_code.co_filename.startswith(str(_SRC_DIR)):
+            return frame
+        frame = frame.f_back
+    return None
+
+
+def _format_stack(frame):
+    """Innermost STACK_DEPTH frames, outermost first, without the event loop and LoopWatch frames"""
+    frames = [(f, lineno) for f, lineno in traceback.walk_stack(frame) if not f.f_code.co_filename.startswith(_HIDDEN_PREFIXES)]
+    stack = traceback.StackSummary.extract(frames[:STACK_DEPTH], lookup_lines=True)
+    return [f"{_relative(entry.filename)}:{entry.lineno} in {entry.name}: {entry.line}" for entry in reversed(stack)]
+
+
+def _describe_handle(handle):
+    """Fallback attribution of a stall from the callback itself, when no stack was sampled"""
+    callback = handle._callback
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        code = task.get_coro().cr_code
+        return f"{_relative(code.co_filename)}:{code.co_qualname}"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class _RunningCallback:
+    __slots__ = ("seeder", "stack", "start")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.seeder = None
+        self.stack = None
+
+
+class LoopWatch:
+    """
+    Times event loop callbacks and flags blocking calls made from coroutines.
+
+    `install()` patches asyncio and the blocking APIs process-wide; `uninstall()` restores them.
+    Findings are aggregated per seeder (stalls) and per calling site (blocking calls).
+    """
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, report_dir=DEFAULT_REPORT_DIR):
+        self.threshold = threshold_ms / 1000
+        self.report_dir = Path(report_dir)
+        self.started_at = datetime.now()
+
+        self.stalls = {}
+        self.blocking_calls = {}
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._running = {}
+        self._patches = []
+        self._original_run = None
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    # Installation
+
+    def install(self):
+        self._original_run = asyncio.events.Handle._run
+        self._patch(asyncio.events.Handle, "_run", lambda handle: self._timed_run(handle))
+        self._patch(time, "sleep", self._guarded("time.sleep", time.sleep))
+
+        try:
+            import requests
+
+            self._patch(requests.Session, "request", self._guarded("requests", requests.Session.request))
+        except ImportError:
+            pass
+
+        try:
+            from frappeclient import FrappeClient
+
+            for name, method in inspect.getmembers(FrappeClient, inspect.isfunction):
+                if not name.startswith("_") and name not in _FRAPPE_LOCAL_METHODS:
+                    self._patch(FrappeClient, name, self._guarded(f"FrappeClient.{name}", method))
+        except ImportError:
+            pass
+
+        self._watchdog = threading.Thread(target=self._watch, name="loopwatch", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Loop watch enabled: reporting event loop stalls over {self.threshold * 1000:.0f}ms")
+
+    def uninstall(self):
+        self._stop.set()
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches.clear()
+
+    def _patch(self, owner, name, replacement):
+        self._patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    # Slow callbacks
+
+    def _timed_run(self, handle):
+        thread_id = threading.get_ident()
+        running = _RunningCallback()
+        self._running[thread_id] = running
+        try:
+            return self._original_run(handle)
+        finally:
+            self._running.pop(thread_id, None)
+            duration = time.perf_counter() - running.start
+            if duration >= self.threshold:
+                self._record_stall(handle, running, duration)
+
+    def _watch(self):
+        """Sample the stack of every thread whose current callback runs past the threshold"""
+        interval = self.threshold / 2
+        while not self._stop.wait(interval):
+            now = time.perf_counter()
+            frames = None
+            for thread_id, running in list(self._running.items()):
+                if running.stack is not None or now - running.start < self.threshold:
+                    continue
+
+                frames = frames or sys._current_frames()
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    running.seeder = _seeder_of(frame)
+                    running.stack = _format_stack(frame)
+
+    def _record_stall(self, handle, running, duration):
+        seeder = running.seeder or _describe_handle(handle)
+        with self._lock:
+            stall = self.stalls.setdefault(seeder, {"seeder": seeder, "count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "stack": None})
+            stall["count"] += 1
+            stall["total_seconds"] += duration
+            if duration >= stall["max_seconds"]:
+                stall["max_seconds"] = duration
+                stall["stack"] = running.stack or stall["stack"]
+
+    # Blocking calls
+
+    def _guarded(self, kind, func):
+        """Wrap a blocking function so that calls from a running event loop are reported"""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Only the outermost blocking call is reported, e.g. FrappeClient.insert and not its requests
+            if getattr(self._local, "inside", False) or asyncio._get_running_loop() is None:
+                return func(*args, **kwargs)
+
+            self._local.inside = True
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.inside = False
+                self._record_blocking_call(kind, time.perf_counter() - start, sys._getframe(1))
+
+        return wrapper
+
+    def _record_blocking_call(self, kind, duration, caller):
+        caller = _calling_site(caller) or caller
+        site = f"{_relative(caller.f_code.co_filename)}:{caller.f_lineno}"
+        with self._lock:
+            call = self.blocking_calls.get((kind, site))
+            if call is None:
+                call = {"call": kind, "site": site, "seeder": _seeder_of(caller), "count": 0, "total_seconds": 0.0, "stack": _format_stack(caller)}
+                self.blocking_calls[(kind, site)] = call
+            call["count"] += 1
+            call["total_seconds"] += duration
+
+    # Report
+
+    def report(self):
+        """Log the worst findings and write the full report. Returns the report path, if any."""
+        stalls = sorted(self.stalls.values(), key=lambda stall: stall["total_seconds"], reverse=True)
+        blocking_calls = sorted(self.blocking_calls.values(), key=lambda call: call["total_seconds"], reverse=True)
+
+        if not stalls and not blocking_calls:
+            logger.info("Loop watch: no event loop blocking detected")
+            return None
+
+        stalled = sum(stall["total_seconds"] for stall in stalls)
+        logger.warning(f"Loop watch: event loops were blocked for {stalled:.1f}s in {sum(stall['count'] for stall in stalls)} stalls")
+        for stall in stalls[:SUMMARY_SIZE]:
+            logger.warning(f"  {stall['total_seconds']:>7.2f}s  {stall['count']:>5}x  max {stall['max_seconds']:.2f}s  {stall['seeder']}")
+
+        if blocking_calls:
+            logger.warning(f"Loop watch: {sum(call['count'] for call in blocking_calls)} blocking calls made from coroutines")
+            for call in blocking_calls[:SUMMARY_SIZE]:
+                logger.warning(f"  {call['total_seconds']:>7.2f}s  {call['count']:>5}x  {call['call']} at {call['site']}")
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        report_path = self.report_dir / f"loopwatch-{self.started_at:%Y%m%d-%H%M%S}.json"
+        report = {
+            "command": " ".join(sys.argv),
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "threshold_ms": self.threshold * 1000,
+            "stalled_seconds": stalled,
+            "stalls": stalls,
+            "blocking_calls": blocking_calls,
+        }
+        report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info(f"Loop watch report written to {report_path}")
+        return report_path
+
+    def finish(self):
+        self.uninstall()
+        self.report()
+
+
+def enable_from_env():
+    """Install a LoopWatch for the rest of the process when SEED_LOOPWATCH is set"""
+    if os.environ.get("SEED_LOOPWATCH", "").lower() not in ("1", "true", "yes"):
+        return None
+
+    watch = LoopWatch(
+        threshold_ms=float(os.environ.get("SEED_LOOPWATCH_THRESHOLD_MS", DEFAULT_THRESHOLD_MS)),
+        report_dir=os.environ.get("SEED_LOOPWATCH_REPORT_DIR", DEFAULT_REPORT_DIR),
+    )
+    watch.install()
+    atexit.register(watch.finish)
+    return watch
@@ -0,0 +1,119 @@
+"""Reference data snapshots for Odoo seeders.
+
+Seeders that create many records (POS orders, invoices, payments) look up the same reference data for every
+record: products, partners, teams, employees, payment methods. An OdooReferenceData fetches each of those
+once, concurrently and with an explicit field list, and indexes the rows by id and by name so that lookups
+inside the seeding loops cost nothing.
+
+Field lists are mandatory: a `search_read` without fields returns every field of the model, computed
+fields included, which for `product.product` is hundreds of values per variant.
+"""
+
+import asyncio
+import typing as t
+
+from common.logger import logger
+
+
+class OdooRPC(t.Protocol):
+    async def search_read(
+        self,
+        model: str,
+        domain: list | None = None,
+        fields: list[str] | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+        order: str | None = None,
+    ) -> list[dict]: ...
+
+
+class ReferenceQuery:
+    """
+    What to fetch for one reference set.
+
+    Args:
+        model: Odoo model name
+        fields: Fields to read; "id" is always added
+        domain: Search domain
+        name_field: Field the set is indexed by name on
+    """
+
+    def __init__(self, model: str, fields: t.Sequence[str], domain: list | None = None, name_field: str = "name"):
+        if not fields:
+            raise ValueError(f"Reference query on {model} needs an explicit field list")
+
+        self.model = model
+        self.fields = list(dict.fromkeys(["id", *fields]))
+        self.domain = domain or []
+        self.name_field = name_field
+
+
+class ReferenceSet:
+    """Rows of one reference query, indexed by id and by name."""
+
+    def __init__(self, records: list[dict], name_field: str = "name"):
+        self.records = records
+        self.by_id = {record["id"]: record for record in records}
+        self.by_name = {record[name_field]: record for record in records if record.get(name_field)}
+        self.name_field = name_field
+
+    def __iter__(self) -> t.Iterator[dict]:
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __bool__(self) -> bool:
+        return bool(self.records)
+
+    def ids(self) -> list[int]:
+        return list(self.by_id)
+
+    def name(self, record_id: int) -> str | None:
+        record = self.by_id.get(record_id)
+        return record[self.name_field] if record else None
+
+    def id_of(self, name: str) -> int | None:
+        record = self.by_name.get(name)
+        return record["id"] if record else None
+
+
+class OdooReferenceData:
+    """
+    Reference sets fetched once per seeder run.
+
+    Example:
+        ```python
+        reference = OdooReferenceData(client)
+        await reference.load(
+            products=ReferenceQuery("product.product", ["display_name", "lst_price"], [("sale_ok", "=", True)]),
+            teams=ReferenceQuery("crm.team", ["name", "user_id"]),
+        )
+        price = reference["products"].by_id[product_id]["lst_price"]
+        team_name = reference["teams"].name(team_id)
+        ```
+    """
+
+    def __init__(self, client: OdooRPC):
+        self.client = client
+        self.sets: dict[str, ReferenceSet] = {}
+
+    def __getitem__(self, name: str) -> ReferenceSet:
+        return self.sets[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sets
+
+    async def load(self, **queries: ReferenceQuery) -> "OdooReferenceData":
+        """Fetch all `queries` concurrently, one search_read each, and keep the results under their keyword names."""
+        results = await asyncio.gather(*(self.client.search_read(query.model, query.domain, query.fields) for query in queries.values()))
+
+        for (name, query), records in zip(queries.items(), results, strict=True):
+            self.sets[name] = ReferenceSet(records or [], query.name_field)
+
+        logger.info(f"Loaded reference data: {', '.join(f'{len(self.sets[name])} {name}' for name in queries)}")
+        return self
+
+    def missing(self) -> list[str]:
+        """Names of the loaded sets that came back empty"""
+        return [name for name, reference_set in self.sets.items() if not reference_set]
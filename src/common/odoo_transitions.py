@@ -0,0 +1,141 @@
+"""Batched Odoo workflow transitions.
+
+Odoo button methods (action_confirm, action_approve, button_validate, ...) accept whole recordsets,
+so moving many records to a target state does not need one RPC per record. A TransitionPlanner
+collects the desired end state of each record, groups records that share the next action on their
+path and calls that action once per chunk of ids. When a chunk fails, it is bisected so the records
+that cannot transition are isolated and the rest still move on.
+
+Some buttons (stock.picking's button_validate) return a wizard action instead of raising when one
+record of the set needs user input, and then transition none of them. When a call returns an action,
+the records' `state` is read back and only those that reached their target state count as moved on,
+so target states of such paths must be named after the model's `state` values.
+"""
+
+import typing as t
+from collections import defaultdict
+
+from common.logger import logger
+
+
+DEFAULT_TRANSITION_CHUNK_SIZE = 200
+
+
+class OdooRPC(t.Protocol):
+    async def execute_kw(self, model: str, method: str, args: list | None = None, kwargs: dict | None = None) -> t.Any: ...
+
+
+class TransitionResult:
+    """Ids that reached each target state, and the ids that failed with the action and error that stopped them."""
+
+    def __init__(self):
+        self.reached: dict[str, list[int]] = defaultdict(list)
+        self.failed: dict[int, tuple[str, str]] = {}
+        self.calls = 0
+
+    def summary(self) -> str:
+        reached = ", ".join(f"{len(ids)} {state}" for state, ids in self.reached.items()) or "nothing"
+        return f"reached {reached}; {len(self.failed)} failed ({self.calls} RPC calls)"
+
+
+class TransitionPlanner:
+    """
+    Move records of one model to their target states with as few RPC calls as possible.
+
+    `paths` maps each target state to the sequence of methods that leads there. Records whose paths
+    share a prefix share those calls too: with paths {"refuse": ["action_refuse"], "cancel": ["action_refuse",
+    "action_cancel"]}, action_refuse is called once for both groups and only the cancelled ids go on.
+
+    Example:
+        ```python
+        planner = client.plan_transitions("hr.leave", {"validate": ["action_approve", "action_validate"], "refuse": ["action_refuse"]})
+        planner.add("validate", approved_ids)
+        planner.add("refuse", refused_ids)
+        result = await planner.run()
+        ```
+    """
+
+    def __init__(self, client: OdooRPC, model: str, paths: dict[str, t.Sequence[str]], chunk_size: int = DEFAULT_TRANSITION_CHUNK_SIZE):
+        self.client = client
+        self.model = model
+        self.paths = {state: tuple(methods) for state, methods in paths.items()}
+        self.chunk_size = max(1, chunk_size)
+        self._targets: dict[int, str] = {}
+
+    def add(self, state: str, ids: int | t.Iterable[int]) -> "TransitionPlanner":
+        """Declare that `ids` should end up in `state`. A later declaration for the same id replaces the earlier one."""
+        if state not in self.paths:
+            raise ValueError(f"Unknown target state '{state}' for {self.model}, expected one of {list(self.paths)}")
+
+        for record_id in [ids] if isinstance(ids, int) else ids:
+            self._targets[record_id] = state
+        return self
+
+    async def run(self) -> TransitionResult:
+        """Apply every declared transition, one step of the action paths at a time."""
+        result = TransitionResult()
+        pending = dict(self._targets)
+        step = 0
+
+        while pending:
+            # Group the ids still in flight by the method they need next; ids at the end of their path are done
+            by_method: dict[str, list[int]] = defaultdict(list)
+            for record_id, state in pending.items():
+                path = self.paths[state]
+                if step < len(path):
+                    by_method[path[step]].append(record_id)
+                else:
+                    result.reached[state].append(record_id)
+
+            pending = {}
+            for method, ids in by_method.items():
+                for i in range(0, len(ids), self.chunk_size):
+                    succeeded = await self._call(method, ids[i : i + self.chunk_size], result)
+                    pending.update({record_id: self._targets[record_id] for record_id in succeeded})
+
+            step += 1
+
+        if result.failed:
+            logger.warning(f"{self.model}: {len(result.failed)} records could not be transitioned")
+            for record_id, (method, error) in list(result.failed.items())[:5]:
+                logger.debug(f"{self.model}({record_id}).{method}: {error}")
+
+        return result
+
+    async def _call(self, method: str, ids: list[int], result: TransitionResult) -> list[int]:
+        """Call `method` on `ids`, bisecting on failure. Returns the ids the call succeeded for."""
+        result.calls += 1
+        try:
+            response = await self.client.execute_kw(self.model, method, [ids])
+            if isinstance(response, dict):
+                return await self._reached_after_action(method, ids, response, result)
+            return ids
+        except Exception as e:
+            if len(ids) == 1:
+                result.failed[ids[0]] = (method, str(e))
+                return []
+
+        # Each execute_kw runs in its own transaction, so a failed chunk left nothing behind and can be split
+        middle = len(ids) // 2
+        return await self._call(method, ids[:middle], result) + await self._call(method, ids[middle:], result)
+
+    async def _reached_after_action(self, method: str, ids: list[int], action: dict, result: TransitionResult) -> list[int]:
+        """
+        Handle `method` returning a wizard action instead of transitioning: keep the ids whose record is in its
+        target state, and bisect the others so that only the records needing the wizard are reported as failed.
+        """
+        records = await self.client.execute_kw(self.model, "read", [ids], {"fields": ["state"]})
+        states = {record["id"]: record["state"] for record in records}
+        reached = [record_id for record_id in ids if states.get(record_id) == self._targets[record_id]]
+        remaining = [record_id for record_id in ids if record_id not in reached]
+
+        if len(ids) == 1:
+            if remaining:
+                result.failed[remaining[0]] = (method, f"returned the {action.get('res_model') or 'wizard'} action instead of transitioning")
+            return reached
+
+        middle = len(remaining) // 2
+        halves = [half for half in (remaining[:middle], remaining[middle:]) if half]
+        for half in halves:
+            reached += await self._call(method, half, result)
+        return reached
@@ -0,0 +1,165 @@
+"""
+Prompt building for per-record LLM calls.
+
+Generators that make one call per record used to resend the same large context with every call: the full
+taxonomy list, the seller profile, every title generated so far. Two things keep that footprint small:
+
+- PromptBuilder splits a prompt into a static system prefix, identical byte for byte across calls, and a
+  small per-record user suffix. Providers cache repeated prefixes (OpenAI does it automatically from 1024
+  tokens), so the prefix is only paid for in full once. Anything that varies per record - a random tone, the
+  record's own context - must go in the suffix, or the prefix stops matching.
+- top_matches and TitleRegistry replace exhaustive context with a relevant slice: the k entries that share
+  the most keywords with the record, and a compact summary of what was already generated instead of the
+  whole list. Exact duplicates are caught locally by TitleRegistry rather than by asking the model.
+
+Every call made through PromptBuilder.parse logs its prompt, cached and completion tokens and its latency,
+and PromptBuilder.log_summary logs the totals.
+"""
+
+import hashlib
+import json
+import re
+import textwrap
+import time
+from collections import Counter
+
+from common.logger import logger
+
+
+STOP_WORDS = {"and", "are", "for", "from", "how", "into", "that", "the", "this", "with", "you", "your"}
+
+
+def keywords(text):
+    """Lowercase words of at least 3 characters, without stop words"""
+    return {word for word in re.findall(r"[a-z0-9]+", str(text).lower()) if len(word) > 2 and word not in STOP_WORDS}
+
+
+def top_matches(items, query, text=str, k=10):
+    """
+    The `k` items sharing the most keywords with `query`, best first.
+
+    `text` gives the searchable text of an item. Items without any shared keyword are left out, so the result
+    can be shorter than `k`; ties keep the original order.
+    """
+    query_keywords = keywords(query)
+    scored = [(len(query_keywords & keywords(text(item))), index, item) for index, item in enumerate(items)]
+    scored = [entry for entry in scored if entry[0] > 0]
+    scored.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [item for _, _, item in scored[:k]]
+
+
+def compact_json(value):
+    """JSON without whitespace, with sorted keys so that equal values give identical prompts"""
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+
+
+class TitleRegistry:
+    """
+    Titles generated so far, for deduplication and for a compact "avoid these" summary.
+
+    Titles are stored as hashes of their normalized form, so membership is exact and cheap however many
+    there are; the prompt only gets the count, the most recent titles and the words used most often.
+    """
+
+    def __init__(self, titles=(), recent=5, common_words=10):
+        self.recent = recent
+        self.common_words = common_words
+        self._hashes = set()
+        self._recent_titles = []
+        self._word_counts = Counter()
+        for title in titles:
+            self.add(title)
+
+    @staticmethod
+    def _hash(title):
+        normalized = " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+        return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+    def __contains__(self, title):
+        return self._hash(title) in self._hashes
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, title):
+        """Register a title. Returns False if an equivalent title was already registered."""
+        title_hash = self._hash(title)
+        if title_hash in self._hashes:
+            return False
+
+        self._hashes.add(title_hash)
+        self._recent_titles = [*self._recent_titles, title][-self.recent :]
+        self._word_counts.update(keywords(title))
+        return True
+
+    def summary(self):
+        """A few lines for the prompt, or an empty string when nothing was generated yet"""
+        if not self._hashes:
+            return ""
+
+        overused = [word for word, count in self._word_counts.most_common(self.common_words) if count > 1]
+        lines = [f"{len(self._hashes)} titles already exist. Do not repeat them or their wording."]
+        lines.append(f"Most recent: {'; '.join(self._recent_titles)}")
+        if overused:
+            lines.append(f"Overused words to avoid: {', '.join(overused)}")
+        return "\n".join(lines)
+
+
+class PromptBuilder:
+    """
+    A static system prefix shared by all calls of one generator, plus per-call user suffixes.
+
+    Args:
+        name: Shown in the token logs
+        system: Instructions that do not change between calls
+        context: Static reference data (profile, categories, ...), appended to the prefix as compact JSON
+    """
+
+    def __init__(self, name, system, context=None):
+        self.name = name
+        self.prefix = textwrap.dedent(system).strip()
+        if context:
+            self.prefix += "\n\n" + "\n".join(f"{key}: {compact_json(value)}" for key, value in context.items())
+
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.seconds = 0.0
+
+    def messages(self, user):
+        return [
+            {"role": "system", "content": self.prefix},
+            {"role": "user", "content": textwrap.dedent(user).strip()},
+        ]
+
+    async def parse(self, client, user, **kwargs):
+        """Call `client.beta.chat.completions.parse` with the prefix and `user`, logging the token usage"""
+        start_time = time.perf_counter()
+        response = await client.beta.chat.completions.parse(messages=self.messages(user), **kwargs)
+        self.record(response, time.perf_counter() - start_time)
+        return response
+
+    def record(self, response, seconds):
+        """Add the usage of one response to the totals and log it"""
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        cached_tokens = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", 0) or 0
+
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+        self.completion_tokens += completion_tokens
+        self.seconds += seconds
+
+        logger.info(f"{self.name}: {prompt_tokens} prompt tokens ({cached_tokens} cached), {completion_tokens} completion tokens, {seconds:.1f}s")
+
+    def log_summary(self):
+        if not self.calls:
+            return
+        logger.info(
+            f"{self.name}: {self.calls} calls, {self.prompt_tokens / self.calls:.0f} prompt tokens per call "
+            f"({self.cached_tokens / max(self.prompt_tokens, 1):.0%} cached), {self.completion_tokens} completion tokens, "
+            f"{self.seconds / self.calls:.1f}s per call"
+        )
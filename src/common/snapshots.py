@@ -0,0 +1,452 @@
+"""
+Snapshots of seeded app environments.
+
+Seeding an app from scratch runs dozens of steps against its API, yet for the same generated data
+and the same app images the result is the same. A snapshot captures the seeded state once - the
+app's databases in their native dump format plus its file storage volumes - so that later
+environments are restored in seconds instead of re-seeded:
+
+    python cli.py odoosales seed
+    python cli.py odoosales snapshot
+    ...
+    python cli.py odoosales up -d
+    python cli.py odoosales restore
+
+Snapshots are keyed by a hash of the app's data files and of the images in its compose file, so
+a restore never picks up a snapshot taken from other data or another app version. Postgres
+databases are dumped with `pg_dump -Fd` and restored with `pg_restore`, both with parallel jobs;
+MariaDB/MySQL databases are dumped with `mariadb-dump` (or `mysqldump`) and restored in parallel,
+one database per job. Every table's row count is recorded at snapshot time and checked after a
+restore.
+
+Snapshots are stored under SNAPSHOT_PATH (default: ~/.cache/seed-snapshots).
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from common.logger import logger
+
+
+SNAPSHOT_PATH = Path(os.environ.get("SNAPSHOT_PATH", Path.home() / ".cache" / "seed-snapshots"))
+DEFAULT_JOBS = min(os.cpu_count() or 2, 8)
+DATABASE_READY_TIMEOUT = 120
+
+# Dump directory inside the database container
+CONTAINER_DUMP_DIR = "/tmp/seed-snapshot"
+
+MARIADB_SYSTEM_DATABASES = {"information_schema", "mysql", "performance_schema", "sys"}
+
+# Shell snippets run inside the database container, so credentials come from the container's own environment
+POSTGRES_USER = '"${SNAPSHOT_DB_USER:-${POSTGRES_USER:-postgres}}"'
+MARIADB_CLIENT = '"$(command -v mariadb || command -v mysql)" -uroot -p"${MARIADB_ROOT_PASSWORD:-$MYSQL_ROOT_PASSWORD}"'
+MARIADB_DUMP = '"$(command -v mariadb-dump || command -v mysqldump)" -uroot -p"${MARIADB_ROOT_PASSWORD:-$MYSQL_ROOT_PASSWORD}"'
+
+# Exact row count of every table of a Postgres database, in one query
+POSTGRES_ROW_COUNTS = """
+SELECT table_schema || '.' || table_name,
+       (xpath('/row/c/text()', query_to_xml(format('SELECT count(*) AS c FROM %I.%I', table_schema, table_name), false, true, '')))[1]::text
+FROM information_schema.tables
+WHERE table_type = 'BASE TABLE' AND table_schema NOT IN ('pg_catalog', 'information_schema')
+ORDER BY 1
+"""
+
+# Builds one UNION query counting the rows of every table of a MariaDB database
+MARIADB_ROW_COUNTS = """
+SET SESSION group_concat_max_len = 1000000000;
+SELECT GROUP_CONCAT(
+    CONCAT('SELECT ', QUOTE(table_name), ', COUNT(*) FROM `', table_schema, '`.`', table_name, '`')
+    ORDER BY table_name SEPARATOR ' UNION ALL ')
+FROM information_schema.tables
+WHERE table_schema = '{database}' AND table_type = 'BASE TABLE';
+"""
+
+
+class SnapshotSpec:
+    """
+    What makes up the seeded state of an app.
+
+    Args:
+        app: App name, used as the snapshot directory
+        docker_dir: Directory of the app's compose file
+        database_service: Compose service of the database, or None for apps without one
+        engine: "postgres" or "mariadb" (also used for MySQL)
+        data_dir: Generated data the seed reads; its content is part of the snapshot key
+        volumes: (service, path) pairs of file storage to capture along with the databases
+        compose_files: Compose files to use instead of the default one
+        env: Callable returning the environment for docker compose, for compose files with variables
+        database_user: Postgres superuser, when it is not the container's POSTGRES_USER
+        databases: Databases to capture instead of every non-system one, for apps whose init script pins the names
+            their config reads; a missing one fails the snapshot
+        key_files: Files that decide the app's setup (e.g. database names in an init script); their content is part of the snapshot key
+    """
+
+    def __init__(
+        self,
+        app,
+        docker_dir,
+        database_service=None,
+        engine="postgres",
+        data_dir=None,
+        volumes=(),
+        compose_files=(),
+        env=None,
+        database_user=None,
+        databases=(),
+        key_files=(),
+    ):
+        self.app = app
+        self.docker_dir = Path(docker_dir)
+        self.database_service = database_service
+        self.engine = engine
+        self.data_dir = Path(data_dir) if data_dir else self.docker_dir.parent.joinpath("data")
+        self.volumes = list(volumes)
+        self.compose_files = list(compose_files)
+        self.env = env
+        self.database_user = database_user
+        self.databases = list(databases)
+        self.key_files = [Path(key_file) for key_file in key_files]
+
+    def compose(self, *args, **kwargs):
+        """Run a docker compose command for this app"""
+        cmd = ["docker", "compose"]
+        for compose_file in self.compose_files:
+            cmd += ["-f", compose_file]
+
+        env = self.env() if self.env else None
+        return subprocess.run([*cmd, *args], cwd=self.docker_dir, env=env, **kwargs)
+
+    def db_exec(self, script, *args, **kwargs):
+        """Run a shell script in the database container, with `args` as its positional parameters"""
+        exec_args = ["exec", "-T"]
+        if self.database_user:
+            exec_args += ["-e", f"SNAPSHOT_DB_USER={self.database_user}"]
+        return self.compose(*exec_args, self.database_service, "sh", "-c", script, "sh", *args, **kwargs)
+
+    def snapshot_key(self):
+        """Hash of the generated data files and the app images"""
+        digest = hashlib.sha256()
+
+        if self.data_dir.exists():
+            for path in sorted(p for p in self.data_dir.rglob("*") if p.is_file()):
+                digest.update(str(path.relative_to(self.data_dir)).encode())
+                digest.update(hashlib.sha256(path.read_bytes()).digest())
+
+        for key_file in self.key_files:
+            digest.update(key_file.name.encode())
+            digest.update(hashlib.sha256(key_file.read_bytes()).digest())
+
+        images = self.compose("config", "--images", capture_output=True, text=True)
+        digest.update("\n".join(sorted(images.stdout.split())).encode())
+
+        return digest.hexdigest()[:16]
+
+
+def _check(result, action):
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace") if isinstance(result.stderr, bytes) else result.stderr
+        raise click.ClickException(f"Failed to {action}: {(stderr or '').strip()[-500:]}")
+    return result
+
+
+def _volume_archive(service, path):
+    return f"{service}-{re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_')}.tar"
+
+
+# Postgres
+
+
+def _postgres_databases(spec):
+    script = f'psql -U {POSTGRES_USER} -d template1 -Atc "SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY 1"'
+    result = _check(spec.db_exec(script, capture_output=True, text=True), "list databases")
+    return result.stdout.split()
+
+
+def _postgres_row_counts(spec, database):
+    result = _check(spec.db_exec(f'psql -U {POSTGRES_USER} -d "$1" -At', database, input=POSTGRES_ROW_COUNTS, capture_output=True, text=True), f"count rows of {database}")
+    return {table: int(count) for table, count in (line.rsplit("|", 1) for line in result.stdout.splitlines() if line)}
+
+
+def _postgres_dump(spec, database, target_dir, jobs):
+    dump_dir = f"{CONTAINER_DUMP_DIR}/{database}"
+    script = f'rm -rf "$1" && mkdir -p {CONTAINER_DUMP_DIR} && pg_dump -U {POSTGRES_USER} -Fd -j "$2" -f "$1" "$3"'
+    _check(spec.db_exec(script, dump_dir, str(jobs), database, capture_output=True, text=True), f"dump {database}")
+    _check(spec.compose("cp", f"{spec.database_service}:{dump_dir}", str(target_dir / database), capture_output=True, text=True), f"copy the dump of {database}")
+    spec.db_exec('rm -rf "$1"', dump_dir, capture_output=True)
+
+
+def _postgres_dump_globals(spec, target_dir):
+    with (target_dir / "globals.sql").open("wb") as globals_file:
+        _check(spec.db_exec(f"pg_dumpall -U {POSTGRES_USER} --globals-only", stdout=globals_file, stderr=subprocess.PIPE), "dump roles")
+
+
+def _postgres_restore(spec, database, source_dir, jobs):
+    dump_dir = f"{CONTAINER_DUMP_DIR}/{database}"
+    spec.db_exec(f'rm -rf "$1" && mkdir -p {CONTAINER_DUMP_DIR}', dump_dir, capture_output=True)
+    _check(spec.compose("cp", str(source_dir / database), f"{spec.database_service}:{dump_dir}", capture_output=True, text=True), f"copy the dump of {database}")
+
+    # template1 as maintenance database, so that "postgres" itself can be recreated too
+    script = f'dropdb -U {POSTGRES_USER} --maintenance-db=template1 --if-exists --force "$1" && createdb -U {POSTGRES_USER} --maintenance-db=template1 "$1"'
+    _check(spec.db_exec(script, database, capture_output=True, text=True), f"recreate {database}")
+
+    result = spec.db_exec(f'pg_restore -U {POSTGRES_USER} -j "$2" -d "$3" "$1"; status=$?; rm -rf "$1"; exit $status', dump_dir, str(jobs), database, capture_output=True, text=True)
+    if result.returncode != 0:
+        # pg_restore also fails on harmless errors (e.g. extensions owned by another role); the row counts tell
+        logger.warning(f"pg_restore reported errors for {database}: {result.stderr.strip()[-300:]}")
+
+
+def _postgres_restore_globals(spec, source_dir):
+    # Roles created by the image's init scripts already exist; only the missing ones matter
+    with (source_dir / "globals.sql").open("rb") as globals_file:
+        spec.db_exec(f"psql -U {POSTGRES_USER} -d template1 -q", stdin=globals_file, capture_output=True)
+
+
+def _postgres_ready(spec):
+    return spec.db_exec(f"pg_isready -U {POSTGRES_USER}", capture_output=True).returncode == 0
+
+
+# MariaDB / MySQL
+
+
+def _mariadb_databases(spec):
+    result = _check(spec.db_exec(f'{MARIADB_CLIENT} -N -e "SHOW DATABASES"', capture_output=True, text=True), "list databases")
+    return [database for database in result.stdout.split() if database not in MARIADB_SYSTEM_DATABASES]
+
+
+def _mariadb_row_counts(spec, database):
+    query = _check(spec.db_exec(f"{MARIADB_CLIENT} -N", input=MARIADB_ROW_COUNTS.format(database=database), capture_output=True, text=True), f"count rows of {database}")
+    count_query = query.stdout.strip()
+    if not count_query or count_query == "NULL":
+        return {}
+
+    result = _check(spec.db_exec(f"{MARIADB_CLIENT} -N --batch", input=count_query, capture_output=True, text=True), f"count rows of {database}")
+    return {table: int(count) for table, count in (line.split("\t") for line in result.stdout.splitlines() if line)}
+
+
+def _mariadb_dump(spec, database, target_dir, _jobs):
+    script = f'{MARIADB_DUMP} --single-transaction --routines --triggers --events --add-drop-database --databases "$1"'
+    with (target_dir / f"{database}.sql").open("wb") as dump_file:
+        _check(spec.db_exec(script, database, stdout=dump_file, stderr=subprocess.PIPE), f"dump {database}")
+
+
+def _mariadb_restore(spec, database, source_dir, _jobs):
+    with (source_dir / f"{database}.sql").open("rb") as dump_file:
+        _check(spec.db_exec(MARIADB_CLIENT, stdin=dump_file, capture_output=True), f"restore {database}")
+
+
+def _mariadb_ready(spec):
+    return spec.db_exec(f'{MARIADB_CLIENT} -e "SELECT 1"', capture_output=True).returncode == 0
+
+
+ENGINES = {
+    "postgres": {
+        "databases": _postgres_databases,
+        "row_counts": _postgres_row_counts,
+        "dump": _postgres_dump,
+        "restore": _postgres_restore,
+        "ready": _postgres_ready,
+        # pg_restore parallelizes within a database
+        "parallel_databases": False,
+    },
+    "mariadb": {
+        "databases": _mariadb_databases,
+        "row_counts": _mariadb_row_counts,
+        "dump": _mariadb_dump,
+        "restore": _mariadb_restore,
+        "ready": _mariadb_ready,
+        # A SQL dump restores on one connection, so databases are restored side by side instead
+        "parallel_databases": True,
+    },
+}
+
+
+def _row_counts(spec, engine, databases):
+    return {database: engine["row_counts"](spec, database) for database in databases}
+
+
+def _wait_for_database(spec, engine):
+    deadline = time.monotonic() + DATABASE_READY_TIMEOUT
+    while not engine["ready"](spec):
+        if time.monotonic() > deadline:
+            raise click.ClickException(f"{spec.database_service} did not become ready within {DATABASE_READY_TIMEOUT}s")
+        time.sleep(2)
+
+
+# Volumes
+
+
+def _archive_volume(spec, service, path, target_dir):
+    with (target_dir / _volume_archive(service, path)).open("wb") as archive:
+        result = spec.compose("run", "--rm", "--no-deps", "-T", "--entrypoint", "tar", service, "-C", path, "-cf", "-", ".", stdout=archive, stderr=subprocess.PIPE)
+    _check(result, f"archive {service}:{path}")
+
+
+def _restore_volume(spec, service, path, source_dir):
+    with (source_dir / _volume_archive(service, path)).open("rb") as archive:
+        script = 'find "$1" -mindepth 1 -delete && tar -C "$1" -xf -'
+        result = spec.compose("run", "--rm", "--no-deps", "-T", "--entrypoint", "sh", service, "-c", script, "sh", path, stdin=archive, capture_output=True)
+    _check(result, f"restore {service}:{path}")
+
+
+# Snapshot and restore
+
+
+def _stop_app_services(spec):
+    """Stop every running service but the database. Returns the stopped services, to start them again."""
+    services = _check(spec.compose("ps", "--services", "--status", "running", capture_output=True, text=True), "list services").stdout.split()
+    stopped = [service for service in services if service != spec.database_service]
+    if stopped:
+        _check(spec.compose("stop", *stopped, capture_output=True, text=True), "stop the app services")
+    return stopped
+
+
+def create_snapshot(spec, jobs=DEFAULT_JOBS, force=False):
+    """Capture the current state of an app. Returns the snapshot directory."""
+    key = spec.snapshot_key()
+    snapshot_dir = SNAPSHOT_PATH / spec.app / key
+
+    if snapshot_dir.exists() and not force:
+        logger.info(f"Snapshot {key} of {spec.app} already exists, use --force to replace it")
+        return snapshot_dir
+
+    partial_dir = snapshot_dir.with_name(f"{key}.partial")
+    shutil.rmtree(partial_dir, ignore_errors=True)
+    (partial_dir / "databases").mkdir(parents=True)
+    (partial_dir / "volumes").mkdir()
+
+    manifest = {"app": spec.app, "key": key, "created_at": datetime.now().isoformat(timespec="seconds"), "engine": None, "row_counts": {}, "volumes": []}
+
+    # The dumps, row counts and volumes must all show the same state, so nothing may write while they are taken
+    stopped = _stop_app_services(spec)
+
+    try:
+        if spec.database_service:
+            engine = ENGINES[spec.engine]
+            databases = engine["databases"](spec)
+            if spec.databases:
+                missing = [database for database in spec.databases if database not in databases]
+                if missing:
+                    raise click.ClickException(f"{spec.app} has no database {', '.join(missing)}; was it created before its database name was pinned?")
+                databases = spec.databases
+            manifest["engine"] = spec.engine
+
+            logger.start(f"Dumping {len(databases)} {spec.engine} databases of {spec.app}...")
+            if spec.engine == "postgres":
+                _postgres_dump_globals(spec, partial_dir / "databases")
+            for database in databases:
+                engine["dump"](spec, database, partial_dir / "databases", jobs)
+            manifest["row_counts"] = _row_counts(spec, engine, databases)
+            logger.succeed(f"Dumped {', '.join(databases)}")
+
+        for service, path in spec.volumes:
+            logger.start(f"Archiving {service}:{path}...")
+            _archive_volume(spec, service, path, partial_dir / "volumes")
+            manifest["volumes"].append([service, path])
+            logger.succeed(f"Archived {service}:{path}")
+
+        (partial_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    except BaseException:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        raise
+    finally:
+        if stopped:
+            spec.compose("start", *stopped, capture_output=True)
+
+    shutil.rmtree(snapshot_dir, ignore_errors=True)
+    partial_dir.rename(snapshot_dir)
+    logger.info(f"Snapshot {key} of {spec.app} saved to {snapshot_dir}")
+    return snapshot_dir
+
+
+def restore_snapshot(spec, jobs=DEFAULT_JOBS, key=None):
+    """Restore the snapshot matching the current data and images, or the one given by `key`."""
+    key = key or spec.snapshot_key()
+    snapshot_dir = SNAPSHOT_PATH / spec.app / key
+    manifest_path = snapshot_dir / "manifest.json"
+
+    if not manifest_path.exists():
+        available = sorted(p.name for p in (SNAPSHOT_PATH / spec.app).glob("*") if (p / "manifest.json").exists())
+        hint = f" Available snapshots: {', '.join(available)}." if available else ""
+        raise click.ClickException(f"No snapshot {key} of {spec.app}: seed it and run `snapshot` first.{hint}")
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    start_time = time.monotonic()
+
+    # Nothing may write to the databases while they are replaced
+    stopped = _stop_app_services(spec)
+
+    try:
+        if manifest["engine"]:
+            engine = ENGINES[manifest["engine"]]
+            databases = list(manifest["row_counts"])
+            source_dir = snapshot_dir / "databases"
+
+            _check(spec.compose("up", "-d", spec.database_service, capture_output=True, text=True), f"start {spec.database_service}")
+            _wait_for_database(spec, engine)
+
+            logger.start(f"Restoring {len(databases)} databases of {spec.app}...")
+            if manifest["engine"] == "postgres":
+                _postgres_restore_globals(spec, source_dir)
+
+            workers = min(jobs, len(databases)) if engine["parallel_databases"] else 1
+            with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+                list(executor.map(lambda database: engine["restore"](spec, database, source_dir, jobs), databases))
+            logger.succeed(f"Restored {', '.join(databases)}")
+
+            _verify_row_counts(spec, engine, manifest["row_counts"])
+
+        for service, path in manifest["volumes"]:
+            logger.start(f"Restoring {service}:{path}...")
+            _restore_volume(spec, service, path, snapshot_dir / "volumes")
+            logger.succeed(f"Restored {service}:{path}")
+    finally:
+        if stopped:
+            spec.compose("start", *stopped, capture_output=True)
+
+    logger.info(f"Snapshot {key} of {spec.app} restored in {time.monotonic() - start_time:.1f}s")
+
+
+def _verify_row_counts(spec, engine, expected):
+    logger.start("Verifying row counts...")
+    actual = _row_counts(spec, engine, expected)
+
+    mismatches = []
+    for database, tables in expected.items():
+        for table, count in tables.items():
+            restored = actual.get(database, {}).get(table)
+            if restored != count:
+                mismatches.append(f"{database}:{table} expected {count}, got {restored}")
+
+    if mismatches:
+        logger.fail(f"{len(mismatches)} tables do not match the snapshot")
+        raise click.ClickException("Restored row counts differ from the snapshot:\n" + "\n".join(mismatches[:20]))
+
+    logger.succeed(f"Verified {sum(len(tables) for tables in expected.values())} tables")
+
+
+def add_snapshot_commands(group, spec):
+    """Add `snapshot` and `restore` commands for `spec` to an app CLI group"""
+
+    @group.command()
+    @click.option("--jobs", type=int, default=DEFAULT_JOBS, help="Parallel dump jobs")
+    @click.option("--force", is_flag=True, help="Replace an existing snapshot of the same data")
+    def snapshot(jobs: int, force: bool):
+        """Save the seeded databases and volumes for a later restore"""
+        create_snapshot(spec, jobs=jobs, force=force)
+
+    @group.command()
+    @click.option("--jobs", type=int, default=DEFAULT_JOBS, help="Parallel restore jobs")
+    @click.option("--key", default=None, help="Snapshot to restore instead of the one matching the current data")
+    def restore(jobs: int, key: str | None):
+        """Restore the snapshot of the seeded state instead of seeding again"""
+        restore_snapshot(spec, jobs=jobs, key=key)